@@ -11,25 +11,32 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
 
 from td_lead_engine.storage.database import LeadDatabase
 from td_lead_engine.storage.models import LeadStatus
-from td_lead_engine.core.scorer import LeadScorer
+from td_lead_engine.core.scorer import get_shared_scorer
 
 app = Flask(__name__)
 CORS(app)
 
 db = LeadDatabase()
-scorer = LeadScorer()
+scorer = get_shared_scorer()
 
 
 @app.route('/api/leads', methods=['GET'])
 def get_leads():
-    """Get all leads with optional filters."""
+    """Get a page of leads (highest score first) with optional filters.
+
+    Pass the returned ``next_cursor`` as ``?cursor=`` for the next page.
+    """
     tier = request.args.get('tier')
-    limit = request.args.get('limit', 100, type=int)
+    limit = min(request.args.get('limit', 100, type=int), 500)
+    cursor = request.args.get('cursor')
 
-    leads = db.get_all_leads(tier=tier, limit=limit)
+    try:
+        page = db.get_leads_page(limit=limit, cursor=cursor, tier=tier)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
 
     result = []
-    for lead in leads:
+    for lead in page.leads:
         signals = []
         if lead.score_breakdown:
             try:
@@ -45,6 +52,7 @@ def get_leads():
             'phone': lead.phone,
             'username': lead.username,
             'score': lead.score,
+            'effective_score': lead.effective_score,
             'tier': lead.tier,
             'status': lead.status.value,
             'source': lead.source,
@@ -52,7 +60,7 @@ def get_leads():
             'profile_url': lead.profile_url,
         })
 
-    return jsonify({'leads': result})
+    return jsonify({'leads': result, 'total': page.total, 'next_cursor': page.next_cursor})
 
 
 @app.route('/api/leads/<int:lead_id>', methods=['GET'])
@@ -147,7 +155,7 @@ def search():
     if not query:
         return jsonify({'leads': []})
 
-    leads = db.search_leads(query, limit=50)
+    leads = db.search_leads(query, limit=50, ranked=True)
 
     result = []
     for lead in leads:
@@ -159,6 +167,7 @@ def search():
             'score': lead.score,
             'tier': lead.tier,
             'source': lead.source,
+            'snippet': lead.snippet,
         })
 
     return jsonify({'leads': result})
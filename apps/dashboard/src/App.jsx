@@ -19,6 +19,8 @@ function App() {
   const [loading, setLoading] = useState(false)
   const [filter, setFilter] = useState('all')
   const [search, setSearch] = useState('')
+  const [searchResults, setSearchResults] = useState(null)
+  const [nextCursor, setNextCursor] = useState(null)
 
   // Calculate stats from leads
   useEffect(() => {
@@ -42,6 +44,7 @@ function App() {
           const data = await response.json()
           if (data.leads && data.leads.length > 0) {
             setLeads(data.leads)
+            setNextCursor(data.next_cursor)
           }
         }
       } catch (e) {
@@ -52,13 +55,49 @@ function App() {
     fetchLeads()
   }, [])
 
+  // Append the next page (cursor pagination keeps deep pages as fast as the first)
+  const loadMore = async () => {
+    if (!nextCursor) return
+    try {
+      const response = await fetch(`/api/leads?cursor=${encodeURIComponent(nextCursor)}`)
+      if (response.ok) {
+        const data = await response.json()
+        setLeads(current => [...current, ...data.leads])
+        setNextCursor(data.next_cursor)
+      }
+    } catch (e) {
+      console.log('Could not load more leads')
+    }
+  }
+
+  // Search the whole database (ranked, with snippets) when the API is up
+  useEffect(() => {
+    if (!search) {
+      setSearchResults(null)
+      return
+    }
+    const timer = setTimeout(async () => {
+      try {
+        const response = await fetch(`/api/search?q=${encodeURIComponent(search)}`)
+        if (response.ok) {
+          const data = await response.json()
+          setSearchResults(data.leads)
+        }
+      } catch (e) {
+        // API not available, filter the loaded leads instead
+        setSearchResults(null)
+      }
+    }, 200)
+    return () => clearTimeout(timer)
+  }, [search])
+
   // Filter leads
-  const filteredLeads = leads.filter(lead => {
+  const filteredLeads = (searchResults || leads).filter(lead => {
     // Tier filter
     if (filter !== 'all' && lead.tier !== filter) return false
 
-    // Search filter
-    if (search) {
+    // Search filter (server results are already matched)
+    if (search && !searchResults) {
       const searchLower = search.toLowerCase()
       const matchesName = lead.name?.toLowerCase().includes(searchLower)
       const matchesEmail = lead.email?.toLowerCase().includes(searchLower)
@@ -194,6 +233,9 @@ function App() {
                         <div className="secondary">
                           {lead.email || lead.phone || 'No contact'}
                         </div>
+                        {lead.snippet && (
+                          <div className="secondary snippet">{lead.snippet}</div>
+                        )}
                       </div>
                     </td>
                     <td>
@@ -210,6 +252,11 @@ function App() {
                 ))}
               </tbody>
             </table>
+            {nextCursor && !searchResults && (
+              <button className="filter-btn" onClick={loadMore}>
+                Load more
+              </button>
+            )}
           </div>
         )}
       </main>
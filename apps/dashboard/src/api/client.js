@@ -14,7 +14,7 @@ export async function fetchLeads(filters = {}) {
   if (filters.status) params.append('status', filters.status);
   if (filters.utm_campaign) params.append('utm_campaign', filters.utm_campaign);
   if (filters.limit) params.append('limit', String(filters.limit));
-  if (filters.offset) params.append('offset', String(filters.offset));
+  if (filters.cursor) params.append('cursor', filters.cursor);
 
   const response = await fetch(`${API_BASE}/v1/leads?${params}`);
   return response.json();
@@ -0,0 +1,103 @@
+"""Benchmark: online backup time and writer stall under concurrent inserts.
+
+Usage:
+    python benchmarks/bench_backup.py [--leads 200000] [--seconds 3]
+
+Fills a database, then runs a writer thread committing one ``insert_lead``
+at a time. Insert latency (p50 / p99 / max) is measured for ``--seconds``
+with no backup running, and again while ``backup_database`` copies the
+live file at several step sizes (``-1`` is the whole file in one step),
+with and without compression. The old ``shutil.copy2`` of the live file is
+timed for reference; it isn't a consistent snapshot under writes.
+"""
+
+import argparse
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.backup import backup_database
+from td_lead_engine.storage.database import LeadDatabase
+
+
+class InsertLoad:
+    """Writer thread inserting leads one transaction at a time, recording latency."""
+
+    def __init__(self, db: LeadDatabase):
+        self.db = db
+        self.latencies = []
+        self._stop = threading.Event()
+        self._next = 0
+        self._thread = None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        while not self._stop.is_set():
+            self._next += 1
+            start = time.perf_counter()
+            self.db.insert_lead(RawLead(source="csv", source_id=f"live-{id(self)}-{self._next}",
+                                        name=f"Live {self._next}", notes="lease is up soon"))
+            self.latencies.append(time.perf_counter() - start)
+
+    def summary(self) -> str:
+        ms = sorted(x * 1000 for x in self.latencies)
+        if not ms:
+            return "no inserts"
+        p99 = ms[min(len(ms) - 1, int(len(ms) * 0.99))]
+        return (f"{len(ms):>6,} inserts | p50 {statistics.median(ms):6.2f} ms | "
+                f"p99 {p99:6.2f} ms | max {ms[-1]:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=200000)
+    parser.add_argument("--seconds", type=float, default=3.0, help="Baseline measurement window")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        db = LeadDatabase(tmp / "leads.db")
+        for start in range(0, args.leads, 50000):
+            db.insert_many([
+                RawLead(source="csv", source_id=str(i), name=f"Lead {i}",
+                        email=f"lead{i}@example.com",
+                        notes="Renting in Dublin, lease is up in March, preapproved",
+                        messages=[f"message {k}" for k in range(3)])
+                for i in range(start, min(args.leads, start + 50000))
+            ])
+        size = (tmp / "leads.db").stat().st_size
+        print(f"database: {args.leads:,} leads, {size / 2 ** 20:.1f} MiB")
+
+        with InsertLoad(db) as load:
+            time.sleep(args.seconds)
+        print(f"{'no backup':<28} {'':>9} | {load.summary()}")
+
+        runs = [("pages=-1", -1, False), ("pages=1024", 1024, False),
+                ("pages=64", 64, False), ("pages=1024 compressed", 1024, True)]
+        for label, pages, compress in runs:
+            with InsertLoad(db) as load:
+                result = backup_database(db.db_path, tmp / "backups", keep=1,
+                                         compress=compress, pages=pages)
+            print(f"{label:<28} {result.seconds:7.2f} s | {load.summary()}")
+
+        with InsertLoad(db) as load:
+            start = time.perf_counter()
+            shutil.copy2(db.db_path, tmp / "copy.db")
+            elapsed = time.perf_counter() - start
+        print(f"{'shutil.copy2 (unsafe)':<28} {elapsed:7.2f} s | {load.summary()}")
+
+
+if __name__ == "__main__":
+    main()
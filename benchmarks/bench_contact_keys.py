@@ -0,0 +1,99 @@
+"""Benchmark: ``insert_lead`` dedup latency as the leads table grows.
+
+Usage:
+    python benchmarks/bench_contact_keys.py [--sizes 10000 100000 1000000] [--inserts 500]
+
+Prefills a database with ``insert_many`` and then times ``insert_lead`` for
+a mix of new leads and re-imports matching by formatted phone, email and
+username. With the normalized key indexes each dedup probe is an index
+seek, so latency stays flat; ``--like`` also times the previous
+``phone LIKE '%digits%'`` probe, which scans the table.
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+
+def _raw(i: int) -> RawLead:
+    return RawLead(
+        source="instagram",
+        username=f"user_{i}",
+        email=f"user{i}@example.com" if i % 2 else None,
+        phone=f"614{i:07d}" if i % 3 == 0 else None,
+    )
+
+
+def prefill(db: LeadDatabase, size: int, chunk: int = 50000):
+    for start in range(0, size, chunk):
+        db.insert_many([_raw(i) for i in range(start, min(size, start + chunk))])
+
+
+def probes(size: int, count: int, seed: int = 7):
+    rng = random.Random(seed)
+    for n in range(count):
+        i = rng.randrange(size)
+        kind = n % 4
+        if kind == 0:
+            yield RawLead(source="csv", name=f"New {n}", phone=f"555{n:07d}",
+                          email=f"new{n}@example.com")
+        elif kind == 1:
+            j = i - i % 3
+            phone = f"(614) {j // 10000 % 1000:03d}-{j % 10000:04d}"
+            yield RawLead(source="zillow", phone=phone, notes="phone")
+        elif kind == 2:
+            yield RawLead(source="zillow", email=f"USER{i | 1}@Example.com", notes="email")
+        else:
+            yield RawLead(source="instagram", username=f"@User_{i}", notes="username")
+
+
+def time_inserts(db: LeadDatabase, size: int, count: int):
+    latencies = []
+    for raw in probes(size, count):
+        start = time.perf_counter()
+        db.insert_lead(raw)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return statistics.median(latencies) * 1000, latencies[int(len(latencies) * 0.99)] * 1000
+
+
+def time_like(db: LeadDatabase, count: int = 20) -> float:
+    start = time.perf_counter()
+    with db._read_connection() as conn:
+        for n in range(count):
+            conn.execute(
+                "SELECT * FROM leads WHERE phone LIKE ? LIMIT 1", (f"%555{n:07d}%",)
+            ).fetchone()
+    return (time.perf_counter() - start) * 1000 / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 1000000])
+    parser.add_argument("--inserts", type=int, default=500, help="insert_lead calls timed per size")
+    parser.add_argument("--like", action="store_true", help="Also time the old LIKE phone probe")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            db = LeadDatabase(Path(tmpdir) / f"leads_{size}.db")
+            start = time.perf_counter()
+            prefill(db, size)
+            fill = time.perf_counter() - start
+            p50, p99 = time_inserts(db, size, args.inserts)
+            line = (f"{size:>9,} leads (prefill {fill:6.1f} s) | insert_lead p50 {p50:6.3f} ms "
+                    f"p99 {p99:6.3f} ms")
+            if args.like:
+                line += f" | LIKE phone probe {time_like(db):8.2f} ms"
+            print(line, flush=True)
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark: cost of recording one conversion as history grows.
+
+Usage:
+    python benchmarks/bench_conversion_log.py [--records 100 --sizes 1000 10000 100000]
+
+Compares the old whole-file JSON rewrite (what ``ConversionTracker`` and
+``ROITracker`` did on every record) with an append to the JSON-lines log,
+then times streaming the log and compacting it.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+from td_lead_engine.core.config import ConversionTracker
+
+
+def _record(i: int) -> dict:
+    return {
+        "lead_id": i,
+        "converted": i % 3 == 0,
+        "conversion_type": "buyer",
+        "signals_at_conversion": ["preapproved", "first time homebuyer"],
+        "score_at_conversion": 120,
+        "days_to_conversion": 14,
+        "source": "zillow",
+        "recorded_at": datetime.now().isoformat(),
+    }
+
+
+def run(size: int, records: int, tmpdir: Path):
+    history = [_record(i) for i in range(size)]
+
+    legacy_path = tmpdir / f"legacy_{size}.json"
+    start = time.perf_counter()
+    for i in range(records):
+        history.append(_record(size + i))
+        with open(legacy_path, "w") as f:
+            json.dump({"conversions": history}, f, indent=2)
+    rewrite_ms = (time.perf_counter() - start) * 1000 / records
+
+    log_path = tmpdir / f"log_{size}.jsonl"
+    log_path.write_text("".join(json.dumps(r) + "\n" for r in history[:size]))
+    tracker = ConversionTracker(log_path)
+    start = time.perf_counter()
+    for i in range(records):
+        tracker.record_conversion(
+            size + i, True, signals=["preapproved"], score=120, source="zillow"
+        )
+    append_ms = (time.perf_counter() - start) * 1000 / records
+
+    start = time.perf_counter()
+    streamed = sum(1 for _ in tracker.iter_conversions())
+    stream_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    tracker.compact()
+    compact_ms = (time.perf_counter() - start) * 1000
+
+    print(f"{size:>8,} history | rewrite {rewrite_ms:9.3f} ms/record "
+          f"| append {append_ms:7.3f} ms/record "
+          f"| stream {streamed:,} in {stream_ms:7.1f} ms | compact {compact_ms:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100, help="Conversions recorded per size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            run(size, args.records, Path(tmpdir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Benchmark: pooled WAL connections vs a new connection per call.
+
+Usage:
+    python benchmarks/bench_db_pool.py [--leads 3000] [--readers 4] [--seconds 3]
+
+Measures ``insert_lead`` throughput (each call dedups, inserts and reads the
+lead back) and the latency of ``get_lead`` / ``get_all_leads`` calls from
+reader threads while a writer thread keeps inserting. "per-call" reproduces
+the previous behaviour: ``sqlite3.connect`` for every method call in the
+default rollback-journal mode.
+"""
+
+import argparse
+import sqlite3
+import statistics
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+
+class PerCallDatabase(LeadDatabase):
+    """LeadDatabase with the old open-per-call connection handling."""
+
+    @contextmanager
+    def _get_connection(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    _read_connection = _get_connection
+
+    @contextmanager
+    def transaction(self):
+        with self._get_connection() as conn:
+            yield conn
+
+
+def _raw(i: int) -> RawLead:
+    return RawLead(
+        source="csv",
+        source_id=str(i),
+        name=f"Lead {i}",
+        email=f"lead{i}@example.com",
+        phone=f"614555{i:04d}",
+        notes="Preapproved, looking in Powell",
+    )
+
+
+def run(label: str, db: LeadDatabase, leads: int, readers: int, seconds: float):
+    start = time.perf_counter()
+    for i in range(leads):
+        db.insert_lead(_raw(i))
+    insert_rate = leads / (time.perf_counter() - start)
+
+    stop = threading.Event()
+    latencies = []
+    lock = threading.Lock()
+
+    def writer():
+        i = leads
+        while not stop.is_set():
+            db.insert_lead(_raw(i))
+            i += 1
+
+    def reader(seed: int):
+        n = seed
+        local = []
+        while not stop.is_set():
+            t = time.perf_counter()
+            if n % 4:
+                db.get_lead(1 + n % leads)
+            else:
+                db.get_all_leads(limit=50)
+            local.append(time.perf_counter() - t)
+            n += 1
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=writer)]
+    threads += [threading.Thread(target=reader, args=(r,)) for r in range(readers)]
+    for t in threads:
+        t.start()
+    time.sleep(seconds)
+    stop.set()
+    for t in threads:
+        t.join()
+
+    latencies.sort()
+    p50 = statistics.median(latencies) * 1000
+    p99 = latencies[int(len(latencies) * 0.99)] * 1000
+    read_rate = len(latencies) / seconds
+    print(f"{label:<9} | inserts {insert_rate:>8,.0f}/s | concurrent reads {read_rate:>8,.0f}/s "
+          f"p50 {p50:6.2f} ms p99 {p99:7.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=3000)
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        per_call = PerCallDatabase(Path(tmpdir) / "per_call.db")
+        with per_call._get_connection() as conn:
+            conn.execute("PRAGMA journal_mode = DELETE")
+        run("per-call", per_call, args.leads, args.readers, args.seconds)
+
+        pooled = LeadDatabase(Path(tmpdir) / "pooled.db", readers=args.readers)
+        run("pooled", pooled, args.leads, args.readers, args.seconds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark: manager mutations/sec, whole-file JSON rewrites vs the document store.
+
+Usage:
+    python benchmarks/bench_doc_store.py [--sizes 1000,10000,100000] [--seconds 2]
+
+For each collection size, loads that many task-like records and then
+updates random records one at a time for ``--seconds`` per mode:
+
+- ``json.dump``: the old manager pattern, rewriting the whole file
+  (``indent=2``) on every change
+- ``put``: one upsert transaction per change (``DocumentStore``)
+- ``put, write-behind``: buffered upserts, flushed in batches (the time
+  includes the final flush)
+
+Also reports the on-disk size and a secondary-index ``find`` lookup.
+"""
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.core.doc_store import DocumentStore
+
+
+def record(i: int) -> dict:
+    return {
+        "id": f"task-{i:07d}",
+        "title": f"Follow up with lead {i}",
+        "description": "Call to discuss pre-approval and neighborhoods",
+        "task_type": "call",
+        "priority": "high",
+        "status": "pending",
+        "lead_id": f"lead-{i % 5000}",
+        "due_date": "2026-03-01T10:00:00",
+        "tags": ["buyer", "powell"],
+        "created_at": "2026-02-01T09:00:00",
+    }
+
+
+def run(label: str, mutate, seconds: float, finish=None) -> int:
+    rng = random.Random(7)
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        mutate(rng)
+        count += 1
+    if finish:
+        finish()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {count / elapsed:12,.1f} mutations/s")
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="1000,10000,100000")
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measurement window per mode")
+    args = parser.parse_args()
+
+    for size in [int(s) for s in args.sizes.split(",")]:
+        print(f"{size:,} records")
+        records = {r["id"]: r for r in map(record, range(size))}
+        keys = list(records)
+
+        with tempfile.TemporaryDirectory() as tmpdir:
+            tmp = Path(tmpdir)
+            json_path = tmp / "tasks.json"
+
+            def dump(rng):
+                records[rng.choice(keys)]["status"] = "completed"
+                with open(json_path, "w") as f:
+                    json.dump({"tasks": list(records.values())}, f, indent=2)
+
+            run("json.dump", dump, args.seconds)
+
+            store = DocumentStore(tmp / "store.db")
+            tasks = store.collection("tasks", indexes=("lead_id",))
+            tasks.put_many(records.items())
+
+            def put(rng):
+                key = rng.choice(keys)
+                records[key]["status"] = "completed"
+                tasks.put(key, records[key])
+
+            run("put", put, args.seconds)
+            store.close()
+
+            behind = DocumentStore(tmp / "store.db", write_behind=True)
+            tasks = behind.collection("tasks", indexes=("lead_id",))
+            run("put, write-behind", put, args.seconds, finish=behind.flush)
+
+            start = time.perf_counter()
+            found = tasks.find("lead_id", "lead-42")
+            find_ms = (time.perf_counter() - start) * 1000
+            behind.close()
+
+            json_mib = json_path.stat().st_size / 2 ** 20
+            store_mib = sum(p.stat().st_size for p in tmp.glob("store.db*")) / 2 ** 20
+            print(f"  size: json {json_mib:.1f} MiB, store {store_mib:.1f} MiB | "
+                  f"find(lead_id) {len(found)} rows in {find_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
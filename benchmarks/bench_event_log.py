@@ -0,0 +1,114 @@
+"""Benchmark: EventTracker ingest cost and range queries over the segmented log.
+
+Usage:
+    python benchmarks/bench_event_log.py [--events 500000] [--days 90] [--seconds 2]
+
+Ingest: events/sec from ``track()`` for ``--seconds`` with each fsync
+policy, against the old pattern of rewriting the newest 5,000 events to
+``events.json`` (``indent=2``) on every event.
+
+Queries: writes ``--events`` page views spread evenly over ``--days``
+days straight into the log, reopens the tracker (timed) and times
+``get_events`` for the last hour (answered by the in-memory tail), for one
+visitor on a day two thirds of the way back (seeks to that day's segment)
+and for the same visitor over all history, plus ``get_event_counts`` for
+one old day.
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from td_lead_engine.tracking.events import EventCategory, EventTracker, _event_record
+
+
+def rate(label: str, fn, seconds: float):
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        fn(count)
+        count += 1
+    print(f"{label:<36} {count / (time.perf_counter() - start):10,.0f} events/s")
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<36} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seconds", type=float, default=2.0,
+                        help="Measurement window per ingest mode")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+
+        legacy = EventTracker(str(tmp / "legacy"))
+        for i in range(5000):
+            legacy.track_page_view(f"/listing/{i}", visitor_id=f"v{i}")
+
+        def legacy_track(i):
+            event = legacy.track_page_view(f"/listing/{i}", visitor_id=f"v{i}")
+            with open(tmp / "events.json", "w") as f:
+                json.dump([_event_record(e) for e in list(legacy.events)[-5000:]], f, indent=2)
+            return event
+
+        rate("json.dump of last 5,000 (old)", legacy_track, args.seconds)
+        for policy in ("never", "interval", "always"):
+            tracker = EventTracker(str(tmp / f"ingest-{policy}"), fsync=policy)
+            rate(f"track(), fsync={policy}",
+                 lambda i: tracker.track_page_view(f"/listing/{i}", visitor_id=f"v{i}"),
+                 args.seconds)
+            tracker.close()
+
+        storage = tmp / "history"
+        tracker = EventTracker(str(storage), fsync="never")
+        now = datetime.now().replace(microsecond=0)
+        start = now - timedelta(days=args.days)
+        step = timedelta(days=args.days) / args.events
+        t0 = time.perf_counter()
+        for i in range(args.events):
+            at = start + step * i
+            tracker.log.append({
+                "id": f"e{i}", "category": "page", "action": "view", "label": "Listing",
+                "visitor_id": f"v{i % 20000}", "session_id": f"s{i // 5}",
+                "timestamp": at.isoformat(), "page_url": f"/listing/{i % 3000}",
+                "referrer": "https://www.google.com/", "properties": {},
+            }, at=at)
+        tracker.close()
+        size = sum(p.stat().st_size for p in (storage / "log").iterdir())
+        print(f"history: {args.events:,} events in {len(tracker.log.segments())} segments, "
+              f"{size / 2 ** 20:.0f} MiB, written in {time.perf_counter() - t0:.1f} s")
+
+        tracker = timed("reopen (fill 5,000-event tail)", lambda: EventTracker(str(storage)))
+        day = now - timedelta(days=args.days * 2 // 3)
+        day_start = day.replace(hour=0, minute=0, second=0)
+        day_end = day.replace(hour=23, minute=59, second=59)
+        # A visitor with an event that day
+        visitor = f"v{int((day_start - start) / step + 1000) % 20000}"
+        timed("get_events, last hour (tail)",
+              lambda: tracker.get_events(start_date=now - timedelta(hours=1), limit=100))
+        found = timed("get_events, visitor on one old day",
+                      lambda: tracker.get_events(visitor_id=visitor, start_date=day_start,
+                                                 end_date=day_end))
+        everything = timed("get_events, visitor, all history",
+                           lambda: tracker.get_events(visitor_id=visitor, start_date=start,
+                                                      limit=10 ** 9))
+        print(f"  {len(found)} events that day, {len(everything)} overall")
+        timed("get_event_counts, one old day",
+              lambda: tracker.get_event_counts(day_start, day_end))
+        timed("get_events, newest 100 of a category",
+              lambda: tracker.get_events(category=EventCategory.PAGE, start_date=start))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark: single-pass funnel engine versus the old per-step visitor loops.
+
+Usage:
+    python benchmarks/bench_funnel.py [--events 1000000] [--visitors 100000] [--days 30]
+
+Writes ``--events`` events for ``--visitors`` visitors spread over
+``--days`` days into an EventTracker's log, drawn from six funnel event
+types (most common first) and two non-funnel ones, then times a six-step
+``get_funnel_analysis`` over the whole range with the engine (unordered,
+ordered, ordered within 7 days, and ordered by source). It compares them
+with the old algorithm: read every event, group by visitor, then loop
+steps × visitors × events.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from td_lead_engine.tracking.events import EventTracker, _event_from_record
+
+STEPS = [
+    ("page", "view"), ("search", "perform"), ("property", "view"),
+    ("property", "favorite"), ("form", "submit"), ("property", "showing_scheduled"),
+]
+WEIGHTS = [40, 20, 20, 6, 3, 1]
+OTHER = [("calculator", "use"), ("communication", "email_open")]
+REFERRERS = ["https://www.google.com/", "https://www.facebook.com/", "https://www.zillow.com/", ""]
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {time.perf_counter() - start:8.2f} s")
+    return result
+
+
+def old_funnel(tracker: EventTracker, start: datetime, end: datetime):
+    visitor_events = {}
+    for event_data in tracker.log.scan(start, end):
+        event = _event_from_record(event_data)
+        if event.visitor_id:
+            visitor_events.setdefault(event.visitor_id, []).append(event)
+    counts = []
+    for category, action in STEPS:
+        visitors_at_step = set()
+        for visitor_id, v_events in visitor_events.items():
+            for event in v_events:
+                if event.category.value == category and event.action == action:
+                    visitors_at_step.add(visitor_id)
+                    break
+        counts.append(len(visitors_at_step))
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=1000000)
+    parser.add_argument("--visitors", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=30)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    types = STEPS + OTHER
+    weights = WEIGHTS + [10, 10]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Path(tmpdir) / "events"
+        tracker = EventTracker(str(storage), fsync="never")
+        now = datetime.now().replace(microsecond=0)
+        start = now - timedelta(days=args.days)
+        step = timedelta(days=args.days) / args.events
+        t0 = time.perf_counter()
+        for i, (category, action) in enumerate(rng.choices(types, weights, k=args.events)):
+            at = start + step * i
+            visitor = rng.randrange(args.visitors)
+            tracker.log.append({
+                "id": f"e{i}", "category": category, "action": action, "visitor_id": f"v{visitor}",
+                "timestamp": at.isoformat(), "referrer": REFERRERS[visitor % 4], "properties": {},
+            }, at=at)
+        tracker.close()
+        print(f"history: {args.events:,} events, {args.visitors:,} visitors, "
+              f"written in {time.perf_counter() - t0:.1f} s")
+
+        tracker = EventTracker(str(storage), fsync="never")
+        end = now + timedelta(minutes=1)
+        old = timed("old: steps x visitors x events", lambda: old_funnel(tracker, start, end))
+        unordered = timed("engine, unordered",
+                          lambda: tracker.get_funnel_analysis(STEPS, start, end))
+        ordered = timed("engine, ordered",
+                        lambda: tracker.get_funnel_analysis(STEPS, start, end, ordered=True))
+        windowed = timed("engine, ordered within 7 days",
+                         lambda: tracker.get_funnel_analysis(STEPS, start, end, ordered=True,
+                                                             window=timedelta(days=7)))
+        by_source = timed("engine, ordered, by source",
+                          lambda: tracker.get_funnel_analysis(STEPS, start, end, ordered=True,
+                                                              breakdown="source"))
+        assert [s["count"] for s in unordered["steps"]] == old
+        print(f"  unordered counts: {old}")
+        print(f"  ordered counts:   {[s['count'] for s in ordered['steps']]}")
+        print(f"  within 7 days:    {[s['count'] for s in windowed['steps']]}")
+        print(f"  sources:          {sorted(by_source['breakdown'])}")
+
+
+if __name__ == "__main__":
+    main()
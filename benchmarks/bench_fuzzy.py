@@ -0,0 +1,126 @@
+"""Benchmark: recall and throughput of variant-tolerant signal matching.
+
+Usage:
+    python benchmarks/bench_fuzzy.py [--texts 2000]
+
+Recall: every real intent signal is embedded in filler text in several
+misspelled or re-punctuated forms (hyphenated, joined, split, apostrophe
+dropped, one-character typo in a long word) and the exact ``PhraseMatcher``
+is compared with ``VariantPhraseMatcher``. Clean filler texts measure
+spurious matches. Throughput reuses the vocabularies from bench_matcher.py
+(50, 500 and 5,000 phrases).
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import Callable, Dict, Optional
+
+from bench_matcher import FILLER, build_phrases, build_texts
+
+from td_lead_engine.core.matcher import PhraseMatcher, VariantPhraseMatcher
+from td_lead_engine.core.signals import INTENT_SIGNALS
+
+
+def _typo(phrase: str, rng: random.Random) -> Optional[str]:
+    """One deletion, transposition or substitution inside a word of 6+ letters."""
+    words = phrase.split()
+    candidates = [i for i, w in enumerate(words) if len(w) >= 6 and w.isalpha()]
+    if not candidates:
+        return None
+    i = rng.choice(candidates)
+    word = words[i]
+    pos = rng.randrange(1, len(word) - 1)
+    kind = rng.choice(["delete", "transpose", "substitute"])
+    if kind == "delete":
+        word = word[:pos] + word[pos + 1:]
+    elif kind == "transpose":
+        word = word[:pos] + word[pos + 1] + word[pos] + word[pos + 2:]
+    else:
+        word = word[:pos] + rng.choice("aeiourstn") + word[pos + 1:]
+    words[i] = word
+    return " ".join(words)
+
+
+VARIANTS: Dict[str, Callable[[str, random.Random], Optional[str]]] = {
+    "hyphenated": lambda p, r: p.replace(" ", "-") if " " in p else None,
+    "joined": lambda p, r: p.replace(" ", "") if " " in p else None,
+    "split": lambda p, r: (
+        (p[:len(p) // 2] + " " + p[len(p) // 2:]) if " " not in p and len(p) >= 8 else None
+    ),
+    "no apostrophe": lambda p, r: p.replace("'", "") if "'" in p else None,
+    "typo": _typo,
+}
+
+
+def recall(text_count: int, seed: int = 11):
+    rng = random.Random(seed)
+    phrases = [s.phrase for s in INTENT_SIGNALS]
+    exact = PhraseMatcher(phrases)
+    variant = VariantPhraseMatcher(phrases)
+
+    def wrap(snippet: str) -> str:
+        return " ".join([rng.choice(FILLER) for _ in range(12)] + [snippet] +
+                        [rng.choice(FILLER) for _ in range(12)])
+
+    def hit(matcher, text: str, phrase: str) -> bool:
+        key = re.sub(r"\W+", "", phrase.lower())
+        return any(
+            re.sub(r"\W+", "", matcher.phrases[i].lower()) == key
+            for i, _, _ in matcher.find_first_spans(text)
+        )
+
+    print(f"{'variant':<14} {'cases':>6} {'exact':>8} {'tolerant':>9}")
+    for name, make in VARIANTS.items():
+        cases = [(p, make(p, rng)) for p in phrases]
+        cases = [(p, v) for p, v in cases if v and v.lower() != p.lower()]
+        texts = [(p, wrap(v)) for p, v in cases]
+        exact_hits = sum(hit(exact, t, p) for p, t in texts)
+        variant_hits = sum(hit(variant, t, p) for p, t in texts)
+        print(f"{name:<14} {len(cases):>6} {exact_hits / len(cases):>8.0%} "
+              f"{variant_hits / len(cases):>9.0%}")
+
+    clean = [" ".join(rng.choice(FILLER) for _ in range(80)) for _ in range(text_count)]
+    spurious = sum(len(variant.find_first_spans(t)) - len(exact.find_first(t)) for t in clean)
+    print(f"spurious variant matches on {text_count:,} clean texts: {spurious}")
+
+
+def throughput(phrase_count: int, text_count: int):
+    phrases = build_phrases(phrase_count)
+    texts = build_texts(phrases, text_count)
+    # Sprinkle variants so the tolerant pass has something to find
+    texts = [t.replace(" ", "-", 3) for t in texts]
+
+    results = []
+    for matcher_class in (PhraseMatcher, VariantPhraseMatcher):
+        start = time.perf_counter()
+        matcher = matcher_class(phrases)
+        compile_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        for text in texts:
+            matcher.find_first_spans(text)
+        elapsed = time.perf_counter() - start
+        results.append((text_count / elapsed, compile_ms))
+
+    (exact_rate, exact_compile), (variant_rate, variant_compile) = results
+    print(
+        f"{phrase_count:>6} phrases | exact {exact_rate:>9,.0f} texts/s "
+        f"(compile {exact_compile:6.1f} ms) | tolerant {variant_rate:>9,.0f} texts/s "
+        f"(compile {variant_compile:7.1f} ms)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000, help="Texts scored per run")
+    args = parser.parse_args()
+
+    recall(args.texts)
+    print()
+    for phrase_count in (50, 500, 5000):
+        throughput(phrase_count, args.texts)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark: identity-graph lookups versus scanning stored visitors.
+
+Usage:
+    python benchmarks/bench_identity.py [--visitors 100000] [--sessions 3] [--lookups 20000]
+
+Links ``--visitors`` visitors, each with ``--sessions`` sessions, and
+gives every fifth one an email and a lead (visitors sharing an email are
+merged). Reports link throughput (write-behind store) and lookups/s for
+session → lead and lead → all its sessions (the timeline read). These
+are compared with the old approach: find the visitor whose session list
+holds the session, or whose ``lead_id`` matches, by scanning every
+visitor.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.tracking.identity import IdentityGraph, identity_nodes
+
+
+def rate(label: str, fn, count: int):
+    start = time.perf_counter()
+    for i in range(count):
+        fn(i)
+    print(f"{label:<40} {count / (time.perf_counter() - start):12,.0f} /s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--visitors", type=int, default=100000)
+    parser.add_argument("--sessions", type=int, default=3)
+    parser.add_argument("--lookups", type=int, default=20000)
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    visitors = []
+    for i in range(args.visitors):
+        email = f"user{i // 10}@example.com" if i % 5 == 0 else ""
+        visitors.append({
+            "id": f"v{i}", "email": email, "lead_id": str(i // 10) if email else "",
+            "sessions": [f"s{i}-{n}" for n in range(args.sessions)],
+        })
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        graph = IdentityGraph(Path(tmpdir) / "identity.db")
+
+        def link(i):
+            v = visitors[i]
+            graph.link(
+                *identity_nodes(visitor_id=v["id"], email=v["email"], lead_id=v["lead_id"]),
+                *(f"session:{s}" for s in v["sessions"]),
+                lead_id=v["lead_id"] or None,
+            )
+
+        rate(f"link {args.visitors:,} visitors", link, args.visitors)
+
+        identified = [v for v in visitors if v["lead_id"]]
+        picks = [rng.choice(identified) for _ in range(args.lookups)]
+        rate("graph: session -> lead",
+             lambda i: graph.lead_for(f"session:{picks[i]['sessions'][-1]}"), args.lookups)
+        rate("graph: lead -> sessions",
+             lambda i: graph.resolve(f"lead:{picks[i]['lead_id']}").ids("session"), args.lookups)
+
+        def scan_session(i):
+            session = picks[i]["sessions"][-1]
+            return next(v["lead_id"] for v in visitors if session in v["sessions"])
+
+        def scan_lead(i):
+            lead_id = picks[i]["lead_id"]
+            return [s for v in visitors if v["lead_id"] == lead_id for s in v["sessions"]]
+
+        scans = max(1, args.lookups // 1000)
+        rate("scan: session -> lead (old)", scan_session, scans)
+        rate("scan: lead -> sessions (old)", scan_lead, scans)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: bulk ``insert_many`` vs one ``insert_lead`` per row.
+
+Usage:
+    python benchmarks/bench_insert_many.py [--leads 5000] [--bulk-leads 50000]
+
+Imports a synthetic Instagram-style export (about 10% of rows repeat an
+earlier account, some by username, some by email) into an empty database,
+then re-imports it on top of itself so every row merges. The per-row path
+is only timed at ``--leads``; ``insert_many`` is also timed at
+``--bulk-leads``.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+
+def build_export(count: int, seed: int = 5):
+    rng = random.Random(seed)
+    leads = []
+    for i in range(count):
+        account = rng.randrange(count) if rng.random() < 0.1 and i else i
+        leads.append(RawLead(
+            source="instagram",
+            username=f"user_{account}",
+            email=f"user{account}@example.com" if account % 3 == 0 else None,
+            phone=f"614555{account % 10000:04d}" if account % 7 == 0 else None,
+            notes=rng.choice(["Love this house!", "DM me about Powell", "lease is up soon"]),
+            messages=[f"message {i}"],
+        ))
+    return leads
+
+
+def time_import(db: LeadDatabase, leads, bulk: bool) -> float:
+    start = time.perf_counter()
+    if bulk:
+        db.insert_many(leads)
+    else:
+        for raw in leads:
+            db.insert_lead(raw)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=5000, help="Rows for the per-row comparison")
+    parser.add_argument("--bulk-leads", type=int, default=50000, help="Rows for insert_many alone")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        runs = [("insert_lead", False, args.leads), ("insert_many", True, args.leads)]
+        if args.bulk_leads != args.leads:
+            runs.append(("insert_many", True, args.bulk_leads))
+        for label, bulk, count in runs:
+            leads = build_export(count)
+            db = LeadDatabase(Path(tmpdir) / f"{label}_{count}.db")
+            fresh = time_import(db, leads, bulk)
+            again = time_import(db, leads, bulk)
+            print(f"{label:<12} {count:>7,} rows | empty db {count / fresh:>9,.0f} rows/s "
+                  f"({fresh:6.2f} s) | re-import {count / again:>9,.0f} rows/s ({again:6.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: streaming the whole lead table with ``iter_leads``.
+
+Usage:
+    python benchmarks/bench_iter_leads.py [--leads 200000] [--batch-size 1000]
+
+Compares reading every lead at once (``get_all_leads`` with a limit as
+large as the table, as ``export_to_csv`` used to) against ``iter_leads``
+keyset batches, reporting wall time and peak Python memory (tracemalloc),
+then times one batch deep into the table with ``LIMIT/OFFSET`` vs keyset.
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<24} {count:>9,} leads in {elapsed:6.2f} s | peak {peak / 2 ** 20:8.1f} MiB")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = LeadDatabase(Path(tmpdir) / "leads.db")
+        for start in range(0, args.leads, 50000):
+            db.insert_many([
+                RawLead(source="csv", source_id=str(i), name=f"Lead {i}",
+                        email=f"lead{i}@example.com",
+                        notes="Renting in Dublin, lease is up in March, preapproved")
+                for i in range(start, min(args.leads, start + 50000))
+            ])
+
+        measure("get_all_leads (at once)", lambda: len(db.get_all_leads(limit=args.leads)))
+        measure("iter_leads by id", lambda: sum(1 for _ in db.iter_leads(args.batch_size)))
+        measure("iter_leads by score",
+                lambda: sum(1 for _ in db.iter_leads(args.batch_size, order_key="score")))
+
+        depth = args.leads - args.batch_size
+        with db._read_connection() as conn:
+            start = time.perf_counter()
+            conn.execute("SELECT * FROM leads ORDER BY id LIMIT ? OFFSET ?",
+                         (args.batch_size, depth)).fetchall()
+            offset_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            conn.execute("SELECT * FROM leads WHERE id > ? ORDER BY id LIMIT ?",
+                         (depth, args.batch_size)).fetchall()
+            keyset_ms = (time.perf_counter() - start) * 1000
+        print(f"last batch: OFFSET {offset_ms:7.2f} ms | keyset {keyset_ms:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Benchmark: per-page latency of OFFSET vs cursor pagination.
+
+Usage:
+    python benchmarks/bench_lead_pages.py [--leads 100000] [--per-page 50]
+
+Fills a database with hot and warm leads, then pages through the hot tier
+(highest score first) both ways: the old ``get_all_leads(limit, offset)``
+and ``get_leads_page`` cursors. Prints latency of the first page, a middle
+page and the last page; with cursors every page is an index seek, with
+OFFSET the cost grows with depth.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=100000)
+    parser.add_argument("--per-page", type=int, default=50)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = LeadDatabase(Path(tmpdir) / "leads.db")
+        for start in range(0, args.leads, 50000):
+            db.insert_many([
+                RawLead(source="csv", source_id=str(i), name=f"Lead {i}")
+                for i in range(start, min(args.leads, start + 50000))
+            ])
+        rng = random.Random(1)
+        with db.transaction() as conn:
+            conn.executemany(
+                "UPDATE leads SET score = ?, tier = ? WHERE id = ?",
+                [(s, "hot" if s >= 150 else "warm", i)
+                 for i in range(1, args.leads + 1) for s in [rng.randrange(75, 400)]],
+            )
+
+        total = db.get_leads_page(limit=1, tier="hot").total
+        pages = (total + args.per_page - 1) // args.per_page
+        probes = {0: "first", pages // 2: "middle", pages - 1: "last"}
+        print(f"{total:,} hot leads, {pages:,} pages of {args.per_page}")
+
+        offset_ms = {}
+        for page in probes:
+            start = time.perf_counter()
+            db.get_all_leads(tier="hot", limit=args.per_page, offset=page * args.per_page)
+            offset_ms[page] = (time.perf_counter() - start) * 1000
+
+        cursor_ms = {}
+        cursor = None
+        scroll_start = time.perf_counter()
+        for page in range(pages):
+            start = time.perf_counter()
+            result = db.get_leads_page(limit=args.per_page, cursor=cursor, tier="hot")
+            if page in probes:
+                cursor_ms[page] = (time.perf_counter() - start) * 1000
+            cursor = result.next_cursor
+        scroll = time.perf_counter() - scroll_start
+
+        for page, label in probes.items():
+            print(f"{label:<6} page {page + 1:>6,} | offset {offset_ms[page]:8.2f} ms "
+                  f"| cursor {cursor_ms[page]:6.2f} ms")
+        print(f"scrolled all {pages:,} pages with cursors in {scroll:.2f} s")
+
+
+if __name__ == "__main__":
+    main()
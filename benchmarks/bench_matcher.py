@@ -0,0 +1,106 @@
+"""Micro-benchmark: PhraseMatcher vs. one regex scan per phrase.
+
+Usage:
+    python benchmarks/bench_matcher.py [--texts 2000]
+
+Builds vocabularies of 50, 500 and 5,000 phrases (the real intent signals
+padded with synthetic Central Ohio style phrases) and reports texts/second
+for the legacy per-pattern ``finditer`` loop and the compiled matcher.
+"""
+
+import argparse
+import random
+import re
+import time
+from typing import List
+
+from td_lead_engine.core.matcher import PhraseMatcher
+from td_lead_engine.core.signals import INTENT_SIGNALS
+
+FILLER = (
+    "hi there we saw your post about the open house last weekend and wanted to ask "
+    "about schools taxes commute parking yard garage basement kitchen neighbors"
+).split()
+STREETS = ["maple", "oak", "high", "broad", "olentangy", "sawmill", "hilliard", "polaris"]
+NOUNS = ["ranch", "condo", "townhome", "duplex", "cape cod", "split level", "farmhouse"]
+
+
+def build_phrases(count: int) -> List[str]:
+    """Real signal phrases followed by synthetic ones up to ``count``."""
+    phrases = [s.phrase for s in INTENT_SIGNALS][:count]
+    i = 0
+    while len(phrases) < count:
+        phrases.append(
+            f"{NOUNS[i % len(NOUNS)]} near {STREETS[(i // 7) % len(STREETS)]} street {i}"
+        )
+        i += 1
+    return phrases
+
+
+def build_texts(phrases: List[str], count: int, seed: int = 42) -> List[str]:
+    """Lead-sized texts (~80 words) with a few embedded phrases each."""
+    rng = random.Random(seed)
+    texts = []
+    for _ in range(count):
+        words = [rng.choice(FILLER) for _ in range(80)]
+        for _ in range(rng.randint(0, 4)):
+            words.insert(rng.randrange(len(words)), rng.choice(phrases).upper())
+        texts.append(" ".join(words))
+    return texts
+
+
+def regex_loop(patterns, text: str) -> int:
+    """The pre-matcher scoring loop: one finditer per pattern."""
+    seen = set()
+    for pattern, phrase in patterns:
+        for _ in pattern.finditer(text):
+            seen.add(phrase)
+            break
+    return len(seen)
+
+
+def run(phrase_count: int, text_count: int):
+    phrases = build_phrases(phrase_count)
+    texts = build_texts(phrases, text_count)
+
+    start = time.perf_counter()
+    patterns = [
+        (re.compile(r"\b" + re.escape(p) + r"\b", re.IGNORECASE), p.lower()) for p in phrases
+    ]
+    regex_compile = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = PhraseMatcher(phrases)
+    matcher_compile = time.perf_counter() - start
+
+    start = time.perf_counter()
+    regex_hits = sum(regex_loop(patterns, t) for t in texts)
+    regex_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher_hits = sum(len(matcher.find_first(t)) for t in texts)
+    matcher_time = time.perf_counter() - start
+
+    assert regex_hits == matcher_hits, (regex_hits, matcher_hits)
+
+    print(
+        f"{phrase_count:>6} phrases | "
+        f"regex {text_count / regex_time:>10,.0f} texts/s "
+        f"(compile {regex_compile * 1000:7.1f} ms) | "
+        f"matcher {text_count / matcher_time:>10,.0f} texts/s "
+        f"(compile {matcher_compile * 1000:6.1f} ms) | "
+        f"speedup {regex_time / matcher_time:6.1f}x"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--texts", type=int, default=2000, help="Texts scored per run")
+    args = parser.parse_args()
+
+    for phrase_count in (50, 500, 5000):
+        run(phrase_count, args.texts)
+
+
+if __name__ == "__main__":
+    main()
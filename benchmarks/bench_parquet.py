@@ -0,0 +1,74 @@
+"""Benchmark: columnar Parquet export and snapshot loads vs row-at-a-time paths.
+
+Usage:
+    python benchmarks/bench_parquet.py [--leads 200000]
+
+Fills and scores a database, then times ``export_to_csv`` against
+``export_parquet`` (leads plus interactions, streamed in record batches)
+and reports the output sizes. For analytics it times the report's
+source-quality / signal pass streamed from SQLite against the same pass
+over a loaded snapshot, and how long loading the snapshot columns takes.
+Needs pyarrow.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.analytics.reports import ReportGenerator
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.columnar import load_snapshot
+from td_lead_engine.storage.database import LeadDatabase
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<34} {(time.perf_counter() - start) * 1000:9.1f} ms")
+    return result
+
+
+def dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.iterdir())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=200000)
+    args = parser.parse_args()
+
+    texts = ["First time homebuyer, preapproved, looking in Powell", "My lease is up in March",
+             "Just saying hi", "Thinking about selling next spring"]
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp = Path(tmpdir)
+        db = LeadDatabase(tmp / "leads.db")
+        for start in range(0, args.leads, 50000):
+            db.insert_many([
+                RawLead(source=("instagram", "facebook", "csv")[i % 3], source_id=str(i),
+                        name=f"Lead {i}", email=f"lead{i}@example.com", notes=texts[i % len(texts)],
+                        messages=[f"message {k}" for k in range(3)])
+                for i in range(start, min(args.leads, start + 50000))
+            ])
+        db.score_all_leads()
+        size = (tmp / "leads.db").stat().st_size
+        print(f"database: {args.leads:,} leads, {size / 2 ** 20:.1f} MiB")
+
+        timed("export_to_csv (leads)", lambda: db.export_to_csv(tmp / "leads.csv"))
+        counts = timed("export_parquet (all tables)", lambda: db.export_parquet(tmp / "parquet"))
+        print(f"  rows {counts} | csv {(tmp / 'leads.csv').stat().st_size / 2 ** 20:.1f} MiB | "
+              f"parquet {dir_size(tmp / 'parquet') / 2 ** 20:.1f} MiB")
+
+        db.snapshot(max_age=None)
+        snapshot = timed("load snapshot (report columns)",
+                         lambda: load_snapshot(db.snapshot_dir, ReportGenerator.SNAPSHOT_COLUMNS))
+        timed("load snapshot (all columns)", lambda: load_snapshot(db.snapshot_dir))
+        timed("report, streamed from SQLite", lambda: ReportGenerator(db).generate_daily_report())
+        timed("report, from snapshot",
+              lambda: ReportGenerator(db, snapshot=snapshot).generate_daily_report())
+        timed("source quality only, snapshot",
+              lambda: snapshot.leads.groupby("source")["score"].mean().to_dict())
+
+
+if __name__ == "__main__":
+    main()
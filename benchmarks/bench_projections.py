@@ -0,0 +1,74 @@
+"""Benchmark: projected ``LeadRow`` queries vs full ``Lead`` objects.
+
+Usage:
+    python benchmarks/bench_projections.py [--leads 100000]
+
+Fills a database with leads carrying realistic message/comment/raw-data
+payloads, then loads all of them for a listing view (id, name, contact,
+score, tier, source) both as full ``Lead`` objects and with
+``get_all_leads(fields=[...])``, reporting wall time and peak Python memory
+(tracemalloc). The same comparison is run for a streamed ``iter_leads``
+pass that reads only score and source.
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+LISTING_FIELDS = ("name", "username", "email", "phone", "score", "tier", "source")
+
+
+def measure(label: str, fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<30} {count:>9,} leads in {elapsed:6.2f} s | peak {peak / 2 ** 20:8.1f} MiB")
+
+
+def listing(leads) -> int:
+    # Touch what a listing renders so lazy decoding is paid for too
+    for lead in leads:
+        lead.display_name, lead.contact_info, lead.score, lead.tier
+    return len(leads)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = LeadDatabase(Path(tmpdir) / "leads.db")
+        for start in range(0, args.leads, 50000):
+            db.insert_many([
+                RawLead(source="instagram", source_id=str(i), name=f"Lead {i}",
+                        email=f"lead{i}@example.com",
+                        bio="Realtor-curious. Coffee, dogs, Columbus. " * 3,
+                        notes="Renting in Dublin, lease is up in March, preapproved",
+                        messages=[f"message {k} about the Powell listing" for k in range(5)],
+                        comments=["Love this house!", "What's the price?"],
+                        raw_data={"post": f"https://instagram.com/p/{i}", "likes": i % 500,
+                                  "caption": "Just listed in Powell " * 4})
+                for i in range(start, min(args.leads, start + 50000))
+            ])
+        db.score_all_leads()
+
+        measure("get_all_leads (Lead)", lambda: listing(db.get_all_leads(limit=args.leads)))
+        measure("get_all_leads (fields)",
+                lambda: listing(db.get_all_leads(limit=args.leads, fields=LISTING_FIELDS)))
+        measure("iter_leads (Lead)", lambda: sum(lead.score >= 0 for lead in db.iter_leads(5000)))
+        measure("iter_leads (fields)",
+                lambda: sum(row.score >= 0
+                            for row in db.iter_leads(5000, fields=("score", "source"))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Benchmark: event counts from rollups versus scanning raw events.
+
+Usage:
+    python benchmarks/bench_rollups.py [--events 500000] [--days 90] [--seconds 2]
+
+Writes ``--events`` page views spread evenly over ``--days`` days into an
+EventTracker's log (8 event types, 6 sources, 20 pages), rebuilds its
+rollups (timed) and compares, for ranges of one hour, one day, 30 days
+and all history, counting by event type while scanning the log's
+overlapping segments (the old ``get_event_counts``) with
+``get_event_counts`` and a daily ``get_event_timeline`` from the
+rollups. Also reports ``track()`` throughput with the rollup counters
+updated on every event.
+"""
+
+import argparse
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from td_lead_engine.tracking.events import EventTracker
+
+SOURCES = ["https://www.google.com/", "https://www.facebook.com/", "https://www.zillow.com/",
+           "", "", ""]
+
+
+def timed(label: str, fn):
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<44} {(time.perf_counter() - start) * 1000:10.1f} ms")
+    return result
+
+
+def scan_counts(tracker: EventTracker, start: datetime, end: datetime):
+    counts = {}
+    for event_data in tracker.log.scan(start, end):
+        key = f"{event_data['category']}:{event_data['action']}"
+        counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--events", type=int, default=500000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--seconds", type=float, default=2.0, help="Measurement window for track()")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        storage = Path(tmpdir) / "events"
+        tracker = EventTracker(str(storage), fsync="never")
+        now = datetime.now().replace(microsecond=0)
+        start = now - timedelta(days=args.days)
+        step = timedelta(days=args.days) / args.events
+        for i in range(args.events):
+            at = start + step * i
+            tracker.log.append({
+                "id": f"e{i}", "category": "page", "action": f"action{i % 8}",
+                "visitor_id": f"v{i % 20000}", "timestamp": at.isoformat(),
+                "page_url": f"/listing/{i % 20}", "referrer": SOURCES[i % 6], "properties": {},
+            }, at=at)
+        tracker.close()
+
+        tracker = EventTracker(str(storage), fsync="never")
+        timed(f"rebuild rollups from {args.events:,} events", tracker.rebuild_rollups)
+        rows = tracker.rollups._conn.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+        print(f"  {rows:,} counter rows")
+
+        spans = (("1 hour", timedelta(hours=1)), ("1 day", timedelta(days=1)),
+                 ("30 days", timedelta(days=30)), ("all history", timedelta(days=args.days)))
+        for label, span in spans:
+            range_start = now - span - timedelta(minutes=7)
+            range_end = now - timedelta(minutes=7)
+            raw = timed(f"{label}: scan raw events",
+                        lambda: scan_counts(tracker, range_start, range_end))
+            rolled = timed(f"{label}: get_event_counts (rollups)",
+                           lambda: tracker.get_event_counts(range_start, range_end))
+            timed(f"{label}: get_event_timeline by day",
+                  lambda: tracker.get_event_timeline(range_start, range_end))
+            # Rollups resolve to whole minutes; differences are edge-minute events
+            print(f"  {sum(raw.values()):,} raw vs {sum(rolled.values()):,} rolled up")
+
+        count = 0
+        t0 = time.perf_counter()
+        while time.perf_counter() - t0 < args.seconds:
+            tracker.track_page_view(f"/listing/{count % 20}", visitor_id=f"v{count}",
+                                    referrer=SOURCES[count % 6])
+            count += 1
+        print(f"{'track() with rollups':<44} {count / (time.perf_counter() - t0):10,.0f} events/s")
+        tracker.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark: ``get_stats`` from ``lead_stats`` vs the aggregate queries.
+
+Usage:
+    python benchmarks/bench_stats.py [--sizes 10000 100000 500000] [--calls 50]
+
+For each table size times the previous five aggregate scans over ``leads``
+against the trigger-maintained summary read by ``get_stats``, and the
+full recount done by ``check_stats``.
+"""
+
+import argparse
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.storage.database import LeadDatabase
+
+SOURCES = ["instagram", "facebook", "csv", "zillow", "website"]
+TIERS = ["hot", "warm", "lukewarm", "cold", "negative"]
+
+
+def aggregate_stats(db: LeadDatabase):
+    with db._read_connection() as conn:
+        conn.execute("SELECT COUNT(*) FROM leads").fetchone()
+        conn.execute("SELECT tier, COUNT(*) FROM leads GROUP BY tier").fetchall()
+        conn.execute("SELECT status, COUNT(*) FROM leads GROUP BY status").fetchall()
+        conn.execute("SELECT source, COUNT(*) FROM leads GROUP BY source").fetchall()
+        conn.execute("SELECT AVG(score), MAX(score), MIN(score) FROM leads").fetchone()
+
+
+def per_call_ms(fn, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - start) * 1000 / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000, 500000])
+    parser.add_argument("--calls", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = random.Random(2)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for size in args.sizes:
+            db = LeadDatabase(Path(tmpdir) / f"leads_{size}.db")
+            for start in range(0, size, 50000):
+                db.insert_many([
+                    RawLead(source=rng.choice(SOURCES), source_id=str(i))
+                    for i in range(start, min(size, start + 50000))
+                ])
+            with db.transaction() as conn:
+                conn.executemany("UPDATE leads SET score = ?, tier = ? WHERE id = ?", [
+                    (rng.randrange(-50, 300), rng.choice(TIERS), i) for i in range(1, size + 1)
+                ])
+
+            old = per_call_ms(lambda: aggregate_stats(db), args.calls)
+            new = per_call_ms(db.get_stats, args.calls)
+            check = per_call_ms(db.check_stats, 1)
+            print(f"{size:>8,} leads | aggregates {old:8.2f} ms | get_stats {new:6.3f} ms "
+                  f"| check_stats {check:8.1f} ms")
+            db.close()
+
+
+if __name__ == "__main__":
+    main()
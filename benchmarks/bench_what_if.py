@@ -0,0 +1,72 @@
+"""Benchmark: what-if re-weighting over the persisted match matrix.
+
+Usage:
+    python benchmarks/bench_what_if.py [--leads 200000]
+
+Builds a synthetic match matrix (0-6 matched signals per lead across ten
+sources), saves and reloads it, then times ``tier_migrations`` for a
+candidate config with new thresholds, multipliers and phrase overrides.
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from td_lead_engine.core.config import ScoringConfig
+from td_lead_engine.core.match_matrix import SignalMatchMatrix
+from td_lead_engine.core.scorer import LeadScorer
+
+
+def build_matrix(leads: int, signal_count: int, version: str) -> SignalMatchMatrix:
+    rng = np.random.default_rng(3)
+    per_lead = rng.integers(0, 7, size=leads)
+    indptr = np.concatenate([[0], np.cumsum(per_lead)]).astype(np.int64)
+    return SignalMatchMatrix(
+        lead_ids=np.arange(1, leads + 1, dtype=np.int64),
+        indptr=indptr,
+        indices=rng.integers(0, signal_count, size=int(indptr[-1])).astype(np.int32),
+        source_codes=rng.integers(0, 10, size=leads).astype(np.int32),
+        sources=["instagram", "facebook", "linkedin", "zillow", "google_ads",
+                 "google_forms", "google_business", "nextdoor", "manual", "csv"],
+        signal_version=version,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--leads", type=int, default=200000)
+    args = parser.parse_args()
+
+    scorer = LeadScorer()
+    matrix = build_matrix(args.leads, len(scorer.signals), scorer.version)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = Path(tmpdir) / "leads.matches.npz"
+        matrix.save(path)
+        start = time.perf_counter()
+        matrix = SignalMatchMatrix.load(path)
+        load_ms = (time.perf_counter() - start) * 1000
+        size_kb = path.stat().st_size / 1024
+
+    baseline = ScoringConfig()
+    candidate = ScoringConfig(
+        hot_threshold=140,
+        warm_threshold=80,
+        source_multipliers={"zillow": 1.4, "instagram": 0.9},
+        signal_weight_overrides={"ready to buy": 110, "down payment": 40},
+    )
+
+    start = time.perf_counter()
+    report = matrix.tier_migrations(scorer.signals, baseline, candidate)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(f"matrix: {len(matrix):,} leads, {matrix.nnz:,} matches, {size_kb:,.0f} KB, "
+          f"load {load_ms:.1f} ms")
+    print(f"what-if: {report['tier_changed']:,} tier changes in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -43,12 +43,32 @@ class LeadReport:
     generated_at: datetime = field(default_factory=datetime.now)
 
 
+def _count_signals(score_breakdown: str, signal_counts: Dict[str, int], leads: int = 1):
+    """Add the matched phrases in a ``score_breakdown`` JSON value, shared by ``leads`` leads."""
+    try:
+        breakdown = json.loads(score_breakdown)
+        for match in breakdown.get("matches", []):
+            phrase = match["phrase"]
+            signal_counts[phrase] = signal_counts.get(phrase, 0) + leads
+    except Exception:
+        pass
+
+
 class ReportGenerator:
     """Generate analytics reports."""
 
-    def __init__(self, db=None):
-        """Initialize report generator."""
+    # Snapshot columns the report aggregates over
+    SNAPSHOT_COLUMNS = {"leads": ["source", "score", "score_breakdown"]}
+
+    def __init__(self, db=None, snapshot=None):
+        """Initialize report generator.
+
+        With a ``LeadSnapshot`` (``LeadDatabase.snapshot(columns=
+        ReportGenerator.SNAPSHOT_COLUMNS)``), source quality and signal
+        counts are computed from it instead of streaming the lead table.
+        """
         self.db = db
+        self.snapshot = snapshot
 
     def generate_daily_report(self, date: Optional[datetime] = None) -> LeadReport:
         """Generate a daily report."""
@@ -122,32 +142,29 @@ class ReportGenerator:
             for lead in hot_leads
         ]
 
-        # Calculate source quality (average score by source)
-        all_leads = db.get_all_leads(limit=10000)
-        source_scores: Dict[str, List[int]] = {}
-        for lead in all_leads:
-            if lead.source not in source_scores:
-                source_scores[lead.source] = []
-            source_scores[lead.source].append(lead.score)
-
-        for source, scores in source_scores.items():
-            if scores:
-                report.source_quality[source] = sum(scores) / len(scores)
-
-        # Analyze signals
         signal_counts: Dict[str, int] = {}
-        for lead in all_leads:
-            if lead.score_breakdown:
-                try:
-                    breakdown = json.loads(lead.score_breakdown)
-                    for match in breakdown.get("matches", []):
-                        phrase = match["phrase"]
-                        signal_counts[phrase] = signal_counts.get(phrase, 0) + 1
-                except Exception:
-                    pass
+        if self.snapshot is not None:
+            # Columnar snapshot: aggregate whole columns instead of walking rows
+            leads = self.snapshot.leads
+            report.source_quality = leads.groupby("source")["score"].mean().to_dict()
+            # Identical breakdowns are decoded once
+            for raw, count in leads["score_breakdown"].value_counts().items():
+                _count_signals(raw, signal_counts, int(count))
+        else:
+            # Source quality (average score by source) and signal counts, streamed
+            source_totals: Dict[str, List[int]] = {}  # source -> [score sum, lead count]
+            for lead in db.iter_leads(batch_size=5000, fields=("source", "score", "score_breakdown")):
+                totals = source_totals.setdefault(lead.source, [0, 0])
+                totals[0] += lead.score
+                totals[1] += 1
+                if lead.score_breakdown:
+                    _count_signals(lead.score_breakdown, signal_counts)
+
+            for source, (total, count) in source_totals.items():
+                report.source_quality[source] = total / count
 
         # Top 10 signals
-        sorted_signals = sorted(signal_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+        sorted_signals = sorted(signal_counts.items(), key=lambda x: (-x[1], x[0]))[:10]
         report.top_signals = [
             {"phrase": phrase, "count": count}
             for phrase, count in sorted_signals
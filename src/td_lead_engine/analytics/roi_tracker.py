@@ -9,6 +9,8 @@ from pathlib import Path
 from enum import Enum
 import uuid
 
+from ..core.append_log import AppendOnlyLog
+
 logger = logging.getLogger(__name__)
 
 
@@ -74,18 +76,64 @@ class ConversionEvent:
         return 0
 
 
+def _conversion_record(c: ConversionEvent) -> Dict[str, Any]:
+    """Serialize a conversion for the log."""
+    return {
+        "id": c.id,
+        "lead_id": c.lead_id,
+        "lead_source": c.lead_source,
+        "event_type": c.event_type,
+        "transaction_value": c.transaction_value,
+        "commission_rate": c.commission_rate,
+        "gross_commission": c.gross_commission,
+        "net_commission": c.net_commission,
+        "campaign": c.campaign,
+        "first_touch_source": c.first_touch_source,
+        "last_touch_source": c.last_touch_source,
+        "lead_created_at": c.lead_created_at.isoformat() if c.lead_created_at else None,
+        "converted_at": c.converted_at.isoformat()
+    }
+
+
+def _conversion_from_record(conv_data: Dict[str, Any]) -> ConversionEvent:
+    """Inverse of ``_conversion_record``."""
+    return ConversionEvent(
+        id=conv_data["id"],
+        lead_id=conv_data["lead_id"],
+        lead_source=conv_data["lead_source"],
+        event_type=conv_data["event_type"],
+        transaction_value=conv_data["transaction_value"],
+        commission_rate=conv_data["commission_rate"],
+        gross_commission=conv_data["gross_commission"],
+        net_commission=conv_data["net_commission"],
+        campaign=conv_data.get("campaign", ""),
+        first_touch_source=conv_data.get("first_touch_source", ""),
+        last_touch_source=conv_data.get("last_touch_source", ""),
+        lead_created_at=datetime.fromisoformat(conv_data["lead_created_at"]) if conv_data.get("lead_created_at") else None,
+        converted_at=datetime.fromisoformat(conv_data["converted_at"])
+    )
+
+
 class ROITracker:
-    """Track ROI across lead sources and campaigns."""
+    """Track ROI across lead sources and campaigns.
+
+    Costs are kept in ``roi_data.json``; conversions go to an append-only
+    log next to it so recording one does not rewrite the whole history.
+    """
 
     def __init__(self, data_path: Optional[Path] = None):
         """Initialize ROI tracker."""
         self.data_path = data_path or Path.home() / ".td-lead-engine" / "roi_data.json"
+        self.conversions_log = AppendOnlyLog(
+            self.data_path.with_name(f"{self.data_path.stem}_conversions.jsonl"), key="id"
+        )
         self.costs: List[LeadCost] = []
         self.conversions: List[ConversionEvent] = []
         self._load_data()
 
     def _load_data(self):
         """Load historical data."""
+        legacy_conversions = []
         if self.data_path.exists():
             try:
                 with open(self.data_path, 'r') as f:
@@ -102,28 +150,24 @@ class ROITracker:
                             leads_generated=cost_data.get("leads_generated", 1)
                         ))
 
-                    for conv_data in data.get("conversions", []):
-                        self.conversions.append(ConversionEvent(
-                            id=conv_data["id"],
-                            lead_id=conv_data["lead_id"],
-                            lead_source=conv_data["lead_source"],
-                            event_type=conv_data["event_type"],
-                            transaction_value=conv_data["transaction_value"],
-                            commission_rate=conv_data["commission_rate"],
-                            gross_commission=conv_data["gross_commission"],
-                            net_commission=conv_data["net_commission"],
-                            campaign=conv_data.get("campaign", ""),
-                            first_touch_source=conv_data.get("first_touch_source", ""),
-                            last_touch_source=conv_data.get("last_touch_source", ""),
-                            lead_created_at=datetime.fromisoformat(conv_data["lead_created_at"]) if conv_data.get("lead_created_at") else None,
-                            converted_at=datetime.fromisoformat(conv_data["converted_at"])
-                        ))
+                    legacy_conversions = data.get("conversions", [])
 
             except Exception as e:
                 logger.error(f"Error loading ROI data: {e}")
 
+        # Conversions stored inline by older versions move to the log once
+        if legacy_conversions and not self.conversions_log.exists():
+            self.conversions_log.extend(legacy_conversions)
+            self._save_data()
+
+        for conv_data in self.conversions_log:
+            try:
+                self.conversions.append(_conversion_from_record(conv_data))
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed ROI conversion: {e}")
+
     def _save_data(self):
-        """Save data to file."""
+        """Save costs to file (conversions are appended to their own log)."""
         self.data_path.parent.mkdir(parents=True, exist_ok=True)
 
         data = {
@@ -139,24 +183,6 @@ class ROITracker:
                 }
                 for c in self.costs
             ],
-            "conversions": [
-                {
-                    "id": c.id,
-                    "lead_id": c.lead_id,
-                    "lead_source": c.lead_source,
-                    "event_type": c.event_type,
-                    "transaction_value": c.transaction_value,
-                    "commission_rate": c.commission_rate,
-                    "gross_commission": c.gross_commission,
-                    "net_commission": c.net_commission,
-                    "campaign": c.campaign,
-                    "first_touch_source": c.first_touch_source,
-                    "last_touch_source": c.last_touch_source,
-                    "lead_created_at": c.lead_created_at.isoformat() if c.lead_created_at else None,
-                    "converted_at": c.converted_at.isoformat()
-                }
-                for c in self.conversions
-            ],
             "updated_at": datetime.now().isoformat()
         }
 
@@ -220,10 +246,14 @@ class ROITracker:
         )
 
         self.conversions.append(conversion)
-        self._save_data()
+        self.conversions_log.append(_conversion_record(conversion))
 
         return conversion
 
+    def compact_conversions(self) -> Dict[str, int]:
+        """Rewrite the conversion log without torn or duplicate records."""
+        return self.conversions_log.compact()
+
     def get_roi_by_source(
         self,
         start_date: Optional[datetime] = None,
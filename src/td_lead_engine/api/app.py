@@ -6,10 +6,10 @@ import os
 from datetime import datetime
 from typing import Optional
 
-from flask import Flask, jsonify, request, g
+from flask import Flask, jsonify, request
 from flask_cors import CORS
 
-from .auth import require_api_key, rate_limit, generate_api_key, get_key_manager
+from .auth import generate_api_key, get_key_manager, rate_limit, require_api_key
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +30,7 @@ def create_app(config: Optional[dict] = None) -> Flask:
 
     # Initialize components lazily
     _db = None
+    _scorer = None
     _scoring_engine = None
     _roi_tracker = None
     _pipeline = None
@@ -38,10 +39,19 @@ def create_app(config: Optional[dict] = None) -> Flask:
     def get_db():
         nonlocal _db
         if _db is None:
-            from ..storage import Database
-            _db = Database(os.path.expanduser(app.config["DATABASE_PATH"]))
+            from pathlib import Path
+
+            from ..storage import LeadDatabase
+            _db = LeadDatabase(Path(os.path.expanduser(app.config["DATABASE_PATH"])))
         return _db
 
+    def get_scorer():
+        nonlocal _scorer
+        if _scorer is None:
+            from ..core import get_shared_scorer
+            _scorer = get_shared_scorer()
+        return _scorer
+
     def get_scoring_engine():
         nonlocal _scoring_engine
         if _scoring_engine is None:
@@ -104,13 +114,12 @@ def create_app(config: Optional[dict] = None) -> Flask:
     @require_api_key(scopes=["read", "leads"])
     @rate_limit()
     def list_leads():
-        """List leads with filtering and pagination."""
+        """List leads with filtering and cursor pagination (highest score first)."""
         db = get_db()
 
-        # Pagination
-        page = request.args.get("page", 1, type=int)
+        # Pagination: pass back "next_cursor" as ?cursor= for the next page
         per_page = min(request.args.get("per_page", 50, type=int), 100)
-        offset = (page - 1) * per_page
+        cursor = request.args.get("cursor")
 
         # Filters
         tier = request.args.get("tier")
@@ -119,18 +128,19 @@ def create_app(config: Optional[dict] = None) -> Flask:
         search = request.args.get("q")
         min_score = request.args.get("min_score", type=int)
 
-        # Build query
-        leads = db.search_leads(
-            query=search,
-            tier=tier,
-            source=source,
-            limit=per_page,
-            offset=offset
-        )
-
-        # Filter by min score if specified
-        if min_score:
-            leads = [l for l in leads if l.score >= min_score]
+        from ..storage.models import LeadStatus
+        try:
+            page = db.get_leads_page(
+                limit=per_page,
+                cursor=cursor,
+                status=LeadStatus(status) if status else None,
+                tier=tier,
+                source=source,
+                min_score=min_score,
+                query=search,
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
 
         # Convert to dict
         leads_data = [
@@ -142,19 +152,19 @@ def create_app(config: Optional[dict] = None) -> Flask:
                 "source": l.source,
                 "score": l.score,
                 "tier": l.tier,
-                "status": l.status,
+                "status": l.status.value,
                 "tags": l.tags.split(",") if l.tags else [],
                 "created_at": l.created_at,
                 "updated_at": l.updated_at
             }
-            for l in leads
+            for l in page.leads
         ]
 
         return jsonify({
             "leads": leads_data,
-            "page": page,
             "per_page": per_page,
-            "total": len(leads_data)  # Would need count query for actual total
+            "total": page.total,
+            "next_cursor": page.next_cursor
         })
 
     @app.route("/api/leads/<int:lead_id>", methods=["GET"])
@@ -302,43 +312,56 @@ def create_app(config: Optional[dict] = None) -> Flask:
         if not data or "text" not in data:
             return jsonify({"error": "text field required"}), 400
 
-        scoring_engine = get_scoring_engine()
-        result = scoring_engine.score(data["text"])
+        result = get_scorer().score_text(data["text"], data.get("source"))
 
         return jsonify({
-            "score": result["score"],
-            "tier": result["tier"],
-            "matches": result.get("matches", []),
-            "categories": result.get("categories", {})
+            "score": result.total_score,
+            "tier": result.tier,
+            "matches": [
+                {"phrase": m.signal.phrase, "weight": m.weight, "category": m.signal.category.value}
+                for m in result.matches
+            ],
+            "categories": {k.value: v for k, v in result.category_scores.items()}
         })
 
+    @app.route("/api/score/cache", methods=["GET"])
+    @require_api_key(scopes=["admin"])
+    @rate_limit()
+    def score_cache_stats():
+        """Hit/miss/eviction counters for the shared scoring cache."""
+        return jsonify(get_scorer().cache.stats())
+
     @app.route("/api/leads/<int:lead_id>/rescore", methods=["POST"])
     @require_api_key(scopes=["write", "scoring"])
     @rate_limit()
     def rescore_lead(lead_id: int):
-        """Re-score a lead."""
+        """Re-score a lead from its notes, bio, messages and comments.
+
+        Skipped when the lead's text and signal set are unchanged since it was
+        last scored; pass ``{"force": true}`` to rescore anyway.
+        """
         db = get_db()
         lead = db.get_lead(lead_id)
 
         if not lead:
             return jsonify({"error": "Lead not found"}), 404
 
-        if not lead.bio:
-            return jsonify({"error": "Lead has no bio to score"}), 400
+        data = request.get_json(silent=True) or {}
+        force = bool(data.get("force")) or request.args.get("force") in ("1", "true")
 
-        scoring_engine = get_scoring_engine()
-        result = scoring_engine.score(lead.bio)
+        scorer = get_scorer()
+        unchanged = not force and db.is_score_current(lead, scorer)
+        if not unchanged:
+            lead = db.score_lead(lead, scorer, force=True)
 
-        lead.score = result["score"]
-        lead.tier = result["tier"]
-        lead.score_breakdown = json.dumps(result)
-        db.update_lead(lead)
+        breakdown = json.loads(lead.score_breakdown) if lead.score_breakdown else {}
 
         return jsonify({
             "id": lead_id,
-            "score": result["score"],
-            "tier": result["tier"],
-            "matches": result.get("matches", [])
+            "score": lead.score,
+            "tier": lead.tier,
+            "matches": breakdown.get("matches", []),
+            "rescored": not unchanged
         })
 
     # ==================== Analytics ====================
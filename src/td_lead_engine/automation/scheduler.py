@@ -69,6 +69,7 @@ class TaskScheduler:
     # Built-in task types
     TASK_TYPES = {
         "score_all": "Score all leads in the database",
+        "decay_tiers": "Update tiers of leads whose score decayed past a threshold",
         "import_watch": "Watch a directory for new import files",
         "export_hot": "Export hot leads to CSV",
         "export_all": "Export all leads to CSV",
@@ -76,6 +77,7 @@ class TaskScheduler:
         "daily_digest": "Send daily lead digest notification",
         "weekly_report": "Generate weekly lead report",
         "backup_db": "Backup the database",
+        "compact_logs": "Compact the append-only conversion logs",
     }
 
     def __init__(self, config_path: Optional[Path] = None):
@@ -139,11 +141,13 @@ class TaskScheduler:
         """Register handlers for built-in task types."""
         self.task_handlers = {
             "score_all": self._handle_score_all,
+            "decay_tiers": self._handle_decay_tiers,
             "export_hot": self._handle_export_hot,
             "export_all": self._handle_export_all,
             "cleanup_old": self._handle_cleanup_old,
             "daily_digest": self._handle_daily_digest,
             "backup_db": self._handle_backup_db,
+            "compact_logs": self._handle_compact_logs,
         }
 
     def register_handler(self, task_type: str, handler: Callable):
@@ -345,16 +349,27 @@ class TaskScheduler:
     # === Built-in task handlers ===
 
     def _handle_score_all(self, task: ScheduledTask) -> Dict[str, Any]:
-        """Score all leads."""
+        """Score leads whose text or signals changed (config "force" rescores all)."""
         from ..storage.database import LeadDatabase
-        from ..core.scorer import LeadScorer
+        from ..core.scorer import get_shared_scorer
 
         db = LeadDatabase()
-        scorer = LeadScorer()
-        count = db.score_all_leads(scorer)
+        scorer = get_shared_scorer()
+        count = db.score_all_leads(
+            scorer,
+            workers=task.config.get("workers", 1),
+            chunk_size=task.config.get("chunk_size", 1000),
+            force=task.config.get("force", False),
+        )
 
         return {"leads_scored": count}
 
+    def _handle_decay_tiers(self, task: ScheduledTask) -> Dict[str, Any]:
+        """Materialize tier changes from score decay (incremental)."""
+        from ..storage.database import LeadDatabase
+
+        return {"tiers_changed": LeadDatabase().apply_score_decay()}
+
     def _handle_export_hot(self, task: ScheduledTask) -> Dict[str, Any]:
         """Export hot leads to CSV."""
         from ..storage.database import LeadDatabase
@@ -416,8 +431,8 @@ class TaskScheduler:
         return digest_data
 
     def _handle_backup_db(self, task: ScheduledTask) -> Dict[str, Any]:
-        """Backup the database."""
-        import shutil
+        """Back up the database online, keeping rotating generations."""
+        from ..storage.backup import DEFAULT_KEEP
         from ..storage.database import LeadDatabase
 
         db = LeadDatabase()
@@ -425,12 +440,28 @@ class TaskScheduler:
             "backup_dir",
             str(Path.home() / "td-lead-backups")
         ))
-        backup_dir.mkdir(parents=True, exist_ok=True)
+        result = db.backup(
+            backup_dir,
+            keep=task.config.get("keep", DEFAULT_KEEP),
+            compress=task.config.get("compress", False),
+        )
+
+        return {
+            "backup_path": str(result.path),
+            "size_bytes": result.size_bytes,
+            "seconds": round(result.seconds, 3),
+            "removed": [str(p) for p in result.removed],
+        }
 
-        backup_path = backup_dir / f"leads_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-        shutil.copy2(db.db_path, backup_path)
+    def _handle_compact_logs(self, task: ScheduledTask) -> Dict[str, Any]:
+        """Compact the ML outcome and ROI conversion logs."""
+        from ..core.config import ConversionTracker
+        from ..analytics.roi_tracker import ROITracker
 
-        return {"backup_path": str(backup_path)}
+        return {
+            "ml_outcomes": ConversionTracker().compact(),
+            "roi_conversions": ROITracker().compact_conversions(),
+        }
 
 
 # === Convenience functions ===
@@ -448,6 +479,15 @@ def setup_default_schedule(scheduler: TaskScheduler):
         minute=0,
     )
 
+    # Hourly tier refresh for score decay (no-op unless decay is enabled)
+    scheduler.create_task(
+        task_id="hourly_decay",
+        name="Hourly Score Decay Tiers",
+        task_type="decay_tiers",
+        frequency=TaskFrequency.HOURLY,
+        minute=15,
+    )
+
     # Daily digest at 8 AM
     scheduler.create_task(
         task_id="daily_digest",
@@ -469,6 +509,17 @@ def setup_default_schedule(scheduler: TaskScheduler):
         day_of_week=0,  # Monday
     )
 
+    # Weekly conversion log compaction on Sunday at 4 AM
+    scheduler.create_task(
+        task_id="weekly_log_compaction",
+        name="Weekly Conversion Log Compaction",
+        task_type="compact_logs",
+        frequency=TaskFrequency.WEEKLY,
+        hour=4,
+        minute=0,
+        day_of_week=6,  # Sunday
+    )
+
     # Daily database backup at 3 AM
     scheduler.create_task(
         task_id="daily_backup",
@@ -477,4 +528,5 @@ def setup_default_schedule(scheduler: TaskScheduler):
         frequency=TaskFrequency.DAILY,
         hour=3,
         minute=0,
+        config={"keep": 7, "compress": True},
     )
@@ -1,20 +1,22 @@
 """Main CLI entry point for socialops command."""
 
 import json
-import click
+from datetime import datetime
 from pathlib import Path
+from typing import Optional
+
+import click
 from rich.console import Console
-from rich.table import Table
+from rich.markup import escape
 from rich.panel import Panel
 from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.prompt import Prompt, Confirm
-from typing import Optional
-from datetime import datetime
+from rich.prompt import Confirm, Prompt
+from rich.table import Table
 
+from ..connectors import CONNECTORS, get_connector
+from ..core.scorer import get_shared_scorer
 from ..storage.database import LeadDatabase
 from ..storage.models import LeadStatus
-from ..connectors import CONNECTORS, get_connector
-from ..core.scorer import LeadScorer
 
 console = Console()
 
@@ -126,21 +128,14 @@ def import_leads(source: str, path: str, auto_score: bool, notify: bool, db_path
 
         progress.update(task, description="Processing leads...")
 
-        new_count = 0
-        merged_count = 0
         hot_leads = []
 
-        for raw_lead in result.leads:
-            lead, is_new = db.insert_lead(raw_lead)
-            if is_new:
-                new_count += 1
-            else:
-                merged_count += 1
+        imported = db.insert_many(result.leads)
 
         # Auto-score if requested
         if auto_score:
             progress.update(task, description="Scoring leads...")
-            scorer = LeadScorer()
+            scorer = get_shared_scorer()
             db.score_all_leads(scorer)
 
             # Find hot leads for notification
@@ -159,8 +154,8 @@ def import_leads(source: str, path: str, auto_score: bool, notify: bool, db_path
 
     output = (
         f"[green]✓ Import complete![/green]\n\n"
-        f"New leads: [cyan]{new_count}[/cyan]\n"
-        f"Merged: [cyan]{merged_count}[/cyan]\n"
+        f"New leads: [cyan]{imported.new_count}[/cyan]\n"
+        f"Merged: [cyan]{imported.merged_count}[/cyan]\n"
         f"Total: [cyan]{result.count}[/cyan]"
     )
 
@@ -181,12 +176,32 @@ def import_leads(source: str, path: str, auto_score: bool, notify: bool, db_path
         _send_hot_lead_notifications(hot_leads)
 
 
-@cli.command()
+@cli.group(invoke_without_command=True)
+@click.option("--workers", "-w", default=1, show_default=True,
+              help="Scoring processes (0 = one per CPU)")
+@click.option("--chunk-size", default=1000, show_default=True,
+              help="Leads read, scored and written per batch")
+@click.option("--force", is_flag=True, help="Rescore leads whose text and signals are unchanged")
 @click.option("--db", "db_path", help="Custom database path")
-def score(db_path: Optional[str]):
-    """Score all leads in the database."""
+@click.pass_context
+def score(ctx: click.Context, workers: int, chunk_size: int, force: bool, db_path: Optional[str]):
+    """Score all leads in the database.
+
+    Only leads whose text or signal set changed since they were last scored
+    are rescored, unless --force is given.
+
+    \b
+    Examples:
+      socialops score
+      socialops score --force                         # rescore everything
+      socialops score --workers 0 --chunk-size 5000   # use every CPU
+      socialops score what-if --config new.json       # preview a re-weighting
+    """
+    if ctx.invoked_subcommand is not None:
+        return
+
     db = get_db(db_path)
-    scorer = LeadScorer()
+    scorer = get_shared_scorer()
 
     with Progress(
         SpinnerColumn(),
@@ -194,23 +209,86 @@ def score(db_path: Optional[str]):
         console=console
     ) as progress:
         task = progress.add_task("Scoring leads...", total=None)
-        count = db.score_all_leads(scorer)
+        count = db.score_all_leads(scorer, workers=workers, chunk_size=chunk_size, force=force)
 
     stats = db.get_stats()
+    unchanged = stats["total_leads"] - count
+    hot = scorer.config.hot_threshold
+    warm = scorer.config.warm_threshold
+    lukewarm = scorer.config.lukewarm_threshold
+    cache = scorer.cache.stats()
 
     console.print(Panel.fit(
-        f"[green]✓ Scored {count} leads[/green]\n\n"
+        f"[green]✓ Scored {count} leads[/green]"
+        + (f" [dim]({unchanged} unchanged, skipped)[/dim]" if unchanged else "")
+        + "\n\n"
         f"[bold]Results:[/bold]\n"
-        f"  🔥 Hot (150+):     [red]{stats['by_tier'].get('hot', 0)}[/red]\n"
-        f"  🌡️  Warm (75-149):  [yellow]{stats['by_tier'].get('warm', 0)}[/yellow]\n"
-        f"  💧 Lukewarm (25-74): [blue]{stats['by_tier'].get('lukewarm', 0)}[/blue]\n"
-        f"  ❄️  Cold (<25):      [dim]{stats['by_tier'].get('cold', 0)}[/dim]\n"
+        f"  🔥 Hot ({hot}+):     [red]{stats['by_tier'].get('hot', 0)}[/red]\n"
+        f"  🌡️  Warm ({warm}-{hot - 1}):  [yellow]{stats['by_tier'].get('warm', 0)}[/yellow]\n"
+        f"  💧 Lukewarm ({lukewarm}-{warm - 1}): "
+        f"[blue]{stats['by_tier'].get('lukewarm', 0)}[/blue]\n"
+        f"  ❄️  Cold (<{lukewarm}):      [dim]{stats['by_tier'].get('cold', 0)}[/dim]\n"
         f"  ⛔ Negative:        [dim]{stats['by_tier'].get('negative', 0)}[/dim]\n\n"
-        f"[dim]Run 'socialops show --tier hot' to view hot leads[/dim]",
+        f"[dim]Run 'socialops show --tier hot' to view hot leads[/dim]"
+        + (f"\n[dim]Result cache: {cache['hits']} hits, {cache['misses']} misses[/dim]"
+           if cache["hits"] else ""),
         title="Scoring Complete"
     ))
 
 
+@score.command("what-if")
+@click.option("--config", "-c", "config_path", type=click.Path(exists=True), required=True,
+              help="Candidate scoring_config.json to evaluate")
+@click.option("--db", "db_path", help="Custom database path")
+def score_what_if(config_path: str, db_path: Optional[str]):
+    """Preview tier migrations under a new scoring config without rescoring text.
+
+    Uses the persisted leads x signals match matrix, so thresholds, category
+    and source multipliers and phrase overrides are applied to every scored
+    lead with one sparse matrix-vector product.
+    """
+    import time
+
+    from ..core.config import ScoringConfigManager
+
+    db = get_db(db_path)
+    scorer = get_shared_scorer()
+    matrix = db.load_match_matrix(scorer)
+
+    baseline = ScoringConfigManager().config
+    candidate = ScoringConfigManager(Path(config_path)).config
+
+    start = time.perf_counter()
+    report = matrix.tier_migrations(scorer.signals, baseline, candidate)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    tiers = ["hot", "warm", "lukewarm", "cold", "negative"]
+    totals = Table(title="Tier Totals")
+    totals.add_column("Tier")
+    totals.add_column("Current", justify="right")
+    totals.add_column("Candidate", justify="right")
+    totals.add_column("Change", justify="right")
+    for tier_name in tiers:
+        before = report["before"][tier_name]
+        after = report["after"][tier_name]
+        totals.add_row(tier_name, str(before), str(after), f"{after - before:+d}")
+    console.print(totals)
+
+    if report["migrations"]:
+        moves = Table(title="Tier Migrations")
+        moves.add_column("From")
+        moves.add_column("To")
+        moves.add_column("Leads", justify="right")
+        for (src, dst), count in sorted(report["migrations"].items(), key=lambda x: -x[1]):
+            moves.add_row(src, dst, str(count))
+        console.print(moves)
+
+    console.print(
+        f"[dim]{report['leads']} leads evaluated in {elapsed_ms:.1f} ms · "
+        f"{report['score_changed']} scores changed · {report['tier_changed']} tiers changed[/dim]"
+    )
+
+
 @cli.command()
 @click.option("--tier", "-t", type=click.Choice(["hot", "warm", "lukewarm", "cold", "negative"]),
               help="Filter by tier")
@@ -225,7 +303,8 @@ def show(tier: Optional[str], source: Optional[str], status: Optional[str], limi
     leads = db.get_all_leads(
         tier=tier,
         status=LeadStatus(status) if status else None,
-        limit=limit
+        limit=limit,
+        fields=("score", "tier", "name", "username", "email", "phone", "source", "score_breakdown")
     )
 
     # Filter by source if specified
@@ -274,11 +353,12 @@ def show(tier: Optional[str], source: Optional[str], status: Optional[str], limi
 
 @cli.command()
 @click.argument("query")
+@click.option("--by-score", is_flag=True, help="Order by lead score instead of relevance")
 @click.option("--db", "db_path", help="Custom database path")
-def search(query: str, db_path: Optional[str]):
+def search(query: str, by_score: bool, db_path: Optional[str]):
     """Search leads by name, email, phone, or notes."""
     db = get_db(db_path)
-    leads = db.search_leads(query)
+    leads = db.search_leads(query, ranked=not by_score)
 
     if not leads:
         console.print(f"[yellow]No leads found matching '{query}'[/yellow]")
@@ -290,6 +370,7 @@ def search(query: str, db_path: Optional[str]):
     table.add_column("Name", style="cyan")
     table.add_column("Contact")
     table.add_column("Source")
+    table.add_column("Match", style="dim")
 
     for lead in leads[:20]:
         table.add_row(
@@ -297,7 +378,8 @@ def search(query: str, db_path: Optional[str]):
             str(lead.score),
             lead.display_name[:30],
             lead.contact_info[:30],
-            lead.source
+            lead.source,
+            escape(lead.snippet or "")
         )
 
     console.print(table)
@@ -375,6 +457,40 @@ def stats(db_path: Optional[str]):
     ))
 
 
+@cli.command("check-stats")
+@click.option("--repair", is_flag=True, help="Replace drifted stats with the recount")
+@click.option("--db", "db_path", help="Custom database path")
+def check_stats(repair: bool, db_path: Optional[str]):
+    """Recount lead statistics from scratch and report drift."""
+    db = get_db(db_path)
+    drift = db.check_stats(repair=repair)
+
+    if not drift:
+        console.print("[green]✓ Lead statistics are consistent[/green]")
+        return
+
+    table = Table(title=f"Stats drift ({len(drift)} rows)")
+    table.add_column("Dimension")
+    table.add_column("Value")
+    table.add_column("Stored", justify="right")
+    table.add_column("Actual", justify="right")
+    for row in drift:
+        table.add_row(
+            row["dimension"],
+            row["value"] or "(none)",
+            f"{row['stored']['count']} / {row['stored']['score_sum']}",
+            f"{row['actual']['count']} / {row['actual']['score_sum']}",
+        )
+    console.print(table)
+    console.print("[dim]count / score sum[/dim]")
+
+    if repair:
+        console.print("[green]✓ Stats rebuilt from the recount[/green]")
+    else:
+        console.print("[yellow]Run with --repair to rebuild them[/yellow]")
+        raise SystemExit(1)
+
+
 # ============================================================================
 # LEAD MANAGEMENT
 # ============================================================================
@@ -417,6 +533,10 @@ def set_status(lead_id: int, new_status: str, db_path: Optional[str]):
     lead.status = LeadStatus(new_status)
     db.update_lead(lead)
 
+    # Lost leads are the negative examples for the conversion model
+    if lead.status == LeadStatus.LOST:
+        _record_outcome(lead, converted=False)
+
     console.print(f"[green]✓ Lead #{lead_id}: {old_status} → {new_status}[/green]")
 
 
@@ -436,6 +556,14 @@ def convert(lead_id: int, db_path: Optional[str]):
     db.update_lead(lead)
 
     # Record conversion for ML
+    _record_outcome(lead, converted=True)
+
+    console.print(f"[green]🎉 Lead #{lead_id} marked as CONVERTED![/green]")
+    console.print("[dim]Conversion recorded for scoring optimization[/dim]")
+
+
+def _record_outcome(lead, converted: bool):
+    """Record a lead's outcome with its matched signals for ML training."""
     try:
         from ..core.config import ConversionTracker
         tracker = ConversionTracker()
@@ -447,7 +575,7 @@ def convert(lead_id: int, db_path: Optional[str]):
         days = (datetime.now() - lead.created_at).days if lead.created_at else 0
         tracker.record_conversion(
             lead_id=lead.id,
-            converted=True,
+            converted=converted,
             signals=signals,
             score=lead.score,
             days=days,
@@ -456,8 +584,71 @@ def convert(lead_id: int, db_path: Optional[str]):
     except Exception:
         pass
 
-    console.print(f"[green]🎉 Lead #{lead_id} marked as CONVERTED![/green]")
-    console.print("[dim]Conversion recorded for scoring optimization[/dim]")
+
+@cli.group()
+def ml():
+    """Conversion model trained from recorded outcomes."""
+    pass
+
+
+@ml.command("train")
+@click.option("--output", "-o", type=click.Path(),
+              help="Model file (default: ml_model_path or ~/.td-lead-engine/conversion_model.bin)")
+@click.option("--l2", default=1.0, show_default=True, help="L2 regularization strength")
+def ml_train(output: Optional[str], l2: float):
+    """Train the conversion model from `convert` / lost outcomes.
+
+    \b
+    Examples:
+      socialops ml train
+      socialops ml train --l2 5 -o ./model.bin
+    """
+    from ..core.config import ConversionTracker
+    from ..core.ml_model import ConversionModel, default_model_path
+
+    scorer = get_shared_scorer()
+    tracker = ConversionTracker()
+    try:
+        model = ConversionModel.train(tracker.iter_conversions(), scorer.signals, l2=l2)
+    except ValueError as e:
+        console.print(f"[red]{e}[/red]")
+        return
+
+    config_path = scorer.config.ml_model_path
+    path = Path(output) if output else Path(config_path) if config_path else default_model_path()
+    model.save(path)
+
+    meta = model.metadata
+    console.print(Panel.fit(
+        f"[green]✓ Trained on {meta['samples']} outcomes "
+        f"({meta['positives']} converted)[/green]\n\n"
+        f"  Log loss: {meta['log_loss']:.3f}\n"
+        f"  AUC:      {meta['auc']:.3f}\n"
+        f"  Saved:    {path} ({path.stat().st_size:,} bytes)\n\n"
+        f"[dim]Set use_ml_scoring (and ml_model_path if not default) in scoring_config.json, "
+        f"then run 'socialops ml apply'[/dim]",
+        title="Conversion Model"
+    ))
+
+
+@ml.command("apply")
+@click.option("--db", "db_path", help="Custom database path")
+def ml_apply(db_path: Optional[str]):
+    """Blend model probabilities into stored scores (per ml_weight)."""
+    import time
+
+    db = get_db(db_path)
+    model = db.get_conversion_model()
+    if model is None:
+        console.print("[yellow]ML scoring is disabled or no model has been trained[/yellow]")
+        return
+
+    start = time.perf_counter()
+    count = db.apply_ml_scores(model)
+    elapsed = time.perf_counter() - start
+    console.print(
+        f"[green]✓ Updated {count} lead scores[/green] [dim]({elapsed * 1000:.0f} ms)[/dim]"
+    )
 
 
 @cli.command()
@@ -491,13 +682,35 @@ def tag(lead_id: int, tags: str, db_path: Optional[str]):
 # ============================================================================
 
 @cli.command()
-@click.option("--path", "-p", type=click.Path(), default="./leads_export.csv", help="Output file path")
+@click.option("--path", "-p", type=click.Path(),
+              help="Output file (csv) or directory (parquet) "
+                   "[default: ./leads_export.csv or ./leads_export]")
+@click.option("--format", "-f", "output_format", type=click.Choice(["csv", "parquet"]),
+              default="csv",
+              help="csv: leads only; parquet: leads, interactions and lead events, "
+                   "one file per table")
 @click.option("--tier", "-t", type=click.Choice(["hot", "warm", "lukewarm", "cold"]), help="Filter by tier")
 @click.option("--db", "db_path", help="Custom database path")
-def export(path: str, tier: Optional[str], db_path: Optional[str]):
-    """Export leads to CSV."""
+def export(path: Optional[str], output_format: str, tier: Optional[str], db_path: Optional[str]):
+    """Export leads to CSV or Parquet."""
     db = get_db(db_path)
-    output_path = Path(path)
+
+    if output_format == "parquet":
+        output_path = Path(path or "./leads_export")
+        try:
+            counts = db.export_parquet(output_path, tier=tier)
+        except ImportError as e:
+            console.print(f"[red]{e}[/red]")
+            raise SystemExit(1)
+        rows = "\n".join(f"  {table}: {count:,} rows" for table, count in counts.items())
+        console.print(Panel.fit(
+            f"[green]✓ Exported {len(counts)} tables[/green]\n{rows}\n\n"
+            f"Directory: [cyan]{output_path.absolute()}[/cyan]",
+            title="Parquet Export"
+        ))
+        return
+
+    output_path = Path(path or "./leads_export.csv")
     count = db.export_to_csv(output_path, tier=tier)
 
     console.print(Panel.fit(
@@ -507,17 +720,71 @@ def export(path: str, tier: Optional[str], db_path: Optional[str]):
     ))
 
 
+@cli.command()
+@click.option("--dir", "backup_dir", type=click.Path(),
+              default=str(Path.home() / "td-lead-backups"), show_default=True,
+              help="Directory holding the backup generations")
+@click.option("--keep", default=7, show_default=True, help="Generations to keep (0 keeps all)")
+@click.option("--compress", is_flag=True, help="Write a gzip-compressed snapshot")
+@click.option("--db", "db_path", help="Custom database path")
+def backup(backup_dir: str, keep: int, compress: bool, db_path: Optional[str]):
+    """Take an online backup of the database (safe while it's in use)."""
+    db = get_db(db_path)
+
+    with Progress(
+        SpinnerColumn(),
+        TextColumn("[progress.description]{task.description}"),
+        console=console
+    ) as progress:
+        task = progress.add_task("Backing up...", total=None)
+        result = db.backup(
+            Path(backup_dir), keep=keep, compress=compress,
+            progress=lambda done, total: progress.update(task, completed=done, total=total)
+        )
+
+    console.print(Panel.fit(
+        f"[green]✓ Backed up {result.pages:,} pages in {result.seconds:.2f} s[/green]\n\n"
+        f"File: [cyan]{result.path}[/cyan] ({result.size_bytes / 2 ** 20:.1f} MiB)"
+        + (f"\n[dim]Rotated out {len(result.removed)} old generation(s)[/dim]"
+           if result.removed else ""),
+        title="Database Backup"
+    ))
+
+
+@cli.command()
+@click.argument("backup_path", type=click.Path(exists=True, dir_okay=False))
+@click.option("--yes", is_flag=True, help="Don't ask for confirmation")
+@click.option("--db", "db_path", help="Custom database path")
+def restore(backup_path: str, yes: bool, db_path: Optional[str]):
+    """Replace the database's contents with a backup generation."""
+    db = get_db(db_path)
+    if not yes and not Confirm.ask(f"Replace every lead in {db.db_path} with {backup_path}?"):
+        return
+
+    pages = db.restore(Path(backup_path))
+    console.print(f"[green]✓ Restored {pages:,} pages from {backup_path}[/green]")
+
+
 @cli.command()
 @click.option("--type", "-t", "report_type", type=click.Choice(["daily", "weekly", "monthly"]), default="daily")
 @click.option("--format", "-f", "output_format", type=click.Choice(["text", "html", "json"]), default="text")
 @click.option("--output", "-o", type=click.Path(), help="Save report to file")
+@click.option("--snapshot", is_flag=True,
+              help="Aggregate from the Parquet analytics snapshot (needs pyarrow)")
 @click.option("--db", "db_path", help="Custom database path")
-def report(report_type: str, output_format: str, output: Optional[str], db_path: Optional[str]):
+def report(
+    report_type: str,
+    output_format: str,
+    output: Optional[str],
+    snapshot: bool,
+    db_path: Optional[str]
+):
     """Generate lead report."""
     from ..analytics.reports import ReportGenerator
 
     db = get_db(db_path)
-    generator = ReportGenerator(db)
+    lead_snapshot = db.snapshot(columns=ReportGenerator.SNAPSHOT_COLUMNS) if snapshot else None
+    generator = ReportGenerator(db, snapshot=lead_snapshot)
 
     if report_type == "daily":
         rep = generator.generate_daily_report()
@@ -548,7 +815,7 @@ def setup():
 @click.option("--webhook-url", prompt="Slack Webhook URL", help="Slack incoming webhook URL")
 def setup_slack(webhook_url: str):
     """Configure Slack notifications."""
-    from ..automation.webhooks import WebhookManager, WebhookEvent
+    from ..automation.webhooks import WebhookEvent, WebhookManager
 
     manager = WebhookManager()
     manager.register(
@@ -573,7 +840,7 @@ def setup_slack(webhook_url: str):
 @click.option("--hot-lead-url", prompt="Zapier webhook for hot leads (or 'skip')", default="skip")
 def setup_zapier(new_lead_url: str, hot_lead_url: str):
     """Configure Zapier webhooks."""
-    from ..automation.webhooks import WebhookManager, WebhookEvent
+    from ..automation.webhooks import WebhookEvent, WebhookManager
 
     manager = WebhookManager()
 
@@ -683,7 +950,7 @@ def setup_hubspot(api_key: str):
 
     # Test connection
     try:
-        from ..integrations.hubspot import HubSpotIntegration, HubSpotConfig
+        from ..integrations.hubspot import HubSpotConfig, HubSpotIntegration
         integration = HubSpotIntegration(HubSpotConfig(api_key=api_key))
         if integration.test_connection():
             console.print("[green]✓ HubSpot connected successfully![/green]")
@@ -833,7 +1100,7 @@ def notify(lead_id: int, channel: str, db_path: Optional[str]):
 @click.argument("channel", type=click.Choice(["slack", "sms", "email"]))
 def test_notify(channel: str):
     """Send a test notification."""
-    from ..automation.webhooks import WebhookManager, WebhookEvent
+    from ..automation.webhooks import WebhookEvent, WebhookManager
 
     test_data = {
         "event": "test",
@@ -855,7 +1122,7 @@ def test_notify(channel: str):
         if config_path.exists():
             with open(config_path) as f:
                 config = json.load(f)
-            from ..integrations.twilio_sms import TwilioSMSIntegration, TwilioConfig
+            from ..integrations.twilio_sms import TwilioConfig, TwilioSMSIntegration
             twilio = TwilioSMSIntegration(TwilioConfig(**config))
             for number in config.get("notify_numbers", []):
                 twilio._send_sms(number, "Test from TD Lead Engine - SMS working!")
@@ -875,7 +1142,7 @@ def test_notify(channel: str):
 @click.argument("text")
 def test_score(text: str):
     """Test scoring on text."""
-    scorer = LeadScorer()
+    scorer = get_shared_scorer()
     result = scorer.score_text(text)
 
     console.print(Panel(
@@ -926,7 +1193,7 @@ def sync_hubspot(db_path: Optional[str]):
     with open(config_path) as f:
         config = json.load(f)
 
-    from ..integrations.hubspot import HubSpotIntegration, HubSpotConfig
+    from ..integrations.hubspot import HubSpotConfig, HubSpotIntegration
 
     db = get_db(db_path)
     integration = HubSpotIntegration(HubSpotConfig(api_key=config["api_key"]))
@@ -960,7 +1227,7 @@ def sync_hubspot(db_path: Optional[str]):
 
 def _send_hot_lead_notifications(leads):
     """Send notifications for hot leads."""
-    from ..automation.webhooks import WebhookManager, WebhookEvent
+    from ..automation.webhooks import WebhookEvent, WebhookManager
 
     manager = WebhookManager()
 
@@ -979,7 +1246,7 @@ def _send_hot_lead_notifications(leads):
 
 def _send_lead_notification(lead, channel: str):
     """Send notification about a specific lead."""
-    from ..automation.webhooks import WebhookManager, WebhookEvent
+    from ..automation.webhooks import WebhookEvent, WebhookManager
 
     lead_data = {
         "lead_id": lead.id,
@@ -1001,7 +1268,7 @@ def _send_lead_notification(lead, channel: str):
         if config_path.exists():
             with open(config_path) as f:
                 config = json.load(f)
-            from ..integrations.twilio_sms import TwilioSMSIntegration, TwilioConfig
+            from ..integrations.twilio_sms import TwilioConfig, TwilioSMSIntegration
             twilio = TwilioSMSIntegration(TwilioConfig(**config))
             twilio.send_hot_lead_alert(lead)
             console.print("[green]✓ SMS notification sent[/green]")
@@ -48,6 +48,9 @@ class ImportResult:
     errors: List[str] = field(default_factory=list)
     warnings: List[str] = field(default_factory=list)
     success: bool = True
+    # Filled in by LeadDatabase.insert_many
+    new_count: int = 0
+    merged_count: int = 0
 
     @property
     def count(self) -> int:
@@ -1,12 +1,14 @@
 """Core scoring engine for lead qualification."""
 
-from .scorer import LeadScorer, ScoringResult
+from .scorer import LeadScorer, ScoreCache, ScoringResult, get_shared_scorer
 from .signals import IntentSignal, SignalCategory, INTENT_SIGNALS
 from .config import ScoringConfig, ScoringConfigManager, ConversionTracker
 
 __all__ = [
     "LeadScorer",
     "ScoringResult",
+    "ScoreCache",
+    "get_shared_scorer",
     "IntentSignal",
     "SignalCategory",
     "INTENT_SIGNALS",
@@ -0,0 +1,143 @@
+"""Append-only JSON-lines log with compaction.
+
+Recording an event is one ``write`` at the end of the file, whatever the
+history size; readers stream records line by line instead of parsing one
+big JSON document. Records that a later record supersedes (same ``key``)
+and lines torn by a crash mid-write (or otherwise not a JSON object) are
+dropped by ``compact()``, which rewrites the file atomically.
+
+Appends and compaction from every process take an exclusive ``flock`` on a
+``.lock`` file beside the log (the log itself is swapped out by compaction,
+so it can't carry the lock). Without ``fcntl`` (Windows) they are only
+serialized within the process.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+
+class AppendOnlyLog:
+    """A JSON-lines file that only grows at the end until compacted."""
+
+    def __init__(self, path: Path, key: Optional[str] = None):
+        """``key`` names the field whose latest record wins on compaction."""
+        self.path = Path(path)
+        self.key = key
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    @contextmanager
+    def _locked(self):
+        """Hold the log exclusively against other threads and processes."""
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:
+                yield
+                return
+            with open(self.path.with_name(self.path.name + ".lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def append(self, record: Dict[str, Any]):
+        """Append one record (a single write; O(1) in the history size)."""
+        self.extend([record])
+
+    def extend(self, records: Iterable[Dict[str, Any]]):
+        """Append several records in one write."""
+        data = "".join(json.dumps(r, separators=(",", ":")) + "\n" for r in records).encode("utf-8")
+        if not data:
+            return
+        with self._locked(), open(self.path, "a+b") as f:
+            # A crash mid-write can leave a torn last line; never glue onto it
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Stream records in append order, skipping unreadable lines."""
+        if not self.path.exists():
+            return
+        with open(self.path, "r", encoding="utf-8") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable line {number} of {self.path}")
+                    continue
+                if not isinstance(record, dict):
+                    logger.warning(f"Skipping non-object line {number} of {self.path}")
+                    continue
+                yield record
+
+    def compact(self) -> Dict[str, int]:
+        """Rewrite the log without superseded or unreadable records.
+
+        Appends wait on the log's lock until the rewritten file (flushed to
+        disk) has replaced the old one.
+        """
+        with self._locked():
+            if not self.path.exists():
+                return {"before": 0, "after": 0}
+
+            with open(self.path, "rb") as f:
+                raw = f.read()
+            end = len(raw)
+            # Only complete lines are compacted; a partial tail is carried over as-is
+            complete = raw[:raw.rfind(b"\n") + 1]
+
+            before = 0
+            records: List[Optional[Dict[str, Any]]] = []
+            position: Dict[Any, int] = {}
+            for number, line in enumerate(complete.splitlines(), 1):
+                if not line.strip():
+                    continue
+                before += 1
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Dropping unreadable line {number} of {self.path}")
+                    continue
+                if not isinstance(record, dict):
+                    logger.warning(f"Dropping non-object line {number} of {self.path}")
+                    continue
+                if self.key is not None and self.key in record:
+                    superseded = position.get(record[self.key])
+                    if superseded is not None:
+                        records[superseded] = None
+                    position[record[self.key]] = len(records)
+                records.append(record)
+            kept = [r for r in records if r is not None]
+
+            tmp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(tmp_path, "wb") as out:
+                for record in kept:
+                    out.write(json.dumps(record, separators=(",", ":")).encode() + b"\n")
+                out.write(raw[len(complete):])
+                out.flush()
+                os.fsync(out.fileno())
+            tmp_path.replace(self.path)
+
+        if len(complete) < end:
+            logger.warning(f"Carried over a partial last line in {self.path}")
+        return {"before": before, "after": len(kept)}
@@ -4,9 +4,11 @@ import json
 import logging
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, Iterator, List, Optional, Any
 from datetime import datetime
 
+from .append_log import AppendOnlyLog
+
 logger = logging.getLogger(__name__)
 
 
@@ -50,6 +52,9 @@ class ScoringConfig:
     # Signal weight adjustments (override default weights)
     signal_weight_overrides: Dict[str, int] = field(default_factory=dict)
 
+    # Phrase matching: also accept spacing, punctuation and typo variants
+    fuzzy_matching: bool = False
+
     # Decay settings (reduce score over time without activity)
     enable_score_decay: bool = False
     decay_days: int = 30  # Days before decay starts
@@ -63,6 +68,68 @@ class ScoringConfig:
     # Updated timestamp
     updated_at: datetime = field(default_factory=datetime.now)
 
+    def effective_weight(
+        self,
+        phrase: str,
+        default_weight: int,
+        category: str,
+        source: Optional[str] = None
+    ) -> int:
+        """Weight of a signal after phrase override, category and source multipliers."""
+        weight = self.signal_weight_overrides.get(phrase, default_weight)
+        multiplier = self.category_multipliers.get(category, 1.0)
+        if source is not None:
+            multiplier *= self.source_multipliers.get(source, 1.0)
+        return int(weight * multiplier)
+
+    def decay_factors(self) -> List[float]:
+        """Fraction of a positive score kept after 0, 1, 2, ... decay periods.
+
+        One period is ``decay_days`` without activity, so decay starts after
+        ``decay_days`` and compounds by ``decay_rate`` each further period.
+        The table stops once the factor is negligible; later periods keep 0.
+        Empty when decay is disabled.
+        """
+        if not self.enable_score_decay or self.decay_days <= 0 or not 0 < self.decay_rate <= 1:
+            return []
+        factors = [1.0]
+        while len(factors) <= 1000:
+            factor = (1 - self.decay_rate) ** len(factors)
+            if factor < 1e-5:
+                break
+            factors.append(factor)
+        return factors
+
+    def decayed_score(self, score: int, idle_days: float) -> int:
+        """Score after ``idle_days`` without contact or updates (negative scores never decay)."""
+        factors = self.decay_factors()
+        if not factors or score <= 0:
+            return score
+        periods = max(int(idle_days // self.decay_days), 0)
+        return int(score * (factors[periods] if periods < len(factors) else 0.0))
+
+
+def tier_for_score(score: int, config: Optional[ScoringConfig] = None) -> str:
+    """Map a score to its tier using the config's thresholds (defaults if none).
+
+    This is the single tier ladder shared by the scorer, task runner, API and CLI.
+    """
+    if config is None:
+        config = _DEFAULT_CONFIG
+    if score < 0:
+        return "negative"
+    elif score >= config.hot_threshold:
+        return "hot"
+    elif score >= config.warm_threshold:
+        return "warm"
+    elif score >= config.lukewarm_threshold:
+        return "lukewarm"
+    else:
+        return "cold"
+
+
+_DEFAULT_CONFIG = ScoringConfig()
+
 
 class ScoringConfigManager:
     """Manage and persist scoring configuration."""
@@ -85,6 +152,7 @@ class ScoringConfigManager:
                         category_multipliers=data.get("category_multipliers", {}),
                         source_multipliers=data.get("source_multipliers", {}),
                         signal_weight_overrides=data.get("signal_weight_overrides", {}),
+                        fuzzy_matching=data.get("fuzzy_matching", False),
                         enable_score_decay=data.get("enable_score_decay", False),
                         decay_days=data.get("decay_days", 30),
                         decay_rate=data.get("decay_rate", 0.1),
@@ -97,6 +165,11 @@ class ScoringConfigManager:
 
         return ScoringConfig()
 
+    def reload(self) -> ScoringConfig:
+        """Re-read the configuration file."""
+        self.config = self._load_config()
+        return self.config
+
     def save_config(self):
         """Save configuration to file."""
         self.config_path.parent.mkdir(parents=True, exist_ok=True)
@@ -107,6 +180,7 @@ class ScoringConfigManager:
             "category_multipliers": self.config.category_multipliers,
             "source_multipliers": self.config.source_multipliers,
             "signal_weight_overrides": self.config.signal_weight_overrides,
+            "fuzzy_matching": self.config.fuzzy_matching,
             "enable_score_decay": self.config.enable_score_decay,
             "decay_days": self.config.decay_days,
             "decay_rate": self.config.decay_rate,
@@ -146,28 +220,11 @@ class ScoringConfigManager:
 
     def get_effective_weight(self, phrase: str, default_weight: int, category: str) -> int:
         """Get effective weight for a signal considering overrides and multipliers."""
-        # Check for explicit override
-        if phrase in self.config.signal_weight_overrides:
-            weight = self.config.signal_weight_overrides[phrase]
-        else:
-            weight = default_weight
-
-        # Apply category multiplier
-        multiplier = self.config.category_multipliers.get(category, 1.0)
-        return int(weight * multiplier)
+        return self.config.effective_weight(phrase, default_weight, category)
 
     def get_tier(self, score: int) -> str:
         """Get tier based on score and current thresholds."""
-        if score < 0:
-            return "negative"
-        elif score >= self.config.hot_threshold:
-            return "hot"
-        elif score >= self.config.warm_threshold:
-            return "warm"
-        elif score >= self.config.lukewarm_threshold:
-            return "lukewarm"
-        else:
-            return "cold"
+        return tier_for_score(score, self.config)
 
 
 # === Conversion Tracking for ML ===
@@ -187,53 +244,117 @@ class ConversionEvent:
 
 
 class ConversionTracker:
-    """Track conversions for ML model training."""
+    """Track conversions for ML model training.
+
+    Outcomes live in an append-only JSON-lines log, so recording one never
+    rewrites the history and training jobs can stream it with
+    ``iter_conversions``. Every outcome is an event of its own (a lead can
+    have several), so ``compact`` only drops torn lines.
+    """
 
     def __init__(self, data_path: Optional[Path] = None):
         """Initialize conversion tracker."""
-        self.data_path = data_path or Path.home() / ".td-lead-engine" / "conversions.json"
-        self.conversions: List[ConversionEvent] = []
-        self._load_data()
+        self.data_path = data_path or Path.home() / ".td-lead-engine" / "conversions.jsonl"
+        self._log = AppendOnlyLog(self.data_path)
+        self._conversions: Optional[List[ConversionEvent]] = None
+        self._migrate_legacy_data()
+
+    @staticmethod
+    def _read_legacy(path: Path) -> Optional[List[Dict[str, Any]]]:
+        """Records of a pre-log ``{"conversions": [...]}`` document at ``path``.
+
+        None if the file is missing or is already a JSON-lines log. Only the
+        first line is read to tell them apart: a legacy document is either
+        pretty-printed (a lone ``{``) or one object with a ``conversions`` list.
+        """
+        if not path.exists():
+            return None
+        with open(path, 'r', encoding='utf-8') as f:
+            first = f.readline().strip()
+            if first != "{":
+                try:
+                    data = json.loads(first)
+                except json.JSONDecodeError:
+                    return None
+                if not isinstance(data, dict) or not isinstance(data.get("conversions"), list):
+                    return None
+                if f.read().strip():
+                    return None
+                return data["conversions"]
+            f.seek(0)
+            data = json.load(f)
+        return data.get("conversions", [])
+
+    def _migrate_legacy_data(self):
+        """Move pre-log conversion data into the log (once).
+
+        The legacy document may sit beside the log (``conversions.json``
+        next to ``conversions.jsonl``) or at ``data_path`` itself, when the
+        caller passes the path it used before the log existed. Either way
+        the original is kept as ``<name>.migrated``.
+        """
+        try:
+            records = self._read_legacy(self.data_path)
+            if records is not None:
+                # Write the log beside the document, then swap it into place
+                tmp_path = self.data_path.with_name(self.data_path.name + ".tmp")
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    f.writelines(json.dumps(r, separators=(",", ":")) + "\n" for r in records)
+                self.data_path.rename(self.data_path.with_name(self.data_path.name + ".migrated"))
+                tmp_path.replace(self.data_path)
+                return
+
+            legacy_path = self.data_path.with_suffix(".json")
+            if legacy_path == self.data_path or self._log.exists():
+                return
+            records = self._read_legacy(legacy_path)
+            if records is not None:
+                self._log.extend(records)
+                legacy_path.rename(legacy_path.with_name(legacy_path.name + ".migrated"))
+        except Exception as e:
+            logger.error(f"Error migrating conversion data: {e}")
+
+    @staticmethod
+    def _from_record(record: Dict[str, Any]) -> ConversionEvent:
+        recorded_at = record.get("recorded_at")
+        return ConversionEvent(
+            lead_id=record["lead_id"],
+            converted=record["converted"],
+            conversion_type=record.get("conversion_type", ""),
+            signals_at_conversion=record.get("signals_at_conversion", []),
+            score_at_conversion=record.get("score_at_conversion", 0),
+            days_to_conversion=record.get("days_to_conversion", 0),
+            source=record.get("source", ""),
+            recorded_at=datetime.fromisoformat(recorded_at) if recorded_at else datetime.now(),
+        )
 
-    def _load_data(self):
-        """Load conversion data."""
-        if self.data_path.exists():
+    @staticmethod
+    def _to_record(event: ConversionEvent) -> Dict[str, Any]:
+        return {
+            "lead_id": event.lead_id,
+            "converted": event.converted,
+            "conversion_type": event.conversion_type,
+            "signals_at_conversion": event.signals_at_conversion,
+            "score_at_conversion": event.score_at_conversion,
+            "days_to_conversion": event.days_to_conversion,
+            "source": event.source,
+            "recorded_at": event.recorded_at.isoformat(),
+        }
+
+    def iter_conversions(self) -> Iterator[ConversionEvent]:
+        """Stream recorded outcomes oldest first without loading the history."""
+        for record in self._log:
             try:
-                with open(self.data_path, 'r') as f:
-                    data = json.load(f)
-                    for conv_data in data.get("conversions", []):
-                        self.conversions.append(ConversionEvent(
-                            lead_id=conv_data["lead_id"],
-                            converted=conv_data["converted"],
-                            conversion_type=conv_data.get("conversion_type", ""),
-                            signals_at_conversion=conv_data.get("signals_at_conversion", []),
-                            score_at_conversion=conv_data.get("score_at_conversion", 0),
-                            days_to_conversion=conv_data.get("days_to_conversion", 0),
-                            source=conv_data.get("source", ""),
-                        ))
-            except Exception as e:
-                logger.error(f"Error loading conversion data: {e}")
+                yield self._from_record(record)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Skipping malformed conversion record: {e}")
 
-    def _save_data(self):
-        """Save conversion data."""
-        self.data_path.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "conversions": [
-                {
-                    "lead_id": c.lead_id,
-                    "converted": c.converted,
-                    "conversion_type": c.conversion_type,
-                    "signals_at_conversion": c.signals_at_conversion,
-                    "score_at_conversion": c.score_at_conversion,
-                    "days_to_conversion": c.days_to_conversion,
-                    "source": c.source,
-                    "recorded_at": c.recorded_at.isoformat(),
-                }
-                for c in self.conversions
-            ]
-        }
-        with open(self.data_path, 'w') as f:
-            json.dump(data, f, indent=2)
+    @property
+    def conversions(self) -> List[ConversionEvent]:
+        """All recorded outcomes (loaded on first access)."""
+        if self._conversions is None:
+            self._conversions = list(self.iter_conversions())
+        return self._conversions
 
     def record_conversion(
         self,
@@ -244,7 +365,7 @@ class ConversionTracker:
         score: int = 0,
         days: int = 0,
         source: str = ""
-    ):
+    ) -> ConversionEvent:
         """Record a conversion (or non-conversion) event."""
         event = ConversionEvent(
             lead_id=lead_id,
@@ -255,23 +376,24 @@ class ConversionTracker:
             days_to_conversion=days,
             source=source,
         )
-        self.conversions.append(event)
-        self._save_data()
+        self._log.append(self._to_record(event))
+        if self._conversions is not None:
+            self._conversions.append(event)
+        return event
+
+    def compact(self) -> Dict[str, int]:
+        """Drop lines torn by a crash mid-write; recorded outcomes are all kept."""
+        result = self._log.compact()
+        self._conversions = None
+        return result
 
     def get_conversion_rate_by_tier(self) -> Dict[str, float]:
         """Calculate conversion rate by tier."""
         tier_conversions: Dict[str, List[bool]] = {}
 
-        for conv in self.conversions:
+        for conv in self.iter_conversions():
             # Determine tier at conversion
-            if conv.score_at_conversion >= 150:
-                tier = "hot"
-            elif conv.score_at_conversion >= 75:
-                tier = "warm"
-            elif conv.score_at_conversion >= 25:
-                tier = "lukewarm"
-            else:
-                tier = "cold"
+            tier = tier_for_score(conv.score_at_conversion)
 
             if tier not in tier_conversions:
                 tier_conversions[tier] = []
@@ -290,7 +412,7 @@ class ConversionTracker:
         """Analyze which signals correlate with conversions."""
         signal_stats: Dict[str, Dict[str, int]] = {}
 
-        for conv in self.conversions:
+        for conv in self.iter_conversions():
             for signal in conv.signals_at_conversion:
                 if signal not in signal_stats:
                     signal_stats[signal] = {"converted": 0, "not_converted": 0}
@@ -0,0 +1,410 @@
+"""SQLite-backed keyed collections of JSON documents.
+
+Managers that used to ``json.dump`` their whole dataset on every change
+keep one row per record here instead: saving a record is a single upsert
+whatever the collection size, a crash can't leave a half-written file,
+and two processes updating different records no longer overwrite each
+other. Collections can declare secondary indexes on top-level fields
+(SQLite expression indexes over the stored JSON) for ``find``.
+
+A store opened with ``write_behind`` buffers writes in memory and flushes
+them in one transaction when ``max_pending`` records are waiting, after
+``flush_interval`` seconds, on ``flush()``/``close()`` and at interpreter
+exit. Reads see pending writes. The trade-off is that a hard crash loses
+at most the unflushed window.
+
+``transaction()`` wraps a read-modify-write in ``BEGIN IMMEDIATE`` so that
+other processes can't interleave their own; writes inside it are applied
+directly even on a write-behind store.
+"""
+
+import atexit
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT = 30.0
+FLUSH_INTERVAL = 1.0  # seconds a write-behind record may wait
+MAX_PENDING = 1000  # write-behind records that trigger an immediate flush
+
+_NAME_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+Document = Dict[str, Any]
+
+# Pending write-behind value marking a delete
+_DELETED = None
+
+# Stores with write-behind, held until closed so pending writes can't be
+# dropped with the last reference, and flushed at exit
+_open_stores: "set[DocumentStore]" = set()
+
+# Stores handed out by open_store, by resolved path
+_shared: "weakref.WeakValueDictionary[Path, DocumentStore]" = weakref.WeakValueDictionary()
+_shared_lock = threading.Lock()
+
+
+@atexit.register
+def _flush_open_stores():
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error(f"Error flushing document store {store.path}: {e}")
+
+
+def keyed(records: Iterable[Document], field: str = "id") -> Iterator[Tuple[str, Document]]:
+    """``(record[field], record)`` pairs, e.g. for importing a legacy list of records."""
+    for record in records:
+        yield str(record[field]), record
+
+
+def open_store(path: Path, write_behind: bool = False) -> "DocumentStore":
+    """The process-wide store for ``path``, opening it on first use.
+
+    Managers get their store here so that two instances over the same
+    directory share one connection and see each other's pending
+    write-behind records. ``write_behind`` applies when the store is first
+    opened.
+    """
+    key = Path(path).resolve()
+    with _shared_lock:
+        store = _shared.get(key)
+        if store is None or store.closed:
+            store = DocumentStore(key, write_behind=write_behind)
+            _shared[key] = store
+        return store
+
+
+def _check_name(kind: str, name: str) -> str:
+    if not _NAME_RE.match(name):
+        raise ValueError(f"Invalid {kind} name {name!r}")
+    return name
+
+
+class DocumentStore:
+    """One SQLite file holding any number of named collections."""
+
+    def __init__(
+        self,
+        path: Path,
+        write_behind: bool = False,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_pending: int = MAX_PENDING,
+    ):
+        self.path = Path(path)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.RLock()
+        self._pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._collections: Dict[str, "Collection"] = {}
+        self._in_transaction = False
+        self.closed = False
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS documents (
+                collection TEXT NOT NULL,
+                key TEXT NOT NULL,
+                data TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (collection, key)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS store_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        if write_behind:
+            _open_stores.add(self)
+
+    def collection(self, name: str, indexes: Sequence[str] = ()) -> "Collection":
+        """The collection ``name``, with expression indexes on the ``indexes`` fields."""
+        _check_name("collection", name)
+        with self._lock:
+            for field in indexes:
+                _check_name("index field", field)
+                self._conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_doc_{name}_{field} "
+                    f"ON documents(json_extract(data, '$.{field}')) WHERE collection = '{name}'"
+                )
+            if name not in self._collections:
+                self._collections[name] = Collection(self, name, indexes)
+            return self._collections[name]
+
+    # === META ===
+
+    def get_meta(self, key: str) -> Optional[str]:
+        row = self._conn.execute("SELECT value FROM store_meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_meta(self, key: str, value: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)", (key, value)
+            )
+
+    # === WRITES ===
+
+    @contextmanager
+    def transaction(self) -> Iterator["DocumentStore"]:
+        """Reads and writes that commit together, holding the database write lock.
+
+        Pending write-behind records are flushed first. Other threads wait
+        on the store lock and other processes on SQLite's, so nothing can
+        change between a read and the write based on it. Nested calls join
+        the outer transaction.
+        """
+        with self._lock:
+            if self._in_transaction:
+                yield self
+                return
+            self._flush_locked()
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_transaction = True
+            try:
+                yield self
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._in_transaction = False
+
+    def _write(self, collection: str, items: Iterable[Tuple[str, Optional[str]]]):
+        """Upsert (or, for a None value, delete) encoded documents."""
+        with self._lock:
+            if self.write_behind and not self._in_transaction:
+                for key, data in items:
+                    self._pending[(collection, key)] = data
+                if len(self._pending) >= self.max_pending:
+                    self._flush_locked()
+                elif self._pending and self._timer is None:
+                    self._timer = threading.Timer(self.flush_interval, self.flush)
+                    self._timer.daemon = True
+                    self._timer.start()
+            else:
+                self._apply([((collection, key), data) for key, data in items])
+
+    def _apply(self, writes: List[Tuple[Tuple[str, str], Optional[str]]]):
+        if not writes:
+            return
+        now = time.time()
+        upserts = [(c, k, data, now) for (c, k), data in writes if data is not _DELETED]
+        deletes = [(c, k) for (c, k), data in writes if data is _DELETED]
+        if self._in_transaction:
+            self._write_rows(upserts, deletes)
+            return
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._write_rows(upserts, deletes)
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _write_rows(self, upserts: List[Tuple], deletes: List[Tuple[str, str]]):
+        if upserts:
+            self._conn.executemany(
+                "INSERT INTO documents (collection, key, data, updated_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT (collection, key) DO UPDATE SET data = excluded.data, "
+                "updated_at = excluded.updated_at",
+                upserts,
+            )
+        if deletes:
+            self._conn.executemany(
+                "DELETE FROM documents WHERE collection = ? AND key = ?", deletes
+            )
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        writes = list(self._pending.items())
+        self._pending.clear()
+        try:
+            self._apply(writes)
+        except BaseException:
+            # Keep anything not superseded meanwhile for the next flush
+            for target, data in writes:
+                self._pending.setdefault(target, data)
+            raise
+
+    def flush(self):
+        """Write any buffered write-behind records now."""
+        with self._lock:
+            self._flush_locked()
+
+    def pending(self) -> int:
+        """Write-behind records not yet flushed."""
+        return len(self._pending)
+
+    def close(self):
+        """Flush and close the connection."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+            self.closed = True
+            _open_stores.discard(self)
+
+
+class Collection:
+    """Documents keyed by a string id inside a ``DocumentStore``."""
+
+    def __init__(self, store: DocumentStore, name: str, indexes: Sequence[str] = ()):
+        self.store = store
+        self.name = name
+        self.indexes = tuple(indexes)
+
+    @staticmethod
+    def _encode(doc: Document) -> str:
+        return json.dumps(doc, separators=(",", ":"), default=str)
+
+    def put(self, key: str, doc: Document):
+        """Insert or replace one document."""
+        self.store._write(self.name, [(str(key), self._encode(doc))])
+
+    def put_many(self, items: Iterable[Tuple[str, Document]]):
+        """Insert or replace several documents in one transaction."""
+        self.store._write(self.name, [(str(key), self._encode(doc)) for key, doc in items])
+
+    def delete(self, key: str):
+        """Remove one document (no error if it doesn't exist)."""
+        self.store._write(self.name, [(str(key), _DELETED)])
+
+    def delete_many(self, keys: Iterable[str]):
+        """Remove several documents in one transaction."""
+        self.store._write(self.name, [(str(key), _DELETED) for key in keys])
+
+    def get(self, key: str) -> Optional[Document]:
+        """The document stored under ``key``, or None."""
+        key = str(key)
+        with self.store._lock:
+            if (self.name, key) in self.store._pending:
+                data = self.store._pending[(self.name, key)]
+                return None if data is _DELETED else json.loads(data)
+            row = self.store._conn.execute(
+                "SELECT data FROM documents WHERE collection = ? AND key = ?", (self.name, key)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def items(self) -> Iterator[Tuple[str, Document]]:
+        """Every ``(key, document)``, in key order."""
+        with self.store._lock:
+            self.store._flush_locked()
+            rows = self.store._conn.execute(
+                "SELECT key, data FROM documents WHERE collection = ? ORDER BY key", (self.name,)
+            ).fetchall()
+        for key, data in rows:
+            yield key, json.loads(data)
+
+    def find(self, field: str, value: Any) -> List[Document]:
+        """Documents whose top-level ``field`` equals ``value`` (indexed if declared)."""
+        _check_name("field", field)
+        with self.store._lock:
+            self.store._flush_locked()
+            rows = self.store._conn.execute(
+                "SELECT data FROM documents "
+                f"WHERE collection = ? AND json_extract(data, '$.{field}') = ? ORDER BY key",
+                (self.name, value),
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+    def find_keys(self, field: str, values: Sequence[Any]) -> List[str]:
+        """Keys of documents whose top-level ``field`` is one of ``values``.
+
+        Uses the field's index when declared. It is named explicitly, with
+        the collection inlined to match the partial index: without statistics
+        SQLite would scan the collection for a long ``IN`` list.
+        """
+        _check_name("field", field)
+        if field in self.indexes:
+            source = f"documents INDEXED BY idx_doc_{self.name}_{field}"
+        else:
+            source = "documents"
+        keys: List[str] = []
+        with self.store._lock:
+            self.store._flush_locked()
+            for start in range(0, len(values), 500):
+                chunk = list(values[start:start + 500])
+                keys.extend(key for (key,) in self.store._conn.execute(
+                    f"SELECT key FROM {source} WHERE collection = '{self.name}' "
+                    f"AND json_extract(data, '$.{field}') IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                ))
+        return keys
+
+    def __len__(self) -> int:
+        with self.store._lock:
+            self.store._flush_locked()
+            return self.store._conn.execute(
+                "SELECT COUNT(*) FROM documents WHERE collection = ?", (self.name,)
+            ).fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def replace_all(self, items: Iterable[Tuple[str, Document]]):
+        """Make the collection hold exactly ``items`` (one transaction)."""
+        encoded = [(str(key), self._encode(doc)) for key, doc in items]
+        keep = {key for key, _ in encoded}
+        with self.store._lock:
+            self.store.flush()
+            stale = [
+                key for (key,) in self.store._conn.execute(
+                    "SELECT key FROM documents WHERE collection = ?", (self.name,)
+                )
+                if key not in keep
+            ]
+            self.store._apply(
+                [((self.name, key), data) for key, data in encoded]
+                + [((self.name, key), _DELETED) for key in stale]
+            )
+
+    def import_legacy(
+        self,
+        path: Path,
+        records: Callable[[Any], Iterable[Tuple[str, Document]]],
+    ) -> int:
+        """One-time import from a legacy JSON file; returns documents imported.
+
+        ``records`` turns the parsed file into ``(key, document)`` pairs.
+        Runs only while the collection has never been imported into, so
+        deleting every document later doesn't bring the old file back. The
+        legacy file is left in place.
+        """
+        marker = f"imported:{self.name}"
+        path = Path(path)
+        if self.store.get_meta(marker) is not None:
+            return 0
+        count = 0
+        if path.exists():
+            try:
+                with open(path, "r") as f:
+                    items = list(records(json.load(f)))
+                self.put_many(items)
+                self.store.flush()
+                count = len(items)
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error(f"Error importing {path} into {self.name}: {e}")
+                return 0
+        self.store.set_meta(marker, str(path))
+        return count
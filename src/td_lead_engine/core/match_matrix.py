@@ -0,0 +1,193 @@
+"""Sparse leads x signals match matrix for instant re-weighting.
+
+Scoring a lead's text is the expensive part of the pipeline; applying
+weights to the signals it matched is not. The matrix records which signals
+each lead matched (CSR layout: ``indptr``/``indices`` over signal columns) so
+a new weighting or tier ladder can be evaluated across the whole database
+with one sparse matrix-vector product instead of rescoring any text.
+"""
+
+import json
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .config import ScoringConfig
+from .signals import IntentSignal
+
+TIERS = ["negative", "cold", "lukewarm", "warm", "hot"]
+
+
+def effective_weights(
+    signals: List[IntentSignal],
+    config: ScoringConfig,
+    sources: Optional[List[str]] = None
+) -> np.ndarray:
+    """Effective weight table, one row per source and one column per signal.
+
+    Uses ``ScoringConfig.effective_weight`` (including its integer
+    truncation) so the table agrees exactly with ``LeadScorer``. Without
+    ``sources`` a single row with no source multiplier is returned.
+    """
+    rows = sources if sources is not None else [None]
+    weights = np.empty((len(rows) or 1, len(signals)), dtype=np.int64)
+    for r, source in enumerate(rows or [None]):
+        for i, signal in enumerate(signals):
+            weights[r, i] = config.effective_weight(
+                signal.phrase, signal.weight, signal.category.value, source
+            )
+    return weights
+
+
+def assign_tiers(scores: np.ndarray, config: ScoringConfig) -> np.ndarray:
+    """Vectorized tier ladder; returns indexes into ``TIERS``."""
+    return np.select(
+        [
+            scores < 0,
+            scores >= config.hot_threshold,
+            scores >= config.warm_threshold,
+            scores >= config.lukewarm_threshold,
+        ],
+        [0, 4, 3, 2],
+        default=1,
+    )
+
+
+@dataclass
+class SignalMatchMatrix:
+    """Which signals each lead matched, in compressed sparse row form."""
+
+    lead_ids: np.ndarray  # int64, one per row
+    indptr: np.ndarray  # int64, len(lead_ids) + 1
+    indices: np.ndarray  # int32 signal column per match
+    source_codes: np.ndarray  # int32 index into ``sources`` per row
+    sources: List[str]
+    signal_version: str
+    built_at: str = ""  # ISO time the breakdowns were read; "" if unknown
+
+    @classmethod
+    def from_breakdowns(
+        cls,
+        rows: Iterable[Tuple[int, str, Optional[str]]],
+        signals: List[IntentSignal],
+        signal_version: str,
+        built_at: str = ""
+    ) -> "SignalMatchMatrix":
+        """Build from ``(lead_id, source, score_breakdown)`` rows.
+
+        Matched phrases are read from the stored breakdown JSON, so no lead
+        text is touched. Phrases not in ``signals`` are ignored.
+        """
+        column_of: Dict[str, int] = {}
+        for i, signal in enumerate(signals):
+            column_of.setdefault(signal.phrase.lower(), i)
+
+        source_code: Dict[str, int] = {}
+        lead_ids: List[int] = []
+        indptr: List[int] = [0]
+        indices: List[int] = []
+        source_codes: List[int] = []
+
+        for lead_id, source, breakdown in rows:
+            if breakdown:
+                for match in json.loads(breakdown).get("matches", []):
+                    column = column_of.get(match["phrase"].lower())
+                    if column is not None:
+                        indices.append(column)
+            lead_ids.append(lead_id)
+            indptr.append(len(indices))
+            source_codes.append(source_code.setdefault(source or "", len(source_code)))
+
+        return cls(
+            lead_ids=np.asarray(lead_ids, dtype=np.int64),
+            indptr=np.asarray(indptr, dtype=np.int64),
+            indices=np.asarray(indices, dtype=np.int32),
+            source_codes=np.asarray(source_codes, dtype=np.int32),
+            sources=list(source_code),
+            signal_version=signal_version,
+            built_at=built_at,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "SignalMatchMatrix":
+        """Load a matrix saved with ``save``."""
+        with np.load(path, allow_pickle=False) as data:
+            return cls(
+                lead_ids=data["lead_ids"],
+                indptr=data["indptr"],
+                indices=data["indices"],
+                source_codes=data["source_codes"],
+                sources=[str(s) for s in data["sources"]],
+                signal_version=str(data["signal_version"]),
+                built_at=str(data["built_at"]) if "built_at" in data.files else "",
+            )
+
+    def save(self, path: Path):
+        """Write the arrays to an uncompressed ``.npz`` (fast to load)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                lead_ids=self.lead_ids,
+                indptr=self.indptr,
+                indices=self.indices,
+                source_codes=self.source_codes,
+                sources=np.asarray(self.sources, dtype=str),
+                signal_version=np.asarray(self.signal_version),
+                built_at=np.asarray(self.built_at),
+            )
+        tmp_path.replace(path)
+
+    def __len__(self) -> int:
+        return len(self.lead_ids)
+
+    @property
+    def nnz(self) -> int:
+        """Number of stored (lead, signal) matches."""
+        return len(self.indices)
+
+    def scores(self, signals: List[IntentSignal], config: ScoringConfig) -> np.ndarray:
+        """Score every lead under ``config`` without touching any text."""
+        row_of_match = np.repeat(np.arange(len(self.lead_ids)), np.diff(self.indptr))
+        weights = effective_weights(signals, config, self.sources)
+        # Sparse matrix-vector product: sum each row's matched (source, signal) weights
+        totals = np.bincount(
+            row_of_match,
+            weights=weights[self.source_codes[row_of_match], self.indices],
+            minlength=len(self.lead_ids),
+        )
+        return totals.astype(np.int64)
+
+    def tier_migrations(
+        self,
+        signals: List[IntentSignal],
+        baseline: ScoringConfig,
+        candidate: ScoringConfig
+    ) -> Dict[str, object]:
+        """Compare tiers under two configs.
+
+        Returns before/after tier counts, ``(from, to)`` migration counts for
+        leads whose tier changes, and the number of leads whose score changes.
+        """
+        before_scores = self.scores(signals, baseline)
+        after_scores = self.scores(signals, candidate)
+        before = assign_tiers(before_scores, baseline)
+        after = assign_tiers(after_scores, candidate)
+
+        moved = before != after
+        pairs = Counter(zip(before[moved].tolist(), after[moved].tolist()))
+
+        return {
+            "leads": len(self),
+            "score_changed": int(np.count_nonzero(before_scores != after_scores)),
+            "tier_changed": int(np.count_nonzero(moved)),
+            "before": {TIERS[t]: int(n) for t, n in enumerate(np.bincount(before, minlength=5))},
+            "after": {TIERS[t]: int(n) for t, n in enumerate(np.bincount(after, minlength=5))},
+            "migrations": {
+                (TIERS[src], TIERS[dst]): count for (src, dst), count in sorted(pairs.items())
+            },
+        }
@@ -0,0 +1,311 @@
+"""Multi-phrase matchers used by the scoring engine.
+
+``PhraseMatcher`` finds every phrase of a fixed vocabulary in a piece of text
+with one tokenization pass instead of one regex scan per phrase. Semantics
+match ``re.compile(r'\\b' + re.escape(phrase) + r'\\b', re.IGNORECASE)``:
+case insensitive, word-boundary anchored, first occurrence of each phrase.
+
+``VariantPhraseMatcher`` adds a tolerant pass on top for the spellings real
+messages use: "pre approved", "house-hunting", "whats my home worth" and
+small typos such as "preaproved" or "lookin".
+"""
+
+import re
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
+
+_WORD_RE = re.compile(r"\w+")
+# Separators folded away when comparing variants: whitespace, hyphens/dashes, apostrophes
+_FOLDABLE_GAP_RE = re.compile(r"[\s\-\u2010\u2011\u2012\u2013'\u2018\u2019`]*")
+
+
+def fold_case(text: str) -> str:
+    """Lowercase text without changing its length (positions stay aligned)."""
+    folded = text.lower()
+    if len(folded) == len(text):
+        return folded
+    # A handful of characters expand when lowercased (e.g. "İ"); keep them as-is
+    return "".join(c.lower() if len(c.lower()) == 1 else c for c in text)
+
+
+def _is_word_char(c: str) -> bool:
+    """Match the definition of ``\\w`` used by the re module for str patterns."""
+    return c.isalnum() or c == "_"
+
+
+class PhraseMatcher:
+    """Compiled matcher over a fixed list of phrases.
+
+    Phrases are indexed by their first word token and then by length. Scoring
+    a text tokenizes it once, intersects its vocabulary with the index and, at
+    each occurrence of a candidate first token, probes one hash table per
+    distinct phrase length. Cost grows with the text and the number of hits
+    rather than with the size of the vocabulary.
+    """
+
+    def __init__(self, phrases: Sequence[str]):
+        """Compile the phrase index."""
+        self.phrases = list(phrases)
+        # first token -> phrase length -> {folded phrase: index}
+        self._by_first_token: Dict[str, Dict[int, Dict[str, int]]] = {}
+        # Phrases that start or end on punctuation keep exact regex semantics
+        self._fallback: List[Tuple[int, re.Pattern]] = []
+
+        seen = set()
+        for index, phrase in enumerate(self.phrases):
+            folded = fold_case(phrase)
+            if not folded or folded in seen:
+                continue
+            seen.add(folded)
+
+            if _is_word_char(folded[0]) and _is_word_char(folded[-1]):
+                first_token = _WORD_RE.match(folded).group()
+                by_length = self._by_first_token.setdefault(first_token, {})
+                by_length.setdefault(len(folded), {})[folded] = index
+            else:
+                pattern = re.compile(r"\b" + re.escape(phrase) + r"\b", re.IGNORECASE)
+                self._fallback.append((index, pattern))
+
+        self._first_tokens = frozenset(self._by_first_token)
+
+    def __len__(self) -> int:
+        return len(self.phrases)
+
+    def find_first_spans(self, text: str) -> List[Tuple[int, int, int]]:
+        """Like ``find_first`` but reporting ``(phrase_index, start, end)``."""
+        return [
+            (index, position, position + len(self.phrases[index]))
+            for index, position in self.find_first(text)
+        ]
+
+    def find_first(self, text: str) -> List[Tuple[int, int]]:
+        """Return ``(phrase_index, position)`` for each phrase found, in phrase order.
+
+        Only the first occurrence of each phrase is reported. When the same
+        phrase appears more than once in the vocabulary only its first index
+        is reported.
+        """
+        if not text:
+            return []
+
+        folded = fold_case(text)
+        length = len(folded)
+        found: List[Tuple[int, int]] = []
+        reported = set()
+
+        for token in self._first_tokens.intersection(_WORD_RE.findall(folded)):
+            by_length = self._by_first_token[token]
+            pending = sum(len(group) for group in by_length.values())
+            token_length = len(token)
+            pos = folded.find(token)
+            while pos != -1 and pending:
+                # Only whole-word occurrences of the first token can start a phrase
+                if pos == 0 or not _is_word_char(folded[pos - 1]):
+                    for phrase_length, group in by_length.items():
+                        end = pos + phrase_length
+                        if end > length or (end < length and _is_word_char(folded[end])):
+                            continue
+                        index = group.get(folded[pos:end])
+                        if index is not None and index not in reported:
+                            reported.add(index)
+                            found.append((index, pos))
+                            pending -= 1
+                pos = folded.find(token, pos + token_length)
+
+        for index, pattern in self._fallback:
+            match = pattern.search(text)
+            if match:
+                found.append((index, match.start()))
+
+        found.sort()
+        return found
+
+
+def _edit_budget(length: int) -> int:
+    """Edits tolerated for a token of ``length`` characters.
+
+    Short words are matched exactly: one edit turns "house" into "horse" and
+    "bonus" into "bonds".
+    """
+    if length < 6:
+        return 0
+    if length < 10:
+        return 1
+    return 2
+
+
+def _deletes(word: str, depth: int) -> Set[str]:
+    """All strings reachable from ``word`` by deleting up to ``depth`` characters."""
+    found = {word}
+    frontier = {word}
+    for _ in range(depth):
+        frontier = {w[:i] + w[i + 1:] for w in frontier for i in range(len(w))} - found
+        found |= frontier
+    return found
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """Optimal string alignment distance (adjacent transpositions count once).
+
+    Returns ``limit + 1`` as soon as the distance is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, cb in enumerate(b, 1):
+            cost = 0 if ca == cb else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                value = min(value, previous2[j - 2] + 1)
+            current[j] = value
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class VariantPhraseMatcher(PhraseMatcher):
+    """``PhraseMatcher`` plus a pass that tolerates spacing and spelling variants.
+
+    After the exact pass, phrases that were not found are looked for in a
+    folded form of the text:
+
+    * Separators made only of whitespace, hyphens and apostrophes are folded
+      away, so "pre approved", "pre-approved" and "preapproved" all compare
+      equal (as do "what's" and "whats").
+    * Tokens that are not in the phrase vocabulary are corrected to a
+      vocabulary token within a small edit budget (see ``_edit_budget``),
+      using a SymSpell-style deletion dictionary: each vocabulary token is
+      indexed under its deletions, so a lookup costs a few hash probes no
+      matter how many phrases there are. Corrections keep the first letter.
+
+    Folded phrases live in a prefix set (a flattened character trie), so
+    spans of consecutive tokens are only extended while they can still
+    complete a phrase. Phrases whose folded forms collide are reported once,
+    under their first index, and only if no member was matched exactly.
+    """
+
+    # Corrections remembered across texts (most tokens in DMs repeat)
+    CORRECTION_CACHE_SIZE = 50000
+
+    def __init__(self, phrases: Sequence[str]):
+        """Compile the exact index, folded phrase table and deletion dictionary."""
+        super().__init__(phrases)
+
+        # folded phrase -> phrase indexes sharing it (first is reported)
+        self._folded: Dict[str, List[int]] = {}
+        self._key_of: Dict[int, str] = {}
+        vocabulary: Set[str] = set()
+        for index, phrase in enumerate(self.phrases):
+            tokens = _WORD_RE.findall(fold_case(phrase))
+            if not tokens:
+                continue
+            key = "".join(tokens)
+            self._folded.setdefault(key, []).append(index)
+            self._key_of[index] = key
+            vocabulary.update(tokens)
+            if len(tokens) == 2:
+                # Lets a typo in a joined compound ("preaproved") be corrected
+                vocabulary.add(key)
+
+        self._prefixes: FrozenSet[str] = frozenset(
+            key[:i] for key in self._folded for i in range(1, len(key) + 1)
+        )
+        self._vocabulary = frozenset(vocabulary)
+
+        # deletion -> vocabulary tokens it was derived from
+        self._deletions: Dict[str, List[str]] = {}
+        for word in sorted(vocabulary):
+            budget = _edit_budget(len(word))
+            if budget:
+                for deletion in _deletes(word, budget):
+                    self._deletions.setdefault(deletion, []).append(word)
+
+        self._corrections: Dict[str, Optional[str]] = {}
+
+    def correct(self, token: str) -> Optional[str]:
+        """Closest vocabulary token within the edit budget, or None.
+
+        ``token`` must already be case folded. Vocabulary tokens map to
+        themselves.
+        """
+        if token in self._vocabulary:
+            return token
+        cached = self._corrections.get(token, False)
+        if cached is not False:
+            return cached
+
+        best: Optional[str] = None
+        if len(token) >= 5 and not token.isdigit():
+            best_distance = 3
+            seen = set()
+            for deletion in _deletes(token, _edit_budget(len(token) + 2)):
+                for word in self._deletions.get(deletion, ()):
+                    if word in seen or word[0] != token[0]:
+                        continue
+                    seen.add(word)
+                    limit = _edit_budget(len(word))
+                    distance = edit_distance(token, word, limit)
+                    if distance <= limit and (distance, word) < (best_distance, best or ""):
+                        best, best_distance = word, distance
+
+        if len(self._corrections) >= self.CORRECTION_CACHE_SIZE:
+            self._corrections.clear()
+        self._corrections[token] = best
+        return best
+
+    def _extend(self, keys: List[str], token: str) -> List[str]:
+        """Append ``token`` and its correction to each key.
+
+        Keys that can no longer complete a phrase are dropped.
+        """
+        forms = [token]
+        corrected = self.correct(token)
+        if corrected is not None and corrected != token:
+            forms.append(corrected)
+        prefixes = self._prefixes
+        return [key + form for key in keys for form in forms if key + form in prefixes]
+
+    def find_first_spans(self, text: str) -> List[Tuple[int, int, int]]:
+        """Exact matches plus variant matches, as ``(phrase_index, start, end)``.
+
+        Variant matches span from the first to the last matched token of the
+        original text.
+        """
+        found = super().find_first_spans(text)
+        if not text:
+            return found
+
+        # Folded keys already reported, exactly or as a variant
+        reported = {self._key_of[index] for index, _, _ in found if index in self._key_of}
+
+        # (token, start, end, joins previous token) for each word in the text
+        folded_text = fold_case(text)
+        tokens = []
+        previous_end = 0
+        for match in _WORD_RE.finditer(folded_text):
+            start, end = match.span()
+            gap = _FOLDABLE_GAP_RE.fullmatch(folded_text, previous_end, start)
+            joins = bool(tokens) and gap is not None
+            tokens.append((match.group(), start, end, joins))
+            previous_end = end
+
+        folded = self._folded
+        for i, (token, start, _, _) in enumerate(tokens):
+            keys = self._extend([""], token)
+            j = i
+            while keys:
+                for key in keys:
+                    indexes = folded.get(key)
+                    if indexes is not None and key not in reported:
+                        reported.add(key)
+                        found.append((indexes[0], start, tokens[j][2]))
+                j += 1
+                if j == len(tokens) or not tokens[j][3]:
+                    break
+                keys = self._extend(keys, tokens[j][0])
+
+        found.sort()
+        return found
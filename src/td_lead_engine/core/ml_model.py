@@ -0,0 +1,263 @@
+"""Conversion-probability model trained from ConversionTracker outcomes.
+
+A regularized logistic regression over the same features the rule scorer
+sees: which intent signals a lead matched, plus its source. Training uses
+Newton's method (the feature count is the signal count, so the Hessian is
+small); inference over the whole lead table is one sparse product against
+the persisted ``SignalMatchMatrix``.
+
+The artifact is a single small binary file: a JSON header (vocabulary and
+training metadata) followed by the float64 coefficient vector, which is
+memory-mapped on load.
+"""
+
+import json
+import os
+import struct
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import ConversionEvent, ScoringConfig
+from .match_matrix import SignalMatchMatrix
+from .signals import IntentSignal
+
+MODEL_MAGIC = b"TDLMODEL"
+MODEL_FORMAT_VERSION = 1
+# Coefficients start on this boundary so the memory map is aligned
+_ALIGNMENT = 64
+
+
+def default_model_path() -> Path:
+    """Where ``socialops ml train`` writes the model unless told otherwise."""
+    return Path.home() / ".td-lead-engine" / "conversion_model.bin"
+
+
+def ml_points(probabilities: np.ndarray, config: ScoringConfig) -> np.ndarray:
+    """Map conversion probabilities onto the rule-score scale.
+
+    Linear, with a 50% probability landing on the hot threshold.
+    """
+    return probabilities * (2 * config.hot_threshold)
+
+
+def blend_scores(
+    rule_scores: np.ndarray, probabilities: np.ndarray, config: ScoringConfig
+) -> np.ndarray:
+    """Blend rule scores with model probabilities per ``config.ml_weight`` (integer result)."""
+    weight = min(max(config.ml_weight, 0.0), 1.0)
+    blended = (1 - weight) * rule_scores + weight * ml_points(probabilities, config)
+    return np.trunc(blended).astype(np.int64)
+
+
+def _sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -35, 35)))
+
+
+@dataclass
+class ConversionModel:
+    """Logistic regression over signal-match and source indicators.
+
+    ``coefficients`` is ``[bias, one weight per phrase, one weight per source]``.
+    """
+
+    phrases: List[str]
+    sources: List[str]
+    coefficients: np.ndarray
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def bias(self) -> float:
+        return float(self.coefficients[0])
+
+    @property
+    def phrase_weights(self) -> np.ndarray:
+        return self.coefficients[1:1 + len(self.phrases)]
+
+    @property
+    def source_weights(self) -> np.ndarray:
+        return self.coefficients[1 + len(self.phrases):]
+
+    # === Training ===
+
+    @classmethod
+    def train(
+        cls,
+        events: Iterable[ConversionEvent],
+        signals: List[IntentSignal],
+        l2: float = 1.0,
+        max_iterations: int = 50,
+        tolerance: float = 1e-8
+    ) -> "ConversionModel":
+        """Fit on conversion outcomes (converted or not) with Newton's method.
+
+        Features are the event's ``signals_at_conversion`` phrases that exist
+        in ``signals`` and its source. ``l2`` penalizes every weight except
+        the bias. Raises ValueError unless both outcomes are present.
+        """
+        phrases: List[str] = []
+        column_of: Dict[str, int] = {}
+        for signal in signals:
+            key = signal.phrase.lower()
+            if key not in column_of:
+                column_of[key] = len(phrases)
+                phrases.append(signal.phrase)
+
+        rows: List[Tuple[List[int], str]] = []
+        labels: List[float] = []
+        source_of: Dict[str, int] = {}
+        for event in events:
+            columns = sorted({
+                column_of[p.lower()] for p in event.signals_at_conversion if p.lower() in column_of
+            })
+            source_of.setdefault(event.source or "", len(source_of))
+            rows.append((columns, event.source or ""))
+            labels.append(1.0 if event.converted else 0.0)
+
+        y = np.asarray(labels)
+        if len(y) == 0 or y.min() == y.max():
+            raise ValueError("Training needs both converted and non-converted outcomes")
+
+        sources = list(source_of)
+        width = 1 + len(phrases) + len(sources)
+        x = np.zeros((len(rows), width))
+        x[:, 0] = 1.0
+        for i, (columns, source) in enumerate(rows):
+            x[i, [1 + c for c in columns]] = 1.0
+            x[i, 1 + len(phrases) + source_of[source]] = 1.0
+
+        penalty = np.full(width, float(l2))
+        penalty[0] = 0.0
+        w = np.zeros(width)
+        iterations = 0
+        for iterations in range(1, max_iterations + 1):
+            p = _sigmoid(x @ w)
+            gradient = x.T @ (p - y) + penalty * w
+            hessian = (x.T * (p * (1 - p))) @ x + np.diag(penalty + 1e-9)
+            step = np.linalg.solve(hessian, gradient)
+            w -= step
+            if float(np.max(np.abs(step))) < tolerance:
+                break
+
+        p = np.clip(_sigmoid(x @ w), 1e-12, 1 - 1e-12)
+        metadata = {
+            "trained_at": datetime.now().isoformat(),
+            "samples": int(len(y)),
+            "positives": int(y.sum()),
+            "l2": float(l2),
+            "iterations": iterations,
+            "log_loss": float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))),
+            "auc": _auc(y, p),
+        }
+        return cls(phrases=phrases, sources=sources, coefficients=w, metadata=metadata)
+
+    # === Inference ===
+
+    def _signal_weights(self, signals: Sequence[IntentSignal]) -> np.ndarray:
+        """Model weight for each of ``signals`` (0 for phrases the model never saw)."""
+        by_phrase = {p.lower(): w for p, w in zip(self.phrases, self.phrase_weights)}
+        return np.array([by_phrase.get(s.phrase.lower(), 0.0) for s in signals] or [0.0])
+
+    def _source_weights_for(self, sources: Sequence[str]) -> np.ndarray:
+        by_source = dict(zip(self.sources, self.source_weights))
+        return np.array([by_source.get(s or "", 0.0) for s in sources] or [0.0])
+
+    def predict_matrix(
+        self, matrix: SignalMatchMatrix, signals: Sequence[IntentSignal]
+    ) -> np.ndarray:
+        """Conversion probability for every lead in ``matrix`` in one vectorized pass."""
+        row_of_match = np.repeat(np.arange(len(matrix)), np.diff(matrix.indptr))
+        logits = np.bincount(
+            row_of_match,
+            weights=self._signal_weights(signals)[matrix.indices],
+            minlength=len(matrix),
+        ).astype(np.float64)  # bincount of no matches is integer
+        logits += self.bias + self._source_weights_for(matrix.sources)[matrix.source_codes]
+        return _sigmoid(logits)
+
+    def predict(self, phrases: Iterable[str], source: Optional[str] = None) -> float:
+        """Conversion probability for one lead's matched phrases and source."""
+        by_phrase = {p.lower(): w for p, w in zip(self.phrases, self.phrase_weights)}
+        logit = self.bias + sum(by_phrase.get(p.lower(), 0.0) for p in set(phrases))
+        logit += dict(zip(self.sources, self.source_weights)).get(source or "", 0.0)
+        return float(_sigmoid(np.asarray(logit)))
+
+    # === Persistence ===
+
+    def save(self, path: Path):
+        """Write the single-file artifact (atomically)."""
+        header = json.dumps({
+            "format": MODEL_FORMAT_VERSION,
+            "phrases": self.phrases,
+            "sources": self.sources,
+            "metadata": self.metadata,
+        }).encode()
+        prefix = len(MODEL_MAGIC) + 8 + len(header)
+        padding = -prefix % _ALIGNMENT
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(MODEL_MAGIC)
+            f.write(struct.pack("<II", MODEL_FORMAT_VERSION, len(header)))
+            f.write(header)
+            f.write(b"\0" * padding)
+            f.write(np.ascontiguousarray(self.coefficients, dtype="<f8").tobytes())
+        tmp_path.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "ConversionModel":
+        """Read the header and memory-map the coefficients."""
+        with open(path, "rb") as f:
+            if f.read(len(MODEL_MAGIC)) != MODEL_MAGIC:
+                raise ValueError(f"{path} is not a conversion model file")
+            version, header_length = struct.unpack("<II", f.read(8))
+            if version != MODEL_FORMAT_VERSION:
+                raise ValueError(f"Unsupported conversion model format {version}")
+            header = json.loads(f.read(header_length))
+
+        prefix = len(MODEL_MAGIC) + 8 + header_length
+        offset = prefix + (-prefix % _ALIGNMENT)
+        width = 1 + len(header["phrases"]) + len(header["sources"])
+        coefficients = np.memmap(path, dtype="<f8", mode="r", offset=offset, shape=(width,))
+        return cls(
+            phrases=header["phrases"],
+            sources=header["sources"],
+            coefficients=coefficients,
+            metadata=header.get("metadata", {}),
+        )
+
+
+def _auc(y: np.ndarray, p: np.ndarray) -> float:
+    """Area under the ROC curve (rank statistic, ties averaged)."""
+    order = np.argsort(p, kind="mergesort")
+    ranks = np.empty(len(p))
+    sorted_p = p[order]
+    # Average ranks over ties
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_p)) + 1]
+    ends = np.r_[starts[1:], len(p)]
+    for start, end in zip(starts, ends):
+        ranks[order[start:end]] = (start + end + 1) / 2
+    positives = y.sum()
+    negatives = len(y) - positives
+    return float((ranks[y == 1].sum() - positives * (positives + 1) / 2) / (positives * negatives))
+
+
+_loaded: Dict[str, Tuple[int, ConversionModel]] = {}
+
+
+def load_conversion_model(path: Optional[Path] = None) -> Optional[ConversionModel]:
+    """Load (and cache per file version) the model at ``path``; None if missing."""
+    path = Path(path) if path else default_model_path()
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+    cached = _loaded.get(str(path))
+    if cached is None or cached[0] != mtime:
+        cached = (mtime, ConversionModel.load(path))
+        _loaded[str(path)] = cached
+    return cached[1]
@@ -0,0 +1,377 @@
+"""Pre-aggregated per-minute / hour / day event counters in SQLite.
+
+Each ingested event adds to three counters, one per granularity, keyed by
+``(event_type, source, campaign, page, property_id)``; a counter holds a count and a
+summed ``value``. A query for ``[start, end]`` is answered from whole days
+in the middle, whole hours next to them and minutes only at the two
+edges, so it reads at most a few hundred counter rows per key however
+many raw events fall in the range. Ranges resolve to whole minutes: an
+event counts when its minute lies within ``[start, end]``.
+
+Increments are buffered in memory and added to the table in one
+transaction (after ``flush_interval`` seconds, at ``max_pending`` distinct
+counters, before every query and at exit). Minute counters older than
+``minute_retention`` are pruned; edges of ranges that old resolve to whole
+hours instead.
+"""
+
+import atexit
+import logging
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+BUSY_TIMEOUT = 30.0
+FLUSH_INTERVAL = 1.0
+MAX_PENDING = 5000  # distinct counters buffered before an immediate flush
+MINUTE_RETENTION = timedelta(days=7)
+PRUNE_INTERVAL = 3600.0  # seconds between minute-counter prunes
+
+GRANULARITIES = ("minute", "hour", "day")
+DIMENSIONS = ("event_type", "source", "campaign", "page", "property_id")
+
+_STEP = {"minute": timedelta(minutes=1), "hour": timedelta(hours=1), "day": timedelta(days=1)}
+_FORMAT = {"minute": "%Y-%m-%dT%H:%M", "hour": "%Y-%m-%dT%H", "day": "%Y-%m-%d"}
+_LABEL_LENGTH = {"minute": 16, "hour": 13, "day": 10}
+
+# (granularity, bucket, event_type, source, campaign, page, property_id)
+CounterKey = Tuple[str, str, str, str, str, str, str]
+
+# Stores with unflushed increments, flushed at exit
+_open_rollups: "set[RollupStore]" = set()
+
+
+@atexit.register
+def _flush_open_rollups():
+    for store in list(_open_rollups):
+        try:
+            store.flush()
+        except Exception as e:
+            logger.error(f"Error flushing rollups {store.path}: {e}")
+
+
+def floor_time(at: datetime, granularity: str) -> datetime:
+    """Start of the ``granularity`` bucket holding ``at``."""
+    at = at.replace(second=0, microsecond=0)
+    if granularity in ("hour", "day"):
+        at = at.replace(minute=0)
+    if granularity == "day":
+        at = at.replace(hour=0)
+    return at
+
+
+def _ceil_time(at: datetime, granularity: str) -> datetime:
+    floored = floor_time(at, granularity)
+    return floored if floored == at else floored + _STEP[granularity]
+
+
+def bucket_label(at: datetime, granularity: str) -> str:
+    return at.strftime(_FORMAT[granularity])
+
+
+def cover(
+    start: datetime,
+    end: datetime,
+    coarsest: str = "day",
+    horizon: Optional[datetime] = None,
+) -> List[Tuple[str, datetime, datetime]]:
+    """Split ``[start, end]`` (to the minute) into half-open bucket ranges.
+
+    Each range is ``(granularity, lo, hi)``, using buckets no coarser than
+    ``coarsest``. Minute ranges before ``horizon`` (which must be
+    hour-aligned) are widened to whole hours.
+    """
+    lo = floor_time(start, "minute")
+    hi = floor_time(end, "minute") + _STEP["minute"]
+    if horizon is not None:
+        if lo < horizon:
+            lo = floor_time(lo, "hour")
+        if hi <= horizon:
+            hi = _ceil_time(hi, "hour")
+    if lo >= hi:
+        return []
+    if coarsest == "minute":
+        return [("minute", lo, hi)]
+
+    hour_lo, hour_hi = _ceil_time(lo, "hour"), floor_time(hi, "hour")
+    if hour_lo >= hour_hi:
+        return [("minute", lo, hi)]
+    pieces = [("minute", lo, hour_lo), ("minute", hour_hi, hi)]
+    day_lo, day_hi = _ceil_time(hour_lo, "day"), floor_time(hour_hi, "day")
+    if coarsest == "hour" or day_lo >= day_hi:
+        pieces.append(("hour", hour_lo, hour_hi))
+    else:
+        pieces += [("hour", hour_lo, day_lo), ("hour", day_hi, hour_hi), ("day", day_lo, day_hi)]
+    return [p for p in pieces if p[1] < p[2]]
+
+
+class RollupStore:
+    """Incrementally maintained event counters at minute, hour and day granularity."""
+
+    def __init__(
+        self,
+        path: Path,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_pending: int = MAX_PENDING,
+        minute_retention: timedelta = MINUTE_RETENTION,
+    ):
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.minute_retention = minute_retention
+        self._lock = threading.RLock()
+        self._pending: Dict[CounterKey, List] = {}
+        self._timer: Optional[threading.Timer] = None
+        self._last_prune = 0.0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, timeout=BUSY_TIMEOUT, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute("PRAGMA synchronous = NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rollup_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(rollups)")}
+        if columns and "property_id" not in columns:
+            # Counters from before the property dimension; the owner rebuilds them
+            self._conn.execute("DROP TABLE rollups")
+            self._conn.execute("DELETE FROM rollup_meta WHERE key = 'built_at'")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS rollups (
+                granularity TEXT NOT NULL,
+                bucket TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                source TEXT NOT NULL DEFAULT '',
+                campaign TEXT NOT NULL DEFAULT '',
+                page TEXT NOT NULL DEFAULT '',
+                property_id TEXT NOT NULL DEFAULT '',
+                count INTEGER NOT NULL DEFAULT 0,
+                value REAL NOT NULL DEFAULT 0,
+                PRIMARY KEY (granularity, bucket, event_type, source, campaign, page, property_id)
+            ) WITHOUT ROWID
+        """)
+        _open_rollups.add(self)
+
+    # === META ===
+
+    @property
+    def built(self) -> bool:
+        """Whether the counters have been built (or rebuilt) from the raw events."""
+        row = self._conn.execute("SELECT 1 FROM rollup_meta WHERE key = 'built_at'").fetchone()
+        return row is not None
+
+    def _mark_built(self):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO rollup_meta (key, value) VALUES ('built_at', ?)",
+            (datetime.now().isoformat(),),
+        )
+
+    # === WRITES ===
+
+    def add(
+        self,
+        at: datetime,
+        event_type: str,
+        source: str = "",
+        campaign: str = "",
+        page: str = "",
+        property_id: str = "",
+        count: int = 1,
+        value: float = 0.0,
+    ):
+        """Add ``count`` (and ``value``) at ``at`` to the minute, hour and day counters."""
+        dims = (event_type, source or "", campaign or "", page or "", property_id or "")
+        with self._lock:
+            for granularity in GRANULARITIES:
+                key = (granularity, bucket_label(at, granularity)) + dims
+                totals = self._pending.get(key)
+                if totals is None:
+                    self._pending[key] = [count, value]
+                else:
+                    totals[0] += count
+                    totals[1] += value
+            if len(self._pending) >= self.max_pending:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_interval, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            rows = [key + (count, value) for key, (count, value) in self._pending.items()]
+            self._pending.clear()
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO rollups (granularity, bucket, event_type, source, campaign, page, "
+                    "property_id, count, value) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT "
+                    "(granularity, bucket, event_type, source, campaign, page, property_id) "
+                    "DO UPDATE SET count = count + excluded.count, value = value + excluded.value",
+                    rows,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        if time.monotonic() - self._last_prune >= PRUNE_INTERVAL:
+            self._prune_locked()
+
+    def flush(self):
+        """Add buffered increments to the table now."""
+        with self._lock:
+            self._flush_locked()
+
+    def _horizon(self) -> datetime:
+        return floor_time(datetime.now() - self.minute_retention, "hour")
+
+    def _prune_locked(self):
+        self._last_prune = time.monotonic()
+        self._conn.execute(
+            "DELETE FROM rollups WHERE granularity = 'minute' AND bucket < ?",
+            (bucket_label(self._horizon(), "minute"),),
+        )
+
+    def rebuild(self, events: Iterable[Tuple[datetime, Mapping[str, Any]]]):
+        """Replace every counter with ones built from ``(at, add() keyword arguments)`` pairs."""
+        with self._lock:
+            self._pending.clear()
+            self._conn.execute("DELETE FROM rollups")
+            for at, fields in events:
+                self.add(at, **fields)
+            self._flush_locked()
+            self._prune_locked()
+            self._mark_built()
+
+    def close(self):
+        """Flush and close the connection."""
+        with self._lock:
+            self._flush_locked()
+            self._conn.close()
+            _open_rollups.discard(self)
+
+    # === READS ===
+
+    def _range_query(
+        self,
+        select: str,
+        start: datetime,
+        end: datetime,
+        where: Optional[Mapping[str, str]],
+        group_by: str,
+        coarsest: str = "day",
+    ) -> List[tuple]:
+        pieces = cover(start, end, coarsest, self._horizon())
+        if not pieces:
+            return []
+        ranges = " OR ".join(["(granularity = ? AND bucket >= ? AND bucket < ?)"] * len(pieces))
+        params: List[Any] = []
+        for granularity, lo, hi in pieces:
+            params += [granularity, bucket_label(lo, granularity), bucket_label(hi, granularity)]
+        filters = ""
+        for dim, value in (where or {}).items():
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown rollup dimension {dim!r}")
+            filters += f" AND {dim} = ?"
+            params.append(value)
+        sql = f"SELECT {select} FROM rollups WHERE ({ranges}){filters}"
+        if group_by:
+            sql += f" GROUP BY {group_by}"
+        with self._lock:
+            self._flush_locked()
+            return self._conn.execute(sql, params).fetchall()
+
+    def counts(
+        self,
+        start: datetime,
+        end: datetime,
+        by: Sequence[str] = ("event_type",),
+        where: Optional[Mapping[str, str]] = None,
+        values: bool = False,
+    ) -> Dict[Any, Any]:
+        """Counts in ``[start, end]`` grouped by the ``by`` dimensions.
+
+        Keys are the dimension value (one dimension) or a tuple of them;
+        with ``values`` each entry is ``(count, value)``. Groups that sum
+        to zero are left out.
+        """
+        for dim in by:
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown rollup dimension {dim!r}")
+        columns = ", ".join(by)
+        select = f"{columns + ', ' if columns else ''}SUM(count), SUM(value)"
+        result = {}
+        for row in self._range_query(select, start, end, where, columns):
+            count, value = row[-2], row[-1]
+            if count is None or (not count and not value):
+                continue
+            key = row[0] if len(by) == 1 else tuple(row[:-2])
+            result[key] = (count, value) if values else count
+        return result
+
+    def total(
+        self, start: datetime, end: datetime, where: Optional[Mapping[str, str]] = None
+    ) -> int:
+        """Total count in ``[start, end]`` matching ``where``."""
+        return self.counts(start, end, by=(), where=where).get((), 0)
+
+    def series(
+        self,
+        start: datetime,
+        end: datetime,
+        granularity: str = "day",
+        where: Optional[Mapping[str, str]] = None,
+    ) -> Dict[str, int]:
+        """Counts per ``granularity`` bucket label in ``[start, end]``, oldest first.
+
+        Empty buckets are omitted.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity!r}")
+        length = _LABEL_LENGTH[granularity]
+        result: Dict[str, int] = {}
+        rows = self._range_query("bucket, SUM(count)", start, end, where, "granularity, bucket",
+                                 coarsest=granularity)
+        for bucket, count in rows:
+            label = bucket[:length]
+            result[label] = result.get(label, 0) + count
+        return {label: count for label, count in sorted(result.items()) if count}
+
+    def active_range(
+        self, granularity: str = "hour", where: Optional[Mapping[str, str]] = None
+    ) -> Optional[Tuple[datetime, datetime]]:
+        """Starts of the first and last non-empty ``granularity`` buckets matching ``where``.
+
+        None if nothing matches. Reads every counter of that granularity
+        (no dimension is indexed), which is far fewer rows than raw events.
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity {granularity!r}")
+        sql = "SELECT MIN(bucket), MAX(bucket) FROM rollups WHERE granularity = ? AND count > 0"
+        params: List[Any] = [granularity]
+        for dim, value in (where or {}).items():
+            if dim not in DIMENSIONS:
+                raise ValueError(f"Unknown rollup dimension {dim!r}")
+            sql += f" AND {dim} = ?"
+            params.append(value)
+        with self._lock:
+            self._flush_locked()
+            first, last = self._conn.execute(sql, params).fetchone()
+        if first is None:
+            return None
+        return (datetime.strptime(first, _FORMAT[granularity]),
+                datetime.strptime(last, _FORMAT[granularity]))
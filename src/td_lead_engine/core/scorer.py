@@ -1,10 +1,27 @@
 """Lead scoring engine - analyzes text for buying/selling intent."""
 
-import re
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from .config import ScoringConfig, ScoringConfigManager, tier_for_score
+from .matcher import PhraseMatcher, VariantPhraseMatcher
 from .signals import IntentSignal, SignalCategory, INTENT_SIGNALS
 
+# Bump when matching semantics change so stored scores are invalidated
+SCORER_ALGORITHM_VERSION = 1
+
+# Seconds between checks of scoring_config.json for changes
+CONFIG_RELOAD_INTERVAL = 1.0
+
+# Entries kept by the process-wide scorer's result cache
+SHARED_CACHE_SIZE = 50000
+
 
 @dataclass
 class SignalMatch:
@@ -13,6 +30,11 @@ class SignalMatch:
     signal: IntentSignal
     matched_text: str
     position: int
+    weight: Optional[int] = None  # Effective weight (config applied); defaults to signal.weight
+
+    def __post_init__(self):
+        if self.weight is None:
+            self.weight = self.signal.weight
 
 
 @dataclass
@@ -24,20 +46,12 @@ class ScoringResult:
     category_scores: Dict[SignalCategory, int] = field(default_factory=dict)
     tier: str = "cold"
     is_negative: bool = False
+    config: Optional[ScoringConfig] = field(default=None, repr=False, compare=False)
 
     def __post_init__(self):
-        """Calculate tier based on total score."""
-        if self.total_score < 0:
-            self.tier = "negative"
-            self.is_negative = True
-        elif self.total_score >= 150:
-            self.tier = "hot"
-        elif self.total_score >= 75:
-            self.tier = "warm"
-        elif self.total_score >= 25:
-            self.tier = "lukewarm"
-        else:
-            self.tier = "cold"
+        """Calculate tier based on total score and the config's thresholds."""
+        self.tier = tier_for_score(self.total_score, self.config)
+        self.is_negative = self.total_score < 0
 
     @property
     def primary_category(self) -> Optional[SignalCategory]:
@@ -54,60 +68,220 @@ class ScoringResult:
             return "No intent signals detected"
 
         parts = []
-        for match in sorted(self.matches, key=lambda m: m.signal.weight, reverse=True)[:3]:
-            parts.append(f'"{match.signal.phrase}" (+{match.signal.weight})')
+        for match in sorted(self.matches, key=lambda m: m.weight, reverse=True)[:3]:
+            parts.append(f'"{match.signal.phrase}" (+{match.weight})')
 
         return ", ".join(parts)
 
 
+class ScoreCache:
+    """Thread-safe LRU cache of scoring results.
+
+    Keys are ``(text digest, scorer version, source)``: the text is hashed so
+    memory stays bounded by ``max_entries`` rather than by text size, and the
+    scorer version (signals, matching mode and config) means a config reload
+    or signal change never serves a stale result. Cached ``ScoringResult``
+    objects are shared between callers and must be treated as read-only.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        """Create an empty cache holding at most ``max_entries`` results."""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Tuple[bytes, str, Optional[str]], ScoringResult]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key(text: str, version: str, source: Optional[str] = None) -> Tuple[bytes, str, Optional[str]]:
+        """Cache key for a text scored by a scorer version for a source."""
+        return hashlib.blake2b(text.encode(), digest_size=16).digest(), version, source
+
+    def get(self, key: Tuple[bytes, str, Optional[str]]) -> Optional["ScoringResult"]:
+        """Return the cached result for ``key`` (marking it recently used), or None."""
+        with self._lock:
+            result = self._entries.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return result
+
+    def put(self, key: Tuple[bytes, str, Optional[str]], result: "ScoringResult"):
+        """Store a result, evicting the least recently used entries past the bound."""
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
 class LeadScorer:
-    """Scores leads based on intent signals in their text/notes."""
+    """Scores leads based on intent signals in their text/notes.
+
+    Weights come from a ``ScoringConfig``: phrase overrides, category and
+    source multipliers are folded into a per-source effective-weight table
+    when the config is loaded, so applying them costs one list lookup per
+    match. Without an explicit ``config`` the scorer reads
+    ``scoring_config.json`` and reloads it when the file's mtime changes; the
+    phrase matcher is recompiled on reload only if the matching mode changed.
+
+    Phrases match exactly unless the config sets ``fuzzy_matching``; then
+    the matcher also accepts spacing, hyphen and apostrophe variants of each
+    phrase and small typos in longer words (see ``VariantPhraseMatcher``).
+
+    Pass a ``ScoreCache`` to memoize results for repeated texts; the
+    process-wide scorer from ``get_shared_scorer`` has one.
+    """
 
-    def __init__(self, signals: Optional[List[IntentSignal]] = None):
-        """Initialize with optional custom signals list."""
+    def __init__(
+        self,
+        signals: Optional[List[IntentSignal]] = None,
+        config: Optional[ScoringConfig] = None,
+        config_path: Optional[Path] = None,
+        cache: Optional[ScoreCache] = None
+    ):
+        """Initialize with optional custom signals list and scoring config."""
         self.signals = signals or INTENT_SIGNALS
-        # Pre-compile regex patterns for efficiency
-        self._patterns: List[Tuple[re.Pattern, IntentSignal]] = []
-        for signal in self.signals:
-            # Create case-insensitive pattern with word boundaries
-            pattern = re.compile(
-                r'\b' + re.escape(signal.phrase) + r'\b',
-                re.IGNORECASE
-            )
-            self._patterns.append((pattern, signal))
-
-    def score_text(self, text: str) -> ScoringResult:
-        """Score a single piece of text for intent signals."""
+        self.cache = cache
+        self.fuzzy: Optional[bool] = None
+
+        self._config_manager: Optional[ScoringConfigManager] = None
+        self._config_mtime: Optional[float] = None
+        self._next_reload_check = 0.0
+        if config is None:
+            self._config_manager = ScoringConfigManager(config_path)
+            self._config_mtime = self._read_config_mtime()
+            config = self._config_manager.config
+        self._apply_config(config)
+
+    def _apply_config(self, config: ScoringConfig):
+        """Precompute effective weights per (source, signal) for a config."""
+        self.config = config
+        if config.fuzzy_matching != self.fuzzy:
+            self.fuzzy = config.fuzzy_matching
+            # One compiled matcher finds every signal in a single pass over the text
+            matcher_class = VariantPhraseMatcher if self.fuzzy else PhraseMatcher
+            self._matcher = matcher_class([signal.phrase for signal in self.signals])
+        self._default_weights = [
+            config.effective_weight(s.phrase, s.weight, s.category.value) for s in self.signals
+        ]
+        self._source_weights: Dict[str, List[int]] = {
+            source: [
+                config.effective_weight(s.phrase, s.weight, s.category.value, source)
+                for s in self.signals
+            ]
+            for source in config.source_multipliers
+        }
+        self.version = scoring_version(self.signals, config)
+
+    def _read_config_mtime(self) -> Optional[float]:
+        try:
+            return os.stat(self._config_manager.config_path).st_mtime
+        except OSError:
+            return None
+
+    def _maybe_reload_config(self):
+        """Reload scoring_config.json if it changed (checked at most once per interval)."""
+        if self._config_manager is None:
+            return
+        now = time.monotonic()
+        if now < self._next_reload_check:
+            return
+        self._next_reload_check = now + CONFIG_RELOAD_INTERVAL
+
+        mtime = self._read_config_mtime()
+        if mtime != self._config_mtime:
+            self._config_mtime = mtime
+            self._apply_config(self._config_manager.reload())
+
+    def current_config(self) -> ScoringConfig:
+        """The config in effect, reloading scoring_config.json if it changed."""
+        self._maybe_reload_config()
+        return self.config
+
+    def tier_for(self, score: int) -> str:
+        """Tier for a score under this scorer's current thresholds."""
+        self._maybe_reload_config()
+        return tier_for_score(score, self.config)
+
+    def score_text(self, text: str, source: Optional[str] = None) -> ScoringResult:
+        """Score a single piece of text for intent signals.
+
+        ``source`` selects the source multiplier (e.g. "zillow"); unknown or
+        missing sources use a multiplier of 1.0.
+        """
+        self._maybe_reload_config()
         if not text:
-            return ScoringResult(total_score=0)
+            return ScoringResult(total_score=0, config=self.config)
 
+        # Sources without their own multiplier share cache entries
+        if source not in self._source_weights:
+            source = None
+
+        if self.cache is None:
+            return self._score_text(text, source)
+
+        key = ScoreCache.key(text, self.version, source)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._score_text(text, source)
+            self.cache.put(key, result)
+        return result
+
+    def _score_text(self, text: str, source: Optional[str]) -> ScoringResult:
+        """Match and weigh ``text`` (no cache)."""
+        weights = self._source_weights.get(source, self._default_weights)
+
+        # Matcher reports the first occurrence of each distinct phrase
         matches: List[SignalMatch] = []
-        seen_phrases: set = set()  # Dedupe same phrase matches
-
-        for pattern, signal in self._patterns:
-            for match in pattern.finditer(text):
-                phrase_lower = signal.phrase.lower()
-                if phrase_lower not in seen_phrases:
-                    seen_phrases.add(phrase_lower)
-                    matches.append(SignalMatch(
-                        signal=signal,
-                        matched_text=match.group(),
-                        position=match.start()
-                    ))
+        for index, start, end in self._matcher.find_first_spans(text):
+            matches.append(SignalMatch(
+                signal=self.signals[index],
+                matched_text=text[start:end],
+                position=start,
+                weight=weights[index]
+            ))
 
         # Calculate scores
-        total_score = sum(m.signal.weight for m in matches)
+        total_score = sum(m.weight for m in matches)
 
         # Calculate category scores
         category_scores: Dict[SignalCategory, int] = {}
         for match in matches:
             cat = match.signal.category
-            category_scores[cat] = category_scores.get(cat, 0) + match.signal.weight
+            category_scores[cat] = category_scores.get(cat, 0) + match.weight
 
         result = ScoringResult(
             total_score=total_score,
             matches=matches,
-            category_scores=category_scores
+            category_scores=category_scores,
+            config=self.config
         )
 
         return result
@@ -117,18 +291,31 @@ class LeadScorer:
         notes: str = "",
         bio: str = "",
         messages: Optional[List[str]] = None,
-        comments: Optional[List[str]] = None
+        comments: Optional[List[str]] = None,
+        source: Optional[str] = None
     ) -> ScoringResult:
         """Score a lead from multiple text sources."""
-        all_text_parts = [notes, bio]
+        return self.score_text(combine_lead_text(notes, bio, messages, comments), source)
 
-        if messages:
-            all_text_parts.extend(messages)
-        if comments:
-            all_text_parts.extend(comments)
+    def score_many(
+        self,
+        texts: Iterable[str],
+        sources: Optional[Iterable[Optional[str]]] = None
+    ) -> Iterator[ScoringResult]:
+        """Score a stream of texts, yielding one result per text in order.
 
-        combined_text = " ".join(filter(None, all_text_parts))
-        return self.score_text(combined_text)
+        Use ``combine_lead_text`` to build the text for a lead; ``sources``
+        optionally runs parallel to ``texts``. This is the batch entry point
+        used by bulk rescoring; results are produced lazily so callers can
+        stream arbitrarily large inputs.
+        """
+        score_text = self.score_text
+        if sources is None:
+            for text in texts:
+                yield score_text(text)
+        else:
+            for text, source in zip(texts, sources):
+                yield score_text(text, source)
 
     def explain_score(self, result: ScoringResult) -> str:
         """Get a detailed explanation of a scoring result."""
@@ -141,10 +328,10 @@ class LeadScorer:
         if not result.matches:
             lines.append("  (none)")
         else:
-            for match in sorted(result.matches, key=lambda m: m.signal.weight, reverse=True):
-                sign = "+" if match.signal.weight > 0 else ""
+            for match in sorted(result.matches, key=lambda m: m.weight, reverse=True):
+                sign = "+" if match.weight > 0 else ""
                 lines.append(
-                    f"  {sign}{match.signal.weight}: \"{match.signal.phrase}\" "
+                    f"  {sign}{match.weight}: \"{match.signal.phrase}\" "
                     f"[{match.signal.category.value}]"
                 )
 
@@ -161,7 +348,59 @@ class LeadScorer:
         return "\n".join(lines)
 
 
+def scoring_version(signals: List[IntentSignal], config: ScoringConfig) -> str:
+    """Hash of the signal set, matching mode and weighting config; stored with each score to detect stale results."""
+    digest = hashlib.blake2b(digest_size=8)
+    mode = "fuzzy" if config.fuzzy_matching else "exact"
+    digest.update(f"{SCORER_ALGORITHM_VERSION}:{mode}".encode())
+    for signal in signals:
+        digest.update(f"\x1e{signal.phrase}\x1f{signal.weight}\x1f{signal.category.value}".encode())
+    digest.update(json.dumps([
+        config.hot_threshold,
+        config.warm_threshold,
+        config.lukewarm_threshold,
+        config.category_multipliers,
+        config.source_multipliers,
+        config.signal_weight_overrides,
+    ], sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def combine_lead_text(
+    notes: Optional[str] = "",
+    bio: Optional[str] = "",
+    messages: Optional[List[str]] = None,
+    comments: Optional[List[str]] = None
+) -> str:
+    """Join a lead's text sources into the single string that gets scored."""
+    all_text_parts = [notes, bio]
+
+    if messages:
+        all_text_parts.extend(messages)
+    if comments:
+        all_text_parts.extend(comments)
+
+    return " ".join(filter(None, all_text_parts))
+
+
+_shared_scorer: Optional[LeadScorer] = None
+_shared_scorer_lock = threading.Lock()
+
+
+def get_shared_scorer() -> LeadScorer:
+    """Process-wide scorer with a result cache, compiled on first use.
+
+    It follows ``scoring_config.json`` like any scorer built without an
+    explicit config, so one instance can serve the whole process.
+    """
+    global _shared_scorer
+    if _shared_scorer is None:
+        with _shared_scorer_lock:
+            if _shared_scorer is None:
+                _shared_scorer = LeadScorer(cache=ScoreCache(SHARED_CACHE_SIZE))
+    return _shared_scorer
+
+
 def quick_score(text: str) -> int:
     """Quick helper to score text and return just the score."""
-    scorer = LeadScorer()
-    return scorer.score_text(text).total_score
+    return get_shared_scorer().score_text(text).total_score
@@ -0,0 +1,310 @@
+"""Segmented, time-indexed JSON-lines log.
+
+Records are appended to the active segment file in a directory of
+``segment-<seq>.jsonl`` files; recording one is a single buffered write
+whatever the history size. The active segment is sealed and a new one
+started once it passes ``segment_bytes`` or spans ``segment_seconds``.
+Sealing writes the segment's first/last timestamp and record count to
+``segments.json``, so a range query opens only the segments overlapping
+the range (segments that were never sealed, e.g. after a crash, are
+scanned once on open).
+
+``fsync`` chooses durability per append: ``"always"`` fsyncs every
+record, ``"interval"`` at most every ``fsync_interval`` seconds (and on
+rotation and close), ``"never"`` leaves it to the OS. Every append is
+flushed to the OS either way, so other readers see it immediately.
+"""
+
+import heapq
+import json
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_BYTES = 16 * 1024 * 1024
+SEGMENT_SECONDS = 24 * 3600
+FSYNC_POLICIES = ("always", "interval", "never")
+FSYNC_INTERVAL = 1.0
+INDEX_NAME = "segments.json"
+
+_SEGMENT_RE = re.compile(r"^segment-(\d+)\.jsonl$")
+
+Record = Dict[str, Any]
+
+
+@dataclass
+class Segment:
+    """One segment file and the time range of its records."""
+    path: Path
+    seq: int
+    first: Optional[datetime] = None
+    last: Optional[datetime] = None
+    count: int = 0
+    size: int = 0
+    sealed: bool = False
+
+    def overlaps(self, start: Optional[datetime], end: Optional[datetime]) -> bool:
+        if self.first is None:
+            return False
+        return (end is None or self.first <= end) and (start is None or self.last >= start)
+
+    def include(self, at: datetime):
+        self.first = at if self.first is None else min(self.first, at)
+        self.last = at if self.last is None else max(self.last, at)
+        self.count += 1
+
+
+class SegmentedLog:
+    """Append-only JSON-lines records spread over time-ordered segment files."""
+
+    def __init__(
+        self,
+        directory: Path,
+        time_field: str = "timestamp",
+        segment_bytes: int = SEGMENT_BYTES,
+        segment_seconds: float = SEGMENT_SECONDS,
+        fsync: str = "interval",
+        fsync_interval: float = FSYNC_INTERVAL,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"fsync must be one of {FSYNC_POLICIES}, not {fsync!r}")
+        self.directory = Path(directory)
+        self.time_field = time_field
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self._lock = threading.RLock()
+        self._file = None
+        self._last_sync = time.monotonic()
+        self._dirty = False
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._segments: List[Segment] = self._open_segments()
+
+    # === SEGMENTS ===
+
+    def _open_segments(self) -> List[Segment]:
+        index = {}
+        index_path = self.directory / INDEX_NAME
+        if index_path.exists():
+            try:
+                index = json.loads(index_path.read_text())
+            except ValueError:
+                logger.warning(f"Rebuilding unreadable segment index {index_path}")
+
+        segments = []
+        for path in self.directory.iterdir():
+            match = _SEGMENT_RE.match(path.name)
+            if not match:
+                continue
+            segment = Segment(path=path, seq=int(match.group(1)), size=path.stat().st_size)
+            stats = index.get(path.name)
+            if stats and stats.get("size") == segment.size:
+                segment.first = datetime.fromisoformat(stats["first"]) if stats["first"] else None
+                segment.last = datetime.fromisoformat(stats["last"]) if stats["last"] else None
+                segment.count = stats["count"]
+                segment.sealed = True
+            else:
+                for record in self._read(segment):
+                    segment.include(self._time(record))
+            segments.append(segment)
+        segments.sort(key=lambda s: s.seq)
+
+        # Every segment but the newest is finished; make sure the index says so
+        if any(not s.sealed for s in segments[:-1]):
+            for segment in segments[:-1]:
+                segment.sealed = True
+            self._write_index(segments)
+        return segments
+
+    def _write_index(self, segments: List[Segment]):
+        index = {
+            s.path.name: {
+                "first": s.first.isoformat() if s.first else None,
+                "last": s.last.isoformat() if s.last else None,
+                "count": s.count,
+                "size": s.size,
+            }
+            for s in segments if s.sealed
+        }
+        tmp_path = self.directory / f".{INDEX_NAME}.tmp"
+        tmp_path.write_text(json.dumps(index, indent=2))
+        os.replace(tmp_path, self.directory / INDEX_NAME)
+
+    def segments(self) -> List[Segment]:
+        """All segments, oldest first."""
+        with self._lock:
+            return list(self._segments)
+
+    def __len__(self) -> int:
+        return sum(s.count for s in self._segments)
+
+    def _time(self, record: Record) -> datetime:
+        return datetime.fromisoformat(record[self.time_field])
+
+    # === WRITES ===
+
+    def _active(self, at: datetime) -> Segment:
+        active = self._segments[-1] if self._segments else None
+        if active is not None and active.sealed:
+            active = None
+        elif active is not None and active.first is not None and (
+            active.size >= self.segment_bytes
+            or (at - active.first).total_seconds() >= self.segment_seconds
+        ):
+            self._seal(active)
+            active = None
+        if active is None:
+            seq = self._segments[-1].seq + 1 if self._segments else 1
+            active = Segment(path=self.directory / f"segment-{seq:08d}.jsonl", seq=seq)
+            self._segments.append(active)
+        if self._file is None:
+            self._file = open(active.path, "a", encoding="utf-8")
+            # A crash mid-write can leave a torn last line; never glue onto it
+            if self._file.tell() and self._last_byte(active.path) != b"\n":
+                self._file.write("\n")
+        return active
+
+    @staticmethod
+    def _last_byte(path: Path) -> bytes:
+        with open(path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1)
+
+    def _seal(self, segment: Segment):
+        self._close_file(sync=True)
+        segment.size = segment.path.stat().st_size
+        segment.sealed = True
+        self._write_index(self._segments)
+
+    def rotate(self):
+        """Seal the active segment now; the next append starts a new one."""
+        with self._lock:
+            if self._segments and self._segments[-1].count:
+                self._seal(self._segments[-1])
+
+    def append(self, record: Record, at: Optional[datetime] = None):
+        """Append one record; ``at`` is its timestamp (parsed from the record if omitted)."""
+        at = at or self._time(record)
+        line = json.dumps(record, separators=(",", ":"), default=str) + "\n"
+        with self._lock:
+            segment = self._active(at)
+            self._file.write(line)
+            self._file.flush()
+            segment.size += len(line)  # json.dumps escapes non-ASCII, so chars == bytes
+            segment.include(at)
+            self._dirty = True
+            if self.fsync == "always" or (
+                self.fsync == "interval"
+                and time.monotonic() - self._last_sync >= self.fsync_interval
+            ):
+                self._sync_locked()
+
+    def _sync_locked(self):
+        if self._file is not None and self._dirty:
+            os.fsync(self._file.fileno())
+            self._dirty = False
+        self._last_sync = time.monotonic()
+
+    def sync(self):
+        """fsync anything appended since the last sync."""
+        with self._lock:
+            self._sync_locked()
+
+    def _close_file(self, sync: bool):
+        if self._file is not None:
+            if sync and self.fsync != "never":
+                self._sync_locked()
+            self._file.close()
+            self._file = None
+
+    def close(self):
+        """Sync and close the active segment (appending reopens it)."""
+        with self._lock:
+            self._close_file(sync=True)
+
+    # === READS ===
+
+    def _read(self, segment: Segment) -> Iterator[Record]:
+        try:
+            f = open(segment.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping unreadable line {number} of {segment.path}")
+
+    def scan(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        reverse: bool = False,
+    ) -> Iterator[Record]:
+        """Records with ``start <= timestamp <= end``, in append order (or reversed).
+
+        Only segments whose time range overlaps ``[start, end]`` are read.
+        """
+        segments = [s for s in self.segments() if s.overlaps(start, end)]
+        if reverse:
+            segments.reverse()
+        for segment in segments:
+            inside = ((start is None or segment.first >= start)
+                      and (end is None or segment.last <= end))
+            records = self._read(segment)
+            if reverse:
+                records = reversed(list(records))
+            for record in records:
+                if inside:
+                    yield record
+                    continue
+                at = self._time(record)
+                if (start is None or at >= start) and (end is None or at <= end):
+                    yield record
+
+    def newest(
+        self,
+        limit: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        where: Optional[Callable[[Record], bool]] = None,
+    ) -> List[Record]:
+        """The ``limit`` newest records in ``[start, end]`` matching ``where``, newest first.
+
+        Segments are read newest first and reading stops once no older
+        segment can hold a record newer than the current ``limit``-th.
+        """
+        if limit <= 0:
+            return []
+        heap: List = []  # (timestamp, tiebreak, record), oldest kept on top
+        tiebreak = 0
+        segments = [s for s in self.segments() if s.overlaps(start, end)]
+        for segment in reversed(segments):
+            if len(heap) >= limit and segment.last < heap[0][0]:
+                break
+            for record in self._read(segment):
+                at = self._time(record)
+                if (start is not None and at < start) or (end is not None and at > end):
+                    continue
+                if where is not None and not where(record):
+                    continue
+                tiebreak += 1
+                item = (at, tiebreak, record)
+                if len(heap) < limit:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return [record for _, _, record in sorted(heap, reverse=True)]
@@ -1,6 +1,5 @@
 """Document management for real estate transactions."""
 
-import json
 import logging
 import hashlib
 import shutil
@@ -11,6 +10,8 @@ from pathlib import Path
 from enum import Enum
 import uuid
 
+from ..core.doc_store import keyed, open_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,6 +114,48 @@ class Document:
     tags: List[str] = field(default_factory=list)
 
 
+def _document_record(d: Document) -> Dict[str, Any]:
+    return {
+        "id": d.id,
+        "transaction_id": d.transaction_id,
+        "doc_type": d.doc_type.value,
+        "name": d.name,
+        "file_path": d.file_path,
+        "status": d.status.value,
+        "file_size": d.file_size,
+        "file_hash": d.file_hash,
+        "uploaded_by": d.uploaded_by,
+        "required_signers": d.required_signers,
+        "signed_by": d.signed_by,
+        "current_version": d.current_version,
+        "uploaded_at": d.uploaded_at.isoformat(),
+        "due_date": d.due_date.isoformat() if d.due_date else None,
+        "description": d.description,
+        "tags": d.tags
+    }
+
+
+def _document_from_record(d: Dict[str, Any]) -> Document:
+    return Document(
+        id=d["id"],
+        transaction_id=d["transaction_id"],
+        doc_type=DocumentType(d["doc_type"]),
+        name=d["name"],
+        file_path=d["file_path"],
+        status=DocumentStatus(d.get("status", "draft")),
+        file_size=d.get("file_size", 0),
+        file_hash=d.get("file_hash", ""),
+        uploaded_by=d.get("uploaded_by", ""),
+        required_signers=d.get("required_signers", []),
+        signed_by=d.get("signed_by", []),
+        current_version=d.get("current_version", 1),
+        uploaded_at=datetime.fromisoformat(d["uploaded_at"]),
+        due_date=datetime.fromisoformat(d["due_date"]) if d.get("due_date") else None,
+        description=d.get("description", ""),
+        tags=d.get("tags", [])
+    )
+
+
 class DocumentManager:
     """Manage transaction documents."""
 
@@ -121,75 +164,28 @@ class DocumentManager:
         self.data_path = data_path or Path.home() / ".td-lead-engine" / "documents.json"
         self.storage_path = storage_path or Path.home() / ".td-lead-engine" / "document_storage"
         self.documents: Dict[str, List[Document]] = {}  # By transaction_id
+        self.store = open_store(self.data_path.with_suffix(".db"))
+        self.doc_store = self.store.collection("documents", indexes=("transaction_id",))
         self._load_data()
 
     def _load_data(self):
         """Load document records."""
-        if self.data_path.exists():
-            try:
-                with open(self.data_path, 'r') as f:
-                    data = json.load(f)
-
-                    for txn_id, docs in data.get("documents", {}).items():
-                        self.documents[txn_id] = [
-                            Document(
-                                id=d["id"],
-                                transaction_id=d["transaction_id"],
-                                doc_type=DocumentType(d["doc_type"]),
-                                name=d["name"],
-                                file_path=d["file_path"],
-                                status=DocumentStatus(d.get("status", "draft")),
-                                file_size=d.get("file_size", 0),
-                                file_hash=d.get("file_hash", ""),
-                                uploaded_by=d.get("uploaded_by", ""),
-                                required_signers=d.get("required_signers", []),
-                                signed_by=d.get("signed_by", []),
-                                current_version=d.get("current_version", 1),
-                                uploaded_at=datetime.fromisoformat(d["uploaded_at"]),
-                                due_date=datetime.fromisoformat(d["due_date"]) if d.get("due_date") else None,
-                                description=d.get("description", ""),
-                                tags=d.get("tags", [])
-                            )
-                            for d in docs
-                        ]
-
-            except Exception as e:
-                logger.error(f"Error loading documents: {e}")
-
-    def _save_data(self):
-        """Save document records."""
-        self.data_path.parent.mkdir(parents=True, exist_ok=True)
-
-        data = {
-            "documents": {
-                txn_id: [
-                    {
-                        "id": d.id,
-                        "transaction_id": d.transaction_id,
-                        "doc_type": d.doc_type.value,
-                        "name": d.name,
-                        "file_path": d.file_path,
-                        "status": d.status.value,
-                        "file_size": d.file_size,
-                        "file_hash": d.file_hash,
-                        "uploaded_by": d.uploaded_by,
-                        "required_signers": d.required_signers,
-                        "signed_by": d.signed_by,
-                        "current_version": d.current_version,
-                        "uploaded_at": d.uploaded_at.isoformat(),
-                        "due_date": d.due_date.isoformat() if d.due_date else None,
-                        "description": d.description,
-                        "tags": d.tags
-                    }
-                    for d in docs
-                ]
-                for txn_id, docs in self.documents.items()
-            },
-            "updated_at": datetime.now().isoformat()
-        }
-
-        with open(self.data_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        self.doc_store.import_legacy(
+            self.data_path,
+            lambda data: keyed(d for docs in data.get("documents", {}).values() for d in docs),
+        )
+        try:
+            for _, record in self.doc_store.items():
+                doc = _document_from_record(record)
+                self.documents.setdefault(doc.transaction_id, []).append(doc)
+            for docs in self.documents.values():
+                docs.sort(key=lambda d: d.uploaded_at)
+        except Exception as e:
+            logger.error(f"Error loading documents: {e}")
+
+    def _save_document(self, document: Document):
+        """Save one document record."""
+        self.doc_store.put(document.id, _document_record(document))
 
     def _compute_file_hash(self, file_path: Path) -> str:
         """Compute SHA-256 hash of a file."""
@@ -267,7 +263,7 @@ class DocumentManager:
         if transaction_id not in self.documents:
             self.documents[transaction_id] = []
         self.documents[transaction_id].append(document)
-        self._save_data()
+        self._save_document(document)
 
         return document
 
@@ -319,7 +315,7 @@ class DocumentManager:
                 else:
                     doc.status = DocumentStatus.DRAFT
 
-                self._save_data()
+                self._save_document(doc)
                 return True
 
         return False
@@ -345,7 +341,7 @@ class DocumentManager:
                     else:
                         doc.status = DocumentStatus.PARTIALLY_SIGNED
 
-                    self._save_data()
+                    self._save_document(doc)
                 return True
 
         return False
@@ -367,7 +363,7 @@ class DocumentManager:
                     doc.notes = notes
                 if status == DocumentStatus.APPROVED:
                     doc.completed_at = datetime.now()
-                self._save_data()
+                self._save_document(doc)
                 return True
 
         return False
@@ -4,9 +4,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Callable
 from datetime import datetime, timedelta
 from enum import Enum
-import json
-import os
 import uuid
+from pathlib import Path
+
+from ..core.doc_store import keyed, open_store
 
 
 class CampaignStatus(Enum):
@@ -84,6 +85,101 @@ class DripCampaign:
     updated_at: datetime = field(default_factory=datetime.now)
 
 
+def _campaign_record(c: DripCampaign) -> Dict:
+    return {
+        'id': c.id,
+        'name': c.name,
+        'description': c.description,
+        'trigger_type': c.trigger_type.value,
+        'trigger_conditions': c.trigger_conditions,
+        'steps': [
+            {
+                'id': s.id,
+                'order': s.order,
+                'message_type': s.message_type.value,
+                'delay_days': s.delay_days,
+                'delay_hours': s.delay_hours,
+                'delay_minutes': s.delay_minutes,
+                'template_id': s.template_id,
+                'subject': s.subject,
+                'content': s.content,
+                'conditions': s.conditions,
+                'send_time': s.send_time,
+                'send_days': s.send_days
+            }
+            for s in c.steps
+        ],
+        'status': c.status.value,
+        'goal': c.goal,
+        'tags': c.tags,
+        'created_by': c.created_by,
+        'created_at': c.created_at.isoformat(),
+        'updated_at': c.updated_at.isoformat()
+    }
+
+
+def _campaign_from_record(c: Dict) -> DripCampaign:
+    steps = [
+        CampaignStep(
+            id=s['id'],
+            order=s['order'],
+            message_type=MessageType(s['message_type']),
+            delay_days=s.get('delay_days', 0),
+            delay_hours=s.get('delay_hours', 0),
+            delay_minutes=s.get('delay_minutes', 0),
+            template_id=s.get('template_id', ''),
+            subject=s.get('subject', ''),
+            content=s.get('content', ''),
+            conditions=s.get('conditions', {}),
+            send_time=s.get('send_time', ''),
+            send_days=s.get('send_days', [])
+        )
+        for s in c.get('steps', [])
+    ]
+    return DripCampaign(
+        id=c['id'],
+        name=c['name'],
+        description=c.get('description', ''),
+        trigger_type=TriggerType(c.get('trigger_type', 'manual')),
+        trigger_conditions=c.get('trigger_conditions', {}),
+        steps=steps,
+        status=CampaignStatus(c.get('status', 'draft')),
+        goal=c.get('goal', ''),
+        tags=c.get('tags', []),
+        created_by=c.get('created_by', ''),
+        created_at=datetime.fromisoformat(c['created_at']),
+        updated_at=datetime.fromisoformat(c.get('updated_at', c['created_at']))
+    )
+
+
+def _enrollment_record(e: CampaignEnrollment) -> Dict:
+    return {
+        'id': e.id,
+        'campaign_id': e.campaign_id,
+        'lead_id': e.lead_id,
+        'current_step': e.current_step,
+        'status': e.status,
+        'enrolled_at': e.enrolled_at.isoformat(),
+        'completed_at': e.completed_at.isoformat() if e.completed_at else None,
+        'last_action_at': e.last_action_at.isoformat() if e.last_action_at else None,
+        'next_action_at': e.next_action_at.isoformat() if e.next_action_at else None
+    }
+
+
+def _enrollment_from_record(e: Dict) -> CampaignEnrollment:
+    return CampaignEnrollment(
+        id=e['id'],
+        campaign_id=e['campaign_id'],
+        lead_id=e['lead_id'],
+        current_step=e.get('current_step', 0),
+        status=e.get('status', 'active'),
+        enrolled_at=datetime.fromisoformat(e['enrolled_at']),
+        completed_at=datetime.fromisoformat(e['completed_at']) if e.get('completed_at') else None,
+        last_action_at=datetime.fromisoformat(e['last_action_at']) if e.get('last_action_at') else None,
+        next_action_at=datetime.fromisoformat(e['next_action_at']) if e.get('next_action_at') else None
+    )
+
+
 class CampaignManager:
     """Manage drip campaigns."""
     
@@ -93,131 +189,32 @@ class CampaignManager:
         self.enrollments: Dict[str, CampaignEnrollment] = {}
         self.trigger_handlers: Dict[TriggerType, List[Callable]] = {}
         
+        self.store = open_store(Path(storage_path) / "store.db")
+        self.campaign_store = self.store.collection("campaigns")
+        self.enrollment_store = self.store.collection("enrollments", indexes=("campaign_id", "lead_id"))
         self._load_data()
         self._create_default_campaigns()
     
     def _load_data(self):
         """Load campaigns from storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        # Load campaigns
-        campaigns_file = f"{self.storage_path}/campaigns.json"
-        if os.path.exists(campaigns_file):
-            with open(campaigns_file, 'r') as f:
-                data = json.load(f)
-                for c in data:
-                    steps = [
-                        CampaignStep(
-                            id=s['id'],
-                            order=s['order'],
-                            message_type=MessageType(s['message_type']),
-                            delay_days=s.get('delay_days', 0),
-                            delay_hours=s.get('delay_hours', 0),
-                            delay_minutes=s.get('delay_minutes', 0),
-                            template_id=s.get('template_id', ''),
-                            subject=s.get('subject', ''),
-                            content=s.get('content', ''),
-                            conditions=s.get('conditions', {}),
-                            send_time=s.get('send_time', ''),
-                            send_days=s.get('send_days', [])
-                        )
-                        for s in c.get('steps', [])
-                    ]
-                    campaign = DripCampaign(
-                        id=c['id'],
-                        name=c['name'],
-                        description=c.get('description', ''),
-                        trigger_type=TriggerType(c.get('trigger_type', 'manual')),
-                        trigger_conditions=c.get('trigger_conditions', {}),
-                        steps=steps,
-                        status=CampaignStatus(c.get('status', 'draft')),
-                        goal=c.get('goal', ''),
-                        tags=c.get('tags', []),
-                        created_by=c.get('created_by', ''),
-                        created_at=datetime.fromisoformat(c['created_at']),
-                        updated_at=datetime.fromisoformat(c.get('updated_at', c['created_at']))
-                    )
-                    self.campaigns[campaign.id] = campaign
-        
-        # Load enrollments
-        enrollments_file = f"{self.storage_path}/enrollments.json"
-        if os.path.exists(enrollments_file):
-            with open(enrollments_file, 'r') as f:
-                data = json.load(f)
-                for e in data:
-                    enrollment = CampaignEnrollment(
-                        id=e['id'],
-                        campaign_id=e['campaign_id'],
-                        lead_id=e['lead_id'],
-                        current_step=e.get('current_step', 0),
-                        status=e.get('status', 'active'),
-                        enrolled_at=datetime.fromisoformat(e['enrolled_at']),
-                        completed_at=datetime.fromisoformat(e['completed_at']) if e.get('completed_at') else None,
-                        last_action_at=datetime.fromisoformat(e['last_action_at']) if e.get('last_action_at') else None,
-                        next_action_at=datetime.fromisoformat(e['next_action_at']) if e.get('next_action_at') else None
-                    )
-                    self.enrollments[enrollment.id] = enrollment
-    
-    def _save_data(self):
-        """Save campaigns to storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        # Save campaigns
-        campaigns_data = [
-            {
-                'id': c.id,
-                'name': c.name,
-                'description': c.description,
-                'trigger_type': c.trigger_type.value,
-                'trigger_conditions': c.trigger_conditions,
-                'steps': [
-                    {
-                        'id': s.id,
-                        'order': s.order,
-                        'message_type': s.message_type.value,
-                        'delay_days': s.delay_days,
-                        'delay_hours': s.delay_hours,
-                        'delay_minutes': s.delay_minutes,
-                        'template_id': s.template_id,
-                        'subject': s.subject,
-                        'content': s.content,
-                        'conditions': s.conditions,
-                        'send_time': s.send_time,
-                        'send_days': s.send_days
-                    }
-                    for s in c.steps
-                ],
-                'status': c.status.value,
-                'goal': c.goal,
-                'tags': c.tags,
-                'created_by': c.created_by,
-                'created_at': c.created_at.isoformat(),
-                'updated_at': c.updated_at.isoformat()
-            }
-            for c in self.campaigns.values()
-        ]
+        self.campaign_store.import_legacy(f"{self.storage_path}/campaigns.json", keyed)
+        self.enrollment_store.import_legacy(f"{self.storage_path}/enrollments.json", keyed)
         
-        with open(f"{self.storage_path}/campaigns.json", 'w') as f:
-            json.dump(campaigns_data, f, indent=2)
+        for _, c in self.campaign_store.items():
+            campaign = _campaign_from_record(c)
+            self.campaigns[campaign.id] = campaign
         
-        # Save enrollments
-        enrollments_data = [
-            {
-                'id': e.id,
-                'campaign_id': e.campaign_id,
-                'lead_id': e.lead_id,
-                'current_step': e.current_step,
-                'status': e.status,
-                'enrolled_at': e.enrolled_at.isoformat(),
-                'completed_at': e.completed_at.isoformat() if e.completed_at else None,
-                'last_action_at': e.last_action_at.isoformat() if e.last_action_at else None,
-                'next_action_at': e.next_action_at.isoformat() if e.next_action_at else None
-            }
-            for e in self.enrollments.values()
-        ]
-        
-        with open(f"{self.storage_path}/enrollments.json", 'w') as f:
-            json.dump(enrollments_data, f, indent=2)
+        for _, e in self.enrollment_store.items():
+            enrollment = _enrollment_from_record(e)
+            self.enrollments[enrollment.id] = enrollment
+    
+    def _save_campaign(self, campaign: DripCampaign):
+        """Save one campaign."""
+        self.campaign_store.put(campaign.id, _campaign_record(campaign))
+    
+    def _save_enrollment(self, enrollment: CampaignEnrollment):
+        """Save one enrollment."""
+        self.enrollment_store.put(enrollment.id, _enrollment_record(enrollment))
     
     def _create_default_campaigns(self):
         """Create default drip campaigns."""
@@ -296,7 +293,7 @@ class CampaignManager:
             created_by=created_by
         )
         self.campaigns[campaign.id] = campaign
-        self._save_data()
+        self._save_campaign(campaign)
         return campaign
     
     def add_step(
@@ -330,7 +327,7 @@ class CampaignManager:
         )
         campaign.steps.append(step)
         campaign.updated_at = datetime.now()
-        self._save_data()
+        self._save_campaign(campaign)
         return step
     
     def activate_campaign(self, campaign_id: str) -> bool:
@@ -341,7 +338,7 @@ class CampaignManager:
         
         campaign.status = CampaignStatus.ACTIVE
         campaign.updated_at = datetime.now()
-        self._save_data()
+        self._save_campaign(campaign)
         return True
     
     def pause_campaign(self, campaign_id: str) -> bool:
@@ -352,7 +349,7 @@ class CampaignManager:
         
         campaign.status = CampaignStatus.PAUSED
         campaign.updated_at = datetime.now()
-        self._save_data()
+        self._save_campaign(campaign)
         return True
     
     def enroll_lead(
@@ -388,7 +385,7 @@ class CampaignManager:
             next_action_at=next_action
         )
         self.enrollments[enrollment.id] = enrollment
-        self._save_data()
+        self._save_enrollment(enrollment)
         return enrollment
     
     def unenroll_lead(self, enrollment_id: str, reason: str = "manual") -> bool:
@@ -398,7 +395,7 @@ class CampaignManager:
             return False
         
         enrollment.status = 'unsubscribed' if reason == 'unsubscribe' else 'paused'
-        self._save_data()
+        self._save_enrollment(enrollment)
         return True
     
     def advance_enrollment(self, enrollment_id: str) -> Optional[CampaignStep]:
@@ -419,7 +416,7 @@ class CampaignManager:
             enrollment.status = 'completed'
             enrollment.completed_at = datetime.now()
             enrollment.next_action_at = None
-            self._save_data()
+            self._save_enrollment(enrollment)
             return None
         
         # Calculate next action time
@@ -430,7 +427,7 @@ class CampaignManager:
             minutes=next_step.delay_minutes
         )
         
-        self._save_data()
+        self._save_enrollment(enrollment)
         return next_step
     
     def get_pending_actions(self) -> List[Dict]:
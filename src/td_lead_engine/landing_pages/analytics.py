@@ -4,9 +4,12 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from collections import defaultdict
+from pathlib import Path
 import json
 import os
 
+from ..core.rollups import RollupStore
+
 
 @dataclass
 class PageView:
@@ -62,7 +65,14 @@ class ABTest:
 
 
 class PageAnalytics:
-    """Analytics tracking for landing pages."""
+    """Analytics tracking for landing pages.
+    
+    View, device and conversion counts per page, source and campaign are
+    kept as rollups in ``storage_path/rollups.db`` (see
+    ``core/rollups.py``) covering all history. Unique visitors and top
+    referrers can't be summed from counters, so they still come from the
+    raw views (the newest 10,000 are kept).
+    """
     
     def __init__(self, storage_path: str = "data/analytics"):
         self.storage_path = storage_path
@@ -70,6 +80,32 @@ class PageAnalytics:
         self.form_submissions: List[FormSubmission] = []
         self.ab_tests: Dict[str, ABTest] = {}
         self._load_data()
+        self.rollups = RollupStore(Path(storage_path) / "rollups.db")
+        if not self.rollups.built:
+            self.rebuild_rollups()
+    
+    def _view_rollups(self, view: PageView) -> List[Dict]:
+        """Rollup counter increments for one page view."""
+        return [
+            {
+                'event_type': 'view',
+                'source': view.utm_source or self._categorize_referrer(view.referrer),
+                'campaign': view.utm_campaign,
+                'page': view.page_id
+            },
+            {'event_type': f"device:{view.device_type or 'unknown'}", 'page': view.page_id}
+        ]
+    
+    def rebuild_rollups(self):
+        """Recount the rollups from the stored views and submissions."""
+        def increments():
+            for view in self.page_views:
+                for fields in self._view_rollups(view):
+                    yield view.timestamp, fields
+            for submission in self.form_submissions:
+                yield submission.timestamp, {'event_type': 'conversion', 'page': submission.page_id}
+        
+        self.rollups.rebuild(increments())
     
     def _load_data(self):
         """Load analytics data from storage."""
@@ -232,6 +268,8 @@ class PageAnalytics:
             device_type=device_type
         )
         self.page_views.append(view)
+        for fields in self._view_rollups(view):
+            self.rollups.add(view.timestamp, **fields)
         self._save_data()
     
     def record_form_submission(
@@ -252,6 +290,7 @@ class PageAnalytics:
             form_data=form_data or {}
         )
         self.form_submissions.append(submission)
+        self.rollups.add(submission.timestamp, 'conversion', page=page_id)
         self._save_data()
     
     def get_page_stats(
@@ -260,57 +299,64 @@ class PageAnalytics:
         days: int = 30
     ) -> Dict:
         """Get statistics for a specific page."""
-        cutoff = datetime.now() - timedelta(days=days)
-        
-        views = [v for v in self.page_views if v.page_id == page_id and v.timestamp > cutoff]
-        submissions = [s for s in self.form_submissions if s.page_id == page_id and s.timestamp > cutoff]
-        
-        unique_visitors = len(set(v.visitor_id for v in views))
-        conversion_rate = (len(submissions) / len(views) * 100) if views else 0
+        now = datetime.now()
+        cutoff = now - timedelta(days=days)
         
-        # Traffic sources
+        counts = self.rollups.counts(cutoff, now, by=("event_type", "source", "campaign"), where={'page': page_id})
+        total_views = 0
+        total_conversions = 0
         sources = defaultdict(int)
-        for v in views:
-            source = v.utm_source or self._categorize_referrer(v.referrer)
-            sources[source] += 1
-        
-        # Device breakdown
+        campaigns = defaultdict(int)
         devices = defaultdict(int)
-        for v in views:
-            devices[v.device_type or 'unknown'] += 1
+        for (event_type, source, campaign), count in counts.items():
+            if event_type == 'view':
+                total_views += count
+                sources[source] += count
+                if campaign:
+                    campaigns[campaign] += count
+            elif event_type == 'conversion':
+                total_conversions += count
+            elif event_type.startswith('device:'):
+                devices[event_type[len('device:'):]] += count
+        
+        # Distinct visitors and referrer URLs aren't rolled up
+        views = [v for v in self.page_views if v.page_id == page_id and v.timestamp > cutoff]
+        unique_visitors = len(set(v.visitor_id for v in views))
+        conversion_rate = (total_conversions / total_views * 100) if total_views else 0
         
-        # Daily views
-        daily_views = defaultdict(int)
-        for v in views:
-            day = v.timestamp.strftime('%Y-%m-%d')
-            daily_views[day] += 1
+        top_campaigns = sorted(campaigns.items(), key=lambda x: x[1], reverse=True)[:5]
         
         return {
-            'total_views': len(views),
+            'total_views': total_views,
             'unique_visitors': unique_visitors,
-            'total_conversions': len(submissions),
+            'total_conversions': total_conversions,
             'conversion_rate': round(conversion_rate, 2),
-            'avg_daily_views': round(len(views) / days, 1),
+            'avg_daily_views': round(total_views / days, 1),
             'traffic_sources': dict(sources),
             'device_breakdown': dict(devices),
-            'daily_views': dict(sorted(daily_views.items())),
+            'daily_views': self.rollups.series(cutoff, now, 'day', {'event_type': 'view', 'page': page_id}),
             'top_referrers': self._get_top_referrers(views, 5),
-            'top_campaigns': self._get_top_campaigns(views, 5)
+            'top_campaigns': [{'campaign': c[0], 'count': c[1]} for c in top_campaigns]
         }
     
     def get_overall_stats(self, days: int = 30) -> Dict:
         """Get overall analytics statistics."""
-        cutoff = datetime.now() - timedelta(days=days)
+        now = datetime.now()
+        cutoff = now - timedelta(days=days)
         
-        views = [v for v in self.page_views if v.timestamp > cutoff]
-        submissions = [s for s in self.form_submissions if s.timestamp > cutoff]
+        counts = self.rollups.counts(cutoff, now, by=("event_type", "source", "page"))
         
         # Page performance
         page_stats = defaultdict(lambda: {'views': 0, 'conversions': 0})
-        for v in views:
-            page_stats[v.page_id]['views'] += 1
-        for s in submissions:
-            page_stats[s.page_id]['conversions'] += 1
+        sources = defaultdict(int)
+        for (event_type, source, page_id), count in counts.items():
+            if event_type == 'view':
+                page_stats[page_id]['views'] += count
+                sources[source] += count
+            elif event_type == 'conversion':
+                page_stats[page_id]['conversions'] += count
+        total_views = sum(stats['views'] for stats in page_stats.values())
+        total_conversions = sum(stats['conversions'] for stats in page_stats.values())
         
         # Calculate conversion rates
         for page_id, stats in page_stats.items():
@@ -320,13 +366,13 @@ class PageAnalytics:
         top_pages = sorted(page_stats.items(), key=lambda x: x[1]['views'], reverse=True)[:10]
         
         return {
-            'total_views': len(views),
-            'total_conversions': len(submissions),
-            'overall_conversion_rate': round((len(submissions) / len(views) * 100) if views else 0, 2),
-            'unique_visitors': len(set(v.visitor_id for v in views)),
+            'total_views': total_views,
+            'total_conversions': total_conversions,
+            'overall_conversion_rate': round((total_conversions / total_views * 100) if total_views else 0, 2),
+            'unique_visitors': len(set(v.visitor_id for v in self.page_views if v.timestamp > cutoff)),
             'top_pages': [{'page_id': p[0], **p[1]} for p in top_pages],
-            'traffic_by_source': self._aggregate_by_source(views),
-            'conversions_by_day': self._aggregate_by_day(submissions)
+            'traffic_by_source': dict(sources),
+            'conversions_by_day': self.rollups.series(cutoff, now, 'day', {'event_type': 'conversion'})
         }
     
     def create_ab_test(
@@ -488,32 +534,6 @@ class PageAnalytics:
         sorted_refs = sorted(referrers.items(), key=lambda x: x[1], reverse=True)[:limit]
         return [{'referrer': r[0], 'count': r[1]} for r in sorted_refs]
     
-    def _get_top_campaigns(self, views: List[PageView], limit: int) -> List[Dict]:
-        """Get top campaigns."""
-        campaigns = defaultdict(int)
-        for v in views:
-            if v.utm_campaign:
-                campaigns[v.utm_campaign] += 1
-        
-        sorted_camps = sorted(campaigns.items(), key=lambda x: x[1], reverse=True)[:limit]
-        return [{'campaign': c[0], 'count': c[1]} for c in sorted_camps]
-    
-    def _aggregate_by_source(self, views: List[PageView]) -> Dict:
-        """Aggregate views by traffic source."""
-        sources = defaultdict(int)
-        for v in views:
-            source = v.utm_source or self._categorize_referrer(v.referrer)
-            sources[source] += 1
-        return dict(sources)
-    
-    def _aggregate_by_day(self, submissions: List[FormSubmission]) -> Dict:
-        """Aggregate submissions by day."""
-        daily = defaultdict(int)
-        for s in submissions:
-            day = s.timestamp.strftime('%Y-%m-%d')
-            daily[day] += 1
-        return dict(sorted(daily.items()))
-    
     def _calculate_confidence(self, variants: List[ABTestVariant]) -> float:
         """Calculate statistical confidence (simplified)."""
         if len(variants) < 2:
@@ -4,8 +4,10 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from datetime import datetime
-import json
 import uuid
+from pathlib import Path
+
+from ..core.doc_store import keyed, open_store
 
 
 class SectionType(Enum):
@@ -570,29 +572,22 @@ class LandingPageBuilder:
     def __init__(self, storage_path: str = "data/landing_pages"):
         self.storage_path = storage_path
         self.pages: Dict[str, LandingPage] = {}
+        # Views and conversions are counted on every request, so writes
+        # are batched (flushed within a second and at exit)
+        self.store = open_store(Path(storage_path) / "store.db", write_behind=True)
+        self.page_store = self.store.collection("pages", indexes=("slug",))
         self._load_pages()
     
     def _load_pages(self):
         """Load pages from storage."""
-        import os
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        pages_file = f"{self.storage_path}/pages.json"
-        if os.path.exists(pages_file):
-            with open(pages_file, 'r') as f:
-                data = json.load(f)
-                for page_data in data:
-                    page = self._dict_to_page(page_data)
-                    self.pages[page.id] = page
+        self.page_store.import_legacy(f"{self.storage_path}/pages.json", keyed)
+        for _, page_data in self.page_store.items():
+            page = self._dict_to_page(page_data)
+            self.pages[page.id] = page
     
-    def _save_pages(self):
-        """Save pages to storage."""
-        import os
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        pages_data = [self._page_to_dict(page) for page in self.pages.values()]
-        with open(f"{self.storage_path}/pages.json", 'w') as f:
-            json.dump(pages_data, f, indent=2, default=str)
+    def _save_page(self, page: LandingPage):
+        """Save one page."""
+        self.page_store.put(page.id, self._page_to_dict(page))
     
     def _page_to_dict(self, page: LandingPage) -> Dict:
         """Convert page to dictionary."""
@@ -667,7 +662,7 @@ class LandingPageBuilder:
             title=title
         )
         self.pages[page.id] = page
-        self._save_pages()
+        self._save_page(page)
         return page
     
     def add_section(self, page_id: str, section: PageSection) -> bool:
@@ -677,7 +672,7 @@ class LandingPageBuilder:
         
         self.pages[page_id].sections.append(section)
         self.pages[page_id].updated_at = datetime.now()
-        self._save_pages()
+        self._save_page(self.pages[page_id])
         return True
     
     def update_section(self, page_id: str, section_id: str, updates: Dict) -> bool:
@@ -691,7 +686,7 @@ class LandingPageBuilder:
                     if hasattr(section, key):
                         setattr(section, key, value)
                 self.pages[page_id].updated_at = datetime.now()
-                self._save_pages()
+                self._save_page(self.pages[page_id])
                 return True
         return False
     
@@ -703,7 +698,7 @@ class LandingPageBuilder:
         self.pages[page_id].sections = [
             s for s in self.pages[page_id].sections if s.id != section_id
         ]
-        self._save_pages()
+        self._save_page(self.pages[page_id])
         return True
     
     def get_page(self, page_id: str) -> Optional[LandingPage]:
@@ -726,7 +721,7 @@ class LandingPageBuilder:
         if page_id in self.pages:
             self.pages[page_id].published = True
             self.pages[page_id].updated_at = datetime.now()
-            self._save_pages()
+            self._save_page(self.pages[page_id])
             return True
         return False
     
@@ -734,7 +729,7 @@ class LandingPageBuilder:
         """Unpublish a page."""
         if page_id in self.pages:
             self.pages[page_id].published = False
-            self._save_pages()
+            self._save_page(self.pages[page_id])
             return True
         return False
     
@@ -742,7 +737,7 @@ class LandingPageBuilder:
         """Delete a page."""
         if page_id in self.pages:
             del self.pages[page_id]
-            self._save_pages()
+            self.page_store.delete(page_id)
             return True
         return False
     
@@ -778,20 +773,20 @@ class LandingPageBuilder:
         )
         
         self.pages[new_page.id] = new_page
-        self._save_pages()
+        self._save_page(new_page)
         return new_page
     
     def record_view(self, page_id: str):
         """Record a page view."""
         if page_id in self.pages:
             self.pages[page_id].views += 1
-            self._save_pages()
+            self._save_page(self.pages[page_id])
     
     def record_conversion(self, page_id: str):
         """Record a conversion."""
         if page_id in self.pages:
             self.pages[page_id].conversions += 1
-            self._save_pages()
+            self._save_page(self.pages[page_id])
     
     def get_analytics(self, page_id: str) -> Dict:
         """Get page analytics."""
@@ -4,14 +4,17 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Callable
 from datetime import datetime, timedelta
 from enum import Enum
-import json
-import os
 import threading
 import time
+from pathlib import Path
+
+from ..core.doc_store import keyed, open_store
 
 from .client import MLSClient, Property, PropertyStatus
 from .search import PropertySearch, SearchCriteria, SavedSearch
 
+MAX_ALERTS = 1000  # newest alerts kept
+
 
 class AlertType(Enum):
     """Types of listing alerts."""
@@ -51,6 +54,61 @@ class AlertPreferences:
     alert_types: List[AlertType] = field(default_factory=lambda: list(AlertType))
 
 
+def _alert_record(a: Alert) -> Dict:
+    return {
+        'id': a.id,
+        'alert_type': a.alert_type.value,
+        'search_id': a.search_id,
+        'lead_id': a.lead_id,
+        'property': a.property.to_dict(),
+        'created_at': a.created_at.isoformat(),
+        'sent_at': a.sent_at.isoformat() if a.sent_at else None,
+        'viewed_at': a.viewed_at.isoformat() if a.viewed_at else None,
+        'details': a.details
+    }
+
+
+def _alert_from_record(alert_data: Dict) -> Alert:
+    return Alert(
+        id=alert_data['id'],
+        alert_type=AlertType(alert_data['alert_type']),
+        search_id=alert_data['search_id'],
+        lead_id=alert_data['lead_id'],
+        property=Property.from_dict(alert_data['property']),
+        created_at=datetime.fromisoformat(alert_data['created_at']),
+        sent_at=datetime.fromisoformat(alert_data['sent_at']) if alert_data.get('sent_at') else None,
+        viewed_at=datetime.fromisoformat(alert_data['viewed_at']) if alert_data.get('viewed_at') else None,
+        details=alert_data.get('details', {})
+    )
+
+
+def _preferences_record(p: AlertPreferences) -> Dict:
+    return {
+        'lead_id': p.lead_id,
+        'email_alerts': p.email_alerts,
+        'sms_alerts': p.sms_alerts,
+        'push_alerts': p.push_alerts,
+        'frequency': p.frequency,
+        'quiet_hours_start': p.quiet_hours_start,
+        'quiet_hours_end': p.quiet_hours_end,
+        'alert_types': [t.value for t in p.alert_types]
+    }
+
+
+def _preferences_from_record(pref_data: Dict) -> AlertPreferences:
+    alert_types = [AlertType(t) for t in pref_data.get('alert_types', [])]
+    return AlertPreferences(
+        lead_id=pref_data['lead_id'],
+        email_alerts=pref_data.get('email_alerts', True),
+        sms_alerts=pref_data.get('sms_alerts', False),
+        push_alerts=pref_data.get('push_alerts', True),
+        frequency=pref_data.get('frequency', 'instant'),
+        quiet_hours_start=pref_data.get('quiet_hours_start', 22),
+        quiet_hours_end=pref_data.get('quiet_hours_end', 8),
+        alert_types=alert_types if alert_types else list(AlertType)
+    )
+
+
 class ListingAlerts:
     """Listing alert system."""
     
@@ -72,98 +130,41 @@ class ListingAlerts:
         self._alert_thread: Optional[threading.Thread] = None
         self._running = False
         
+        self.store = open_store(Path(storage_path) / "store.db")
+        self.alert_store = self.store.collection("alerts", indexes=("lead_id",))
+        self.preference_store = self.store.collection("preferences")
+        self.snapshot_store = self.store.collection("snapshots")
         self._load_data()
     
     def _load_data(self):
         """Load alert data from storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
+        self.alert_store.import_legacy(f"{self.storage_path}/alerts.json", keyed)
+        self.preference_store.import_legacy(
+            f"{self.storage_path}/preferences.json",
+            lambda data: keyed(data, 'lead_id')
+        )
+        self.snapshot_store.import_legacy(
+            f"{self.storage_path}/snapshots.json",
+            lambda data: data.items()
+        )
         
-        # Load alerts
-        alerts_file = f"{self.storage_path}/alerts.json"
-        if os.path.exists(alerts_file):
-            with open(alerts_file, 'r') as f:
-                data = json.load(f)
-                for alert_data in data[-1000:]:  # Keep last 1000
-                    alert = Alert(
-                        id=alert_data['id'],
-                        alert_type=AlertType(alert_data['alert_type']),
-                        search_id=alert_data['search_id'],
-                        lead_id=alert_data['lead_id'],
-                        property=Property.from_dict(alert_data['property']),
-                        created_at=datetime.fromisoformat(alert_data['created_at']),
-                        sent_at=datetime.fromisoformat(alert_data['sent_at']) if alert_data.get('sent_at') else None,
-                        viewed_at=datetime.fromisoformat(alert_data['viewed_at']) if alert_data.get('viewed_at') else None,
-                        details=alert_data.get('details', {})
-                    )
-                    self.alerts[alert.id] = alert
+        # Load alerts (last MAX_ALERTS)
+        alerts = [_alert_from_record(a) for _, a in self.alert_store.items()]
+        alerts.sort(key=lambda a: a.created_at)
+        for alert in alerts[-MAX_ALERTS:]:
+            self.alerts[alert.id] = alert
         
-        # Load preferences
-        prefs_file = f"{self.storage_path}/preferences.json"
-        if os.path.exists(prefs_file):
-            with open(prefs_file, 'r') as f:
-                data = json.load(f)
-                for pref_data in data:
-                    alert_types = [AlertType(t) for t in pref_data.get('alert_types', [])]
-                    prefs = AlertPreferences(
-                        lead_id=pref_data['lead_id'],
-                        email_alerts=pref_data.get('email_alerts', True),
-                        sms_alerts=pref_data.get('sms_alerts', False),
-                        push_alerts=pref_data.get('push_alerts', True),
-                        frequency=pref_data.get('frequency', 'instant'),
-                        quiet_hours_start=pref_data.get('quiet_hours_start', 22),
-                        quiet_hours_end=pref_data.get('quiet_hours_end', 8),
-                        alert_types=alert_types if alert_types else list(AlertType)
-                    )
-                    self.preferences[prefs.lead_id] = prefs
+        for _, pref_data in self.preference_store.items():
+            prefs = _preferences_from_record(pref_data)
+            self.preferences[prefs.lead_id] = prefs
         
-        # Load property snapshots
-        snapshots_file = f"{self.storage_path}/snapshots.json"
-        if os.path.exists(snapshots_file):
-            with open(snapshots_file, 'r') as f:
-                self.property_snapshots = json.load(f)
+        self.property_snapshots = dict(self.snapshot_store.items())
     
-    def _save_data(self):
-        """Save alert data to storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        # Save alerts (last 1000)
-        alerts_data = [
-            {
-                'id': a.id,
-                'alert_type': a.alert_type.value,
-                'search_id': a.search_id,
-                'lead_id': a.lead_id,
-                'property': a.property.to_dict(),
-                'created_at': a.created_at.isoformat(),
-                'sent_at': a.sent_at.isoformat() if a.sent_at else None,
-                'viewed_at': a.viewed_at.isoformat() if a.viewed_at else None,
-                'details': a.details
-            }
-            for a in list(self.alerts.values())[-1000:]
-        ]
-        with open(f"{self.storage_path}/alerts.json", 'w') as f:
-            json.dump(alerts_data, f, indent=2)
-        
-        # Save preferences
-        prefs_data = [
-            {
-                'lead_id': p.lead_id,
-                'email_alerts': p.email_alerts,
-                'sms_alerts': p.sms_alerts,
-                'push_alerts': p.push_alerts,
-                'frequency': p.frequency,
-                'quiet_hours_start': p.quiet_hours_start,
-                'quiet_hours_end': p.quiet_hours_end,
-                'alert_types': [t.value for t in p.alert_types]
-            }
-            for p in self.preferences.values()
-        ]
-        with open(f"{self.storage_path}/preferences.json", 'w') as f:
-            json.dump(prefs_data, f, indent=2)
-        
-        # Save snapshots
-        with open(f"{self.storage_path}/snapshots.json", 'w') as f:
-            json.dump(self.property_snapshots, f, indent=2)
+    def _save_alerts(self, alerts: List[Alert]):
+        """Save alert records, dropping stored alerts beyond the newest MAX_ALERTS."""
+        self.alert_store.put_many((a.id, _alert_record(a)) for a in alerts)
+        if len(self.alerts) > MAX_ALERTS:
+            self.alert_store.delete_many(list(self.alerts)[:-MAX_ALERTS])
     
     def add_alert_handler(self, handler: Callable):
         """Add a handler for alert events."""
@@ -210,7 +211,7 @@ class ListingAlerts:
             prefs.alert_types = alert_types
         
         self.preferences[lead_id] = prefs
-        self._save_data()
+        self.preference_store.put(lead_id, _preferences_record(prefs))
         return prefs
     
     def get_preferences(self, lead_id: str) -> AlertPreferences:
@@ -222,6 +223,7 @@ class ListingAlerts:
     def check_for_alerts(self) -> List[Alert]:
         """Check all saved searches for new alerts."""
         new_alerts = []
+        touched_snapshots = set()
         
         for saved_search in self.property_search.saved_searches.values():
             # Run the search
@@ -240,6 +242,7 @@ class ListingAlerts:
                 
                 # Check for price changes
                 if saved_search.notify_price_changes:
+                    touched_snapshots.add(f"property_{prop.mls_id}")
                     price_change = self._check_price_change(prop)
                     if price_change:
                         alert_type, details = price_change
@@ -253,8 +256,10 @@ class ListingAlerts:
             
             # Update snapshot for this search
             self._update_search_snapshot(saved_search, results.properties)
+            touched_snapshots.add(f"search_{saved_search.id}")
         
-        self._save_data()
+        self._save_alerts(new_alerts)
+        self.snapshot_store.put_many((key, self.property_snapshots[key]) for key in touched_snapshots)
         return new_alerts
     
     def _is_new_for_search(self, prop: Property, search: SavedSearch) -> bool:
@@ -360,27 +365,27 @@ class ListingAlerts:
         """Mark an alert as viewed."""
         if alert_id in self.alerts:
             self.alerts[alert_id].viewed_at = datetime.now()
-            self._save_data()
+            self._save_alerts([self.alerts[alert_id]])
             return True
         return False
     
     def mark_all_viewed(self, lead_id: str) -> int:
         """Mark all alerts as viewed for a lead."""
-        count = 0
+        viewed = []
         for alert in self.alerts.values():
             if alert.lead_id == lead_id and alert.viewed_at is None:
                 alert.viewed_at = datetime.now()
-                count += 1
+                viewed.append(alert)
         
-        if count > 0:
-            self._save_data()
-        return count
+        if viewed:
+            self._save_alerts(viewed)
+        return len(viewed)
     
     def delete_alert(self, alert_id: str) -> bool:
         """Delete an alert."""
         if alert_id in self.alerts:
             del self.alerts[alert_id]
-            self._save_data()
+            self.alert_store.delete(alert_id)
             return True
         return False
     
@@ -434,10 +439,12 @@ class ListingAlerts:
     def mark_alerts_sent(self, alert_ids: List[str]):
         """Mark alerts as sent."""
         now = datetime.now()
+        sent = []
         for alert_id in alert_ids:
             if alert_id in self.alerts:
                 self.alerts[alert_id].sent_at = now
-        self._save_data()
+                sent.append(self.alerts[alert_id])
+        self._save_alerts(sent)
     
     def start_monitoring(self, check_interval_minutes: int = 15):
         """Start background alert monitoring."""
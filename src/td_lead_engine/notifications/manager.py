@@ -1,13 +1,15 @@
 """Notification management system."""
 
-import json
 import os
 import uuid
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 from typing import Optional, Dict, List, Any, Callable
 
+from ..core.doc_store import keyed, open_store
+
 
 class NotificationType(Enum):
     """Types of notifications."""
@@ -111,12 +113,66 @@ class NotificationRule:
     is_active: bool = True
 
 
+def _notification_record(notif: Notification) -> Dict[str, Any]:
+    """Serialize a notification for storage."""
+    item = asdict(notif)
+    item['notification_type'] = notif.notification_type.value
+    item['priority'] = notif.priority.value
+    item['status'] = notif.status.value
+    item['created_at'] = notif.created_at.isoformat()
+    if notif.sent_at:
+        item['sent_at'] = notif.sent_at.isoformat()
+    if notif.read_at:
+        item['read_at'] = notif.read_at.isoformat()
+    if notif.expires_at:
+        item['expires_at'] = notif.expires_at.isoformat()
+    return item
+
+
+def _notification_from_record(item: Dict[str, Any]) -> Notification:
+    """Rebuild a notification from its stored form."""
+    item['notification_type'] = NotificationType(item['notification_type'])
+    item['priority'] = NotificationPriority(item['priority'])
+    item['status'] = NotificationStatus(item['status'])
+    item['created_at'] = datetime.fromisoformat(item['created_at'])
+    if item.get('sent_at'):
+        item['sent_at'] = datetime.fromisoformat(item['sent_at'])
+    if item.get('read_at'):
+        item['read_at'] = datetime.fromisoformat(item['read_at'])
+    if item.get('expires_at'):
+        item['expires_at'] = datetime.fromisoformat(item['expires_at'])
+    return Notification(**item)
+
+
+def _rule_record(rule: NotificationRule) -> Dict[str, Any]:
+    """Serialize a rule for storage."""
+    item = asdict(rule)
+    item['notification_type'] = rule.notification_type.value
+    item['priority'] = rule.priority.value
+    return item
+
+
+def _rule_from_record(item: Dict[str, Any]) -> NotificationRule:
+    """Rebuild a rule from its stored form."""
+    item['notification_type'] = NotificationType(item['notification_type'])
+    item['priority'] = NotificationPriority(item['priority'])
+    return NotificationRule(**item)
+
+
 class NotificationManager:
-    """Manages notifications across all channels."""
+    """Manages notifications across all channels.
+
+    Notifications and rules are stored one record each in
+    ``<data_dir>/store.db``; the older ``notifications.json`` and
+    ``rules.json`` files are imported on first use.
+    """
 
     def __init__(self, data_dir: str = "data/notifications"):
         self.data_dir = data_dir
         os.makedirs(data_dir, exist_ok=True)
+        self.store = open_store(Path(data_dir) / "store.db")
+        self.notification_store = self.store.collection("notifications", indexes=("recipient_id",))
+        self.rule_store = self.store.collection("rules")
         self.notifications: Dict[str, Notification] = {}
         self.rules: Dict[str, NotificationRule] = {}
         self.channel_handlers: Dict[str, Callable] = {}
@@ -124,62 +180,20 @@ class NotificationManager:
         self._ensure_default_rules()
 
     def _load_data(self):
-        """Load existing data from files."""
-        notifications_file = os.path.join(self.data_dir, "notifications.json")
-        if os.path.exists(notifications_file):
-            with open(notifications_file) as f:
-                data = json.load(f)
-                for item in data:
-                    item['notification_type'] = NotificationType(item['notification_type'])
-                    item['priority'] = NotificationPriority(item['priority'])
-                    item['status'] = NotificationStatus(item['status'])
-                    item['created_at'] = datetime.fromisoformat(item['created_at'])
-                    if item.get('sent_at'):
-                        item['sent_at'] = datetime.fromisoformat(item['sent_at'])
-                    if item.get('read_at'):
-                        item['read_at'] = datetime.fromisoformat(item['read_at'])
-                    if item.get('expires_at'):
-                        item['expires_at'] = datetime.fromisoformat(item['expires_at'])
-                    self.notifications[item['id']] = Notification(**item)
-
-        rules_file = os.path.join(self.data_dir, "rules.json")
-        if os.path.exists(rules_file):
-            with open(rules_file) as f:
-                data = json.load(f)
-                for item in data:
-                    item['notification_type'] = NotificationType(item['notification_type'])
-                    item['priority'] = NotificationPriority(item['priority'])
-                    self.rules[item['id']] = NotificationRule(**item)
-
-    def _save_data(self):
-        """Save data to files."""
-        notifications_file = os.path.join(self.data_dir, "notifications.json")
-        with open(notifications_file, 'w') as f:
-            data = []
-            for notif in self.notifications.values():
-                item = asdict(notif)
-                item['notification_type'] = notif.notification_type.value
-                item['priority'] = notif.priority.value
-                item['status'] = notif.status.value
-                item['created_at'] = notif.created_at.isoformat()
-                if notif.sent_at:
-                    item['sent_at'] = notif.sent_at.isoformat()
-                if notif.read_at:
-                    item['read_at'] = notif.read_at.isoformat()
-                if notif.expires_at:
-                    item['expires_at'] = notif.expires_at.isoformat()
-                data.append(item)
-            json.dump(data, f, indent=2)
-
-        rules_file = os.path.join(self.data_dir, "rules.json")
-        with open(rules_file, 'w') as f:
-            data = []
-            for rule in self.rules.values():
-                item = asdict(rule)
-                item['notification_type'] = rule.notification_type.value
-                item['priority'] = rule.priority.value
-                data.append(item)
-            json.dump(data, f, indent=2)
+        """Load existing data from the store."""
+        self.notification_store.import_legacy(os.path.join(self.data_dir, "notifications.json"), keyed)
+        self.rule_store.import_legacy(os.path.join(self.data_dir, "rules.json"), keyed)
+
+        for _, item in self.notification_store.items():
+            notification = _notification_from_record(item)
+            self.notifications[notification.id] = notification
+        for _, item in self.rule_store.items():
+            rule = _rule_from_record(item)
+            self.rules[rule.id] = rule
+
+    def _save_notification(self, notification: Notification):
+        """Save one notification."""
+        self.notification_store.put(notification.id, _notification_record(notification))
 
     def register_channel(self, channel_name: str, handler: Callable):
         """Register a channel handler."""
@@ -231,7 +245,7 @@ class NotificationManager:
         )
 
         self.notifications[notification.id] = notification
-        self._save_data()
+        self._save_notification(notification)
 
         return notification
 
@@ -256,7 +270,7 @@ class NotificationManager:
         else:
             notification.status = NotificationStatus.FAILED
 
-        self._save_data()
+        self._save_notification(notification)
         return success
 
     def notify(
@@ -313,17 +327,19 @@ class NotificationManager:
         if notification and not notification.is_read:
             notification.status = NotificationStatus.READ
             notification.read_at = datetime.now()
-            self._save_data()
+            self._save_notification(notification)
             return True
         return False
 
     def mark_all_read(self, recipient_id: str):
         """Mark all notifications as read for a recipient."""
+        changed = []
         for notif in self.notifications.values():
             if notif.recipient_id == recipient_id and not notif.is_read:
                 notif.status = NotificationStatus.READ
                 notif.read_at = datetime.now()
-        self._save_data()
+                changed.append(notif)
+        self.notification_store.put_many((n.id, _notification_record(n)) for n in changed)
 
     def get_unread_count(self, recipient_id: str) -> int:
         """Get unread notification count for a recipient."""
@@ -339,7 +355,7 @@ class NotificationManager:
         """Delete a notification."""
         if notification_id in self.notifications:
             del self.notifications[notification_id]
-            self._save_data()
+            self.notification_store.delete(notification_id)
             return True
         return False
 
@@ -349,7 +365,7 @@ class NotificationManager:
         for nid in expired:
             del self.notifications[nid]
         if expired:
-            self._save_data()
+            self.notification_store.delete_many(expired)
 
     def _find_matching_rule(
         self,
@@ -387,7 +403,7 @@ class NotificationManager:
             conditions=conditions or {}
         )
         self.rules[rule.id] = rule
-        self._save_data()
+        self.rule_store.put(rule.id, _rule_record(rule))
         return rule
 
     def _ensure_default_rules(self):
@@ -478,8 +494,6 @@ class NotificationManager:
             priority=NotificationPriority.LOW
         )
 
-        self._save_data()
-
     # Convenience methods for common notifications
 
     def notify_new_lead(
@@ -1,6 +1,5 @@
 """SMS messaging service with provider abstraction."""
 
-import json
 import os
 import uuid
 import re
@@ -10,6 +9,8 @@ from enum import Enum
 from typing import Optional, Dict, List, Any, Protocol
 from abc import ABC, abstractmethod
 
+from ..core.doc_store import keyed, open_store
+
 
 class MessageStatus(Enum):
     """Status of an SMS message."""
@@ -142,59 +143,49 @@ class SMSMessenger:
         self.from_number = from_number or '+16145550123'
         self.messages: Dict[str, SMSMessage] = {}
         self.conversations: Dict[str, Conversation] = {}
+        self.store = open_store(os.path.join(data_dir, "store.db"))
+        self.message_store = self.store.collection("messages", indexes=("contact_id",))
+        self.conversation_store = self.store.collection("conversations", indexes=("contact_number",))
         self._load_data()
 
     def _load_data(self):
-        """Load existing data from files."""
-        messages_file = os.path.join(self.data_dir, "messages.json")
-        if os.path.exists(messages_file):
-            with open(messages_file) as f:
-                data = json.load(f)
-                for item in data:
-                    item['direction'] = MessageDirection(item['direction'])
-                    item['status'] = MessageStatus(item['status'])
-                    item['created_at'] = datetime.fromisoformat(item['created_at'])
-                    if item.get('sent_at'):
-                        item['sent_at'] = datetime.fromisoformat(item['sent_at'])
-                    if item.get('delivered_at'):
-                        item['delivered_at'] = datetime.fromisoformat(item['delivered_at'])
-                    self.messages[item['id']] = SMSMessage(**item)
-
-        convos_file = os.path.join(self.data_dir, "conversations.json")
-        if os.path.exists(convos_file):
-            with open(convos_file) as f:
-                data = json.load(f)
-                for item in data:
-                    if item.get('last_message_at'):
-                        item['last_message_at'] = datetime.fromisoformat(item['last_message_at'])
-                    self.conversations[item['id']] = Conversation(**item)
-
-    def _save_data(self):
-        """Save data to files."""
-        messages_file = os.path.join(self.data_dir, "messages.json")
-        with open(messages_file, 'w') as f:
-            data = []
-            for msg in self.messages.values():
-                item = asdict(msg)
-                item['direction'] = msg.direction.value
-                item['status'] = msg.status.value
-                item['created_at'] = msg.created_at.isoformat()
-                if msg.sent_at:
-                    item['sent_at'] = msg.sent_at.isoformat()
-                if msg.delivered_at:
-                    item['delivered_at'] = msg.delivered_at.isoformat()
-                data.append(item)
-            json.dump(data, f, indent=2)
-
-        convos_file = os.path.join(self.data_dir, "conversations.json")
-        with open(convos_file, 'w') as f:
-            data = []
-            for convo in self.conversations.values():
-                item = asdict(convo)
-                if convo.last_message_at:
-                    item['last_message_at'] = convo.last_message_at.isoformat()
-                data.append(item)
-            json.dump(data, f, indent=2)
+        """Load existing data from the store."""
+        self.message_store.import_legacy(os.path.join(self.data_dir, "messages.json"), keyed)
+        self.conversation_store.import_legacy(os.path.join(self.data_dir, "conversations.json"), keyed)
+
+        for _, item in self.message_store.items():
+            item['direction'] = MessageDirection(item['direction'])
+            item['status'] = MessageStatus(item['status'])
+            item['created_at'] = datetime.fromisoformat(item['created_at'])
+            if item.get('sent_at'):
+                item['sent_at'] = datetime.fromisoformat(item['sent_at'])
+            if item.get('delivered_at'):
+                item['delivered_at'] = datetime.fromisoformat(item['delivered_at'])
+            self.messages[item['id']] = SMSMessage(**item)
+
+        for _, item in self.conversation_store.items():
+            if item.get('last_message_at'):
+                item['last_message_at'] = datetime.fromisoformat(item['last_message_at'])
+            self.conversations[item['id']] = Conversation(**item)
+
+    def _save_message(self, msg: SMSMessage):
+        """Save one message."""
+        item = asdict(msg)
+        item['direction'] = msg.direction.value
+        item['status'] = msg.status.value
+        item['created_at'] = msg.created_at.isoformat()
+        if msg.sent_at:
+            item['sent_at'] = msg.sent_at.isoformat()
+        if msg.delivered_at:
+            item['delivered_at'] = msg.delivered_at.isoformat()
+        self.message_store.put(msg.id, item)
+
+    def _save_conversation(self, convo: Conversation):
+        """Save one conversation."""
+        item = asdict(convo)
+        if convo.last_message_at:
+            item['last_message_at'] = convo.last_message_at.isoformat()
+        self.conversation_store.put(convo.id, item)
 
     @staticmethod
     def normalize_phone(phone: str) -> str:
@@ -244,12 +235,13 @@ class SMSMessenger:
         self.messages[sms.id] = sms
 
         # Update conversation
-        self._update_conversation(sms)
+        convo = self._update_conversation(sms)
 
-        self._save_data()
+        self._save_message(sms)
+        self._save_conversation(convo)
         return sms
 
-    def _update_conversation(self, message: SMSMessage):
+    def _update_conversation(self, message: SMSMessage) -> Conversation:
         """Update or create conversation for a message."""
         # Find existing conversation
         convo = None
@@ -273,6 +265,8 @@ class SMSMessenger:
         if message.direction == MessageDirection.INBOUND:
             convo.unread_count += 1
 
+        return convo
+
     def receive(
         self,
         from_number: str,
@@ -298,8 +292,9 @@ class SMSMessenger:
         )
 
         self.messages[sms.id] = sms
-        self._update_conversation(sms)
-        self._save_data()
+        convo = self._update_conversation(sms)
+        self._save_message(sms)
+        self._save_conversation(convo)
         return sms
 
     def get_message(self, message_id: str) -> Optional[SMSMessage]:
@@ -329,14 +324,14 @@ class SMSMessenger:
         convo = self.get_conversation(conversation_id)
         if convo:
             convo.unread_count = 0
-            self._save_data()
+            self._save_conversation(convo)
 
     def archive_conversation(self, conversation_id: str):
         """Archive a conversation."""
         convo = self.get_conversation(conversation_id)
         if convo:
             convo.is_archived = True
-            self._save_data()
+            self._save_conversation(convo)
 
     def get_unread_count(self) -> int:
         """Get total unread message count."""
@@ -1,6 +1,6 @@
 """Storage layer for leads database."""
 
 from .database import LeadDatabase
-from .models import Lead, LeadStatus, InteractionType
+from .models import Lead, LeadRow, LeadStatus, InteractionType
 
-__all__ = ["LeadDatabase", "Lead", "LeadStatus", "InteractionType"]
+__all__ = ["LeadDatabase", "Lead", "LeadRow", "LeadStatus", "InteractionType"]
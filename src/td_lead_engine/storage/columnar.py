@@ -0,0 +1,218 @@
+"""Columnar (Arrow / Parquet) export and snapshots of the lead tables.
+
+``write_snapshot`` streams ``leads``, ``interactions`` and ``lead_events``
+out of one read snapshot in Arrow record batches (``batch_size`` rows at a
+time, typed from each table's declared column types) into one Parquet file
+per table plus a small manifest. ``load_snapshot`` reads them back as
+pandas DataFrames, optionally only some columns, so the analytics code can
+aggregate over the whole table without re-querying SQLite or building a
+Python object per row.
+
+Needs pyarrow (the ``parquet`` extra); it's imported on first use.
+"""
+
+import json
+import os
+import shutil
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+SNAPSHOT_TABLES = ("leads", "interactions", "lead_events")
+EXPORT_BATCH_ROWS = 50000
+MANIFEST_NAME = "manifest.json"
+
+# SQL condition and values selecting a subset of a table's rows
+TableFilter = Tuple[str, Sequence[Any]]
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.compute
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "pyarrow package required for Parquet export "
+            "(pip install 'td-lead-engine[parquet]')"
+        )
+    return pyarrow
+
+
+def _arrow_type(pa, declared: str):
+    declared = declared.upper()
+    if "INT" in declared:
+        return pa.int64()
+    if any(t in declared for t in ("REAL", "FLOA", "DOUB")):
+        return pa.float64()
+    if "TIMESTAMP" in declared or "DATETIME" in declared:
+        return pa.timestamp("us")
+    return pa.string()
+
+
+def table_schema(conn: sqlite3.Connection, table: str):
+    """Arrow schema for ``table`` from its declared SQLite column types."""
+    pa = _pyarrow()
+    return pa.schema([
+        pa.field(name, _arrow_type(pa, declared or ""))
+        for _, name, declared, *_ in conn.execute(f"PRAGMA table_info({table})")
+    ])
+
+
+def _coerce(value: Any, arrow_type, pa) -> Any:
+    # Slow path for values SQLite's dynamic typing let through with another type
+    if value is None:
+        return None
+    try:
+        if pa.types.is_int64(arrow_type):
+            return int(value)
+        if pa.types.is_float64(arrow_type):
+            return float(value)
+        if pa.types.is_timestamp(arrow_type):
+            return value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    except (TypeError, ValueError):
+        return None
+    return str(value)
+
+
+def _column(values: Sequence[Any], arrow_type, pa):
+    try:
+        if pa.types.is_timestamp(arrow_type):
+            return pa.compute.cast(pa.array(values, pa.string()), arrow_type)
+        return pa.array(values, arrow_type)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+        return pa.array([_coerce(v, arrow_type, pa) for v in values], arrow_type)
+
+
+def iter_record_batches(
+    conn: sqlite3.Connection,
+    table: str,
+    batch_size: int = EXPORT_BATCH_ROWS,
+    where: Optional[TableFilter] = None,
+) -> Iterator[Any]:
+    """``table``'s rows (optionally filtered) as Arrow record batches, in id order."""
+    pa = _pyarrow()
+    schema = table_schema(conn, table)
+    condition, params = where or ("1=1", ())
+    cursor = conn.execute(f"SELECT * FROM {table} WHERE {condition} ORDER BY id", tuple(params))
+    while True:
+        rows = cursor.fetchmany(batch_size)
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        yield pa.RecordBatch.from_arrays(
+            [_column(values, f.type, pa) for values, f in zip(columns, schema)], schema=schema
+        )
+
+
+def write_snapshot(
+    conn: sqlite3.Connection,
+    out_dir: Path,
+    tables: Sequence[str] = SNAPSHOT_TABLES,
+    batch_size: int = EXPORT_BATCH_ROWS,
+    filters: Optional[Mapping[str, TableFilter]] = None,
+    compression: str = "zstd",
+) -> Dict[str, int]:
+    """Write ``tables`` to ``out_dir/<table>.parquet``; returns rows written per table.
+
+    Read everything through ``conn`` inside one transaction so the tables
+    are mutually consistent. Tables that don't exist in this database (e.g.
+    ``lead_events`` without the website schema) are skipped. The files are
+    built in a temp directory and swapped in, so readers never see a
+    half-written snapshot.
+    """
+    pa = _pyarrow()
+    out_dir = Path(out_dir)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = out_dir.with_name(f".{out_dir.name}.tmp")
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    tmp_dir.mkdir()
+
+    existing = {
+        row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+    }
+    counts: Dict[str, int] = {}
+    try:
+        for table in tables:
+            if table not in existing:
+                continue
+            schema = table_schema(conn, table)
+            rows = 0
+            path = tmp_dir / f"{table}.parquet"
+            where = (filters or {}).get(table)
+            with pa.parquet.ParquetWriter(path, schema, compression=compression) as writer:
+                for batch in iter_record_batches(conn, table, batch_size, where):
+                    writer.write_batch(batch)
+                    rows += batch.num_rows
+            counts[table] = rows
+
+        manifest = {"created_at": datetime.now().isoformat(), "rows": counts}
+        (tmp_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2))
+
+        old_dir = out_dir.with_name(f".{out_dir.name}.old")
+        shutil.rmtree(old_dir, ignore_errors=True)
+        if out_dir.exists():
+            os.replace(out_dir, old_dir)
+        os.replace(tmp_dir, out_dir)
+        shutil.rmtree(old_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+    return counts
+
+
+@dataclass
+class LeadSnapshot:
+    """Lead tables loaded from a Parquet snapshot, as pandas DataFrames.
+
+    A table missing from the snapshot loads as an empty DataFrame.
+    """
+    created_at: datetime
+    leads: Any
+    interactions: Any
+    lead_events: Any
+    rows: Dict[str, int] = field(default_factory=dict)
+
+
+def snapshot_created_at(snapshot_dir: Path) -> Optional[datetime]:
+    """When the snapshot in ``snapshot_dir`` was written, or None if there isn't one."""
+    manifest = Path(snapshot_dir) / MANIFEST_NAME
+    if not manifest.exists():
+        return None
+    return datetime.fromisoformat(json.loads(manifest.read_text())["created_at"])
+
+
+def load_snapshot(
+    snapshot_dir: Path,
+    columns: Optional[Mapping[str, List[str]]] = None,
+) -> LeadSnapshot:
+    """Load a snapshot written by ``write_snapshot``.
+
+    ``columns`` maps a table to the columns to read (Parquet only decodes
+    those); other tables are read whole. Raises FileNotFoundError when
+    there's no snapshot in ``snapshot_dir``.
+    """
+    import pandas as pd
+
+    _pyarrow()
+    snapshot_dir = Path(snapshot_dir)
+    manifest_path = snapshot_dir / MANIFEST_NAME
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"No lead snapshot in {snapshot_dir}")
+    manifest = json.loads(manifest_path.read_text())
+
+    frames = {}
+    for table in SNAPSHOT_TABLES:
+        path = snapshot_dir / f"{table}.parquet"
+        wanted = (columns or {}).get(table)
+        if path.exists():
+            frames[table] = pd.read_parquet(path, columns=wanted)
+        else:
+            frames[table] = pd.DataFrame(columns=wanted or [])
+
+    return LeadSnapshot(
+        created_at=datetime.fromisoformat(manifest["created_at"]),
+        rows=manifest.get("rows", {}),
+        **frames,
+    )
@@ -0,0 +1,131 @@
+"""Normalized contact keys used for lead deduplication.
+
+Each lead stores canonical forms of its phone, email and username in
+``phone_key``, ``email_key`` and ``username_key`` so duplicate lookups are
+index probes instead of ``LIKE`` scans or case-folding comparisons. Every
+writer of the ``leads`` table computes them with the functions below;
+``backfill_contact_keys`` fills in rows written without them.
+"""
+
+import re
+import sqlite3
+from typing import Optional, Tuple
+
+# Bump when the normalization rules change so stored keys are recomputed
+CONTACT_KEYS_VERSION = "1"
+
+_EXTENSION_RE = re.compile(r"(?i)\s*(?:x|ext\.?|extension)\s*\d+\s*$")
+_GMAIL_DOMAINS = {"gmail.com", "googlemail.com"}
+
+# Rows written by a tool that doesn't maintain the keys (kept small by the backfill)
+PENDING_KEYS_SQL = (
+    "(phone IS NOT NULL AND phone_key IS NULL)"
+    " OR (email IS NOT NULL AND email_key IS NULL)"
+    " OR (username IS NOT NULL AND username_key IS NULL)"
+)
+
+
+def normalize_phone(phone: Optional[str]) -> Optional[str]:
+    """E.164-style key: ``+`` and country code plus national digits.
+
+    Ten-digit numbers are taken as North American (``+1``); an extension
+    (``x12``, ``ext. 12``) is dropped. Numbers too short to carry an area
+    code keep their bare digits. Returns None when there are no digits.
+    """
+    if not phone:
+        return None
+    text = _EXTENSION_RE.sub("", phone.strip())
+    digits = "".join(c for c in text if c.isdigit())
+    if not digits:
+        return None
+    if text.startswith("+"):
+        return f"+{digits}"
+    if digits.startswith("00") and len(digits) > 11:
+        return f"+{digits[2:]}"
+    if len(digits) == 10:
+        return f"+1{digits}"
+    if len(digits) >= 11:
+        return f"+{digits}"
+    return digits
+
+
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    """Lowercase email; Gmail addresses also lose dots and ``+tags`` in the local part."""
+    if not email:
+        return None
+    email = email.strip().lower()
+    local, at, domain = email.rpartition("@")
+    if not at:
+        return email or None
+    if domain in _GMAIL_DOMAINS:
+        local = local.split("+", 1)[0].replace(".", "")
+        domain = "gmail.com"
+    return f"{local}@{domain}"
+
+
+def normalize_username(username: Optional[str]) -> Optional[str]:
+    """Lowercase handle without a leading ``@``."""
+    if not username:
+        return None
+    return username.strip().lstrip("@").lower() or None
+
+
+def _stored(value: Optional[str], key: Optional[str]) -> Optional[str]:
+    # '' marks "has a value but no usable key" so the row never looks pending
+    return None if value is None else (key or "")
+
+
+def contact_keys(
+    email: Optional[str], phone: Optional[str], username: Optional[str]
+) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    """Stored ``(email_key, phone_key, username_key)`` column values for a lead."""
+    return (
+        _stored(email, normalize_email(email)),
+        _stored(phone, normalize_phone(phone)),
+        _stored(username, normalize_username(username)),
+    )
+
+
+def register_functions(conn: sqlite3.Connection):
+    """Make the normalizers callable from SQL on ``conn``."""
+    conn.create_function("normalize_phone", 1, normalize_phone, deterministic=True)
+    conn.create_function("normalize_email", 1, normalize_email, deterministic=True)
+    conn.create_function("normalize_username", 1, normalize_username, deterministic=True)
+
+
+def ensure_contact_key_indexes(conn: sqlite3.Connection):
+    """Partial indexes for the dedup probes and for finding rows that need keys."""
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_leads_phone_key ON leads(phone_key) "
+        "WHERE phone_key IS NOT NULL"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_leads_email_key ON leads(email_key) "
+        "WHERE email_key IS NOT NULL"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_leads_username_key ON leads(username_key, source) "
+        "WHERE username_key IS NOT NULL"
+    )
+    conn.execute(
+        f"CREATE INDEX IF NOT EXISTS idx_leads_keys_pending ON leads(id) WHERE {PENDING_KEYS_SQL}"
+    )
+
+
+def backfill_contact_keys(conn: sqlite3.Connection, full: bool = False) -> int:
+    """Compute keys for rows missing them (every row when ``full``). Returns rows updated.
+
+    The incremental form only visits rows in the ``idx_leads_keys_pending``
+    partial index, so it costs nothing when all writers maintain the keys.
+    """
+    register_functions(conn)
+    where = "1=1" if full else PENDING_KEYS_SQL
+    cursor = conn.execute(f"""
+        UPDATE leads SET
+            phone_key = CASE WHEN phone IS NOT NULL THEN COALESCE(normalize_phone(phone), '') END,
+            email_key = CASE WHEN email IS NOT NULL THEN COALESCE(normalize_email(email), '') END,
+            username_key = CASE WHEN username IS NOT NULL
+                THEN COALESCE(normalize_username(username), '') END
+        WHERE {where}
+    """)
+    return cursor.rowcount
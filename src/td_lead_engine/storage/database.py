@@ -1,43 +1,423 @@
 """SQLite database for lead storage with deduplication."""
 
+import hashlib
 import json
+import os
 import sqlite3
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Generator, Tuple
+from typing import Optional, List, Dict, Any, Generator, Iterable, Iterator, Sequence, Tuple
+
+import numpy as np
+
+from .models import Lead, LeadPage, LeadRow, LeadStatus, Interaction, InteractionType
+from .backup import DEFAULT_KEEP, BackupResult, ProgressCallback, backup_database, restore_database
+from .columnar import (
+    EXPORT_BATCH_ROWS, SNAPSHOT_TABLES, LeadSnapshot, load_snapshot, snapshot_created_at, write_snapshot,
+)
+from .contact_keys import (
+    CONTACT_KEYS_VERSION, backfill_contact_keys, contact_keys, ensure_contact_key_indexes,
+    normalize_email, normalize_phone, normalize_username,
+)
+from .lead_stats import STATS_DIMENSIONS, ensure_stats_table, read_stats, rebuild_stats, stats_drift
+from .pagination import LEAD_PAGE_ORDER, decode_cursor, encode_cursor, filters_key, keyset_after
+from .pool import DEFAULT_READERS, get_pool
+from .search_index import ensure_search_index, match_expression
+from ..connectors.base import ImportResult, RawLead
+from ..core.match_matrix import SignalMatchMatrix
+from ..core.ml_model import ConversionModel, blend_scores, load_conversion_model
+from ..core.config import ScoringConfig, tier_for_score
+from ..core.scorer import (
+    SHARED_CACHE_SIZE, LeadScorer, ScoreCache, ScoringResult, combine_lead_text, get_shared_scorer
+)
+from ..core.signals import IntentSignal
+
+# Row shape shipped to scoring workers: (id, source, notes, bio, messages_json, comments_json)
+ScoringRow = Tuple[int, Optional[str], Optional[str], Optional[str], Optional[str], Optional[str]]
+# Row shape written back:
+# (score, tier, score_breakdown, content_fingerprint, scorer_version, last_scored_at, id)
+ScoredRow = Tuple[int, str, str, str, str, str, int]
+
+
+def content_fingerprint(
+    notes: Optional[str],
+    bio: Optional[str],
+    messages_json: Optional[str],
+    comments_json: Optional[str]
+) -> str:
+    """Hash the raw text columns a score is computed from.
+
+    Works on the stored column values so unchanged leads can be skipped
+    without JSON-decoding messages/comments or scanning any text.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for part in (notes, bio, messages_json, comments_json):
+        digest.update((part or "").encode())
+        digest.update(b"\x1f")
+    return digest.hexdigest()
+
+
+def _breakdown_json(result: ScoringResult) -> str:
+    """Serialize a scoring result into the score_breakdown column format."""
+    return json.dumps({
+        "matches": [
+            {"phrase": m.signal.phrase, "weight": m.weight, "category": m.signal.category.value}
+            for m in result.matches
+        ],
+        "category_scores": {k.value: v for k, v in result.category_scores.items()}
+    })
+
+
+# Columns written when a lead is first imported
+NEW_LEAD_COLUMNS = (
+    "source", "source_id", "name", "email", "phone", "username", "profile_url",
+    "bio", "notes", "messages_json", "comments_json", "raw_data_json",
+    "created_at", "updated_at", "email_key", "phone_key", "username_key",
+)
+# Columns a re-import can change on an existing lead
+MERGED_COLUMNS = ("name", "email", "phone", "bio", "notes", "messages_json", "comments_json")
+# ...plus the dedup keys that follow email and phone
+MERGE_WRITE_COLUMNS = MERGED_COLUMNS + ("email_key", "phone_key")
+# Columns whose change is lead activity (moves ``updated_at``); scoring columns aren't
+ACTIVITY_COLUMNS = (
+    "name", "email", "phone", "username", "profile_url", "bio", "notes",
+    "messages_json", "comments_json", "status", "tags", "last_contacted_at",
+)
+
+
+def _new_lead_values(raw_lead: RawLead, now: str) -> Tuple[Any, ...]:
+    """Values for ``NEW_LEAD_COLUMNS`` from raw import data."""
+    email = raw_lead.email.lower() if raw_lead.email else None
+    return (
+        raw_lead.source,
+        raw_lead.source_id,
+        raw_lead.name,
+        email,
+        raw_lead.phone,
+        raw_lead.username,
+        raw_lead.profile_url,
+        raw_lead.bio,
+        raw_lead.notes,
+        json.dumps(raw_lead.messages) if raw_lead.messages else None,
+        json.dumps(raw_lead.comments) if raw_lead.comments else None,
+        json.dumps(raw_lead.raw_data) if raw_lead.raw_data else None,
+        now,
+        now,
+        *contact_keys(email, raw_lead.phone, raw_lead.username),
+    )
+
+
+def _merge_changes(current: Dict[str, Any], raw_lead: RawLead) -> Dict[str, Any]:
+    """New values for ``MERGE_WRITE_COLUMNS`` when ``raw_lead`` is merged into ``current``.
+
+    Prefers existing contact fields, appends bio/notes and unions
+    messages/comments. Only changed columns are returned.
+    """
+    changes: Dict[str, Any] = {}
+
+    if raw_lead.name and not current["name"]:
+        changes["name"] = raw_lead.name
+
+    if raw_lead.email and not current["email"]:
+        changes["email"] = raw_lead.email.lower()
+        changes["email_key"] = contact_keys(changes["email"], None, None)[0]
+
+    if raw_lead.phone and not current["phone"]:
+        changes["phone"] = raw_lead.phone
+        changes["phone_key"] = contact_keys(None, raw_lead.phone, None)[1]
+
+    if raw_lead.bio:
+        changes["bio"] = f"{current['bio'] or ''}\n{raw_lead.bio}".strip()
+
+    if raw_lead.notes:
+        changes["notes"] = f"{current['notes'] or ''}\n{raw_lead.notes}".strip()
+
+    if raw_lead.messages:
+        existing_msgs = json.loads(current["messages_json"]) if current["messages_json"] else []
+        changes["messages_json"] = json.dumps(list(set(existing_msgs + raw_lead.messages)))
+
+    if raw_lead.comments:
+        existing_comments = json.loads(current["comments_json"]) if current["comments_json"] else []
+        changes["comments_json"] = json.dumps(list(set(existing_comments + raw_lead.comments)))
+
+    return changes
+
+
+def _score_rows(scorer: LeadScorer, rows: Sequence[ScoringRow]) -> List[ScoredRow]:
+    """Score a chunk of lead rows and return UPDATE parameters for them."""
+    texts = (
+        combine_lead_text(
+            notes,
+            bio,
+            json.loads(messages_json) if messages_json else None,
+            json.loads(comments_json) if comments_json else None,
+        )
+        for _, _, notes, bio, messages_json, comments_json in rows
+    )
+    sources = (row[1] for row in rows)
+    now = datetime.now().isoformat()
+    return [
+        (
+            result.total_score, result.tier, _breakdown_json(result),
+            content_fingerprint(*row[2:]), scorer.version, now, row[0],
+        )
+        for row, result in zip(rows, scorer.score_many(texts, sources))
+    ]
+
+
+# Time of a lead's latest activity (contact or update) as a Julian day, indexed.
+# Scoring never moves ``updated_at``, so rescoring doesn't reset decay.
+ACTIVITY_SQL = (
+    "MAX(COALESCE(julianday(last_contacted_at), 0), COALESCE(julianday(updated_at), 0))"
+)
+
+# julianday() rounds to milliseconds; pass ranges are widened by this much (in
+# days) on both ends so activity within a millisecond of a pass is not missed
+ACTIVITY_RESOLUTION = 0.001 / 86400
+
+
+def julian_day(moment: datetime) -> float:
+    """Julian day number of a naive timestamp, matching SQLite's ``julianday()``."""
+    return (moment.replace(tzinfo=None) - datetime(1970, 1, 1)).total_seconds() / 86400 + 2440587.5
 
-from .models import Lead, LeadStatus, Interaction, InteractionType
-from ..connectors.base import RawLead
-from ..core.scorer import LeadScorer, ScoringResult
+
+def effective_score_sql(config: ScoringConfig, now: datetime) -> str:
+    """SQL expression for a lead's score after time decay at ``now``.
+
+    Mirrors ``ScoringConfig.decayed_score``: the per-period decay factors are
+    inlined as a CASE table, so sorting and filtering need no Python calls.
+    Plain ``score`` when decay is disabled.
+    """
+    factors = config.decay_factors()
+    if not factors:
+        return "score"
+    periods = (
+        f"MAX(CAST(({julian_day(now)!r} - {ACTIVITY_SQL}) / {float(config.decay_days)!r} "
+        f"AS INTEGER), 0)"
+    )
+    table = " ".join(f"WHEN {k} THEN {factor!r}" for k, factor in enumerate(factors))
+    return (
+        f"(CASE WHEN score > 0 THEN CAST(score * (CASE {periods} {table} ELSE 0.0 END) "
+        f"AS INTEGER) ELSE score END)"
+    )
+
+
+def _min_score_condition(effective: str, min_score: int) -> Tuple[str, List[Any]]:
+    """SQL condition (and values) for a decayed score of at least ``min_score``.
+
+    Decay never raises a score, so the indexed stored score prefilters.
+    """
+    if effective == "score":
+        return "score >= ?", [min_score]
+    return f"score >= ? AND {effective} >= ?", [min_score, min_score]
+
+
+# Per-process scorer for the scoring pool, built once by the initializer
+_worker_scorer: Optional[LeadScorer] = None
+
+
+# Substring match over the searchable fields (one placeholder per field), for
+# queries the full-text index can't answer
+SEARCH_LIKE_SQL = (
+    "name LIKE ? OR email LIKE ? OR phone LIKE ? OR username LIKE ? OR notes LIKE ? OR bio LIKE ?"
+)
+
+# Columns a projected query (``fields=[...]``) may select
+LEAD_FIELDS = frozenset({
+    "id", "source", "source_id", "name", "email", "phone", "username", "profile_url",
+    "bio", "notes", "messages_json", "comments_json", "raw_data_json", "score", "tier",
+    "score_breakdown", "content_fingerprint", "scorer_version", "status", "tags",
+    "created_at", "updated_at", "last_scored_at", "last_contacted_at",
+})
+
+
+def projection_columns(fields: Iterable[str], required: Sequence[str] = ("id",)) -> List[str]:
+    """Validated, de-duplicated column list for a projected query.
+
+    ``required`` columns come first (``id`` always); raises ValueError for a
+    name that isn't a lead column.
+    """
+    fields = list(fields)
+    unknown = sorted(set(fields) - LEAD_FIELDS - {"effective_score"})
+    if unknown:
+        raise ValueError(f"Unknown lead field(s): {', '.join(unknown)}")
+    return list(dict.fromkeys([*required, *fields]))
+
+
+# Keyset pagination for ``iter_leads``: ORDER BY clause, the condition resuming
+# after the previous batch, and that condition's values from its last row
+LEAD_ORDER_KEYS = {
+    "id": ("id", "id > ?", lambda row: (row["id"],)),
+    "score": (
+        "score DESC, id",
+        "score <= ? AND (score < ? OR id > ?)",
+        lambda row: (row["score"], row["score"], row["id"]),
+    ),
+}
+
+
+def _init_score_worker(signals: List[IntentSignal], config: ScoringConfig):
+    """Process pool initializer: compile the scorer once per worker."""
+    global _worker_scorer
+    _worker_scorer = LeadScorer(signals, config=config, cache=ScoreCache(SHARED_CACHE_SIZE))
+
+
+def _score_rows_in_worker(rows: Sequence[ScoringRow]) -> List[ScoredRow]:
+    """Process pool task: score one chunk with the worker's scorer."""
+    return _score_rows(_worker_scorer, rows)
+
+
+class _BatchDedupIndex:
+    """In-memory ``find_duplicate`` for one ``insert_many`` batch.
+
+    Holds, for every dedup key the batch uses, the lowest matching lead id
+    (which is what ``find_duplicate`` returns): seeded from the database
+    with one indexed join per key type, then kept up to date as the batch
+    creates leads and merges in new emails and phones.
+    """
+
+    def __init__(self, raw_leads: List[RawLead]):
+        self.raw_leads = raw_leads
+        self.by_source_id: Dict[Tuple[str, str], int] = {}
+        self.by_email: Dict[str, int] = {}
+        self.by_phone: Dict[str, int] = {}
+        self.by_username: Dict[Tuple[str, str], int] = {}
+
+    def seed(self, conn: sqlite3.Connection) -> Dict[int, Dict[str, Any]]:
+        """Look up existing matches; returns the matched leads' merge columns by id."""
+        conn.execute("""
+            CREATE TEMP TABLE IF NOT EXISTS import_keys (
+                source TEXT,
+                source_id TEXT,
+                email_key TEXT,
+                phone_key TEXT,
+                username_key TEXT
+            )
+        """)
+        conn.execute("DELETE FROM import_keys")
+        conn.executemany(
+            "INSERT INTO import_keys VALUES (?, ?, ?, ?, ?)",
+            [
+                (
+                    raw.source,
+                    raw.source_id or None,
+                    normalize_email(raw.email),
+                    normalize_phone(raw.phone),
+                    normalize_username(raw.username),
+                )
+                for raw in self.raw_leads
+            ],
+        )
+
+        lookups = [
+            (self.by_source_id, "k.source, k.source_id",
+             "l.source = k.source AND l.source_id = k.source_id"),
+            (self.by_email, "k.email_key", "l.email_key = k.email_key"),
+            (self.by_phone, "k.phone_key", "l.phone_key = k.phone_key"),
+            (self.by_username, "k.username_key, k.source",
+             "l.username_key = k.username_key AND l.source = k.source"),
+        ]
+        for mapping, key, condition in lookups:
+            for row in conn.execute(
+                f"SELECT {key}, MIN(l.id) FROM import_keys k JOIN leads l ON {condition} GROUP BY {key}"
+            ):
+                mapping[row[0] if len(row) == 2 else tuple(row[:-1])] = row[-1]
+        conn.execute("DELETE FROM import_keys")
+
+        matched = sorted(
+            set(self.by_source_id.values()) | set(self.by_email.values())
+            | set(self.by_phone.values()) | set(self.by_username.values())
+        )
+        states: Dict[int, Dict[str, Any]] = {}
+        for start in range(0, len(matched), 500):
+            chunk = matched[start:start + 500]
+            for row in conn.execute(
+                f"SELECT id, {', '.join(MERGE_WRITE_COLUMNS)} FROM leads "
+                f"WHERE id IN ({', '.join('?' * len(chunk))})",
+                chunk,
+            ):
+                states[row[0]] = dict(zip(MERGE_WRITE_COLUMNS, tuple(row)[1:]))
+        return states
+
+    @staticmethod
+    def _keep_lowest(mapping: Dict[Any, int], key: Any, lead_id: int):
+        if key and (key not in mapping or lead_id < mapping[key]):
+            mapping[key] = lead_id
+
+    def add(self, lead_id: int, state: Dict[str, Any]):
+        """Index a lead created, or given a new email/phone, by the batch."""
+        if state.get("source_id"):
+            self._keep_lowest(self.by_source_id, (state["source"], state["source_id"]), lead_id)
+        self._keep_lowest(self.by_email, state["email_key"], lead_id)
+        self._keep_lowest(self.by_phone, state["phone_key"], lead_id)
+        if state.get("username_key"):
+            self._keep_lowest(self.by_username, (state["username_key"], state["source"]), lead_id)
+
+    def find(self, raw_lead: RawLead) -> Optional[int]:
+        """Same precedence as ``find_duplicate``: source id, email, phone, username."""
+        candidates = [
+            (self.by_source_id, (raw_lead.source, raw_lead.source_id) if raw_lead.source_id else None),
+            (self.by_email, normalize_email(raw_lead.email)),
+            (self.by_phone, normalize_phone(raw_lead.phone)),
+            (self.by_username, (normalize_username(raw_lead.username), raw_lead.source)
+             if normalize_username(raw_lead.username) else None),
+        ]
+        for mapping, key in candidates:
+            if key and key in mapping:
+                return mapping[key]
+        return None
 
 
 class LeadDatabase:
     """SQLite database for storing and managing leads."""
 
-    def __init__(self, db_path: Optional[Path] = None):
-        """Initialize database connection."""
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        scoring_config: Optional[ScoringConfig] = None,
+        readers: int = DEFAULT_READERS
+    ):
+        """Initialize database connection.
+
+        ``scoring_config`` supplies tier thresholds and decay settings; by
+        default the shared scorer's (hot-reloaded) config is used. Connections
+        come from a pool shared by every ``LeadDatabase`` on the same file:
+        one writer and up to ``readers`` concurrent readers.
+        """
         if db_path is None:
             db_path = Path.home() / ".td-lead-engine" / "leads.db"
 
         self.db_path = db_path
+        self.scoring_config = scoring_config
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._pool = get_pool(self.db_path, readers)
 
         self._init_db()
 
     @contextmanager
-    def _get_connection(self) -> Generator[sqlite3.Connection, None, None]:
-        """Get a database connection with row factory."""
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
-        try:
+    def transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """Run a multi-step operation on the writer connection as one transaction.
+
+        Commits when the block exits normally and rolls back on error. Every
+        ``LeadDatabase`` method called inside the block (from the same thread)
+        joins the transaction and sees its uncommitted writes.
+        """
+        with self._pool.transaction() as conn:
             yield conn
-            conn.commit()
-        except Exception:
-            conn.rollback()
-            raise
-        finally:
-            conn.close()
+
+    def _get_connection(self):
+        """Writer connection in a (possibly enclosing) transaction."""
+        return self._pool.transaction()
+
+    def _read_connection(self):
+        """Pooled read-only connection (the writer inside a transaction)."""
+        return self._pool.reader()
+
+    def close(self):
+        """Close the pooled connections (they reopen on next use)."""
+        self._pool.close()
 
     def _init_db(self):
         """Initialize database schema."""
@@ -65,6 +445,8 @@ class LeadDatabase:
                     score INTEGER DEFAULT 0,
                     tier TEXT DEFAULT 'cold',
                     score_breakdown TEXT,
+                    content_fingerprint TEXT,
+                    scorer_version TEXT,
 
                     status TEXT DEFAULT 'new',
                     tags TEXT,
@@ -80,6 +462,15 @@ class LeadDatabase:
                 )
             """)
 
+            # Columns added after the original schema (existing databases)
+            self._ensure_columns(cursor, "leads", {
+                "content_fingerprint": "TEXT",
+                "scorer_version": "TEXT",
+                "email_key": "TEXT",
+                "phone_key": "TEXT",
+                "username_key": "TEXT",
+            })
+
             # Interactions table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS interactions (
@@ -101,6 +492,14 @@ class LeadDatabase:
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_leads_tier ON leads(tier)
             """)
+            # Per-tier / per-source score order, for streaming and paging a tier or
+            # source highest-first without sorting (iter_leads, get_leads_page)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_leads_tier_score ON leads(tier, score DESC)
+            """)
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_leads_source_score ON leads(source, score DESC)
+            """)
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_leads_status ON leads(status)
             """)
@@ -113,6 +512,46 @@ class LeadDatabase:
             cursor.execute("""
                 CREATE INDEX IF NOT EXISTS idx_interactions_lead ON interactions(lead_id)
             """)
+            # Latest activity, for decayed-score queries and the incremental decay pass
+            cursor.execute(f"""
+                CREATE INDEX IF NOT EXISTS idx_leads_activity ON leads({ACTIVITY_SQL})
+            """)
+
+            # Small key/value state for incremental background passes
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS engine_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            """)
+
+            # Normalized dedup keys: recompute all of them when the rules
+            # change, otherwise only fill in rows written without them
+            ensure_contact_key_indexes(conn)
+            row = cursor.execute(
+                "SELECT value FROM engine_state WHERE key = 'contact_keys_version'"
+            ).fetchone()
+            if row is None or row[0] != CONTACT_KEYS_VERSION:
+                backfill_contact_keys(conn, full=True)
+                cursor.execute(
+                    "INSERT OR REPLACE INTO engine_state (key, value) VALUES ('contact_keys_version', ?)",
+                    (CONTACT_KEYS_VERSION,)
+                )
+            else:
+                backfill_contact_keys(conn)
+
+            # Full-text index for search_leads (trigger-maintained)
+            self._search_tokenizer = ensure_search_index(conn)
+
+            # Materialized counts for get_stats (trigger-maintained)
+            ensure_stats_table(conn)
+
+    def _ensure_columns(self, cursor: sqlite3.Cursor, table: str, columns: Dict[str, str]):
+        """Add any missing columns to an existing table."""
+        existing = {row[1] for row in cursor.execute(f"PRAGMA table_info({table})")}
+        for name, declaration in columns.items():
+            if name not in existing:
+                cursor.execute(f"ALTER TABLE {table} ADD COLUMN {name} {declaration}")
 
     def _row_to_lead(self, row: sqlite3.Row) -> Lead:
         """Convert a database row to a Lead object."""
@@ -132,6 +571,8 @@ class LeadDatabase:
             score=row["score"] or 0,
             tier=row["tier"] or "cold",
             score_breakdown=row["score_breakdown"],
+            content_fingerprint=row["content_fingerprint"],
+            scorer_version=row["scorer_version"],
             status=LeadStatus(row["status"]) if row["status"] else LeadStatus.NEW,
             tags=row["tags"],
             created_at=datetime.fromisoformat(row["created_at"]) if row["created_at"] else datetime.now(),
@@ -139,13 +580,15 @@ class LeadDatabase:
             last_scored_at=datetime.fromisoformat(row["last_scored_at"]) if row["last_scored_at"] else None,
             last_contacted_at=datetime.fromisoformat(row["last_contacted_at"]) if row["last_contacted_at"] else None,
             raw_data_json=row["raw_data_json"],
+            effective_score=row["effective_score"] if "effective_score" in row.keys() else None,
+            snippet=row["snippet"] if "snippet" in row.keys() else None,
         )
 
     # === DEDUPLICATION ===
 
     def find_duplicate(self, raw_lead: RawLead) -> Optional[Lead]:
         """Find an existing lead that matches the raw lead (deduplication)."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
 
             # Check by source + source_id first (strongest match)
@@ -158,31 +601,17 @@ class LeadDatabase:
                 if row:
                     return self._row_to_lead(row)
 
-            # Check by email (strong match)
-            if raw_lead.email:
-                cursor.execute(
-                    "SELECT * FROM leads WHERE email = ? COLLATE NOCASE",
-                    (raw_lead.email.lower(),)
-                )
-                row = cursor.fetchone()
-                if row:
-                    return self._row_to_lead(row)
-
-            # Check by phone (strong match)
-            if raw_lead.phone:
-                # Normalize phone for comparison
-                phone_digits = ''.join(c for c in raw_lead.phone if c.isdigit())
-                cursor.execute("SELECT * FROM leads WHERE phone LIKE ?", (f"%{phone_digits[-10:]}%",))
-                row = cursor.fetchone()
-                if row:
-                    return self._row_to_lead(row)
-
-            # Check by username + source (moderate match)
-            if raw_lead.username:
-                cursor.execute(
-                    "SELECT * FROM leads WHERE username = ? COLLATE NOCASE AND source = ?",
-                    (raw_lead.username.lower(), raw_lead.source)
-                )
+            # Then email, phone (strong matches) and username + source (moderate),
+            # each an equality probe on its normalized key
+            probes = [
+                ("email_key = ?", (normalize_email(raw_lead.email),)),
+                ("phone_key = ?", (normalize_phone(raw_lead.phone),)),
+                ("username_key = ? AND source = ?", (normalize_username(raw_lead.username), raw_lead.source)),
+            ]
+            for condition, params in probes:
+                if not params[0]:
+                    continue
+                cursor.execute(f"SELECT * FROM leads WHERE {condition} ORDER BY id LIMIT 1", params)
                 row = cursor.fetchone()
                 if row:
                     return self._row_to_lead(row)
@@ -196,43 +625,26 @@ class LeadDatabase:
         Insert or update a lead from raw import data.
         Returns (lead, is_new) tuple.
         """
-        existing = self.find_duplicate(raw_lead)
+        with self.transaction():
+            existing = self.find_duplicate(raw_lead)
 
-        if existing:
-            # Merge data into existing lead
-            return self._merge_lead(existing, raw_lead), False
-        else:
-            # Create new lead
-            return self._create_lead(raw_lead), True
+            if existing:
+                # Merge data into existing lead
+                return self._merge_lead(existing, raw_lead), False
+            else:
+                # Create new lead
+                return self._create_lead(raw_lead), True
 
     def _create_lead(self, raw_lead: RawLead) -> Lead:
         """Create a new lead from raw data."""
-        now = datetime.now()
+        now = datetime.now().isoformat()
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                INSERT INTO leads (
-                    source, source_id, name, email, phone, username, profile_url,
-                    bio, notes, messages_json, comments_json, raw_data_json,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                raw_lead.source,
-                raw_lead.source_id,
-                raw_lead.name,
-                raw_lead.email.lower() if raw_lead.email else None,
-                raw_lead.phone,
-                raw_lead.username,
-                raw_lead.profile_url,
-                raw_lead.bio,
-                raw_lead.notes,
-                json.dumps(raw_lead.messages) if raw_lead.messages else None,
-                json.dumps(raw_lead.comments) if raw_lead.comments else None,
-                json.dumps(raw_lead.raw_data) if raw_lead.raw_data else None,
-                now.isoformat(),
-                now.isoformat(),
-            ))
+            cursor.execute(f"""
+                INSERT INTO leads ({', '.join(NEW_LEAD_COLUMNS)})
+                VALUES ({', '.join('?' * len(NEW_LEAD_COLUMNS))})
+            """, _new_lead_values(raw_lead, now))
 
             lead_id = cursor.lastrowid
 
@@ -240,7 +652,7 @@ class LeadDatabase:
             cursor.execute("""
                 INSERT INTO interactions (lead_id, interaction_type, content, created_at)
                 VALUES (?, ?, ?, ?)
-            """, (lead_id, InteractionType.IMPORT.value, f"Imported from {raw_lead.source}", now.isoformat()))
+            """, (lead_id, InteractionType.IMPORT.value, f"Imported from {raw_lead.source}", now))
 
         return self.get_lead(lead_id)
 
@@ -248,98 +660,142 @@ class LeadDatabase:
         """Merge new raw data into an existing lead."""
         now = datetime.now()
 
-        # Merge fields (prefer non-null values, update if new has data)
-        updates = []
-        params = []
-
-        if raw_lead.name and not existing.name:
-            updates.append("name = ?")
-            params.append(raw_lead.name)
-
-        if raw_lead.email and not existing.email:
-            updates.append("email = ?")
-            params.append(raw_lead.email.lower())
-
-        if raw_lead.phone and not existing.phone:
-            updates.append("phone = ?")
-            params.append(raw_lead.phone)
-
-        if raw_lead.bio:
-            # Append bio
-            new_bio = f"{existing.bio or ''}\n{raw_lead.bio}".strip()
-            updates.append("bio = ?")
-            params.append(new_bio)
-
-        if raw_lead.notes:
-            # Append notes
-            new_notes = f"{existing.notes or ''}\n{raw_lead.notes}".strip()
-            updates.append("notes = ?")
-            params.append(new_notes)
-
-        # Merge messages
-        if raw_lead.messages:
-            existing_msgs = json.loads(existing.messages_json) if existing.messages_json else []
-            merged_msgs = list(set(existing_msgs + raw_lead.messages))
-            updates.append("messages_json = ?")
-            params.append(json.dumps(merged_msgs))
-
-        # Merge comments
-        if raw_lead.comments:
-            existing_comments = json.loads(existing.comments_json) if existing.comments_json else []
-            merged_comments = list(set(existing_comments + raw_lead.comments))
-            updates.append("comments_json = ?")
-            params.append(json.dumps(merged_comments))
-
-        updates.append("updated_at = ?")
-        params.append(now.isoformat())
-
-        if updates:
-            params.append(existing.id)
-            with self._get_connection() as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    f"UPDATE leads SET {', '.join(updates)} WHERE id = ?",
-                    params
-                )
+        current = {column: getattr(existing, column) for column in MERGED_COLUMNS}
+        changes = _merge_changes(current, raw_lead)
+        changes["updated_at"] = now.isoformat()
 
-                # Log merge
-                cursor.execute("""
-                    INSERT INTO interactions (lead_id, interaction_type, content, created_at)
-                    VALUES (?, ?, ?, ?)
-                """, (existing.id, InteractionType.IMPORT.value, f"Merged data from {raw_lead.source}", now.isoformat()))
+        with self._get_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE leads SET {', '.join(f'{c} = ?' for c in changes)} WHERE id = ?",
+                [*changes.values(), existing.id]
+            )
+
+            # Log merge
+            cursor.execute("""
+                INSERT INTO interactions (lead_id, interaction_type, content, created_at)
+                VALUES (?, ?, ?, ?)
+            """, (existing.id, InteractionType.IMPORT.value, f"Merged data from {raw_lead.source}", now.isoformat()))
 
         return self.get_lead(existing.id)
 
+    def insert_many(self, raw_leads: Iterable[RawLead]) -> ImportResult:
+        """Insert or merge a batch of raw leads in one transaction.
+
+        Gives the same result as calling ``insert_lead`` for each lead in
+        order (same dedup precedence, merges and interactions, including
+        duplicates within the batch), but existing matches for the whole
+        batch are found with a few set-based queries against a temp table,
+        merging happens in memory, and everything is written with
+        ``executemany``. Returns an ``ImportResult`` with ``new_count`` and
+        ``merged_count`` set.
+        """
+        raw_leads = list(raw_leads)
+        sources = {raw.source for raw in raw_leads}
+        result = ImportResult(source=sources.pop() if len(sources) == 1 else "mixed", leads=raw_leads)
+        if not raw_leads:
+            return result
+
+        now = datetime.now().isoformat()
+        with self.transaction() as conn:
+            index = _BatchDedupIndex(raw_leads)
+            states = index.seed(conn)
+
+            next_id = conn.execute("""
+                SELECT MAX(
+                    COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'leads'), 0),
+                    COALESCE((SELECT MAX(id) FROM leads), 0)
+                ) + 1
+            """).fetchone()[0]
+            created: List[int] = []
+            merged = set()
+            interactions = []
+
+            for raw in raw_leads:
+                lead_id = index.find(raw)
+                if lead_id is None:
+                    lead_id = next_id
+                    next_id += 1
+                    states[lead_id] = dict(zip(NEW_LEAD_COLUMNS, _new_lead_values(raw, now)))
+                    created.append(lead_id)
+                    index.add(lead_id, states[lead_id])
+                    interactions.append((lead_id, f"Imported from {raw.source}"))
+                    result.new_count += 1
+                else:
+                    state = states[lead_id]
+                    changes = _merge_changes(state, raw)
+                    state.update(changes, updated_at=now)
+                    if "email_key" in changes or "phone_key" in changes:
+                        index.add(lead_id, state)
+                    if lead_id not in created:
+                        merged.add(lead_id)
+                    interactions.append((lead_id, f"Merged data from {raw.source}"))
+                    result.merged_count += 1
+
+            conn.executemany(f"""
+                INSERT INTO leads (id, {', '.join(NEW_LEAD_COLUMNS)})
+                VALUES (?, {', '.join('?' * len(NEW_LEAD_COLUMNS))})
+            """, [(i, *(states[i][c] for c in NEW_LEAD_COLUMNS)) for i in created])
+            conn.executemany(f"""
+                UPDATE leads SET {', '.join(f'{c} = ?' for c in MERGE_WRITE_COLUMNS)}, updated_at = ?
+                WHERE id = ?
+            """, [(*(states[i][c] for c in MERGE_WRITE_COLUMNS), now, i) for i in sorted(merged)])
+            conn.executemany("""
+                INSERT INTO interactions (lead_id, interaction_type, content, created_at)
+                VALUES (?, ?, ?, ?)
+            """, [(i, InteractionType.IMPORT.value, content, now) for i, content in interactions])
+
+        return result
+
     def get_lead(self, lead_id: int) -> Optional[Lead]:
         """Get a lead by ID."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("SELECT * FROM leads WHERE id = ?", (lead_id,))
             row = cursor.fetchone()
             return self._row_to_lead(row) if row else None
 
     def update_lead(self, lead: Lead) -> Lead:
-        """Update a lead in the database."""
-        lead.updated_at = datetime.now()
+        """Update a lead in the database.
+
+        ``updated_at`` (the lead's activity time for score decay) moves only
+        when an ``ACTIVITY_COLUMNS`` value changed, so saving new scores
+        alone doesn't make a lead fresh again.
+        """
+        activity = (
+            lead.name, lead.email, lead.phone, lead.username, lead.profile_url,
+            lead.bio, lead.notes, lead.messages_json, lead.comments_json,
+            lead.status.value, lead.tags,
+            lead.last_contacted_at.isoformat() if lead.last_contacted_at else None,
+        )
 
         with self._get_connection() as conn:
             cursor = conn.cursor()
+            stored = cursor.execute(
+                f"SELECT {', '.join(ACTIVITY_COLUMNS)} FROM leads WHERE id = ?", (lead.id,)
+            ).fetchone()
+            if stored is None or tuple(stored) != activity:
+                lead.updated_at = datetime.now()
             cursor.execute("""
                 UPDATE leads SET
                     name = ?, email = ?, phone = ?, username = ?, profile_url = ?,
                     bio = ?, notes = ?, messages_json = ?, comments_json = ?,
                     score = ?, tier = ?, score_breakdown = ?,
+                    content_fingerprint = ?, scorer_version = ?,
                     status = ?, tags = ?,
-                    updated_at = ?, last_scored_at = ?, last_contacted_at = ?
+                    updated_at = ?, last_scored_at = ?, last_contacted_at = ?,
+                    email_key = ?, phone_key = ?, username_key = ?
                 WHERE id = ?
             """, (
                 lead.name, lead.email, lead.phone, lead.username, lead.profile_url,
                 lead.bio, lead.notes, lead.messages_json, lead.comments_json,
                 lead.score, lead.tier, lead.score_breakdown,
+                lead.content_fingerprint, lead.scorer_version,
                 lead.status.value, lead.tags,
                 lead.updated_at.isoformat(),
                 lead.last_scored_at.isoformat() if lead.last_scored_at else None,
                 lead.last_contacted_at.isoformat() if lead.last_contacted_at else None,
+                *contact_keys(lead.email, lead.phone, lead.username),
                 lead.id
             ))
 
@@ -355,10 +811,31 @@ class LeadDatabase:
 
     # === SCORING ===
 
-    def score_lead(self, lead: Lead, scorer: Optional[LeadScorer] = None) -> Lead:
-        """Score a single lead and update the database."""
+    def is_score_current(self, lead: Lead, scorer: LeadScorer) -> bool:
+        """Whether the lead's stored score was computed from its current text and signals."""
+        return (
+            lead.scorer_version == scorer.version
+            and lead.content_fingerprint == content_fingerprint(
+                lead.notes, lead.bio, lead.messages_json, lead.comments_json
+            )
+        )
+
+    def score_lead(
+        self,
+        lead: Lead,
+        scorer: Optional[LeadScorer] = None,
+        force: bool = False
+    ) -> Lead:
+        """Score a single lead and update the database.
+
+        Leads whose text and scorer version are unchanged since the last
+        scoring are returned as-is unless ``force`` is set.
+        """
         if scorer is None:
-            scorer = LeadScorer()
+            scorer = get_shared_scorer()
+
+        if not force and self.is_score_current(lead, scorer):
+            return lead
 
         # Build text for scoring
         messages = json.loads(lead.messages_json) if lead.messages_json else []
@@ -368,33 +845,404 @@ class LeadDatabase:
             notes=lead.notes or "",
             bio=lead.bio or "",
             messages=messages,
-            comments=comments
+            comments=comments,
+            source=lead.source
         )
 
         # Update lead
         lead.score = result.total_score
         lead.tier = result.tier
-        lead.score_breakdown = json.dumps({
-            "matches": [
-                {"phrase": m.signal.phrase, "weight": m.signal.weight, "category": m.signal.category.value}
-                for m in result.matches
-            ],
-            "category_scores": {k.value: v for k, v in result.category_scores.items()}
-        })
+        model = self.get_conversion_model()
+        if model is not None:
+            probability = model.predict((m.signal.phrase for m in result.matches), lead.source)
+            lead.score = int(blend_scores(
+                np.array([result.total_score]), np.array([probability]), self.get_scoring_config()
+            )[0])
+            lead.tier = scorer.tier_for(lead.score)
+        lead.score_breakdown = _breakdown_json(result)
+        lead.content_fingerprint = content_fingerprint(
+            lead.notes, lead.bio, lead.messages_json, lead.comments_json
+        )
+        lead.scorer_version = scorer.version
         lead.last_scored_at = datetime.now()
 
-        return self.update_lead(lead)
+        lead = self.update_lead(lead)
+        if model is not None:
+            with self._get_connection() as conn:
+                self._set_ml_blended(conn, True)
+        self._refresh_decayed_tiers(" AND id = ?", [lead.id])
+        lead.tier = self.get_lead(lead.id).tier
+        return lead
+
+    def score_all_leads(
+        self,
+        scorer: Optional[LeadScorer] = None,
+        workers: int = 1,
+        chunk_size: int = 1000,
+        force: bool = False
+    ) -> int:
+        """Score all leads in the database. Returns count scored.
+
+        Leads are streamed out in chunks of ``chunk_size`` and written back with
+        one ``executemany`` per chunk, each chunk its own short transaction so
+        imports and the API can write in between. With
+        ``workers > 1`` chunks are scored on a process pool while the next
+        chunks are read; ``workers=0`` uses one worker per CPU.
+
+        Leads whose content fingerprint and scorer version match the stored
+        ones are skipped unless ``force`` is set. With a conversion model,
+        each chunk is blended as it is written, so the cost follows the
+        number of leads rescored. The persisted match matrix used for what-if
+        re-weighting and ``ml apply`` goes stale and is rebuilt when next
+        loaded (see ``load_match_matrix``).
+        """
+        if scorer is None:
+            scorer = get_shared_scorer()
+        if workers <= 0:
+            workers = os.cpu_count() or 1
+        model = self.get_conversion_model()
+
+        count = 0
+        started = datetime.now().isoformat()
+        chunks = self._iter_scoring_chunks(chunk_size, None if force else scorer.version)
+        if workers == 1:
+            for rows in chunks:
+                scored = self._blend_scored(_score_rows(scorer, rows), rows, model, scorer)
+                count += self._write_scores(scored)
+        else:
+            count += self._score_chunks_in_pool(chunks, scorer, workers, model)
+
+        if count:
+            self._refresh_decayed_tiers(" AND last_scored_at >= ?", [started])
+            if model is not None:
+                with self._get_connection() as conn:
+                    self._set_ml_blended(conn, True)
+        if model is None:
+            # No-op unless scores blended earlier need putting back on the rule scores
+            self.apply_ml_scores(scorer=scorer)
+        self.apply_score_decay()
+
+        return count
+
+    def _score_chunks_in_pool(
+        self,
+        chunks: Iterator[List[ScoringRow]],
+        scorer: LeadScorer,
+        workers: int,
+        model: Optional[ConversionModel] = None
+    ) -> int:
+        """Score chunks on a process pool, writing results as they complete."""
+        count = 0
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_score_worker,
+            initargs=(scorer.signals, scorer.config),
+        ) as pool:
+            # Keep a bounded number of chunks in flight so memory stays flat
+            pending: Dict[Any, List[ScoringRow]] = {}
+            for rows in chunks:
+                pending[pool.submit(_score_rows_in_worker, rows)] = rows
+                if len(pending) >= workers * 2:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        rows = pending.pop(future)
+                        count += self._write_scores(
+                            self._blend_scored(future.result(), rows, model, scorer)
+                        )
+            for future, rows in pending.items():
+                count += self._write_scores(
+                    self._blend_scored(future.result(), rows, model, scorer)
+                )
+        return count
+
+    def _iter_scoring_chunks(
+        self,
+        chunk_size: int,
+        skip_version: Optional[str] = None
+    ) -> Iterator[List[ScoringRow]]:
+        """Stream the text columns needed for scoring, ``chunk_size`` rows at a time.
+
+        When ``skip_version`` is given, leads already scored with that version
+        whose text fingerprint is unchanged are left out of the chunks.
+        """
+        pending: List[ScoringRow] = []
+        batches = self._iter_row_batches(
+            "id, source, notes, bio, messages_json, comments_json, content_fingerprint, scorer_version",
+            batch_size=chunk_size,
+        )
+        for rows in batches:
+            for row in rows:
+                scoring_row = tuple(row)[:6]
+                if (
+                    skip_version is not None
+                    and row[7] == skip_version
+                    and row[6] == content_fingerprint(*scoring_row[2:])
+                ):
+                    continue
+                pending.append(scoring_row)
+
+            if len(pending) >= chunk_size:
+                yield pending
+                pending = []
+
+        if pending:
+            yield pending
+
+    @property
+    def match_matrix_path(self) -> Path:
+        """Where the leads x signals match matrix is persisted (next to the database)."""
+        return self.db_path.with_name(f"{self.db_path.stem}.matches.npz")
+
+    def build_match_matrix(self, scorer: Optional[LeadScorer] = None) -> SignalMatchMatrix:
+        """Build the match matrix from stored score breakdowns (no text is rescanned)."""
+        if scorer is None:
+            scorer = get_shared_scorer()
+
+        built_at = datetime.now().isoformat()
+        batches = self._iter_row_batches(
+            "id, source, score_breakdown", where="last_scored_at IS NOT NULL", batch_size=5000
+        )
+        rows = (tuple(row) for batch in batches for row in batch)
+        return SignalMatchMatrix.from_breakdowns(rows, scorer.signals, scorer.version, built_at)
+
+    def save_match_matrix(self, scorer: Optional[LeadScorer] = None) -> SignalMatchMatrix:
+        """Rebuild and persist the match matrix."""
+        matrix = self.build_match_matrix(scorer)
+        matrix.save(self.match_matrix_path)
+        return matrix
+
+    def load_match_matrix(self, scorer: Optional[LeadScorer] = None) -> SignalMatchMatrix:
+        """Load the persisted match matrix, rebuilding it if missing or stale.
+
+        It is stale when built for other signals or when any lead was scored
+        after it was built (``score_lead`` doesn't touch the matrix).
+        """
+        if scorer is None:
+            scorer = get_shared_scorer()
+        if self.match_matrix_path.exists():
+            matrix = SignalMatchMatrix.load(self.match_matrix_path)
+            if matrix.signal_version == scorer.version and matrix.built_at:
+                with self._read_connection() as conn:
+                    rescored = conn.execute(
+                        "SELECT 1 FROM leads WHERE last_scored_at > ? LIMIT 1", (matrix.built_at,)
+                    ).fetchone()
+                if rescored is None:
+                    return matrix
+        return self.save_match_matrix(scorer)
+
+    # === SCORE DECAY ===
+
+    def get_scoring_config(self) -> ScoringConfig:
+        """Config for tiers and decay: the explicit one, else the shared scorer's."""
+        if self.scoring_config is not None:
+            return self.scoring_config
+        return get_shared_scorer().current_config()
+
+    def apply_score_decay(self, now: Optional[datetime] = None) -> int:
+        """Materialize tier changes caused by score decay. Returns leads updated.
+
+        Scores are never rewritten; decay is applied at query time (see
+        ``effective_score_sql``). Only the stored ``tier`` is kept in step, and
+        only for leads whose decay period boundary was crossed, or whose
+        activity changed, since the previous pass: each boundary ``k`` maps
+        the interval since that pass to one range scan on the activity index.
+        The first pass, or one after the decay settings change, checks every
+        lead. With decay disabled, tiers lowered by earlier passes are
+        restored once.
+        """
+        if now is None:
+            now = datetime.now()
+        config = self.get_scoring_config()
+        factors = config.decay_factors()
+        settings = json.dumps([
+            config.decay_days if factors else None, config.decay_rate if factors else None,
+            config.hot_threshold, config.warm_threshold, config.lukewarm_threshold,
+        ])
+        now_jd = julian_day(now)
+
+        with self._get_connection() as conn:
+            state = dict(conn.execute(
+                "SELECT key, value FROM engine_state WHERE key IN ('decay_pass_at', 'decay_settings')"
+            ).fetchall())
+
+            if not factors and "decay_pass_at" not in state:
+                return 0
+
+            where = ""
+            params: List[Any] = []
+            last_jd = float(state["decay_pass_at"]) if "decay_pass_at" in state else None
+            if factors and last_jd is not None and state.get("decay_settings") == settings:
+                # Boundaries beyond which even the top score is below every threshold can't matter
+                max_score = conn.execute("SELECT MAX(score) FROM leads").fetchone()[0] or 0
+                periods = 1
+                while periods < len(factors) and factors[periods] * max_score >= config.lukewarm_threshold:
+                    periods += 1
+
+                ranges: List[Tuple[float, float]] = []
+                for k in range(periods + 1):
+                    low = last_jd - ACTIVITY_RESOLUTION - k * config.decay_days
+                    high = now_jd + ACTIVITY_RESOLUTION - k * config.decay_days
+                    if ranges and high >= ranges[-1][0]:
+                        ranges[-1] = (low, ranges[-1][1])
+                    else:
+                        ranges.append((low, high))
+                where = " AND (" + " OR ".join(
+                    f"({ACTIVITY_SQL} > ? AND {ACTIVITY_SQL} <= ?)" for _ in ranges
+                ) + ")"
+                for low, high in ranges:
+                    params.extend([low, high])
+
+            changed = self._refresh_tiers(conn, config, now, where, params)
+
+            if factors:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO engine_state (key, value) VALUES (?, ?)",
+                    [("decay_pass_at", repr(now_jd)), ("decay_settings", settings)],
+                )
+            else:
+                conn.execute(
+                    "DELETE FROM engine_state WHERE key IN ('decay_pass_at', 'decay_settings')"
+                )
+            return changed
+
+    def _refresh_tiers(
+        self,
+        conn: sqlite3.Connection,
+        config: ScoringConfig,
+        now: datetime,
+        where: str = "",
+        params: Sequence[Any] = ()
+    ) -> int:
+        """Set ``tier`` from the effective score for leads matching ``where``; returns changes."""
+        effective = effective_score_sql(config, now)
+        changed = [
+            (new_tier, lead_id)
+            for lead_id, tier, score in conn.execute(
+                f"SELECT id, tier, {effective} FROM leads WHERE 1=1{where}", params
+            )
+            for new_tier in (tier_for_score(score, config),)
+            if new_tier != tier
+        ]
+        conn.executemany("UPDATE leads SET tier = ? WHERE id = ?", changed)
+        return len(changed)
+
+    def _refresh_decayed_tiers(self, where: str, params: Sequence[Any]):
+        """Put just-scored leads matching ``where`` on the tier of their decayed score.
+
+        Scoring writes the raw score's tier, and the incremental decay pass
+        only revisits leads whose activity or decay period changed.
+        """
+        config = self.get_scoring_config()
+        if config.decay_factors():
+            with self._get_connection() as conn:
+                self._refresh_tiers(conn, config, datetime.now(), where, params)
+
+    # === ML BLENDING ===
 
-    def score_all_leads(self, scorer: Optional[LeadScorer] = None) -> int:
-        """Score all leads in the database. Returns count scored."""
+    def get_conversion_model(self) -> Optional[ConversionModel]:
+        """The conversion model to blend, or None when ML scoring is off or untrained."""
+        config = self.get_scoring_config()
+        if not config.use_ml_scoring:
+            return None
+        return load_conversion_model(Path(config.ml_model_path) if config.ml_model_path else None)
+
+    def apply_ml_scores(
+        self,
+        model: Optional[ConversionModel] = None,
+        scorer: Optional[LeadScorer] = None
+    ) -> int:
+        """Blend model probabilities into every scored lead's score. Returns leads changed.
+
+        Rule scores are recomputed from the match matrix (no text is read),
+        the model scores all leads in one vectorized call, and only rows whose
+        blended score changed are written. Leads scored with another scorer
+        version than the matrix are left alone. Tiers are then refreshed from
+        the (decayed) blended scores.
+
+        With ML scoring off, scores blended by earlier passes are put back on
+        the rule scores once.
+        """
         if scorer is None:
-            scorer = LeadScorer()
+            scorer = get_shared_scorer()
+        if model is None:
+            model = self.get_conversion_model()
+        if model is None:
+            with self._read_connection() as conn:
+                blended_before = conn.execute(
+                    "SELECT 1 FROM engine_state WHERE key = 'ml_blended'"
+                ).fetchone()
+            if blended_before is None:
+                return 0
+
+        config = self.get_scoring_config()
+        matrix = self.load_match_matrix(scorer)
+        scores = matrix.scores(scorer.signals, scorer.config)
+        if model is not None and len(matrix):
+            scores = blend_scores(scores, model.predict_matrix(matrix, scorer.signals), config)
 
-        leads = self.get_all_leads()
-        for lead in leads:
-            self.score_lead(lead, scorer)
+        with self._get_connection() as conn:
+            stored = dict(conn.execute(
+                "SELECT id, score FROM leads WHERE last_scored_at IS NOT NULL AND scorer_version = ?",
+                (matrix.signal_version,),
+            ))
+            changed = [
+                (score, lead_id)
+                for lead_id, score in zip(matrix.lead_ids.tolist(), scores.tolist())
+                if stored.get(lead_id, score) != score
+            ]
+            conn.executemany("UPDATE leads SET score = ? WHERE id = ?", changed)
+            if changed:
+                self._refresh_tiers(conn, config, datetime.now())
+            self._set_ml_blended(conn, model is not None)
+        return len(changed)
+
+    def _blend_scored(
+        self,
+        scored: List[ScoredRow],
+        rows: Sequence[ScoringRow],
+        model: Optional[ConversionModel],
+        scorer: LeadScorer
+    ) -> List[ScoredRow]:
+        """Blend ``model`` into a chunk of scoring results before it is written.
+
+        Builds a match matrix over just this chunk's breakdowns, so blending
+        costs the same per lead as in ``apply_ml_scores``.
+        """
+        if model is None or not scored:
+            return scored
+        sources = {row[0]: row[1] for row in rows}
+        matrix = SignalMatchMatrix.from_breakdowns(
+            ((lead_id, sources[lead_id], breakdown) for _, _, breakdown, *_, lead_id in scored),
+            scorer.signals,
+            scorer.version,
+        )
+        scores = blend_scores(
+            np.array([row[0] for row in scored]),
+            model.predict_matrix(matrix, scorer.signals),
+            self.get_scoring_config(),
+        )
+        return [
+            (score, scorer.tier_for(score), *row[2:])
+            for row, score in zip(scored, scores.tolist())
+        ]
+
+    def _set_ml_blended(self, conn: sqlite3.Connection, blended: bool):
+        """Record whether stored scores may include a model blend."""
+        if blended:
+            conn.execute("INSERT OR REPLACE INTO engine_state (key, value) VALUES ('ml_blended', '1')")
+        else:
+            conn.execute("DELETE FROM engine_state WHERE key = 'ml_blended'")
 
-        return len(leads)
+    def _write_scores(self, scored: List[ScoredRow]) -> int:
+        """Write a chunk of scoring results in one transaction."""
+        with self._get_connection() as conn:
+            conn.executemany("""
+                UPDATE leads SET score = ?, tier = ?, score_breakdown = ?,
+                    content_fingerprint = ?, scorer_version = ?,
+                    last_scored_at = ?
+                WHERE id = ?
+            """, scored)
+        return len(scored)
 
     # === QUERIES ===
 
@@ -404,10 +1252,29 @@ class LeadDatabase:
         tier: Optional[str] = None,
         min_score: Optional[int] = None,
         limit: int = 1000,
-        offset: int = 0
+        offset: int = 0,
+        fields: Optional[Sequence[str]] = None
     ) -> List[Lead]:
-        """Get leads with optional filters."""
-        query = "SELECT * FROM leads WHERE 1=1"
+        """Get leads with optional filters, highest (decayed) score first.
+
+        With score decay enabled, ``min_score`` and the ordering use the
+        effective score at query time (also returned as ``Lead.effective_score``).
+        ``min_score`` is the same filter as in ``get_leads_page``: the indexed
+        stored score narrows the rows (decay never raises a score) and the
+        decay expression is evaluated on those. Ordering by the decayed score
+        has no index, so it sorts every matching row; ``get_leads_page``
+        orders by the stored score instead and pages through the index.
+
+        With ``fields``, only those columns (plus ``id`` and
+        ``effective_score``) are read and each result is a ``LeadRow``
+        instead of a full ``Lead``, leaving the large text and JSON columns
+        on disk. Raises ValueError for an unknown field.
+        """
+        effective = effective_score_sql(self.get_scoring_config(), datetime.now())
+        columns = "*"
+        if fields is not None:
+            columns = ", ".join(c for c in projection_columns(fields) if c != "effective_score")
+        query = f"SELECT {columns}, {effective} AS effective_score FROM leads WHERE 1=1"
         params: List[Any] = []
 
         if status:
@@ -419,16 +1286,164 @@ class LeadDatabase:
             params.append(tier)
 
         if min_score is not None:
-            query += " AND score >= ?"
-            params.append(min_score)
+            condition, values = _min_score_condition(effective, min_score)
+            query += f" AND {condition}"
+            params.extend(values)
 
-        query += " ORDER BY score DESC LIMIT ? OFFSET ?"
+        query += " ORDER BY effective_score DESC LIMIT ? OFFSET ?"
         params.extend([limit, offset])
 
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute(query, params)
-            return [self._row_to_lead(row) for row in cursor.fetchall()]
+            rows = cursor.fetchall()
+        if fields is not None:
+            return [LeadRow(row) for row in rows]
+        return [self._row_to_lead(row) for row in rows]
+
+    def get_leads_page(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        status: Optional[LeadStatus] = None,
+        tier: Optional[str] = None,
+        source: Optional[str] = None,
+        min_score: Optional[int] = None,
+        query: Optional[str] = None
+    ) -> LeadPage:
+        """One page of leads, highest stored score first, with cursor pagination.
+
+        Pages are ordered by the stored score (which the indexes cover);
+        each lead's decayed ``effective_score`` is filled in for display.
+        ``min_score`` applies to the decayed score, as in ``get_all_leads``,
+        evaluated only on rows the stored-score index lets through.
+
+        All filters (including ``query``, a ``search_leads``-style match) are
+        applied in SQL before the limit. Pass the returned ``next_cursor``
+        to get the following page: it resumes after the last row, so every
+        page costs the same however deep it is. ``total`` is counted from
+        the indexes on the first page and carried in the cursor. Raises
+        ValueError for a malformed cursor or one from different filters.
+        """
+        wheres: List[str] = []
+        params: List[Any] = []
+        if status:
+            wheres.append("status = ?")
+            params.append(status.value)
+        if tier:
+            wheres.append("tier = ?")
+            params.append(tier)
+        if source:
+            wheres.append("source = ?")
+            params.append(source)
+        if query:
+            match = match_expression(query, self._search_tokenizer)
+            if match is None:
+                wheres.append(f"({SEARCH_LIKE_SQL})")
+                params.extend([f"%{query}%"] * 6)
+            else:
+                wheres.append("id IN (SELECT rowid FROM leads_fts WHERE leads_fts MATCH ?)")
+                params.append(match)
+        effective = effective_score_sql(self.get_scoring_config(), datetime.now())
+        # The cursor key covers ``min_score`` but not the decay expression, which embeds "now"
+        key = filters_key(" AND ".join(wheres) or "1=1", [*params, min_score])
+        if min_score is not None:
+            condition, values = _min_score_condition(effective, min_score)
+            wheres.append(condition)
+            params.extend(values)
+        where = " AND ".join(wheres) or "1=1"
+
+        columns = f"*, {effective} AS effective_score"
+        with self._read_connection() as conn:
+            if cursor:
+                after_score, after_id, total = decode_cursor(cursor, key)
+                after, after_params = keyset_after(after_score, after_id)
+                rows = conn.execute(
+                    f"SELECT {columns} FROM leads WHERE {where} AND {after} ORDER BY {LEAD_PAGE_ORDER} LIMIT ?",
+                    (*params, *after_params, limit + 1)
+                ).fetchall()
+            else:
+                total = conn.execute(f"SELECT COUNT(*) FROM leads WHERE {where}", params).fetchone()[0]
+                rows = conn.execute(
+                    f"SELECT {columns} FROM leads WHERE {where} ORDER BY {LEAD_PAGE_ORDER} LIMIT ?",
+                    (*params, limit + 1)
+                ).fetchall()
+
+        leads = [self._row_to_lead(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            next_cursor = encode_cursor(leads[-1].score, leads[-1].id, total, key)
+        return LeadPage(leads=leads, total=total, next_cursor=next_cursor)
+
+    def iter_leads(
+        self,
+        batch_size: int = 1000,
+        where: Optional[str] = None,
+        params: Sequence[Any] = (),
+        order_key: str = "id",
+        fields: Optional[Sequence[str]] = None
+    ) -> Iterator[Lead]:
+        """Stream every lead (optionally filtered) in constant memory.
+
+        Rows are read ``batch_size`` at a time with keyset pagination, so
+        each batch is an index seek no matter how deep into the table it is
+        and only one batch is held at once. ``where`` is an SQL condition on
+        ``leads`` columns with ``params`` as its placeholder values.
+        ``order_key`` is ``"id"`` (ascending) or ``"score"`` (stored score,
+        highest first, then id).
+
+        Each batch is its own read snapshot: leads inserted while iterating
+        may or may not be seen, and with ``order_key="score"`` a lead whose
+        score changes mid-iteration can be skipped or seen twice.
+
+        With ``fields``, yields ``LeadRow`` views of just those columns (plus
+        the order key's) instead of full ``Lead`` objects.
+        """
+        if fields is None:
+            for rows in self._iter_row_batches("*", where, params, order_key, batch_size):
+                yield from (self._row_to_lead(row) for row in rows)
+            return
+        if "effective_score" in fields:
+            raise ValueError("iter_leads can't project effective_score; use get_all_leads")
+        required = ("id", "score") if order_key == "score" else ("id",)
+        columns = ", ".join(projection_columns(fields, required))
+        for rows in self._iter_row_batches(columns, where, params, order_key, batch_size):
+            yield from (LeadRow(row) for row in rows)
+
+    def _iter_row_batches(
+        self,
+        columns: str,
+        where: Optional[str] = None,
+        params: Sequence[Any] = (),
+        order_key: str = "id",
+        batch_size: int = 1000,
+        conn: Optional[sqlite3.Connection] = None
+    ) -> Iterator[List[sqlite3.Row]]:
+        """Keyset-paginated batches of ``columns`` (which must include the order key columns).
+
+        Reads from ``conn`` when given (e.g. inside a transaction), otherwise
+        takes a pooled reader for each batch.
+        """
+        if order_key not in LEAD_ORDER_KEYS:
+            raise ValueError(f"Unknown order key {order_key!r}; expected one of {sorted(LEAD_ORDER_KEYS)}")
+        order_by, after, after_values = LEAD_ORDER_KEYS[order_key]
+        filters = f"({where})" if where else "1=1"
+
+        query = f"SELECT {columns} FROM leads WHERE {filters} ORDER BY {order_by} LIMIT ?"
+        bindings = (*params, batch_size)
+        while True:
+            if conn is not None:
+                rows = conn.execute(query, bindings).fetchall()
+            else:
+                with self._read_connection() as reader:
+                    rows = reader.execute(query, bindings).fetchall()
+            if not rows:
+                return
+            yield rows
+            if len(rows) < batch_size:
+                return
+            query = f"SELECT {columns} FROM leads WHERE {filters} AND {after} ORDER BY {order_by} LIMIT ?"
+            bindings = (*params, *after_values(rows[-1]), batch_size)
 
     def get_hot_leads(self, limit: int = 50) -> List[Lead]:
         """Get leads in the hot tier."""
@@ -438,49 +1453,156 @@ class LeadDatabase:
         """Get leads in the warm tier."""
         return self.get_all_leads(tier="warm", limit=limit)
 
-    def search_leads(self, query: str, limit: int = 100) -> List[Lead]:
-        """Search leads by name, email, phone, or notes."""
-        search_term = f"%{query}%"
-        with self._get_connection() as conn:
+    def search_leads(self, query: str, limit: int = 100, ranked: bool = False) -> List[Lead]:
+        """Search leads by name, email, phone, username, notes or bio.
+
+        Matches are case-insensitive substrings of any of those fields,
+        answered from the ``leads_fts`` full-text index. By default results
+        are ordered by score; with ``ranked`` they are ordered by relevance
+        (bm25, name and contact fields weighted above free text) and each
+        lead's ``snippet`` shows the best match with ``[brackets]``.
+        Queries too short for the index, or any query when SQLite lacks
+        FTS5, fall back to a table scan.
+        """
+        match = match_expression(query, self._search_tokenizer)
+        with self._read_connection() as conn:
             cursor = conn.cursor()
-            cursor.execute("""
-                SELECT * FROM leads
-                WHERE name LIKE ? OR email LIKE ? OR phone LIKE ?
-                   OR username LIKE ? OR notes LIKE ? OR bio LIKE ?
-                ORDER BY score DESC
-                LIMIT ?
-            """, (search_term,) * 6 + (limit,))
+            if match is None:
+                search_term = f"%{query}%"
+                cursor.execute(f"""
+                    SELECT * FROM leads WHERE {SEARCH_LIKE_SQL}
+                    ORDER BY score DESC
+                    LIMIT ?
+                """, (search_term,) * 6 + (limit,))
+            elif ranked:
+                cursor.execute("""
+                    SELECT leads.*, snippet(leads_fts, -1, '[', ']', '...', 48) AS snippet
+                    FROM leads_fts JOIN leads ON leads.id = leads_fts.rowid
+                    WHERE leads_fts MATCH ?
+                    ORDER BY leads_fts.rank
+                    LIMIT ?
+                """, (match, limit))
+            else:
+                cursor.execute("""
+                    SELECT * FROM leads
+                    WHERE id IN (SELECT rowid FROM leads_fts WHERE leads_fts MATCH ?)
+                    ORDER BY score DESC
+                    LIMIT ?
+                """, (match, limit))
             return [self._row_to_lead(row) for row in cursor.fetchall()]
 
     def get_stats(self) -> Dict[str, Any]:
-        """Get database statistics."""
-        with self._get_connection() as conn:
-            cursor = conn.cursor()
+        """Get database statistics.
 
-            cursor.execute("SELECT COUNT(*) FROM leads")
-            total = cursor.fetchone()[0]
+        Counts and the average come from the trigger-maintained
+        ``lead_stats`` table and max/min from the score index, so this does
+        not scan ``leads``.
+        """
+        with self._read_connection() as conn:
+            stats = read_stats(conn)
+            score_max, score_min = conn.execute(
+                "SELECT (SELECT MAX(score) FROM leads), (SELECT MIN(score) FROM leads)"
+            ).fetchone()
+
+        total, score_sum = stats.get(("all", ""), (0, 0))
+        groups: Dict[str, Dict[str, int]] = {dimension: {} for dimension in STATS_DIMENSIONS}
+        for (dimension, value), (count, _) in stats.items():
+            if dimension in groups:
+                groups[dimension][value] = count
+
+        return {
+            "total_leads": total,
+            "by_tier": groups["tier"],
+            "by_status": groups["status"],
+            "by_source": groups["source"],
+            "score_avg": round(score_sum / total, 1) if total else 0,
+            "score_max": score_max or 0,
+            "score_min": score_min or 0,
+        }
+
+    def check_stats(self, repair: bool = False) -> List[Dict[str, Any]]:
+        """Recount stats from ``leads`` and return every row that drifted.
+
+        With ``repair`` the materialized stats are replaced by the recount.
+        Drift means something wrote to ``leads`` with the triggers missing
+        (e.g. an older schema or a restored file).
+        """
+        with self.transaction() as conn:
+            drift = stats_drift(conn)
+            if drift and repair:
+                rebuild_stats(conn)
+        return drift
 
-            cursor.execute("SELECT tier, COUNT(*) FROM leads GROUP BY tier")
-            tier_counts = {row[0]: row[1] for row in cursor.fetchall()}
+    # === BACKUPS ===
 
-            cursor.execute("SELECT status, COUNT(*) FROM leads GROUP BY status")
-            status_counts = {row[0]: row[1] for row in cursor.fetchall()}
+    def backup(
+        self,
+        backup_dir: Path,
+        keep: int = DEFAULT_KEEP,
+        compress: bool = False,
+        progress: Optional[ProgressCallback] = None
+    ) -> BackupResult:
+        """Take an online backup generation into ``backup_dir`` (see ``storage/backup.py``).
+
+        Writers keep going while it runs; the newest ``keep`` generations
+        are kept and ``compress`` gzips the snapshot.
+        """
+        return backup_database(self.db_path, backup_dir, keep=keep, compress=compress, progress=progress)
 
-            cursor.execute("SELECT source, COUNT(*) FROM leads GROUP BY source")
-            source_counts = {row[0]: row[1] for row in cursor.fetchall()}
+    def restore(self, backup_path: Path) -> int:
+        """Replace this database's contents with a backup generation. Returns pages copied.
 
-            cursor.execute("SELECT AVG(score), MAX(score), MIN(score) FROM leads")
-            score_stats = cursor.fetchone()
+        The schema is brought up to date afterwards, since the backup may
+        predate columns, indexes or triggers added since. Must not be called
+        inside ``transaction()``.
+        """
+        pages = restore_database(backup_path, self.db_path)
+        self._init_db()
+        return pages
 
-            return {
-                "total_leads": total,
-                "by_tier": tier_counts,
-                "by_status": status_counts,
-                "by_source": source_counts,
-                "score_avg": round(score_stats[0] or 0, 1),
-                "score_max": score_stats[1] or 0,
-                "score_min": score_stats[2] or 0,
-            }
+    # === COLUMNAR EXPORT ===
+
+    def export_parquet(
+        self,
+        out_dir: Path,
+        tables: Sequence[str] = SNAPSHOT_TABLES,
+        tier: Optional[str] = None,
+        batch_size: int = EXPORT_BATCH_ROWS
+    ) -> Dict[str, int]:
+        """Export lead tables to ``out_dir/<table>.parquet``; returns rows per table.
+
+        All tables come from one read snapshot, streamed in record batches
+        (see ``storage/columnar.py``). With ``tier``, interactions and
+        events are limited to that tier's leads. Needs pyarrow.
+        """
+        filters = None
+        if tier:
+            by_lead = ("lead_id IN (SELECT id FROM leads WHERE tier = ?)", (tier,))
+            filters = {"leads": ("tier = ?", (tier,)), "interactions": by_lead, "lead_events": by_lead}
+        with self._read_connection() as conn:
+            return write_snapshot(conn, out_dir, tables, batch_size, filters)
+
+    @property
+    def snapshot_dir(self) -> Path:
+        """Where ``snapshot()`` keeps this database's analytics snapshot."""
+        return self.db_path.parent / f"{self.db_path.stem}_snapshot"
+
+    def snapshot(
+        self,
+        max_age: Optional[timedelta] = timedelta(hours=1),
+        columns: Optional[Dict[str, List[str]]] = None
+    ) -> LeadSnapshot:
+        """Columnar snapshot of the lead tables for analytics.
+
+        Reuses the Parquet snapshot in ``snapshot_dir`` unless it's missing
+        or older than ``max_age`` (``None`` always re-exports), so repeated
+        analytics runs load in milliseconds instead of re-querying. Pass
+        ``columns`` to decode only what an analysis needs. Needs pyarrow.
+        """
+        created = snapshot_created_at(self.snapshot_dir)
+        if created is None or max_age is None or datetime.now() - created > max_age:
+            self.export_parquet(self.snapshot_dir)
+        return load_snapshot(self.snapshot_dir, columns)
 
     # === INTERACTIONS ===
 
@@ -518,7 +1640,7 @@ class LeadDatabase:
 
     def get_interactions(self, lead_id: int, limit: int = 100) -> List[Interaction]:
         """Get interactions for a lead."""
-        with self._get_connection() as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute("""
                 SELECT * FROM interactions
@@ -545,8 +1667,14 @@ class LeadDatabase:
         """Export leads to CSV. Returns count exported."""
         import csv
 
-        leads = self.get_all_leads(tier=tier, limit=100000)
+        fields = ("name", "email", "phone", "username", "score", "tier", "status", "source",
+                  "notes", "profile_url")
+        if tier:
+            leads = self.iter_leads(where="tier = ?", params=(tier,), order_key="score", fields=fields)
+        else:
+            leads = self.iter_leads(order_key="score", fields=fields)
 
+        count = 0
         with open(path, 'w', newline='', encoding='utf-8') as f:
             writer = csv.writer(f)
             writer.writerow([
@@ -568,5 +1696,6 @@ class LeadDatabase:
                     (lead.notes or "")[:200],  # Truncate notes
                     lead.profile_url or ""
                 ])
+                count += 1
 
-        return len(leads)
+        return count
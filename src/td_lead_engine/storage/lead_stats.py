@@ -0,0 +1,128 @@
+"""Materialized lead counts for ``LeadDatabase.get_stats``.
+
+``lead_stats`` holds one row per (dimension, value): the total (``'all'``)
+plus a row per tier, status and source, each with a lead count and, on the
+total row, the sum of scores. Triggers on ``leads`` keep it current for
+every writer, so reading stats is a handful of primary-key lookups instead
+of aggregate scans. NULL tiers/statuses/sources are counted under ``''``.
+"""
+
+import sqlite3
+from typing import Dict, List, Tuple
+
+STATS_DIMENSIONS = ("tier", "status", "source")
+
+StatsKey = Tuple[str, str]  # (dimension, value)
+
+
+def _bump(row: str, sign: str) -> str:
+    # One statement per dimension adding ``sign``1 to the row's group counts
+    statements = [
+        f"""INSERT INTO lead_stats (dimension, value, count, score_sum)
+            VALUES ('{dimension}', IFNULL({row}.{dimension}, ''), {sign}1, 0)
+            ON CONFLICT (dimension, value) DO UPDATE SET count = count {sign} 1;"""
+        for dimension in STATS_DIMENSIONS
+    ]
+    return "\n".join(statements)
+
+
+def ensure_stats_table(conn: sqlite3.Connection):
+    """Create ``lead_stats`` and its triggers; a new table is filled from ``leads``."""
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'lead_stats'"
+    ).fetchone()
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS lead_stats (
+            dimension TEXT NOT NULL,
+            value TEXT NOT NULL,
+            count INTEGER NOT NULL DEFAULT 0,
+            score_sum INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (dimension, value)
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS leads_stats_insert AFTER INSERT ON leads BEGIN
+            UPDATE lead_stats SET count = count + 1, score_sum = score_sum + IFNULL(new.score, 0)
+            WHERE dimension = 'all';
+            {_bump('new', '+')}
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS leads_stats_delete AFTER DELETE ON leads BEGIN
+            UPDATE lead_stats SET count = count - 1, score_sum = score_sum - IFNULL(old.score, 0)
+            WHERE dimension = 'all';
+            {_bump('old', '-')}
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS leads_stats_score AFTER UPDATE OF score ON leads
+        WHEN old.score IS NOT new.score BEGIN
+            UPDATE lead_stats
+            SET score_sum = score_sum + IFNULL(new.score, 0) - IFNULL(old.score, 0)
+            WHERE dimension = 'all';
+        END
+    """)
+    changed = " OR ".join(f"old.{d} IS NOT new.{d}" for d in STATS_DIMENSIONS)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS leads_stats_groups
+        AFTER UPDATE OF {', '.join(STATS_DIMENSIONS)} ON leads
+        WHEN {changed} BEGIN
+            {_bump('old', '-')}
+            {_bump('new', '+')}
+        END
+    """)
+
+    if not exists:
+        rebuild_stats(conn)
+
+
+def compute_stats(conn: sqlite3.Connection) -> Dict[StatsKey, Tuple[int, int]]:
+    """Recompute every ``(count, score_sum)`` from ``leads`` (a full scan)."""
+    count, score_sum = conn.execute("SELECT COUNT(*), IFNULL(SUM(score), 0) FROM leads").fetchone()
+    stats: Dict[StatsKey, Tuple[int, int]] = {("all", ""): (count, score_sum)}
+    for dimension in STATS_DIMENSIONS:
+        for value, group_count in conn.execute(
+            f"SELECT IFNULL({dimension}, ''), COUNT(*) FROM leads GROUP BY 1"
+        ):
+            stats[(dimension, value)] = (group_count, 0)
+    return stats
+
+
+def read_stats(conn: sqlite3.Connection) -> Dict[StatsKey, Tuple[int, int]]:
+    """The materialized ``(count, score_sum)`` rows, leaving out emptied groups."""
+    return {
+        (dimension, value): (count, score_sum)
+        for dimension, value, count, score_sum in conn.execute(
+            "SELECT dimension, value, count, score_sum FROM lead_stats "
+            "WHERE count != 0 OR dimension = 'all'"
+        )
+    }
+
+
+def stats_drift(conn: sqlite3.Connection) -> List[Dict[str, object]]:
+    """Rows where the materialized stats disagree with a recount, as dicts."""
+    actual = compute_stats(conn)
+    stored = read_stats(conn)
+    drift = []
+    for key in sorted(set(actual) | set(stored)):
+        expected = actual.get(key, (0, 0))
+        found = stored.get(key, (0, 0))
+        if expected != found:
+            drift.append({
+                "dimension": key[0],
+                "value": key[1],
+                "stored": {"count": found[0], "score_sum": found[1]},
+                "actual": {"count": expected[0], "score_sum": expected[1]},
+            })
+    return drift
+
+
+def rebuild_stats(conn: sqlite3.Connection):
+    """Replace the materialized stats with a recount."""
+    conn.execute("DELETE FROM lead_stats")
+    conn.executemany(
+        "INSERT INTO lead_stats (dimension, value, count, score_sum) VALUES (?, ?, ?, ?)",
+        [(dimension, value, count, score_sum)
+         for (dimension, value), (count, score_sum) in compute_stats(conn).items()],
+    )
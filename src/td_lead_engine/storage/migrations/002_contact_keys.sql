@@ -0,0 +1,15 @@
+-- Migration: 002_contact_keys.sql
+-- Normalized contact keys for lead deduplication (see storage/contact_keys.py)
+
+-- Canonical email / E.164 phone / handle; '' when the raw value has no usable key
+ALTER TABLE leads ADD COLUMN email_key TEXT;
+ALTER TABLE leads ADD COLUMN phone_key TEXT;
+ALTER TABLE leads ADD COLUMN username_key TEXT;
+
+-- Equality probes used by dedup
+CREATE INDEX IF NOT EXISTS idx_leads_email_key ON leads(email_key) WHERE email_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_leads_phone_key ON leads(phone_key) WHERE phone_key IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_leads_username_key ON leads(username_key, source) WHERE username_key IS NOT NULL;
+
+-- Rows still waiting for keys (filled by backfill_contact_keys on startup)
+CREATE INDEX IF NOT EXISTS idx_leads_keys_pending ON leads(id) WHERE (phone IS NOT NULL AND phone_key IS NULL) OR (email IS NOT NULL AND email_key IS NULL) OR (username IS NOT NULL AND username_key IS NULL);
@@ -1,5 +1,6 @@
 """Data models for lead storage."""
 
+import json
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
@@ -55,6 +56,11 @@ class Lead:
     score: int = 0
     tier: str = "cold"
     score_breakdown: Optional[str] = None  # JSON object
+    content_fingerprint: Optional[str] = None  # Hash of scored text at last scoring
+    scorer_version: Optional[str] = None  # Signal-set version used at last scoring
+    # Score after time decay (computed at query time, not stored)
+    effective_score: Optional[int] = None
+    snippet: Optional[str] = None  # Highlighted match from a ranked search (not stored)
 
     # Status
     status: LeadStatus = LeadStatus.NEW
@@ -96,6 +102,102 @@ class Lead:
         self.tags = ",".join(tags) if tags else None
 
 
+class LeadRow:
+    """Lightweight read-only view of selected lead columns.
+
+    Returned by projected queries (``get_all_leads(fields=[...])``,
+    ``iter_leads(fields=[...])``) instead of a full ``Lead``. It only wraps
+    the database row: datetimes and status are decoded when read, and
+    ``breakdown`` / ``messages`` / ``comments`` decode their JSON columns on
+    access. Fields that weren't selected raise AttributeError.
+    """
+
+    __slots__ = ("_row",)
+
+    _DATETIME_FIELDS = frozenset(
+        {"created_at", "updated_at", "last_scored_at", "last_contacted_at"}
+    )
+
+    def __init__(self, row):
+        self._row = row
+
+    def __getattr__(self, name: str) -> Any:
+        # Private and dunder names (looked up by copy/pickle, or before __init__) are never
+        # columns; reading _row through __getattr__ would recurse while it is unset
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            value = object.__getattribute__(self, "_row")[name]
+        except AttributeError:
+            raise AttributeError(f"LeadRow has no field {name!r} (no row)") from None
+        except (IndexError, KeyError):
+            raise AttributeError(f"LeadRow has no field {name!r} (not selected)") from None
+        if name in self._DATETIME_FIELDS:
+            if value:
+                return datetime.fromisoformat(value)
+            return datetime.now() if name in ("created_at", "updated_at") else None
+        if name == "status":
+            return LeadStatus(value) if value else LeadStatus.NEW
+        if name == "score":
+            return value or 0
+        if name == "tier":
+            return value or "cold"
+        return value
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{key}={self._row[key]!r}" for key in self._row.keys())
+        return f"LeadRow({fields})"
+
+    def _get(self, name: str) -> Any:
+        return getattr(self, name) if name in self._row.keys() else None
+
+    def _json(self, name: str, default: Any) -> Any:
+        raw = getattr(self, name)
+        return json.loads(raw) if raw else default
+
+    @property
+    def breakdown(self) -> Dict[str, Any]:
+        """Decoded ``score_breakdown``."""
+        return self._json("score_breakdown", {})
+
+    @property
+    def messages(self) -> List[str]:
+        """Decoded ``messages_json``."""
+        return self._json("messages_json", [])
+
+    @property
+    def comments(self) -> List[str]:
+        """Decoded ``comments_json``."""
+        return self._json("comments_json", [])
+
+    @property
+    def display_name(self) -> str:
+        """Same as ``Lead.display_name``, from whichever of its fields were selected."""
+        return (self._get("name") or self._get("username") or self._get("email")
+                or f"Lead #{self.id}")
+
+    @property
+    def contact_info(self) -> str:
+        """Same as ``Lead.contact_info``, from whichever of its fields were selected."""
+        if self._get("phone"):
+            return self.phone
+        if self._get("email"):
+            return self.email
+        if self._get("username"):
+            return f"@{self.username}"
+        return "No contact"
+
+    def get_tags_list(self) -> List[str]:
+        """Get tags as a list."""
+        if not self.tags:
+            return []
+        return [t.strip() for t in self.tags.split(",") if t.strip()]
+
+    def keys(self) -> List[str]:
+        """Selected field names."""
+        return list(self._row.keys())
+
+
 @dataclass
 class Interaction:
     """Record of an interaction with a lead."""
@@ -106,3 +208,12 @@ class Interaction:
     content: Optional[str] = None
     metadata_json: Optional[str] = None
     created_at: datetime = field(default_factory=datetime.now)
+
+
+@dataclass
+class LeadPage:
+    """One page of a keyset-paginated lead listing."""
+
+    leads: List[Lead] = field(default_factory=list)
+    total: int = 0  # Leads matching the filters (as of the first page)
+    next_cursor: Optional[str] = None  # Pass back to get the next page; None on the last page
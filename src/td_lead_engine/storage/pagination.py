@@ -0,0 +1,46 @@
+"""Opaque cursors for keyset-paginated lead listings.
+
+Listings are ordered by ``(score DESC, id)``. A cursor carries the last
+row's score and id, so the next page is an index seek instead of an
+``OFFSET`` scan. It also carries the total computed for the first page and
+a fingerprint of the filters, so later pages skip the count and a cursor
+can't be replayed against a different query.
+"""
+
+import base64
+import hashlib
+import json
+from typing import Any, Sequence, Tuple
+
+LEAD_PAGE_ORDER = "score DESC, id"
+
+
+def filters_key(where: str, params: Sequence[Any]) -> str:
+    """Short fingerprint of a listing's filter SQL and values."""
+    raw = json.dumps([where, list(params)], default=str)
+    return hashlib.sha1(raw.encode()).hexdigest()[:12]
+
+
+def encode_cursor(score: int, lead_id: int, total: int, key: str) -> str:
+    """Cursor resuming after the row ``(score, lead_id)``."""
+    raw = json.dumps([score, lead_id, total, key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key: str) -> Tuple[int, int, int]:
+    """``(score, lead_id, total)`` from a cursor; ValueError if malformed or for other filters."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        score, lead_id, total, cursor_key = json.loads(raw)
+        score, lead_id, total = int(score), int(lead_id), int(total)
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_key != key:
+        raise ValueError("Cursor does not match the current filters")
+    return score, lead_id, total
+
+
+def keyset_after(score: int, lead_id: int, alias: str = "") -> Tuple[str, Tuple[int, int, int]]:
+    """SQL condition (and its values) for rows after ``(score, lead_id)`` in page order."""
+    p = f"{alias}." if alias else ""
+    return f"{p}score <= ? AND ({p}score < ? OR {p}id > ?)", (score, score, lead_id)
@@ -0,0 +1,173 @@
+"""Connection pool for the SQLite lead database.
+
+One writer connection (serialized by a lock, one transaction at a time)
+and up to N reader connections. The database runs in WAL mode, so readers
+see a consistent snapshot and never wait for the writer. Every connection
+gets the same tuned pragmas and a statement cache; connections are created
+on first use and reused for the life of the pool.
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Generator, Optional
+
+DEFAULT_READERS = 4
+BUSY_TIMEOUT = 30.0  # seconds to wait on another process's write lock
+MMAP_SIZE = 256 * 1024 * 1024
+CACHE_SIZE_KIB = 16 * 1024
+CACHED_STATEMENTS = 256
+
+
+class ConnectionPool:
+    """Thread-safe pool of one writer and up to ``readers`` reader connections."""
+
+    def __init__(self, db_path: Path, readers: int = DEFAULT_READERS):
+        self.db_path = Path(db_path)
+        self.readers = max(1, readers)
+        self._writer_lock = threading.RLock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._writer_owner: Optional[int] = None
+        self._depth = 0
+        self._reset()
+
+    def _reset(self):
+        """(Re)initialize reader state; also used after a fork."""
+        self._pid = os.getpid()
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.readers)
+
+    def _check_fork(self):
+        # SQLite connections must not be used across fork; a child starts fresh
+        if self._pid != os.getpid():
+            self._writer = None
+            self._writer_owner = None
+            self._depth = 0
+            self._writer_lock = threading.RLock()
+            self._reset()
+
+    def _connect(self, readonly: bool) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=BUSY_TIMEOUT,
+            isolation_level=None,  # transactions are managed explicitly
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        conn.row_factory = sqlite3.Row
+        if not readonly:
+            conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+        conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KIB}")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        if readonly:
+            conn.execute("PRAGMA query_only = 1")
+        return conn
+
+    @contextmanager
+    def transaction(self) -> Generator[sqlite3.Connection, None, None]:
+        """The writer connection inside one ``BEGIN IMMEDIATE`` transaction.
+
+        Commits on success and rolls back on error. Nested calls from the
+        thread that already holds the transaction run in a ``SAVEPOINT`` of
+        it: an error undoes just the nested block's writes, so an outer
+        block that catches it commits none of them.
+        """
+        self._check_fork()
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = self._connect(readonly=False)
+            conn = self._writer
+
+            if self._depth:
+                savepoint = f"nested_{self._depth}"
+                conn.execute(f"SAVEPOINT {savepoint}")
+                self._depth += 1
+                try:
+                    yield conn
+                    conn.execute(f"RELEASE {savepoint}")
+                except BaseException:
+                    if conn.in_transaction:
+                        conn.execute(f"ROLLBACK TO {savepoint}")
+                        conn.execute(f"RELEASE {savepoint}")
+                    raise
+                finally:
+                    self._depth -= 1
+                return
+
+            conn.execute("BEGIN IMMEDIATE")
+            self._depth = 1
+            self._writer_owner = threading.get_ident()
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+            finally:
+                self._depth = 0
+                self._writer_owner = None
+
+    @contextmanager
+    def reader(self) -> Generator[sqlite3.Connection, None, None]:
+        """A read-only connection holding one snapshot for the block.
+
+        Inside this thread's open transaction the writer is returned
+        instead, so uncommitted writes are visible.
+        """
+        self._check_fork()
+        if self._writer_owner == threading.get_ident():
+            yield self._writer
+            return
+
+        self._slots.acquire()
+        conn = None
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect(readonly=True)
+            conn.execute("BEGIN")
+            yield conn
+        finally:
+            try:
+                if conn is not None and conn.in_transaction:
+                    conn.execute("ROLLBACK")
+            finally:
+                # Returned even if BEGIN or ROLLBACK failed, so the pool never leaks it
+                if conn is not None:
+                    self._idle.put(conn)
+                self._slots.release()
+
+    def close(self):
+        """Close every idle connection and the writer."""
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_pools: "weakref.WeakValueDictionary[str, ConnectionPool]" = weakref.WeakValueDictionary()
+_pools_lock = threading.Lock()
+
+
+def get_pool(db_path: Path, readers: int = DEFAULT_READERS) -> ConnectionPool:
+    """The pool for ``db_path``, shared by every ``LeadDatabase`` on that file in this process."""
+    key = str(Path(db_path).resolve())
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path, readers)
+            _pools[key] = pool
+        return pool
@@ -0,0 +1,107 @@
+"""FTS5 full-text index over the searchable lead fields.
+
+``leads_fts`` is an external-content FTS5 table: it stores only the index,
+reads column text from ``leads`` and is kept in sync by triggers, so every
+writer (including ones outside ``LeadDatabase``) updates it. The trigram
+tokenizer indexes every three-character substring, which keeps the old
+``LIKE '%query%'`` semantics (case-insensitive substring match) while
+answering from the index; SQLite builds without it fall back to
+``unicode61`` word-prefix matching. Builds without FTS5 at all get no
+index, and searches keep using ``LIKE`` over the table.
+"""
+
+import logging
+import sqlite3
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+SEARCH_COLUMNS = ("name", "email", "phone", "username", "notes", "bio")
+
+# bm25 weight per column: a hit in the name or a contact field outranks free text
+SEARCH_WEIGHTS = (10.0, 5.0, 5.0, 5.0, 1.0, 1.0)
+
+# Trigram indexes can't answer queries shorter than one trigram
+MIN_TRIGRAM_QUERY = 3
+
+
+def _columns(prefix: str) -> str:
+    return ", ".join(f"{prefix}{column}" for column in SEARCH_COLUMNS)
+
+
+def _tokenizer(conn: sqlite3.Connection) -> Optional[str]:
+    row = conn.execute("SELECT sql FROM sqlite_master WHERE name = 'leads_fts'").fetchone()
+    if row is None:
+        return None
+    return "trigram" if "trigram" in row[0] else "unicode61"
+
+
+def ensure_search_index(conn: sqlite3.Connection) -> Optional[str]:
+    """Create ``leads_fts`` and its triggers if missing; returns the tokenizer in use.
+
+    A newly created index is filled from the existing leads. Returns None,
+    creating nothing, if this SQLite build has no FTS5 module.
+    """
+    tokenizer = _tokenizer(conn)
+    if tokenizer is None:
+        for tokenizer in ("trigram", "unicode61"):
+            try:
+                conn.execute(f"""
+                    CREATE VIRTUAL TABLE leads_fts USING fts5(
+                        {_columns('')},
+                        content='leads', content_rowid='id', tokenize='{tokenizer}'
+                    )
+                """)
+                break
+            except sqlite3.OperationalError as e:
+                if "no such module" in str(e):
+                    logger.warning("SQLite has no FTS5 module; lead search will scan the table")
+                    return None
+                if "tokenizer" not in str(e):
+                    raise
+        conn.execute(
+            "INSERT INTO leads_fts (leads_fts, rank) VALUES ('rank', ?)",
+            (f"bm25({', '.join(str(w) for w in SEARCH_WEIGHTS)})",)
+        )
+        conn.execute("INSERT INTO leads_fts (leads_fts) VALUES ('rebuild')")
+
+    changed = " OR ".join(f"old.{c} IS NOT new.{c}" for c in SEARCH_COLUMNS)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS leads_fts_insert AFTER INSERT ON leads BEGIN
+            INSERT INTO leads_fts (rowid, {_columns('')}) VALUES (new.id, {_columns('new.')});
+        END
+    """)
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS leads_fts_delete AFTER DELETE ON leads BEGIN
+            INSERT INTO leads_fts (leads_fts, rowid, {_columns('')})
+            VALUES ('delete', old.id, {_columns('old.')});
+        END
+    """)
+    # Only when searchable text changed, so score and status writes skip the index
+    conn.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS leads_fts_update AFTER UPDATE OF {_columns('')} ON leads
+        WHEN {changed} BEGIN
+            INSERT INTO leads_fts (leads_fts, rowid, {_columns('')})
+            VALUES ('delete', old.id, {_columns('old.')});
+            INSERT INTO leads_fts (rowid, {_columns('')}) VALUES (new.id, {_columns('new.')});
+        END
+    """)
+    return tokenizer
+
+
+def match_expression(query: str, tokenizer: Optional[str]) -> Optional[str]:
+    """FTS5 MATCH string for a user query, or None if the index can't answer it.
+
+    With trigrams the whole query is one quoted phrase (a substring match);
+    with ``unicode61`` every word must appear as a word prefix.
+    """
+    query = query.strip()
+    if tokenizer is None:
+        return None
+    if tokenizer == "trigram":
+        if len(query) < MIN_TRIGRAM_QUERY:
+            return None
+        return '"' + query.replace('"', '""') + '"'
+
+    words = ['"' + word.replace('"', '""') + '"*' for word in query.split()]
+    return " ".join(words) or None
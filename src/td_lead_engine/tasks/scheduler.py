@@ -63,10 +63,10 @@ class LeadTaskRunner:
             if not lead_ids:
                 return
 
-            from ..core.scorer import LeadScorer
+            from ..core.scorer import get_shared_scorer
             from .website_scorer import score_website_events_for_lead
 
-            scorer = LeadScorer()
+            scorer = get_shared_scorer()
 
             for lead_id in lead_ids:
                 cursor = conn.execute("SELECT * FROM leads WHERE id = ?", (lead_id,))
@@ -85,24 +85,14 @@ class LeadTaskRunner:
                     except Exception:
                         pass
                 combined = " ".join(filter(None, text_parts))
-                text_result = scorer.score_text(combined)
+                text_result = scorer.score_text(combined, lead_row["source"])
 
                 # Website event score
                 website_score = score_website_events_for_lead(conn, lead_id)
 
                 new_score = text_result.total_score + website_score
 
-                # Determine new tier
-                if new_score >= 150:
-                    new_tier = "hot"
-                elif new_score >= 75:
-                    new_tier = "warm"
-                elif new_score >= 25:
-                    new_tier = "lukewarm"
-                elif new_score >= 0:
-                    new_tier = "cold"
-                else:
-                    new_tier = "negative"
+                new_tier = scorer.tier_for(new_score)
 
                 if new_score != old_score:
                     conn.execute(
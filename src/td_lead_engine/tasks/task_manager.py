@@ -1,6 +1,5 @@
 """Task management system for lead follow-ups."""
 
-import json
 import logging
 from dataclasses import dataclass, field, asdict
 from datetime import datetime, timedelta
@@ -9,6 +8,8 @@ from pathlib import Path
 from typing import Optional, List, Dict, Any
 import uuid
 
+from ..core.doc_store import keyed, open_store
+
 logger = logging.getLogger(__name__)
 
 
@@ -113,35 +114,34 @@ class Task:
 
 
 class TaskManager:
-    """Manage follow-up tasks for leads."""
+    """Manage follow-up tasks for leads.
+
+    Tasks are stored one record each in a document store next to
+    ``data_path`` (``tasks.db``); an existing ``tasks.json`` is imported
+    on first use.
+    """
 
     def __init__(self, data_path: Optional[Path] = None):
         """Initialize task manager."""
         self.data_path = data_path or Path.home() / ".td-lead-engine" / "tasks.json"
+        self.store = open_store(self.data_path.with_suffix(".db"))
+        self.task_store = self.store.collection("tasks", indexes=("lead_id",))
         self.tasks: Dict[str, Task] = {}
         self._load_data()
 
     def _load_data(self):
-        """Load tasks from file."""
-        if self.data_path.exists():
+        """Load tasks from the store."""
+        self.task_store.import_legacy(self.data_path, lambda data: keyed(data.get("tasks", [])))
+        for task_id, task_data in self.task_store.items():
             try:
-                with open(self.data_path, 'r') as f:
-                    data = json.load(f)
-                    for task_data in data.get("tasks", []):
-                        task = Task.from_dict(task_data)
-                        self.tasks[task.id] = task
+                task = Task.from_dict(task_data)
+                self.tasks[task.id] = task
             except Exception as e:
-                logger.error(f"Error loading tasks: {e}")
-
-    def _save_data(self):
-        """Save tasks to file."""
-        self.data_path.parent.mkdir(parents=True, exist_ok=True)
-        data = {
-            "tasks": [task.to_dict() for task in self.tasks.values()],
-            "updated_at": datetime.now().isoformat()
-        }
-        with open(self.data_path, 'w') as f:
-            json.dump(data, f, indent=2)
+                logger.error(f"Error loading task {task_id}: {e}")
+
+    def _save_task(self, task: Task):
+        """Save one task."""
+        self.task_store.put(task.id, task.to_dict())
 
     def create_task(
         self,
@@ -181,7 +181,7 @@ class TaskManager:
         )
 
         self.tasks[task_id] = task
-        self._save_data()
+        self._save_task(task)
 
         logger.info(f"Created task: {title} (due: {due_date})")
         return task
@@ -201,7 +201,7 @@ class TaskManager:
                 setattr(task, key, value)
 
         task.updated_at = datetime.now()
-        self._save_data()
+        self._save_task(task)
 
         return task
 
@@ -221,7 +221,7 @@ class TaskManager:
         if task.is_recurring and task.recurrence_pattern:
             self._create_next_occurrence(task)
 
-        self._save_data()
+        self._save_task(task)
         return task
 
     def _create_next_occurrence(self, task: Task):
@@ -266,7 +266,7 @@ class TaskManager:
         task.reminder_date = task.due_date - timedelta(hours=1)
         task.updated_at = datetime.now()
 
-        self._save_data()
+        self._save_task(task)
         return task
 
     def cancel_task(self, task_id: str) -> Optional[Task]:
@@ -278,14 +278,14 @@ class TaskManager:
         task.status = TaskStatus.CANCELLED
         task.updated_at = datetime.now()
 
-        self._save_data()
+        self._save_task(task)
         return task
 
     def delete_task(self, task_id: str) -> bool:
         """Delete a task permanently."""
         if task_id in self.tasks:
             del self.tasks[task_id]
-            self._save_data()
+            self.task_store.delete(task_id)
             return True
         return False
 
@@ -1,12 +1,15 @@
 """Lead attribution and marketing analytics."""
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 import json
 import os
 
+from ..core.rollups import RollupStore
+
 
 class AttributionModel(Enum):
     """Attribution models."""
@@ -52,8 +55,43 @@ class LeadAttribution:
     campaign_credits: Dict[str, float] = field(default_factory=dict)
 
 
+def _conversion_rollups(attribution: LeadAttribution, sign: int = 1) -> List[Dict]:
+    """Rollup counter increments for a conversion (``sign=-1`` takes them back)."""
+    increments = []
+    for channel, credit in attribution.channel_credits.items():
+        increments.append({
+            'event_type': 'conversion', 'source': channel, 'count': sign, 'value': sign * credit
+        })
+        increments.append({
+            'event_type': 'conversion_value', 'source': channel,
+            'count': 0, 'value': sign * attribution.conversion_value * credit
+        })
+        if attribution.first_touch_channel == channel:
+            increments.append(
+                {'event_type': 'first_touch_conversion', 'source': channel, 'count': sign}
+            )
+        if attribution.last_touch_channel == channel:
+            increments.append(
+                {'event_type': 'last_touch_conversion', 'source': channel, 'count': sign}
+            )
+    for campaign, credit in attribution.campaign_credits.items():
+        increments.append({
+            'event_type': 'conversion', 'campaign': campaign, 'count': sign, 'value': sign * credit
+        })
+        increments.append({
+            'event_type': 'conversion_value', 'campaign': campaign,
+            'count': 0, 'value': sign * attribution.conversion_value * credit
+        })
+    return increments
+
+
 class AttributionManager:
-    """Manage lead attribution and marketing analytics."""
+    """Manage lead attribution and marketing analytics.
+    
+    Conversions are also counted into rollups (``storage_path/rollups.db``,
+    see ``core/rollups.py``) by channel and campaign at conversion time,
+    so channel and campaign performance don't walk every attribution.
+    """
     
     def __init__(self, storage_path: str = "data/attribution"):
         self.storage_path = storage_path
@@ -61,6 +99,22 @@ class AttributionManager:
         self.default_model = AttributionModel.POSITION_BASED
         
         self._load_data()
+        self.rollups = RollupStore(Path(storage_path) / "rollups.db")
+        if not self.rollups.built:
+            self.rebuild_rollups()
+    
+    def rebuild_rollups(self):
+        """Recount the conversion rollups from the stored attributions."""
+        def increments():
+            for attribution in self.attributions.values():
+                if not attribution.conversion_date:
+                    continue
+                if not attribution.channel_credits:
+                    self._calculate_credits(attribution, self.default_model)
+                for fields in _conversion_rollups(attribution):
+                    yield attribution.conversion_date, fields
+        
+        self.rollups.rebuild(increments())
     
     def _load_data(self):
         """Load attribution data."""
@@ -192,12 +246,18 @@ class AttributionManager:
             return
         
         attribution = self.attributions[lead_id]
+        if attribution.conversion_date:
+            # Re-recorded conversion: take back the previous one's counts
+            for fields in _conversion_rollups(attribution, sign=-1):
+                self.rollups.add(attribution.conversion_date, **fields)
         attribution.conversion_date = datetime.now()
         attribution.conversion_value = value
         
         # Calculate credits based on model
         model = model or self.default_model
         self._calculate_credits(attribution, model)
+        for fields in _conversion_rollups(attribution):
+            self.rollups.add(attribution.conversion_date, **fields)
         
         self._save_data()
     
@@ -275,6 +335,34 @@ class AttributionManager:
         attribution.source_credits = source_credits
         attribution.campaign_credits = campaign_credits
     
+    def _counts_under_model(
+        self,
+        model: AttributionModel,
+        start_date: datetime,
+        end_date: datetime,
+        dimension: str
+    ) -> Dict[Tuple[str, str], Tuple[int, float]]:
+        """Rollup-shaped counts by ``(event_type, dimension)`` with credits under ``model``.
+        
+        Recomputes the credits of every conversion in the range (stored
+        credits are left alone), so it walks all attributions.
+        """
+        counts: Dict[Tuple[str, str], Tuple[int, float]] = {}
+        for attribution in self.attributions.values():
+            if not attribution.conversion_date:
+                continue
+            if not (start_date <= attribution.conversion_date <= end_date):
+                continue
+            recalculated = replace(attribution)
+            self._calculate_credits(recalculated, model)
+            for fields in _conversion_rollups(recalculated):
+                if dimension not in fields:
+                    continue
+                key = (fields['event_type'], fields[dimension])
+                count, value = counts.get(key, (0, 0.0))
+                counts[key] = (count + fields['count'], value + fields.get('value', 0.0))
+        return counts
+    
     def get_attribution(self, lead_id: str) -> Optional[LeadAttribution]:
         """Get attribution for a lead."""
         return self.attributions.get(lead_id)
@@ -285,46 +373,47 @@ class AttributionManager:
         end_date: datetime = None,
         model: AttributionModel = None
     ) -> Dict:
-        """Get performance by channel."""
-        model = model or self.default_model
+        """Get performance by channel.
+        
+        Without a ``model`` (or with ``default_model``) this is served from
+        the rollups, to the minute, with credits as of each conversion.
+        Another ``model`` recomputes every conversion's credits under it,
+        walking all attributions.
+        """
         start_date = start_date or (datetime.now() - timedelta(days=30))
         end_date = end_date or datetime.now()
         
-        # Recalculate credits if needed
-        for attribution in self.attributions.values():
-            if attribution.conversion_date and start_date <= attribution.conversion_date <= end_date:
-                if not attribution.channel_credits:
-                    self._calculate_credits(attribution, model)
+        if model is None or model == self.default_model:
+            counts = self.rollups.counts(start_date, end_date, by=("event_type", "source"),
+                                         values=True)
+        else:
+            counts = self._counts_under_model(model, start_date, end_date, 'source')
         
-        # Aggregate by channel
         channel_stats = {}
-        
-        for attribution in self.attributions.values():
-            if not attribution.conversion_date:
-                continue
-            if not (start_date <= attribution.conversion_date <= end_date):
+        for (event_type, channel), (count, value) in counts.items():
+            if not channel:
                 continue
+            if channel not in channel_stats:
+                channel_stats[channel] = {
+                    'conversions': 0,
+                    'credit': 0,
+                    'value': 0,
+                    'first_touch_conversions': 0,
+                    'last_touch_conversions': 0
+                }
             
-            for channel, credit in attribution.channel_credits.items():
-                if channel not in channel_stats:
-                    channel_stats[channel] = {
-                        'conversions': 0,
-                        'credit': 0,
-                        'value': 0,
-                        'first_touch_conversions': 0,
-                        'last_touch_conversions': 0
-                    }
-                
-                channel_stats[channel]['conversions'] += 1
-                channel_stats[channel]['credit'] += credit
-                channel_stats[channel]['value'] += attribution.conversion_value * credit
-                
-                if attribution.first_touch_channel == channel:
-                    channel_stats[channel]['first_touch_conversions'] += 1
-                if attribution.last_touch_channel == channel:
-                    channel_stats[channel]['last_touch_conversions'] += 1
+            stats = channel_stats[channel]
+            if event_type == 'conversion':
+                stats['conversions'] += count
+                stats['credit'] += value
+            elif event_type == 'conversion_value':
+                stats['value'] += value
+            elif event_type == 'first_touch_conversion':
+                stats['first_touch_conversions'] += count
+            elif event_type == 'last_touch_conversion':
+                stats['last_touch_conversions'] += count
         
-        return channel_stats
+        return {channel: stats for channel, stats in channel_stats.items() if stats['conversions']}
     
     def get_campaign_performance(
         self,
@@ -332,35 +421,36 @@ class AttributionManager:
         end_date: datetime = None,
         model: AttributionModel = None
     ) -> Dict:
-        """Get performance by campaign."""
-        model = model or self.default_model
+        """Get performance by campaign (rollups or ``model``, like get_channel_performance)."""
         start_date = start_date or (datetime.now() - timedelta(days=30))
         end_date = end_date or datetime.now()
         
-        campaign_stats = {}
+        if model is None or model == self.default_model:
+            counts = self.rollups.counts(start_date, end_date, by=("event_type", "campaign"),
+                                         values=True)
+        else:
+            counts = self._counts_under_model(model, start_date, end_date, 'campaign')
         
-        for attribution in self.attributions.values():
-            if not attribution.conversion_date:
-                continue
-            if not (start_date <= attribution.conversion_date <= end_date):
+        campaign_stats = {}
+        for (event_type, campaign), (count, value) in counts.items():
+            if not campaign:
                 continue
+            if campaign not in campaign_stats:
+                campaign_stats[campaign] = {
+                    'conversions': 0,
+                    'credit': 0,
+                    'value': 0
+                }
             
-            if not attribution.campaign_credits:
-                self._calculate_credits(attribution, model)
-            
-            for campaign, credit in attribution.campaign_credits.items():
-                if campaign not in campaign_stats:
-                    campaign_stats[campaign] = {
-                        'conversions': 0,
-                        'credit': 0,
-                        'value': 0
-                    }
-                
-                campaign_stats[campaign]['conversions'] += 1
-                campaign_stats[campaign]['credit'] += credit
-                campaign_stats[campaign]['value'] += attribution.conversion_value * credit
+            if event_type == 'conversion':
+                campaign_stats[campaign]['conversions'] += count
+                campaign_stats[campaign]['credit'] += value
+            elif event_type == 'conversion_value':
+                campaign_stats[campaign]['value'] += value
         
-        return campaign_stats
+        return {
+            campaign: stats for campaign, stats in campaign_stats.items() if stats['conversions']
+        }
     
     def get_conversion_path_analysis(self, limit: int = 20) -> Dict:
         """Analyze common conversion paths."""
@@ -1,13 +1,24 @@
 """Event tracking for user interactions."""
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Callable
+from typing import Deque, Dict, Iterator, List, Optional, Callable
 from datetime import datetime, timedelta
 from enum import Enum
+from collections import deque
+from pathlib import Path
+from urllib.parse import urlsplit
 import json
-import os
+import logging
 import uuid
 
+from ..core.rollups import RollupStore
+from ..core.segment_log import SegmentedLog
+from .funnel import FunnelEngine
+
+logger = logging.getLogger(__name__)
+
+TAIL_EVENTS = 5000  # newest events kept in memory
+
 
 class EventCategory(Enum):
     """Event categories."""
@@ -48,72 +59,150 @@ class TrackingEvent:
     properties: Dict = field(default_factory=dict)
 
 
+def _event_record(e: TrackingEvent) -> Dict:
+    return {
+        'id': e.id,
+        'category': e.category.value,
+        'action': e.action,
+        'label': e.label,
+        'value': e.value,
+        'visitor_id': e.visitor_id,
+        'session_id': e.session_id,
+        'lead_id': e.lead_id,
+        'property_id': e.property_id,
+        'timestamp': e.timestamp.isoformat(),
+        'page_url': e.page_url,
+        'referrer': e.referrer,
+        'user_agent': e.user_agent,
+        'ip_address': e.ip_address,
+        'properties': e.properties
+    }
+
+
+def _event_from_record(event_data: Dict) -> TrackingEvent:
+    return TrackingEvent(
+        id=event_data['id'],
+        category=EventCategory(event_data['category']),
+        action=event_data['action'],
+        label=event_data.get('label', ''),
+        value=event_data.get('value'),
+        visitor_id=event_data.get('visitor_id', ''),
+        session_id=event_data.get('session_id', ''),
+        lead_id=event_data.get('lead_id', ''),
+        property_id=event_data.get('property_id', ''),
+        timestamp=datetime.fromisoformat(event_data['timestamp']),
+        page_url=event_data.get('page_url', ''),
+        referrer=event_data.get('referrer', ''),
+        user_agent=event_data.get('user_agent', ''),
+        ip_address=event_data.get('ip_address', ''),
+        properties=event_data.get('properties', {})
+    )
+
+
+def _event_source(referrer: str, properties: Dict) -> str:
+    """``utm_source``, else the referrer host (``""`` for direct traffic)."""
+    source = (properties or {}).get('utm_source') or ''
+    if not source and referrer:
+        source = urlsplit(referrer).netloc.lower()
+        if source.startswith('www.'):
+            source = source[4:]
+    return source
+
+
+def _event_rollup(event_data: Dict) -> Dict:
+    """Rollup counter dimensions for one event record."""
+    properties = event_data.get('properties') or {}
+    page_url = event_data.get('page_url') or ''
+    return {
+        'event_type': f"{event_data['category']}:{event_data['action']}",
+        'source': _event_source(event_data.get('referrer'), properties),
+        'campaign': properties.get('utm_campaign') or '',
+        'page': urlsplit(page_url).path or page_url,
+        'property_id': event_data.get('property_id') or '',
+    }
+
+
 class EventTracker:
-    """Track and analyze user events."""
+    """Track and analyze user events.
+    
+    Every event is appended to a segmented log under ``storage_path/log``
+    (full history, see ``core/segment_log.py``); the newest ``tail_size``
+    events are also kept in ``self.events`` and answer queries whose range
+    they cover without touching disk. Per-minute/hour/day counters by
+    event type, source, campaign and page are kept in
+    ``storage_path/rollups.db`` (see ``core/rollups.py``) and answer the
+    count and timeline queries.
+    """
     
-    def __init__(self, storage_path: str = "data/events"):
+    def __init__(
+        self,
+        storage_path: str = "data/events",
+        fsync: str = "interval",
+        tail_size: int = TAIL_EVENTS
+    ):
         self.storage_path = storage_path
-        self.events: List[TrackingEvent] = []
+        self.events: Deque[TrackingEvent] = deque(maxlen=tail_size)  # Newest events, oldest first
         self.event_handlers: Dict[str, List[Callable]] = {}
+        self.log = SegmentedLog(Path(storage_path) / "log", fsync=fsync)
+        self.rollups = RollupStore(Path(storage_path) / "rollups.db")
         
         self._load_events()
+        if not self.rollups.built:
+            self.rebuild_rollups()
     
     def _load_events(self):
-        """Load recent events from storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
+        """Fill the in-memory tail from the log (importing a legacy events.json once)."""
+        legacy_file = Path(self.storage_path) / "events.json"
+        if not len(self.log) and legacy_file.exists():
+            try:
+                with open(legacy_file, 'r') as f:
+                    data = json.load(f)
+                for event_data in data:
+                    self.log.append(event_data)
+                self.log.sync()
+            except (OSError, ValueError, KeyError) as e:
+                logger.error(f"Error importing {legacy_file}: {e}")
         
-        events_file = f"{self.storage_path}/events.json"
-        if os.path.exists(events_file):
-            with open(events_file, 'r') as f:
-                data = json.load(f)
-                for event_data in data[-5000:]:  # Keep last 5000
-                    event = TrackingEvent(
-                        id=event_data['id'],
-                        category=EventCategory(event_data['category']),
-                        action=event_data['action'],
-                        label=event_data.get('label', ''),
-                        value=event_data.get('value'),
-                        visitor_id=event_data.get('visitor_id', ''),
-                        session_id=event_data.get('session_id', ''),
-                        lead_id=event_data.get('lead_id', ''),
-                        property_id=event_data.get('property_id', ''),
-                        timestamp=datetime.fromisoformat(event_data['timestamp']),
-                        page_url=event_data.get('page_url', ''),
-                        referrer=event_data.get('referrer', ''),
-                        user_agent=event_data.get('user_agent', ''),
-                        ip_address=event_data.get('ip_address', ''),
-                        properties=event_data.get('properties', {})
-                    )
-                    self.events.append(event)
+        recent = []
+        for event_data in self.log.scan(reverse=True):
+            recent.append(_event_from_record(event_data))
+            if len(recent) == self.events.maxlen:
+                break
+        self.events.extend(reversed(recent))
     
-    def _save_events(self):
-        """Save events to storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        # Keep last 5000 events
-        data = [
-            {
-                'id': e.id,
-                'category': e.category.value,
-                'action': e.action,
-                'label': e.label,
-                'value': e.value,
-                'visitor_id': e.visitor_id,
-                'session_id': e.session_id,
-                'lead_id': e.lead_id,
-                'property_id': e.property_id,
-                'timestamp': e.timestamp.isoformat(),
-                'page_url': e.page_url,
-                'referrer': e.referrer,
-                'user_agent': e.user_agent,
-                'ip_address': e.ip_address,
-                'properties': e.properties
-            }
-            for e in self.events[-5000:]
-        ]
-        
-        with open(f"{self.storage_path}/events.json", 'w') as f:
-            json.dump(data, f, indent=2)
+    def _tail_covers(self, start_date: Optional[datetime]) -> bool:
+        """Whether the in-memory tail holds every logged event from ``start_date`` on."""
+        if len(self.events) >= len(self.log):
+            return True
+        return (start_date is not None and bool(self.events)
+                and start_date >= self.events[0].timestamp)
+    
+    def _events_between(
+        self,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Iterator[TrackingEvent]:
+        """Events in ``[start_date, end_date]`` from the tail, or the log's overlapping segments."""
+        if self._tail_covers(start_date):
+            for event in self.events:
+                if (start_date is None or event.timestamp >= start_date) and \
+                        (end_date is None or event.timestamp <= end_date):
+                    yield event
+        else:
+            for event_data in self.log.scan(start_date, end_date):
+                yield _event_from_record(event_data)
+    
+    def rebuild_rollups(self):
+        """Recount every rollup counter from the full log."""
+        self.rollups.rebuild(
+            (datetime.fromisoformat(event_data['timestamp']), _event_rollup(event_data))
+            for event_data in self.log.scan()
+        )
+    
+    def close(self):
+        """Sync and close the event log and flush the rollups."""
+        self.log.close()
+        self.rollups.close()
     
     def on_event(self, event_key: str, handler: Callable):
         """Register an event handler."""
@@ -183,8 +272,10 @@ class EventTracker:
             properties=properties or {}
         )
         
+        record = _event_record(event)
         self.events.append(event)
-        self._save_events()
+        self.log.append(record, at=event.timestamp)
+        self.rollups.add(event.timestamp, **_event_rollup(record))
         self._trigger_handlers(event)
         
         return event
@@ -328,8 +419,22 @@ class EventTracker:
         end_date: datetime = None,
         limit: int = 100
     ) -> List[TrackingEvent]:
-        """Get events with filters."""
-        events = self.events
+        """Get events with filters, newest first."""
+        if not self._tail_covers(start_date):
+            def matches(event_data: Dict) -> bool:
+                return (
+                    (not category or event_data['category'] == category.value) and
+                    (not action or event_data['action'] == action) and
+                    (not visitor_id or event_data.get('visitor_id') == visitor_id) and
+                    (not lead_id or event_data.get('lead_id') == lead_id)
+                )
+            
+            return [
+                _event_from_record(event_data)
+                for event_data in self.log.newest(limit, start_date, end_date, where=matches)
+            ]
+        
+        events = list(self.events)
         
         if category:
             events = [e for e in events if e.category == category]
@@ -357,79 +462,158 @@ class EventTracker:
         start_date: datetime = None,
         end_date: datetime = None
     ) -> Dict:
-        """Get event counts by category and action."""
+        """Get event counts by category and action (from the rollups, to the minute)."""
         start_date = start_date or (datetime.now() - timedelta(days=30))
         end_date = end_date or datetime.now()
         
-        events = [e for e in self.events if start_date <= e.timestamp <= end_date]
+        counts = self.rollups.counts(start_date, end_date)
+        return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True))
+    
+    def get_event_timeline(
+        self,
+        start_date: datetime = None,
+        end_date: datetime = None,
+        granularity: str = "day",
+        category: EventCategory = None,
+        action: str = None,
+        source: str = None,
+        campaign: str = None
+    ) -> Dict[str, int]:
+        """Event counts per minute, hour or day bucket, oldest first.
         
-        counts = {}
-        for event in events:
-            key = f"{event.category.value}:{event.action}"
-            counts[key] = counts.get(key, 0) + 1
+        Buckets are labelled ``YYYY-MM-DD``, ``YYYY-MM-DDTHH`` or
+        ``YYYY-MM-DDTHH:MM``; an ``action`` filter needs a ``category``.
+        """
+        start_date = start_date or (datetime.now() - timedelta(days=30))
+        end_date = end_date or datetime.now()
         
-        return dict(sorted(counts.items(), key=lambda x: x[1], reverse=True))
+        where = {}
+        if category and action:
+            where['event_type'] = f"{category.value}:{action}"
+        if source is not None:
+            where['source'] = source
+        if campaign is not None:
+            where['campaign'] = campaign
+        if category and not action:
+            series: Dict[str, int] = {}
+            for event_type in self.rollups.counts(start_date, end_date, where=where):
+                if event_type.startswith(f"{category.value}:"):
+                    for label, count in self.rollups.series(
+                        start_date, end_date, granularity, {**where, 'event_type': event_type}
+                    ).items():
+                        series[label] = series.get(label, 0) + count
+            return dict(sorted(series.items()))
+        return self.rollups.series(start_date, end_date, granularity, where)
     
     def get_funnel_analysis(
         self,
         steps: List[tuple],  # [(category, action), ...]
         start_date: datetime = None,
-        end_date: datetime = None
+        end_date: datetime = None,
+        window: timedelta = None,
+        breakdown: str = None,
+        ordered: bool = False
     ) -> Dict:
-        """Analyze conversion funnel."""
+        """Analyze conversion funnel.
+        
+        By default each step counts the visitors who did it in the range.
+        With ``ordered`` a visitor reaches a step only after completing
+        every earlier step in order, all within ``window`` of entering the
+        funnel (any time in the range if ``None``). ``breakdown``
+        ("source" or "campaign") adds per-value funnels keyed by the
+        visitor's value on entering. Visitors come from one pass over the
+        tail or the log (see ``tracking/funnel.py``); each step's total
+        ``events`` come from the rollups.
+        """
+        if breakdown not in (None, 'source', 'campaign'):
+            raise ValueError(f"Unknown funnel breakdown {breakdown!r}")
         start_date = start_date or (datetime.now() - timedelta(days=30))
         end_date = end_date or datetime.now()
         
-        events = [e for e in self.events if start_date <= e.timestamp <= end_date]
+        step_names = [f"{category}:{action}" for category, action in steps]
+        engine = FunnelEngine(step_names, window, ordered)
+        step_types = engine.step_types
         
-        # Group events by visitor
-        visitor_events = {}
-        for event in events:
-            if event.visitor_id:
-                if event.visitor_id not in visitor_events:
-                    visitor_events[event.visitor_id] = []
-                visitor_events[event.visitor_id].append(event)
+        if self._tail_covers(start_date):
+            for event in self.events:
+                event_type = f"{event.category.value}:{event.action}"
+                if event_type not in step_types or not start_date <= event.timestamp <= end_date:
+                    continue
+                group = ""
+                if breakdown == 'source':
+                    group = _event_source(event.referrer, event.properties)
+                elif breakdown == 'campaign':
+                    group = event.properties.get('utm_campaign') or ''
+                engine.feed(event.visitor_id, event_type, event.timestamp, group)
+        else:
+            for event_data in self.log.scan(start_date, end_date):
+                event_type = f"{event_data['category']}:{event_data['action']}"
+                if event_type not in step_types:
+                    continue
+                properties = event_data.get('properties') or {}
+                group = ""
+                if breakdown == 'source':
+                    group = _event_source(event_data.get('referrer'), properties)
+                elif breakdown == 'campaign':
+                    group = properties.get('utm_campaign') or ''
+                engine.feed(
+                    event_data.get('visitor_id'), event_type,
+                    datetime.fromisoformat(event_data['timestamp']), group
+                )
         
-        # Analyze funnel
-        funnel_results = []
-        for i, (category, action) in enumerate(steps):
-            visitors_at_step = set()
-            
-            for visitor_id, v_events in visitor_events.items():
-                # Check if visitor completed this step
-                for event in v_events:
-                    if event.category.value == category and event.action == action:
-                        visitors_at_step.add(visitor_id)
-                        break
-            
-            count = len(visitors_at_step)
-            prev_count = funnel_results[i-1]['count'] if i > 0 else count
-            drop_rate = ((prev_count - count) / prev_count * 100) if prev_count > 0 else 0
-            
-            funnel_results.append({
-                'step': f"{category}:{action}",
-                'count': count,
-                'drop_rate': round(drop_rate, 1)
-            })
-        
-        return {
-            'steps': funnel_results,
-            'overall_conversion': (
-                (funnel_results[-1]['count'] / funnel_results[0]['count'] * 100)
-                if funnel_results and funnel_results[0]['count'] > 0 else 0
-            )
-        }
+        result = engine.summary()
+        step_events = self.rollups.counts(start_date, end_date)
+        for step in result['steps']:
+            step['events'] = step_events.get(step['step'], 0)
+        if breakdown:
+            unset = 'direct' if breakdown == 'source' else 'none'
+            result['breakdown'] = {
+                group or unset: engine.summary(counts)
+                for group, counts in engine.breakdown().items()
+            }
+        return result
     
-    def get_property_engagement(self, property_id: str) -> Dict:
-        """Get engagement metrics for a property."""
-        events = [e for e in self.events if e.property_id == property_id]
+    def get_property_engagement(
+        self,
+        property_id: str,
+        start_date: datetime = None,
+        end_date: datetime = None
+    ) -> Dict:
+        """Get engagement metrics for a property (default: all history).
+        
+        Counts come from the rollups. Unique visitors aren't additive, so
+        they come from the events between the property's first and last
+        active hour in the range (the tail, or only those log segments).
+        Open ends of the range default to those active hours, so the whole
+        history costs no more to read than the property's own activity.
+        """
+        if start_date is None or end_date is None:
+            now = datetime.now()
+            active = self.rollups.active_range('hour', {'property_id': property_id})
+            first, last = active or (now, now)
+            start_date = start_date or first
+            end_date = end_date or last + timedelta(minutes=59)
         
-        views = len([e for e in events if e.action == 'view'])
-        favorites = len([e for e in events if e.action == 'favorite'])
-        inquiries = len([e for e in events if e.action == 'inquiry'])
-        showings = len([e for e in events if e.action == 'showing_scheduled'])
+        actions: Dict[str, int] = {}
+        for event_type, count in self.rollups.counts(
+            start_date, end_date, where={'property_id': property_id}
+        ).items():
+            action = event_type.split(':', 1)[-1]
+            actions[action] = actions.get(action, 0) + count
+        views = actions.get('view', 0)
+        favorites = actions.get('favorite', 0)
+        inquiries = actions.get('inquiry', 0)
+        showings = actions.get('showing_scheduled', 0)
         
-        unique_visitors = len(set(e.visitor_id for e in events if e.visitor_id))
+        visitors = set()
+        hours = self.rollups.series(start_date, end_date, 'hour', {'property_id': property_id})
+        if hours:
+            first = max(start_date, datetime.strptime(min(hours), '%Y-%m-%dT%H'))
+            last = min(end_date, datetime.strptime(max(hours), '%Y-%m-%dT%H') + timedelta(hours=1))
+            for event in self._events_between(first, last):
+                if event.property_id == property_id and event.visitor_id:
+                    visitors.add(event.visitor_id)
+        unique_visitors = len(visitors)
         
         return {
             'total_views': views,
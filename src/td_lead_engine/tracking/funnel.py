@@ -0,0 +1,105 @@
+"""Single-pass funnel engine.
+
+Events are fed once, oldest first. Each visitor carries a small state
+machine: for each step, the start time of the most recent chain that has
+reached it. A step-``k`` event advances a chain that has reached step
+``k - 1`` (and, with a ``window``, started no more than ``window`` before
+it). Keeping the latest start gives every later step the most room in
+the window. An event matching several steps advances the later steps
+first, so one event never counts as two steps. The work is
+O(events × matching steps) and the memory O(visitors × steps).
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Sequence
+
+
+class FunnelEngine:
+    """Per-visitor funnel progress over a stream of ``(visitor, event type, time)`` events."""
+
+    def __init__(
+        self,
+        steps: Sequence[str],
+        window: Optional[timedelta] = None,
+        ordered: bool = True
+    ):
+        if not steps:
+            raise ValueError("A funnel needs at least one step")
+        self.steps = list(steps)
+        self.window = window
+        self.ordered = ordered
+        # Event type -> the steps it completes, latest first
+        self._step_indices: Dict[str, List[int]] = {}
+        for index, step in enumerate(self.steps):
+            self._step_indices.setdefault(step, []).insert(0, index)
+        self._chains: Dict[str, List[Optional[datetime]]] = {}
+        self._groups: Dict[str, str] = {}
+
+    @property
+    def step_types(self) -> frozenset:
+        """Event types that complete some step (everything else can be skipped unread)."""
+        return frozenset(self._step_indices)
+
+    def feed(self, visitor_id: str, event_type: str, at: datetime, group: str = ""):
+        """Advance ``visitor_id``'s state with one event; events must arrive oldest first.
+
+        ``group`` is the breakdown value the visitor is counted under; the
+        one on the visitor's first funnel entry sticks.
+        """
+        indices = self._step_indices.get(event_type)
+        if indices is None or not visitor_id:
+            return
+        chains = self._chains.get(visitor_id)
+        if chains is None:
+            if self.ordered and indices[-1] != 0:
+                return  # Ordered funnels are entered at the first step only
+            chains = self._chains[visitor_id] = [None] * len(self.steps)
+            self._groups[visitor_id] = group
+        for index in indices:
+            if index == 0 or not self.ordered:
+                chains[index] = at
+                continue
+            start = chains[index - 1]
+            if start is None or (self.window is not None and at - start > self.window):
+                continue
+            if chains[index] is None or start > chains[index]:
+                chains[index] = start
+
+    def counts(self) -> List[int]:
+        """Visitors that reached each step."""
+        counts = [0] * len(self.steps)
+        for chains in self._chains.values():
+            for index, start in enumerate(chains):
+                if start is not None:
+                    counts[index] += 1
+        return counts
+
+    def breakdown(self) -> Dict[str, List[int]]:
+        """Per-step visitor counts for every group."""
+        result: Dict[str, List[int]] = {}
+        for visitor_id, chains in self._chains.items():
+            counts = result.setdefault(self._groups[visitor_id], [0] * len(self.steps))
+            for index, start in enumerate(chains):
+                if start is not None:
+                    counts[index] += 1
+        return result
+
+    def summary(self, counts: Optional[List[int]] = None) -> Dict:
+        """``counts`` (default: all visitors) as steps with drop rates.
+
+        Also reports the overall conversion from the first step to the last.
+        """
+        counts = self.counts() if counts is None else counts
+        funnel_results = []
+        for i, (step, count) in enumerate(zip(self.steps, counts)):
+            prev_count = counts[i - 1] if i > 0 else count
+            drop_rate = ((prev_count - count) / prev_count * 100) if prev_count > 0 else 0
+            funnel_results.append({
+                'step': step,
+                'count': count,
+                'drop_rate': round(drop_rate, 1)
+            })
+        return {
+            'steps': funnel_results,
+            'overall_conversion': (counts[-1] / counts[0] * 100) if counts[0] > 0 else 0
+        }
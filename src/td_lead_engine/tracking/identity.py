@@ -0,0 +1,195 @@
+"""Identity resolution across visitor, session, email and phone identifiers.
+
+Each identifier is a node (``visitor:<id>``, ``session:<id>``,
+``email:<sha256>``, ``phone:<sha256>``, ``lead:<id>``) in a union-find
+forest kept in a ``DocumentStore`` collection, one document per node.
+Linking identifiers seen together (a session of a visitor, a form with
+an email from a session) merges their sets; resolving any identifier to
+its person (root) and lead takes a few point reads whatever the history
+size. Merges are union by size, which keeps paths short; ``link`` also
+compresses the paths it walks, while ``resolve`` and ``lead_for`` only read.
+
+Root documents hold just ``size`` and ``lead_id``, so a link or lookup
+doesn't grow with the identity; the members of a set are found through
+the index on ``parent``, one lookup per tree level, when asked for.
+Each ``link`` is one store transaction, so processes sharing the file
+can't overwrite each other's merges.
+
+Emails and phones are stored only as hashes of their normalized form
+(``storage/contact_keys.py``), so the index holds no contact details.
+"""
+
+import hashlib
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from ..core.doc_store import open_store
+from ..storage.contact_keys import normalize_email, normalize_phone
+
+
+def _hash(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _size(root_doc: Dict) -> int:
+    """Set size of a root document (older roots listed their members instead)."""
+    return root_doc.get("size") or len(root_doc.get("members", ())) or 1
+
+
+def identity_nodes(
+    visitor_id: str = None,
+    session_id: str = None,
+    email: str = None,
+    phone: str = None,
+    lead_id: str = None
+) -> List[str]:
+    """Graph nodes for whichever identifiers are given.
+
+    Phones too short to carry an area code are left out, as in lead dedup.
+    """
+    nodes = []
+    if visitor_id:
+        nodes.append(f"visitor:{visitor_id}")
+    if session_id:
+        nodes.append(f"session:{session_id}")
+    email_key = normalize_email(email)
+    if email_key:
+        nodes.append(f"email:{_hash(email_key)}")
+    phone_key = normalize_phone(phone)
+    if phone_key and len(phone_key.lstrip("+")) >= 10:
+        nodes.append(f"phone:{_hash(phone_key)}")
+    if lead_id:
+        nodes.append(f"lead:{lead_id}")
+    return nodes
+
+
+@dataclass
+class Identity:
+    """One resolved person: their root node, lead and set size.
+
+    ``members`` (every identifier linked to them) is read from the graph
+    on access.
+    """
+    root: str
+    lead_id: Optional[str] = None
+    size: int = 1
+    graph: Optional["IdentityGraph"] = field(default=None, repr=False, compare=False)
+
+    @property
+    def members(self) -> List[str]:
+        return self.graph.members(self.root) if self.graph is not None else [self.root]
+
+    def ids(self, kind: str) -> List[str]:
+        """Raw ids of the ``kind`` members (e.g. every ``visitor`` id)."""
+        prefix = f"{kind}:"
+        return [node[len(prefix):] for node in self.members if node.startswith(prefix)]
+
+
+class IdentityGraph:
+    """Persisted union-find over identifier nodes.
+
+    Root documents hold ``size`` and ``lead_id``; every other node holds
+    its ``parent``. The store is never write-behind: a merge must be
+    committed before another process reads the roots it changed.
+    """
+
+    def __init__(self, path: Path):
+        self.store = open_store(Path(path))
+        self.nodes = self.store.collection("identity_nodes", indexes=("parent",))
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def _find(self, node: str, compress: bool = False) -> Optional[Tuple[str, Dict]]:
+        """``(root, root document)`` for ``node``, or None if it was never linked.
+
+        With ``compress``, nodes on the walked path are repointed at the root.
+        """
+        doc = self.nodes.get(node)
+        if doc is None:
+            return None
+        path = []
+        key = node
+        while "parent" in doc:
+            path.append(key)
+            key = doc["parent"]
+            doc = self.nodes.get(key)
+        if compress and len(path) > 1:
+            self.nodes.put_many((p, {"parent": key}) for p in path[:-1])
+        return key, doc
+
+    def link(self, *nodes: str, lead_id: str = None) -> Optional[str]:
+        """Merge the sets of ``nodes`` (creating new ones); returns the root.
+
+        ``lead_id`` becomes the merged identity's lead; otherwise it keeps
+        the largest set's lead (or any merged set's).
+        """
+        nodes = list(dict.fromkeys(n for n in nodes if n))
+        if not nodes:
+            return None
+        with self._lock, self.store.transaction():
+            roots: Dict[str, Dict] = {}
+            new = []
+            for node in nodes:
+                found = self._find(node, compress=True)
+                if found is None:
+                    new.append(node)
+                else:
+                    roots[found[0]] = found[1]
+
+            if roots:
+                winner = max(roots, key=lambda r: _size(roots[r]))
+                winner_doc = roots.pop(winner)
+                unchanged = lead_id is None or winner_doc.get("lead_id") == str(lead_id)
+                if not roots and not new and unchanged:
+                    return winner  # Already linked
+            else:
+                winner = new.pop(0)
+                winner_doc = {"size": 1, "lead_id": None}
+
+            size = _size(winner_doc) + len(new)
+            merged_lead = winner_doc.get("lead_id")
+            writes = []
+            for other, doc in roots.items():
+                size += _size(doc)
+                merged_lead = merged_lead or doc.get("lead_id")
+                writes.append((other, {"parent": winner}))
+            writes.extend((node, {"parent": winner}) for node in new)
+            if lead_id is not None:
+                merged_lead = str(lead_id)
+            writes.append((winner, {"size": size, "lead_id": merged_lead}))
+            self.nodes.put_many(writes)
+            return winner
+
+    def resolve(self, *nodes: str) -> Optional[Identity]:
+        """The identity of the first of ``nodes`` that has been linked (read-only)."""
+        with self._lock:
+            for node in nodes:
+                found = node and self._find(node)
+                if found:
+                    root, doc = found
+                    return Identity(root=root, lead_id=doc.get("lead_id"), size=_size(doc),
+                                    graph=self)
+        return None
+
+    def lead_for(self, *nodes: str) -> Optional[str]:
+        """The lead linked to any of ``nodes`` (checked in order; read-only)."""
+        with self._lock:
+            for node in nodes:
+                found = node and self._find(node)
+                if found and found[1].get("lead_id"):
+                    return found[1]["lead_id"]
+        return None
+
+    def members(self, root: str) -> List[str]:
+        """Every node in ``root``'s set, root first (one indexed lookup per tree level)."""
+        members = [root]
+        level = [root]
+        with self._lock:
+            while level:
+                level = self.nodes.find_keys("parent", level)
+                members.extend(level)
+        return members
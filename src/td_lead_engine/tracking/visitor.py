@@ -4,11 +4,14 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from enum import Enum
+from pathlib import Path
 import json
 import os
 import uuid
 import hashlib
 
+from .identity import IdentityGraph, identity_nodes
+
 
 class VisitorStatus(Enum):
     """Visitor status."""
@@ -119,15 +122,39 @@ class Visitor:
 
 
 class VisitorTracker:
-    """Track website visitors."""
+    """Track website visitors.
+    
+    Visitors, their sessions, emails, phones and leads are linked in an
+    identity graph (``storage_path/identity.db``, see
+    ``tracking/identity.py``), so a visitor, session or contact resolves to
+    its lead, and a lead to every visitor and session stitched to it,
+    without scanning stored visitors.
+    """
     
     def __init__(self, storage_path: str = "data/tracking"):
         self.storage_path = storage_path
         self.visitors: Dict[str, Visitor] = {}
         self.sessions: Dict[str, VisitorSession] = {}
         self.active_sessions: Dict[str, str] = {}  # fingerprint -> session_id
+        self._fingerprints: Dict[str, str] = {}  # fingerprint -> visitor_id
         
         self._load_data()
+        for visitor in self.visitors.values():
+            if visitor.fingerprint:
+                self._fingerprints.setdefault(visitor.fingerprint, visitor.id)
+        
+        self.identities = IdentityGraph(Path(storage_path) / "identity.db")
+        if self.visitors and not len(self.identities):
+            self._build_identities()
+    
+    def _build_identities(self):
+        """Link the stored visitors' sessions, emails and leads (first run with the graph)."""
+        for visitor in self.visitors.values():
+            self.identities.link(
+                *identity_nodes(visitor_id=visitor.id, email=visitor.email, lead_id=visitor.lead_id),
+                *(f"session:{session_id}" for session_id in visitor.sessions),
+                lead_id=visitor.lead_id or None
+            )
     
     def _load_data(self):
         """Load tracking data from storage."""
@@ -297,9 +324,9 @@ class VisitorTracker:
     ) -> Visitor:
         """Get or create a visitor by fingerprint."""
         # Look for existing visitor
-        for visitor in self.visitors.values():
-            if visitor.fingerprint == fingerprint:
-                return visitor
+        visitor_id = self._fingerprints.get(fingerprint)
+        if visitor_id in self.visitors:
+            return self.visitors[visitor_id]
         
         # Create new visitor
         visitor = Visitor(
@@ -307,6 +334,8 @@ class VisitorTracker:
             fingerprint=fingerprint
         )
         self.visitors[visitor.id] = visitor
+        self._fingerprints[fingerprint] = visitor.id
+        self.identities.link(*identity_nodes(visitor_id=visitor.id))
         self._save_data()
         return visitor
     
@@ -346,6 +375,7 @@ class VisitorTracker:
         )
         
         self.sessions[session.id] = session
+        self.identities.link(*identity_nodes(visitor_id=visitor_id, session_id=session.id))
         
         # Update visitor
         if visitor_id in self.visitors:
@@ -476,19 +506,81 @@ class VisitorTracker:
         self,
         visitor_id: str,
         email: str,
-        lead_id: str = ""
+        lead_id: str = "",
+        phone: str = ""
     ):
-        """Identify a visitor with their email."""
+        """Identify a visitor with their email (and phone).
+        
+        Every visitor already linked to the same email, phone or lead (e.g.
+        the same person on another device) is identified along with it.
+        """
         if visitor_id not in self.visitors:
             return
         
-        visitor = self.visitors[visitor_id]
-        visitor.email = email
-        visitor.lead_id = lead_id
-        visitor.status = VisitorStatus.IDENTIFIED if not lead_id else VisitorStatus.LEAD
+        self.identities.link(
+            *identity_nodes(visitor_id=visitor_id, email=email, phone=phone, lead_id=lead_id),
+            lead_id=lead_id or None
+        )
+        identity = self.identities.resolve(f"visitor:{visitor_id}")
+        lead_id = lead_id or identity.lead_id or ""
+        
+        for linked_id in identity.ids("visitor"):
+            visitor = self.visitors.get(linked_id)
+            if visitor is None:
+                continue
+            if linked_id == visitor_id or not visitor.email:
+                visitor.email = email
+            visitor.lead_id = lead_id
+            visitor.status = VisitorStatus.IDENTIFIED if not lead_id else VisitorStatus.LEAD
         
         self._save_data()
     
+    def resolve_lead(
+        self,
+        visitor_id: str = None,
+        session_id: str = None,
+        email: str = None,
+        phone: str = None
+    ) -> Optional[str]:
+        """The lead linked to any of the given identifiers, if there is one."""
+        return self.identities.lead_for(
+            *identity_nodes(visitor_id=visitor_id, session_id=session_id, email=email, phone=phone)
+        )
+    
+    def get_lead_timeline(self, lead_id: str) -> List[Dict]:
+        """Page views and events of every session stitched to a lead, oldest first.
+        
+        Reads only the lead's own sessions (those still kept in memory).
+        """
+        identity = self.identities.resolve(f"lead:{lead_id}")
+        if identity is None:
+            return []
+        
+        timeline = []
+        for session_id in identity.ids("session"):
+            session = self.sessions.get(session_id)
+            if session is None:
+                continue
+            for pv in session.page_views:
+                timeline.append({
+                    'type': 'page_view',
+                    'timestamp': pv.timestamp,
+                    'visitor_id': session.visitor_id,
+                    'session_id': session.id,
+                    'url': pv.url,
+                    'title': pv.title
+                })
+            for event in session.events:
+                timeline.append({
+                    'type': event['type'],
+                    'timestamp': datetime.fromisoformat(event['timestamp']),
+                    'visitor_id': session.visitor_id,
+                    'session_id': session.id,
+                    'data': event.get('data', {})
+                })
+        timeline.sort(key=lambda item: item['timestamp'])
+        return timeline
+    
     def _parse_source(self, referrer: str) -> str:
         """Parse traffic source from referrer."""
         if not referrer:
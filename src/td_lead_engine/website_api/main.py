@@ -24,6 +24,10 @@ async def lifespan(app: FastAPI):
         from ..storage.migrations import run_migrations
         run_migrations(settings.db_path)
         logger.info("Database migrations applied")
+        from .services.ingestion import backfill_lead_keys
+        filled = backfill_lead_keys()
+        if filled:
+            logger.info(f"Computed contact keys for {filled} leads")
     except Exception as e:
         logger.warning(f"Migration check: {e}")
 
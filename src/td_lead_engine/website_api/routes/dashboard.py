@@ -14,18 +14,21 @@ async def list_leads(
     status: Optional[str] = None,
     utm_campaign: Optional[str] = None,
     limit: int = Query(default=50, le=500),
-    offset: int = 0,
+    cursor: Optional[str] = None,
 ):
-    """List leads with filtering."""
+    """List leads with filtering; pass ``next_cursor`` back as ``cursor`` for the next page."""
     service = LeadService()
-    return service.list_leads(
-        source=source,
-        tier=tier,
-        status=status,
-        utm_campaign=utm_campaign,
-        limit=limit,
-        offset=offset,
-    )
+    try:
+        return service.list_leads(
+            source=source,
+            tier=tier,
+            status=status,
+            utm_campaign=utm_campaign,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(400, str(e))
 
 
 @router.get("/{lead_id}")
@@ -42,6 +42,7 @@ class Attribution(BaseModel):
 
 class SessionInfo(BaseModel):
     session_id: Optional[str] = None
+    visitor_id: Optional[str] = None
     device_type: Optional[str] = None
     browser: Optional[str] = None
     city: Optional[str] = None
@@ -2,13 +2,25 @@
 
 import json
 import sqlite3
+import threading
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Tuple
-
+from typing import Dict, Tuple
+
+from ...storage.contact_keys import (
+    backfill_contact_keys,
+    contact_keys,
+    normalize_email,
+    normalize_phone,
+)
+from ...tracking.identity import IdentityGraph, identity_nodes
 from ..config import settings
 from .validation import validate_and_normalize
 
+# Identity graphs by path, shared by every request in the process
+_identity_graphs: Dict[Path, IdentityGraph] = {}
+_identity_lock = threading.Lock()
+
 
 def get_db_connection() -> sqlite3.Connection:
     """Get a database connection."""
@@ -21,47 +33,95 @@ def get_db_connection() -> sqlite3.Connection:
     return conn
 
 
+def get_identity_graph() -> IdentityGraph:
+    """The identity index (``identity.db``) next to the leads database."""
+    path = Path(settings.db_path).with_name("identity.db")
+    with _identity_lock:
+        if path not in _identity_graphs:
+            _identity_graphs[path] = IdentityGraph(path)
+        return _identity_graphs[path]
+
+
+def backfill_lead_keys() -> int:
+    """Fill in dedup keys for leads written without them. Returns rows updated."""
+    conn = get_db_connection()
+    try:
+        filled = backfill_contact_keys(conn)
+        conn.commit()
+        return filled
+    finally:
+        conn.close()
+
+
 def ingest_lead(payload: dict) -> Tuple[dict, bool]:
     """Process an incoming website lead event.
 
     Returns (response_dict, is_new_lead).
+
+    The session's visitor and session ids and the contact's email and
+    phone are linked to the lead in the identity graph. A returning
+    visitor or session whose contact details match no lead (e.g. a phone
+    after an earlier email-only form) continues the lead it is linked to,
+    which gains the new details, instead of starting a new one.
     """
     # Validate and normalize
     payload = validate_and_normalize(payload)
 
+    graph = get_identity_graph()
     conn = get_db_connection()
     try:
         contact = payload.get("contact", {})
         email = contact.get("email")
         phone = contact.get("phone")
+        session = payload.get("session", {})
+        nodes = identity_nodes(
+            visitor_id=session.get("visitor_id"),
+            session_id=session.get("session_id"),
+            email=email,
+            phone=phone,
+        )
+        linked_lead = graph.lead_for(*nodes)
 
         # Find existing lead by email or phone (dedup)
         lead_id = None
         is_new = False
 
-        if email:
+        email_key = normalize_email(email)
+        if email_key:
             cursor = conn.execute(
-                "SELECT id FROM leads WHERE email = ? COLLATE NOCASE LIMIT 1",
-                (email,),
+                "SELECT id FROM leads WHERE email_key = ? ORDER BY id LIMIT 1",
+                (email_key,),
             )
             row = cursor.fetchone()
             if row:
                 lead_id = row[0]
 
-        if lead_id is None and phone:
-            digits = "".join(c for c in phone if c.isdigit())
-            if len(digits) >= 10:
-                cursor = conn.execute(
-                    "SELECT id FROM leads WHERE phone LIKE ? LIMIT 1",
-                    (f"%{digits[-10:]}%",),
-                )
-                row = cursor.fetchone()
-                if row:
-                    lead_id = row[0]
+        phone_key = normalize_phone(phone)
+        if lead_id is None and phone_key and len(phone_key.lstrip("+")) >= 10:
+            cursor = conn.execute(
+                "SELECT id FROM leads WHERE phone_key = ? ORDER BY id LIMIT 1",
+                (phone_key,),
+            )
+            row = cursor.fetchone()
+            if row:
+                lead_id = row[0]
 
         now = datetime.now(timezone.utc).isoformat()
         name = f"{contact.get('first_name', '')} {contact.get('last_name', '')}".strip()
 
+        if lead_id is None and linked_lead is not None and linked_lead.isdigit():
+            # Visitor seen before under other contact details: continue that lead
+            if conn.execute("SELECT 1 FROM leads WHERE id = ?", (int(linked_lead),)).fetchone():
+                lead_id = int(linked_lead)
+                email_key, phone_key, _ = contact_keys(email, phone, None)
+                conn.execute(
+                    """UPDATE leads SET
+                        email = COALESCE(email, ?), phone = COALESCE(phone, ?),
+                        email_key = COALESCE(email_key, ?), phone_key = COALESCE(phone_key, ?)
+                    WHERE id = ?""",
+                    (email, phone, email_key, phone_key, lead_id),
+                )
+
         if lead_id:
             # Update existing lead
             conn.execute(
@@ -81,15 +141,16 @@ def ingest_lead(payload: dict) -> Tuple[dict, bool]:
                 """INSERT INTO leads (
                     source, name, email, phone, lead_source,
                     first_seen_at, last_seen_at, status,
-                    created_at, updated_at
-                ) VALUES (?, ?, ?, ?, 'website', ?, ?, 'new', ?, ?)""",
-                ("website", name or None, email, phone, now, now, now, now),
+                    created_at, updated_at,
+                    email_key, phone_key, username_key
+                ) VALUES (?, ?, ?, ?, 'website', ?, ?, 'new', ?, ?, ?, ?, ?)""",
+                ("website", name or None, email, phone, now, now, now, now,
+                 *contact_keys(email, phone, None)),
             )
             lead_id = cursor.lastrowid
 
         # Record event
         event_data = payload.get("event_data", {})
-        session = payload.get("session", {})
         conn.execute(
             """INSERT INTO lead_events (
                 lead_id, event_name, event_value, calculator_type,
@@ -153,6 +214,7 @@ def ingest_lead(payload: dict) -> Tuple[dict, bool]:
             )
 
         conn.commit()
+        graph.link(*nodes, f"lead:{lead_id}", lead_id=str(lead_id))
 
         return {
             "success": True,
@@ -6,6 +6,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+from ...storage.pagination import decode_cursor, encode_cursor, filters_key, keyset_after
 from ..config import settings
 
 
@@ -25,18 +26,22 @@ class LeadService:
         status: Optional[str] = None,
         utm_campaign: Optional[str] = None,
         limit: int = 50,
-        offset: int = 0,
+        cursor: Optional[str] = None,
     ) -> dict:
+        """One page of leads, highest score first.
+
+        ``cursor`` is the previous page's ``next_cursor``; each page is an
+        index seek after the last row rather than an OFFSET scan. ``total``
+        is counted on the first page and carried in the cursor. Raises
+        ValueError for a cursor from a different query.
+        """
         conn = _get_conn()
         try:
-            query = "SELECT l.* FROM leads l"
             params = []
-            joins = []
             wheres = []
 
             if utm_campaign:
-                joins.append("JOIN lead_attribution la ON la.lead_id = l.id")
-                wheres.append("la.utm_campaign = ?")
+                wheres.append("l.id IN (SELECT lead_id FROM lead_attribution WHERE utm_campaign = ?)")
                 params.append(utm_campaign)
 
             if source:
@@ -49,17 +54,24 @@ class LeadService:
                 wheres.append("l.status = ?")
                 params.append(status)
 
-            if joins:
-                query += " " + " ".join(joins)
-            if wheres:
-                query += " WHERE " + " AND ".join(wheres)
+            where = " AND ".join(wheres) or "1=1"
+            key = filters_key(where, params)
+
+            if cursor:
+                after_score, after_id, total = decode_cursor(cursor, key)
+                after, after_params = keyset_after(after_score, after_id, alias="l")
+                query = f"SELECT l.* FROM leads l WHERE {where} AND {after}"
+                params.extend(after_params)
+            else:
+                total = conn.execute(f"SELECT COUNT(*) FROM leads l WHERE {where}", params).fetchone()[0]
+                query = f"SELECT l.* FROM leads l WHERE {where}"
 
-            query += " ORDER BY l.score DESC LIMIT ? OFFSET ?"
-            params.extend([limit, offset])
+            query += " ORDER BY l.score DESC, l.id LIMIT ?"
+            params.append(limit + 1)
 
-            cursor = conn.execute(query, params)
+            rows = conn.execute(query, params).fetchall()
             leads = []
-            for row in cursor.fetchall():
+            for row in rows[:limit]:
                 signals = []
                 if row["score_breakdown"]:
                     try:
@@ -80,7 +92,10 @@ class LeadService:
                     "created_at": row["created_at"],
                     "updated_at": row["updated_at"],
                 })
-            return {"leads": leads, "count": len(leads)}
+            next_cursor = None
+            if len(rows) > limit:
+                next_cursor = encode_cursor(leads[-1]["score"], leads[-1]["id"], total, key)
+            return {"leads": leads, "count": len(leads), "total": total, "next_cursor": next_cursor}
         finally:
             conn.close()
 
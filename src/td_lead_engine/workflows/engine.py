@@ -4,12 +4,13 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Callable
 from datetime import datetime, timedelta
 from enum import Enum
-import json
-import os
+from pathlib import Path
 import uuid
 import threading
 import time
 
+from ..core.doc_store import keyed, open_store
+
 
 class WorkflowStatus(Enum):
     """Workflow status."""
@@ -84,6 +85,96 @@ class WorkflowExecution:
     error: str = ""
 
 
+def _workflow_record(wf: Workflow) -> Dict:
+    return {
+        'id': wf.id,
+        'name': wf.name,
+        'description': wf.description,
+        'trigger_type': wf.trigger_type,
+        'trigger_config': wf.trigger_config,
+        'steps': [
+            {
+                'id': s.id,
+                'name': s.name,
+                'step_type': s.step_type.value,
+                'config': s.config,
+                'next_steps': s.next_steps,
+                'conditions': s.conditions,
+                'position': s.position
+            }
+            for s in wf.steps.values()
+        ],
+        'entry_step_id': wf.entry_step_id,
+        'status': wf.status.value,
+        'created_at': wf.created_at.isoformat(),
+        'updated_at': wf.updated_at.isoformat(),
+        'executions_count': wf.executions_count,
+        'success_count': wf.success_count
+    }
+
+
+def _workflow_from_record(wf_data: Dict) -> Workflow:
+    steps = {}
+    for step_data in wf_data.get('steps', []):
+        step = WorkflowStep(
+            id=step_data['id'],
+            name=step_data['name'],
+            step_type=StepType(step_data['step_type']),
+            config=step_data.get('config', {}),
+            next_steps=step_data.get('next_steps', []),
+            conditions=step_data.get('conditions', {}),
+            position=step_data.get('position', {})
+        )
+        steps[step.id] = step
+    
+    return Workflow(
+        id=wf_data['id'],
+        name=wf_data['name'],
+        description=wf_data.get('description', ''),
+        trigger_type=wf_data.get('trigger_type', ''),
+        trigger_config=wf_data.get('trigger_config', {}),
+        steps=steps,
+        entry_step_id=wf_data.get('entry_step_id', ''),
+        status=WorkflowStatus(wf_data.get('status', 'draft')),
+        created_at=datetime.fromisoformat(wf_data['created_at']) if wf_data.get('created_at') else datetime.now(),
+        updated_at=datetime.fromisoformat(wf_data['updated_at']) if wf_data.get('updated_at') else datetime.now(),
+        executions_count=wf_data.get('executions_count', 0),
+        success_count=wf_data.get('success_count', 0)
+    )
+
+
+def _execution_record(e: WorkflowExecution) -> Dict:
+    return {
+        'id': e.id,
+        'workflow_id': e.workflow_id,
+        'lead_id': e.lead_id,
+        'status': e.status.value,
+        'current_step_id': e.current_step_id,
+        'started_at': e.started_at.isoformat(),
+        'completed_at': e.completed_at.isoformat() if e.completed_at else None,
+        'resume_at': e.resume_at.isoformat() if e.resume_at else None,
+        'context': e.context,
+        'step_history': e.step_history,
+        'error': e.error
+    }
+
+
+def _execution_from_record(exec_data: Dict) -> WorkflowExecution:
+    return WorkflowExecution(
+        id=exec_data['id'],
+        workflow_id=exec_data['workflow_id'],
+        lead_id=exec_data['lead_id'],
+        status=ExecutionStatus(exec_data.get('status', 'pending')),
+        current_step_id=exec_data.get('current_step_id', ''),
+        started_at=datetime.fromisoformat(exec_data['started_at']) if exec_data.get('started_at') else datetime.now(),
+        completed_at=datetime.fromisoformat(exec_data['completed_at']) if exec_data.get('completed_at') else None,
+        resume_at=datetime.fromisoformat(exec_data['resume_at']) if exec_data.get('resume_at') else None,
+        context=exec_data.get('context', {}),
+        step_history=exec_data.get('step_history', []),
+        error=exec_data.get('error', '')
+    )
+
+
 class WorkflowEngine:
     """Engine for executing workflows."""
     
@@ -97,127 +188,34 @@ class WorkflowEngine:
         self._engine_thread: Optional[threading.Thread] = None
         self._running = False
         
+        self.store = open_store(Path(storage_path) / "store.db")
+        self.workflow_store = self.store.collection("workflows")
+        self.execution_store = self.store.collection("executions", indexes=("status", "workflow_id"))
         self._load_data()
         self._register_default_handlers()
     
     def _load_data(self):
-        """Load workflows and executions from storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        # Load workflows
-        workflows_file = f"{self.storage_path}/workflows.json"
-        if os.path.exists(workflows_file):
-            with open(workflows_file, 'r') as f:
-                data = json.load(f)
-                for wf_data in data:
-                    steps = {}
-                    for step_data in wf_data.get('steps', []):
-                        step = WorkflowStep(
-                            id=step_data['id'],
-                            name=step_data['name'],
-                            step_type=StepType(step_data['step_type']),
-                            config=step_data.get('config', {}),
-                            next_steps=step_data.get('next_steps', []),
-                            conditions=step_data.get('conditions', {}),
-                            position=step_data.get('position', {})
-                        )
-                        steps[step.id] = step
-                    
-                    workflow = Workflow(
-                        id=wf_data['id'],
-                        name=wf_data['name'],
-                        description=wf_data.get('description', ''),
-                        trigger_type=wf_data.get('trigger_type', ''),
-                        trigger_config=wf_data.get('trigger_config', {}),
-                        steps=steps,
-                        entry_step_id=wf_data.get('entry_step_id', ''),
-                        status=WorkflowStatus(wf_data.get('status', 'draft')),
-                        created_at=datetime.fromisoformat(wf_data['created_at']) if wf_data.get('created_at') else datetime.now(),
-                        updated_at=datetime.fromisoformat(wf_data['updated_at']) if wf_data.get('updated_at') else datetime.now(),
-                        executions_count=wf_data.get('executions_count', 0),
-                        success_count=wf_data.get('success_count', 0)
-                    )
-                    self.workflows[workflow.id] = workflow
-        
-        # Load active executions
-        executions_file = f"{self.storage_path}/executions.json"
-        if os.path.exists(executions_file):
-            with open(executions_file, 'r') as f:
-                data = json.load(f)
-                for exec_data in data:
-                    if exec_data.get('status') in ['pending', 'running', 'waiting']:
-                        execution = WorkflowExecution(
-                            id=exec_data['id'],
-                            workflow_id=exec_data['workflow_id'],
-                            lead_id=exec_data['lead_id'],
-                            status=ExecutionStatus(exec_data.get('status', 'pending')),
-                            current_step_id=exec_data.get('current_step_id', ''),
-                            started_at=datetime.fromisoformat(exec_data['started_at']) if exec_data.get('started_at') else datetime.now(),
-                            completed_at=datetime.fromisoformat(exec_data['completed_at']) if exec_data.get('completed_at') else None,
-                            resume_at=datetime.fromisoformat(exec_data['resume_at']) if exec_data.get('resume_at') else None,
-                            context=exec_data.get('context', {}),
-                            step_history=exec_data.get('step_history', []),
-                            error=exec_data.get('error', '')
-                        )
-                        self.executions[execution.id] = execution
-    
-    def _save_data(self):
-        """Save workflows and executions to storage."""
-        os.makedirs(self.storage_path, exist_ok=True)
-        
-        # Save workflows
-        workflows_data = []
-        for wf in self.workflows.values():
-            steps_data = [
-                {
-                    'id': s.id,
-                    'name': s.name,
-                    'step_type': s.step_type.value,
-                    'config': s.config,
-                    'next_steps': s.next_steps,
-                    'conditions': s.conditions,
-                    'position': s.position
-                }
-                for s in wf.steps.values()
-            ]
-            workflows_data.append({
-                'id': wf.id,
-                'name': wf.name,
-                'description': wf.description,
-                'trigger_type': wf.trigger_type,
-                'trigger_config': wf.trigger_config,
-                'steps': steps_data,
-                'entry_step_id': wf.entry_step_id,
-                'status': wf.status.value,
-                'created_at': wf.created_at.isoformat(),
-                'updated_at': wf.updated_at.isoformat(),
-                'executions_count': wf.executions_count,
-                'success_count': wf.success_count
-            })
-        
-        with open(f"{self.storage_path}/workflows.json", 'w') as f:
-            json.dump(workflows_data, f, indent=2)
-        
-        # Save executions
-        executions_data = [
-            {
-                'id': e.id,
-                'workflow_id': e.workflow_id,
-                'lead_id': e.lead_id,
-                'status': e.status.value,
-                'current_step_id': e.current_step_id,
-                'started_at': e.started_at.isoformat(),
-                'completed_at': e.completed_at.isoformat() if e.completed_at else None,
-                'resume_at': e.resume_at.isoformat() if e.resume_at else None,
-                'context': e.context,
-                'step_history': e.step_history,
-                'error': e.error
-            }
-            for e in self.executions.values()
-        ]
+        """Load workflows and active executions from storage."""
+        self.workflow_store.import_legacy(f"{self.storage_path}/workflows.json", keyed)
+        self.execution_store.import_legacy(f"{self.storage_path}/executions.json", keyed)
+        
+        for _, wf_data in self.workflow_store.items():
+            workflow = _workflow_from_record(wf_data)
+            self.workflows[workflow.id] = workflow
         
-        with open(f"{self.storage_path}/executions.json", 'w') as f:
-            json.dump(executions_data, f, indent=2)
+        # Finished executions stay in the store as history but aren't loaded
+        for status in ['pending', 'running', 'waiting']:
+            for exec_data in self.execution_store.find('status', status):
+                execution = _execution_from_record(exec_data)
+                self.executions[execution.id] = execution
+    
+    def _save_workflow(self, workflow: Workflow):
+        """Save one workflow."""
+        self.workflow_store.put(workflow.id, _workflow_record(workflow))
+    
+    def _save_execution(self, execution: WorkflowExecution):
+        """Save one execution."""
+        self.execution_store.put(execution.id, _execution_record(execution))
     
     def _register_default_handlers(self):
         """Register default action handlers and condition evaluators."""
@@ -273,7 +271,7 @@ class WorkflowEngine:
             trigger_config=trigger_config or {}
         )
         self.workflows[workflow.id] = workflow
-        self._save_data()
+        self._save_workflow(workflow)
         return workflow
     
     def add_step(
@@ -307,7 +305,7 @@ class WorkflowEngine:
         if not self.workflows[workflow_id].entry_step_id:
             self.workflows[workflow_id].entry_step_id = step.id
         
-        self._save_data()
+        self._save_workflow(self.workflows[workflow_id])
         return step
     
     def update_step(
@@ -328,7 +326,7 @@ class WorkflowEngine:
                 setattr(step, key, value)
         
         self.workflows[workflow_id].updated_at = datetime.now()
-        self._save_data()
+        self._save_workflow(self.workflows[workflow_id])
         return step
     
     def remove_step(self, workflow_id: str, step_id: str) -> bool:
@@ -345,14 +343,14 @@ class WorkflowEngine:
             if step_id in step.next_steps:
                 step.next_steps.remove(step_id)
         
-        self._save_data()
+        self._save_workflow(self.workflows[workflow_id])
         return True
     
     def activate_workflow(self, workflow_id: str) -> bool:
         """Activate a workflow."""
         if workflow_id in self.workflows:
             self.workflows[workflow_id].status = WorkflowStatus.ACTIVE
-            self._save_data()
+            self._save_workflow(self.workflows[workflow_id])
             return True
         return False
     
@@ -360,7 +358,7 @@ class WorkflowEngine:
         """Pause a workflow."""
         if workflow_id in self.workflows:
             self.workflows[workflow_id].status = WorkflowStatus.PAUSED
-            self._save_data()
+            self._save_workflow(self.workflows[workflow_id])
             return True
         return False
     
@@ -368,7 +366,7 @@ class WorkflowEngine:
         """Delete a workflow."""
         if workflow_id in self.workflows:
             del self.workflows[workflow_id]
-            self._save_data()
+            self.workflow_store.delete(workflow_id)
             return True
         return False
     
@@ -397,7 +395,8 @@ class WorkflowEngine:
         
         self.executions[execution.id] = execution
         workflow.executions_count += 1
-        self._save_data()
+        self._save_workflow(workflow)
+        self._save_execution(execution)
         
         # Start processing
         self._process_execution(execution)
@@ -410,7 +409,7 @@ class WorkflowEngine:
         if not workflow:
             execution.status = ExecutionStatus.FAILED
             execution.error = "Workflow not found"
-            self._save_data()
+            self._save_execution(execution)
             return
         
         while execution.status == ExecutionStatus.RUNNING:
@@ -459,7 +458,9 @@ class WorkflowEngine:
                 execution.error = str(e)
                 break
         
-        self._save_data()
+        self._save_execution(execution)
+        if execution.status == ExecutionStatus.COMPLETED:
+            self._save_workflow(workflow)
     
     def _execute_step(self, step: WorkflowStep, execution: WorkflowExecution) -> Dict:
         """Execute a single workflow step."""
@@ -561,7 +562,7 @@ class WorkflowEngine:
         if execution_id in self.executions:
             self.executions[execution_id].status = ExecutionStatus.CANCELLED
             self.executions[execution_id].completed_at = datetime.now()
-            self._save_data()
+            self._save_execution(self.executions[execution_id])
             return True
         return False
     
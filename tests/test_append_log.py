@@ -0,0 +1,177 @@
+"""Tests for the append-only conversion logs."""
+
+import json
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.analytics.roi_tracker import ROITracker
+from td_lead_engine.core.append_log import AppendOnlyLog
+from td_lead_engine.core.config import ConversionTracker
+
+
+def _append_many(path, writer, count):
+    log = AppendOnlyLog(path)
+    for i in range(count):
+        log.append({"writer": writer, "i": i})
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestAppendOnlyLog:
+    """Tests for AppendOnlyLog."""
+
+    def test_append_and_stream(self, temp_data_dir):
+        log = AppendOnlyLog(temp_data_dir / "log.jsonl")
+        assert list(log) == []
+        log.append({"id": 1})
+        log.extend([{"id": 2}, {"id": 3}])
+        assert [r["id"] for r in log] == [1, 2, 3]
+
+    def test_append_does_not_rewrite(self, temp_data_dir):
+        """Existing bytes stay in place; new records land at the end."""
+        path = temp_data_dir / "log.jsonl"
+        log = AppendOnlyLog(path)
+        log.append({"id": 1})
+        before = path.read_bytes()
+        log.append({"id": 2})
+        assert path.read_bytes().startswith(before)
+
+    def test_torn_line_is_skipped(self, temp_data_dir):
+        """A partial line from a crash neither breaks reads nor the next append."""
+        path = temp_data_dir / "log.jsonl"
+        path.write_text('{"id": 1}\n{"id": 2, "na')
+        log = AppendOnlyLog(path)
+        log.append({"id": 3})
+        assert [r["id"] for r in log] == [1, 3]
+
+    def test_non_object_lines_are_skipped(self, temp_data_dir):
+        """Valid JSON that isn't an object is skipped on reads and dropped by compaction."""
+        path = temp_data_dir / "log.jsonl"
+        path.write_text('{"id": 1}\n[1, 2]\n"text"\n3\n{"id": 2}\n')
+        log = AppendOnlyLog(path, key="id")
+        assert [r["id"] for r in log] == [1, 2]
+        assert log.compact() == {"before": 5, "after": 2}
+        assert [r["id"] for r in log] == [1, 2]
+
+    def test_compact_keeps_latest_per_key(self, temp_data_dir):
+        path = temp_data_dir / "log.jsonl"
+        path.write_text('{"id": 1, "v": "a"}\nnot json\n{"id": 2, "v": "b"}\n')
+        log = AppendOnlyLog(path, key="id")
+        log.append({"id": 1, "v": "c"})
+
+        assert log.compact() == {"before": 4, "after": 2}
+        assert list(log) == [{"id": 2, "v": "b"}, {"id": 1, "v": "c"}]
+        log.append({"id": 3, "v": "d"})
+        assert len(list(log)) == 3
+
+    def test_appends_from_other_processes_survive_compaction(self, temp_data_dir):
+        path = temp_data_dir / "log.jsonl"
+        AppendOnlyLog(path).extend({"n": n} for n in range(2000))
+        ctx = multiprocessing.get_context("fork")
+        writers = [ctx.Process(target=_append_many, args=(path, w, 200)) for w in range(3)]
+        for writer in writers:
+            writer.start()
+        log = AppendOnlyLog(path, key="n")
+        while any(writer.is_alive() for writer in writers):
+            log.compact()
+        for writer in writers:
+            writer.join()
+        assert sum(1 for r in log if "writer" in r) == 600
+
+
+class TestConversionTracker:
+    """Tests for the log-backed ConversionTracker."""
+
+    def test_record_and_iterate(self, temp_data_dir):
+        path = temp_data_dir / "conversions.jsonl"
+        tracker = ConversionTracker(path)
+        tracker.record_conversion(1, True, signals=["preapproved"], score=180, source="csv")
+        tracker.record_conversion(2, False, score=10)
+
+        reloaded = ConversionTracker(path)
+        events = list(reloaded.iter_conversions())
+        assert [(e.lead_id, e.converted) for e in events] == [(1, True), (2, False)]
+        assert events[0].signals_at_conversion == ["preapproved"]
+        assert events[0].recorded_at == tracker.conversions[0].recorded_at
+
+    def test_loaded_list_tracks_appends(self, temp_data_dir):
+        tracker = ConversionTracker(temp_data_dir / "conversions.jsonl")
+        assert tracker.conversions == []
+        tracker.record_conversion(1, True)
+        assert len(tracker.conversions) == 1
+
+    def test_migrates_legacy_json(self, temp_data_dir):
+        """A pre-log conversions.json is moved into the log once."""
+        legacy = temp_data_dir / "conversions.json"
+        legacy.write_text(json.dumps({"conversions": [
+            {"lead_id": 7, "converted": True, "signals_at_conversion": ["relocating"]},
+        ]}))
+        tracker = ConversionTracker(temp_data_dir / "conversions.jsonl")
+        assert [e.lead_id for e in tracker.iter_conversions()] == [7]
+        assert not legacy.exists()
+
+    @pytest.mark.parametrize("indent", [2, None])
+    def test_migrates_legacy_json_at_given_path(self, temp_data_dir, indent):
+        """A legacy document at the tracker's own path is rewritten as a log."""
+        path = temp_data_dir / "outcomes.json"
+        path.write_text(json.dumps({"conversions": [
+            {"lead_id": 7, "converted": True},
+            {"lead_id": 8, "converted": False},
+        ]}, indent=indent))
+        tracker = ConversionTracker(path)
+        assert [e.lead_id for e in tracker.iter_conversions()] == [7, 8]
+        assert (temp_data_dir / "outcomes.json.migrated").exists()
+
+        tracker.record_conversion(9, True)
+        assert [e.lead_id for e in ConversionTracker(path).iter_conversions()] == [7, 8, 9]
+
+    def test_compact_keeps_every_outcome(self, temp_data_dir):
+        """A lead's earlier outcomes are history, not superseded versions."""
+        path = temp_data_dir / "conversions.jsonl"
+        tracker = ConversionTracker(path)
+        tracker.record_conversion(1, False)
+        tracker.record_conversion(2, False)
+        tracker.record_conversion(1, True, conversion_type="buyer")
+        tracker.record_conversion(1, True, conversion_type="seller")
+        with open(path, "a") as f:
+            f.write('{"lead_id": 3, "conv')
+        assert tracker.compact() == {"before": 4, "after": 4}
+        assert [(e.lead_id, e.converted) for e in tracker.conversions] == [
+            (1, False), (2, False), (1, True), (1, True)
+        ]
+
+
+class TestROITrackerConversions:
+    """Tests for ROI conversions stored in their own log."""
+
+    def test_conversions_survive_reload(self, temp_data_dir):
+        path = temp_data_dir / "roi_data.json"
+        tracker = ROITracker(path)
+        tracker.record_cost("zillow", "spring", 500.0)
+        conversion = tracker.record_conversion("L1", "zillow", "closed", 400000)
+
+        reloaded = ROITracker(path)
+        assert [c.id for c in reloaded.conversions] == [conversion.id]
+        assert len(reloaded.costs) == 1
+        assert "conversions" not in json.loads(path.read_text())
+
+    def test_migrates_inline_conversions(self, temp_data_dir):
+        path = temp_data_dir / "roi_data.json"
+        tracker = ROITracker(path)
+        conversion = tracker.record_conversion("L1", "zillow", "closed", 400000)
+        record = next(iter(tracker.conversions_log))
+        tracker.conversions_log.path.unlink()
+        path.write_text(json.dumps({"costs": [], "conversions": [record]}))
+
+        reloaded = ROITracker(path)
+        assert [c.id for c in reloaded.conversions] == [conversion.id]
+        assert reloaded.conversions_log.exists()
+        assert "conversions" not in json.loads(path.read_text())
@@ -0,0 +1,913 @@
+"""Tests for the lead database."""
+
+import copy
+import json
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.core.config import ScoringConfig
+from td_lead_engine.core.match_matrix import SignalMatchMatrix
+from td_lead_engine.core.scorer import LeadScorer
+from td_lead_engine.core.signals import IntentSignal, SignalCategory
+from td_lead_engine.storage.contact_keys import normalize_email, normalize_phone, normalize_username
+from td_lead_engine.storage.database import LeadDatabase
+from td_lead_engine.storage.models import LeadRow, LeadStatus
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def db(temp_data_dir):
+    """Create lead database with temp storage."""
+    return LeadDatabase(temp_data_dir / "leads.db")
+
+
+def _seed(db, count):
+    """Insert ``count`` leads with a mix of hot, warm and cold text."""
+    texts = [
+        "First time homebuyer, preapproved, looking in Powell",
+        "My lease is up in March",
+        "Just saying hi",
+    ]
+    for i in range(count):
+        db.insert_lead(RawLead(
+            source="csv",
+            source_id=str(i),
+            name=f"Lead {i}",
+            notes=texts[i % len(texts)],
+            messages=["ready to buy"] if i % 5 == 0 else [],
+        ))
+
+
+@pytest.fixture
+def scored_db(db):
+    """A database with 25 seeded leads, all scored."""
+    _seed(db, 25)
+    db.score_all_leads()
+    return db
+
+
+class TestBatchScoring:
+    """Tests for score_all_leads batching and the worker pool."""
+
+    def test_score_all_leads_scores_every_lead(self, db):
+        """All leads are scored, not just the first page."""
+        _seed(db, 25)
+        assert db.score_all_leads(chunk_size=4) == 25
+        assert all(lead.last_scored_at is not None for lead in db.get_all_leads())
+
+    def test_batch_matches_single_lead_scoring(self, db):
+        """Batch results should equal score_lead for each lead."""
+        _seed(db, 12)
+        db.score_all_leads(chunk_size=5)
+        batch = {
+            lead.id: (lead.score, lead.tier, lead.score_breakdown) for lead in db.get_all_leads()
+        }
+
+        scorer = LeadScorer()
+        for lead in db.get_all_leads():
+            single = db.score_lead(lead, scorer, force=True)
+            assert batch[lead.id] == (single.score, single.tier, single.score_breakdown)
+
+    def test_process_pool_matches_serial(self, db):
+        """Worker pool scoring should produce the same scores as serial scoring."""
+        _seed(db, 30)
+        db.score_all_leads(workers=1, chunk_size=7)
+        serial = {lead.id: (lead.score, lead.tier) for lead in db.get_all_leads()}
+
+        db.score_all_leads(workers=2, chunk_size=7)
+        pooled = {lead.id: (lead.score, lead.tier) for lead in db.get_all_leads()}
+        assert pooled == serial
+
+    def test_breakdown_format(self, db):
+        """score_breakdown keeps its JSON shape."""
+        _seed(db, 1)
+        db.score_all_leads()
+        lead = db.get_all_leads()[0]
+        breakdown = json.loads(lead.score_breakdown)
+        assert {"phrase", "weight", "category"} <= set(breakdown["matches"][0])
+        assert "category_scores" in breakdown
+
+
+class TestIncrementalScoring:
+    """Tests for fingerprint-based skipping of unchanged leads."""
+
+    def test_unchanged_leads_are_skipped(self, db):
+        """A second pass with no text changes scores nothing."""
+        _seed(db, 10)
+        assert db.score_all_leads() == 10
+        assert db.score_all_leads() == 0
+
+    def test_changed_text_is_rescored(self, db):
+        """Only leads whose text changed are rescored."""
+        _seed(db, 10)
+        db.score_all_leads()
+
+        lead = db.get_all_leads()[-1]
+        lead.notes = "Ready to buy, preapproved"
+        db.update_lead(lead)
+
+        assert db.score_all_leads() == 1
+        assert db.get_lead(lead.id).score >= 180
+
+    def test_force_rescores_everything(self, db):
+        """force=True ignores fingerprints."""
+        _seed(db, 6)
+        db.score_all_leads()
+        assert db.score_all_leads(force=True) == 6
+
+    def test_signal_change_invalidates_scores(self, db):
+        """A scorer with a different signal set rescores every lead."""
+        _seed(db, 6)
+        db.score_all_leads()
+
+        signals = list(LeadScorer().signals)
+        signals.append(IntentSignal("open house", 20, SignalCategory.BUYER_PASSIVE))
+        assert db.score_all_leads(LeadScorer(signals)) == 6
+
+    def test_config_change_invalidates_scores(self, db):
+        """A scorer with a different weighting config rescores every lead."""
+        _seed(db, 6)
+        db.score_all_leads(LeadScorer(config=ScoringConfig()))
+        assert db.score_all_leads(LeadScorer(config=ScoringConfig(hot_threshold=120))) == 6
+
+    def test_score_lead_skips_when_current(self, db):
+        """score_lead returns the stored lead when nothing changed."""
+        _seed(db, 1)
+        scorer = LeadScorer()
+        lead = db.score_lead(db.get_all_leads()[0], scorer)
+        assert db.is_score_current(lead, scorer)
+
+        lead.bio = "Relocating for work"
+        assert not db.is_score_current(lead, scorer)
+
+
+class TestMatchMatrix:
+    """Tests for the persisted match matrix and what-if re-weighting."""
+
+    def test_matrix_scores_match_stored_scores(self, db):
+        """Under the scorer's own config, matrix scores equal the stored scores."""
+        _seed(db, 15)
+        scorer = LeadScorer(config=ScoringConfig(source_multipliers={"csv": 1.3}))
+        db.score_all_leads(scorer)
+        matrix = db.load_match_matrix(scorer)
+        assert db.match_matrix_path.exists()
+
+        scores = dict(zip(matrix.lead_ids.tolist(), matrix.scores(scorer.signals, scorer.config)))
+        assert scores == {lead.id: lead.score for lead in db.get_all_leads()}
+
+    def test_tier_migrations(self, db):
+        """Lowering the hot threshold moves warm leads up."""
+        _seed(db, 9)
+        db.score_all_leads()
+        matrix = db.load_match_matrix()
+
+        baseline = ScoringConfig(category_multipliers={}, source_multipliers={})
+        candidate = ScoringConfig(
+            hot_threshold=70, category_multipliers={}, source_multipliers={}
+        )
+        report = matrix.tier_migrations(LeadScorer().signals, baseline, candidate)
+        assert report["migrations"] == {("warm", "hot"): report["before"]["warm"]}
+        assert report["after"]["warm"] == 0
+
+    def test_rescoring_leaves_matrix_to_next_load(self, db):
+        """An incremental rescore doesn't rebuild the matrix; the next load does."""
+        _seed(db, 5)
+        db.score_all_leads()
+        before = db.load_match_matrix()
+        mtime = db.match_matrix_path.stat().st_mtime_ns
+
+        lead = db.get_all_leads()[0]
+        lead.notes = "Preapproved and ready to buy"
+        db.update_lead(lead)
+        assert db.score_all_leads() == 1
+        assert db.match_matrix_path.stat().st_mtime_ns == mtime
+
+        scorer = LeadScorer()
+        after = db.load_match_matrix(scorer)
+        assert after.built_at > before.built_at
+        scores = dict(zip(after.lead_ids.tolist(), after.scores(scorer.signals, scorer.config)))
+        assert scores[lead.id] == db.get_lead(lead.id).score
+
+    def test_matrix_round_trip(self, db):
+        """save/load preserves the arrays."""
+        _seed(db, 5)
+        db.score_all_leads()
+        saved = db.save_match_matrix()
+        loaded = SignalMatchMatrix.load(db.match_matrix_path)
+        assert loaded.lead_ids.tolist() == saved.lead_ids.tolist()
+        assert loaded.indices.tolist() == saved.indices.tolist()
+        assert loaded.sources == saved.sources
+
+
+def _set_idle_days(db, lead_id, days, now=None):
+    """Backdate a lead's last activity by ``days``.
+
+    Activity only moves forward in real use, so the incremental decay state is
+    reset too, as if the lead had been idle since before the first pass.
+    """
+    moment = (now or datetime.now()) - timedelta(days=days)
+    with db._get_connection() as conn:
+        conn.execute(
+            "UPDATE leads SET updated_at = ?, last_contacted_at = NULL WHERE id = ?",
+            (moment.isoformat(), lead_id),
+        )
+        conn.execute("DELETE FROM engine_state")
+
+
+class TestScoreDecay:
+    """Tests for query-time score decay and incremental tier materialization."""
+
+    @pytest.fixture
+    def decay_db(self, temp_data_dir):
+        config = ScoringConfig(
+            enable_score_decay=True, decay_days=30, decay_rate=0.5,
+            category_multipliers={}, source_multipliers={},
+        )
+        db = LeadDatabase(temp_data_dir / "leads.db", scoring_config=config)
+        db.insert_lead(RawLead(source="csv", source_id="1", name="A",
+                               notes="ready to buy, preapproved"))
+        db.insert_lead(RawLead(source="csv", source_id="2", name="B", notes="ready to buy"))
+        db.score_all_leads(LeadScorer(config=config))
+        return db
+
+    def test_sql_matches_python_decay(self, decay_db):
+        """The SQL effective score equals ScoringConfig.decayed_score."""
+        config = decay_db.scoring_config
+        for days in (0, 29, 31, 65, 400):
+            _set_idle_days(decay_db, 1, days)
+            lead = {lead.id: lead for lead in decay_db.get_all_leads()}[1]
+            assert lead.effective_score == config.decayed_score(lead.score, days)
+        assert config.decayed_score(180, 31) == 90
+        assert config.decayed_score(-50, 400) == -50
+
+    def test_queries_sort_and_filter_by_decayed_score(self, decay_db):
+        """A stale high scorer drops below a fresh lower scorer."""
+        _set_idle_days(decay_db, 1, 65)  # 180 -> 45
+        leads = decay_db.get_all_leads()
+        assert [lead.id for lead in leads] == [2, 1]
+        assert leads[1].score == 180 and leads[1].effective_score == 45
+        assert [lead.id for lead in decay_db.get_all_leads(min_score=60)] == [2]
+        page = decay_db.get_leads_page(min_score=60)
+        assert [lead.id for lead in page.leads] == [2] and page.total == 1
+
+    def test_incremental_pass_materializes_tier_changes(self, decay_db):
+        """Only threshold crossings are written, and only once."""
+        now = datetime.now()
+        assert decay_db.apply_score_decay(now) == 0
+        assert decay_db.get_lead(1).tier == "hot"
+
+        _set_idle_days(decay_db, 1, 29, now)
+        assert decay_db.apply_score_decay(now) == 0
+        # A day later the lead crosses its first decay boundary: 180 -> 90 (warm)
+        later = now + timedelta(days=2)
+        assert decay_db.apply_score_decay(later) == 1
+        assert decay_db.get_lead(1).tier == "warm"
+        assert decay_db.get_lead(1).score == 180
+        assert decay_db.apply_score_decay(later) == 0
+
+    def test_activity_restores_tier(self, decay_db):
+        """Updating a decayed lead makes it fresh again on the next pass."""
+        _set_idle_days(decay_db, 1, 65)
+        decay_db.apply_score_decay()
+        assert decay_db.get_lead(1).tier == "lukewarm"
+
+        lead = decay_db.get_lead(1)
+        decay_db.update_lead(lead)  # Nothing changed: still idle
+        assert decay_db.apply_score_decay() == 0
+
+        lead.last_contacted_at = datetime.now()
+        decay_db.update_lead(lead)
+        assert decay_db.apply_score_decay() == 1
+        assert decay_db.get_lead(1).tier == "hot"
+
+    def test_rescoring_keeps_decay(self, decay_db):
+        """Rescoring (forced, or after a config change) is not activity."""
+        _set_idle_days(decay_db, 1, 65)
+        decay_db.apply_score_decay()
+        idle_since = decay_db.get_lead(1).updated_at
+
+        decay_db.score_all_leads(force=True)
+        decay_db.scoring_config.hot_threshold += 1
+        decay_db.score_all_leads(LeadScorer(config=decay_db.scoring_config))
+        decay_db.score_lead(decay_db.get_lead(1), force=True)
+        lead = {lead.id: lead for lead in decay_db.get_all_leads()}[1]
+        assert lead.updated_at == idle_since
+        assert lead.tier == "lukewarm" and lead.effective_score == 45
+
+    def test_disabling_decay_restores_tiers(self, decay_db):
+        """Turning decay off puts stored tiers back on the raw score."""
+        _set_idle_days(decay_db, 1, 65)
+        decay_db.apply_score_decay()
+        decay_db.scoring_config.enable_score_decay = False
+        assert decay_db.apply_score_decay() == 1
+        assert decay_db.get_lead(1).tier == "hot"
+        assert decay_db.apply_score_decay() == 0
+
+
+class TestConnectionPool:
+    """Tests for pooled connections and the transaction API."""
+
+    def test_pragmas(self, db):
+        with db._read_connection() as conn:
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+            assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+            assert conn.execute("PRAGMA query_only").fetchone()[0] == 1
+
+    def test_transaction_rolls_back(self, db):
+        """A failed multi-step operation leaves nothing behind."""
+        with pytest.raises(RuntimeError):
+            with db.transaction():
+                db.insert_lead(RawLead(source="csv", source_id="1", name="A"))
+                db.insert_lead(RawLead(source="csv", source_id="2", name="B"))
+                raise RuntimeError("abort")
+        assert db.get_stats()["total_leads"] == 0
+
+    def test_transaction_sees_own_writes(self, db):
+        """Reads inside a transaction run on the writer, so dedup sees earlier inserts."""
+        with db.transaction():
+            lead, is_new = db.insert_lead(RawLead(source="csv", source_id="1", name="A"))
+            assert is_new and db.get_lead(lead.id).name == "A"
+            _, is_new = db.insert_lead(RawLead(source="csv", source_id="1", notes="again"))
+            assert not is_new
+        assert db.get_stats()["total_leads"] == 1
+
+    def test_readers_do_not_wait_for_writer(self, db):
+        """Another thread reads the last committed snapshot during a write."""
+        import threading
+
+        db.insert_lead(RawLead(source="csv", source_id="1", name="A"))
+        seen = []
+        with db.transaction():
+            db.insert_lead(RawLead(source="csv", source_id="2", name="B"))
+            reader = threading.Thread(target=lambda: seen.append(db.get_stats()["total_leads"]))
+            reader.start()
+            reader.join(timeout=5)
+        assert seen == [1]
+        assert db.get_stats()["total_leads"] == 2
+
+    def test_nested_failure_caught_by_outer_block(self, db):
+        """A nested block that fails is rolled back even when the outer block carries on."""
+        with db.transaction():
+            db.insert_lead(RawLead(source="csv", source_id="1", name="A"))
+            try:
+                with db.transaction():
+                    db.insert_lead(RawLead(source="csv", source_id="2", name="B"))
+                    raise RuntimeError("abort")
+            except RuntimeError:
+                pass
+            db.insert_lead(RawLead(source="csv", source_id="3", name="C"))
+        assert sorted(lead.name for lead in db.get_all_leads()) == ["A", "C"]
+
+    def test_rescore_commits_per_chunk(self, db):
+        """Other threads can write between the chunks of a rescore."""
+        import threading
+
+        _seed(db, 10)
+        write_scores = db._write_scores
+        inserted = []
+
+        def write_then_insert(scored):
+            count = write_scores(scored)
+            if not inserted:
+                raw = RawLead(source="csv", source_id="during", notes="preapproved")
+                writer = threading.Thread(target=lambda: inserted.append(db.insert_lead(raw)))
+                writer.start()
+                writer.join(timeout=5)
+                assert inserted, "insert blocked by the rescore"
+            return count
+
+        db._write_scores = write_then_insert
+        # The lead inserted mid-run lands in a later chunk and is scored too
+        assert db.score_all_leads(chunk_size=4) == 11
+
+    def test_reader_returned_when_begin_fails(self, db):
+        """A reader whose BEGIN raises still goes back to the pool with its slot."""
+        pool = db._pool
+        with pool.reader() as conn:
+            pass
+        conn.execute("BEGIN")  # Left open, so the next BEGIN on it fails
+        with pytest.raises(sqlite3.OperationalError):
+            with pool.reader():
+                pass
+        assert not conn.in_transaction
+        with pool.reader() as again:
+            assert again is conn
+
+    def test_instances_share_a_pool(self, temp_data_dir):
+        first = LeadDatabase(temp_data_dir / "leads.db")
+        second = LeadDatabase(temp_data_dir / "leads.db")
+        assert first._pool is second._pool
+
+
+def _lead_table(db):
+    """Lead rows and import interactions, normalized for comparison across databases."""
+    with db._read_connection() as conn:
+        leads = [
+            (
+                row["id"], row["source"], row["source_id"], row["name"], row["email"],
+                row["phone"], row["username"], row["bio"], row["notes"],
+                sorted(json.loads(row["messages_json"] or "[]")),
+            )
+            for row in conn.execute("SELECT * FROM leads ORDER BY id")
+        ]
+        interactions = [
+            tuple(row) for row in conn.execute(
+                "SELECT lead_id, interaction_type, content FROM interactions ORDER BY id"
+            )
+        ]
+    return leads, interactions
+
+
+class TestInsertMany:
+    """Tests for set-based bulk ingestion."""
+
+    BATCH = [
+        RawLead(source="instagram", source_id="1", username="Powell_Home", notes="first"),
+        RawLead(source="instagram", source_id="1", notes="same source id", messages=["hi"]),
+        RawLead(source="csv", email="Jo@Example.com", phone="6145550101", name="Jo"),
+        RawLead(source="zillow", email="jo@example.com", notes="same email"),
+        RawLead(source="facebook", phone="+1 614-555-0101", notes="same phone"),
+        RawLead(source="instagram", username="powell_home", notes="same username"),
+        RawLead(source="facebook", username="powell_home", notes="other source"),
+        RawLead(source="csv", name="Sam", email="sam@example.com"),
+        RawLead(source="csv", email="SAM@example.com", phone="16145550199", messages=["a", "b"]),
+        RawLead(source="zillow", phone="6145550199", notes="phone gained by a merge"),
+        RawLead(source="manual", name="No keys"),
+        RawLead(source="manual", name="No keys"),
+    ]
+    EXISTING = [
+        RawLead(source="csv", source_id="9", name="Old", email="old@example.com",
+                phone="6145557777"),
+        RawLead(source="instagram", username="Taken", notes="existing"),
+    ]
+    AGAINST_EXISTING = [
+        RawLead(source="zillow", email="OLD@example.com", notes="matches existing email"),
+        RawLead(source="facebook", phone="(614) 555-7777", notes="matches existing phone"),
+        RawLead(source="instagram", username="taken", notes="matches existing username"),
+        RawLead(source="csv", source_id="9", notes="matches existing source id"),
+    ]
+
+    def _compare(self, temp_data_dir, existing, batch):
+        sequential = LeadDatabase(temp_data_dir / "sequential.db")
+        bulk = LeadDatabase(temp_data_dir / "bulk.db")
+        for db in (sequential, bulk):
+            for raw in existing:
+                db.insert_lead(raw)
+
+        outcomes = [sequential.insert_lead(raw)[1] for raw in batch]
+        result = bulk.insert_many(batch)
+
+        assert result.new_count == outcomes.count(True)
+        assert result.merged_count == outcomes.count(False)
+        assert _lead_table(bulk) == _lead_table(sequential)
+        return result
+
+    def test_matches_sequential_within_batch(self, temp_data_dir):
+        """Duplicates inside the batch resolve exactly as one insert_lead at a time."""
+        result = self._compare(temp_data_dir, [], self.BATCH)
+        assert (result.new_count, result.merged_count) == (6, 6)
+
+    def test_matches_sequential_against_existing(self, temp_data_dir):
+        result = self._compare(temp_data_dir, self.EXISTING, self.AGAINST_EXISTING + self.BATCH)
+        assert result.merged_count == 10
+
+    def test_ids_continue_after_deletes(self, temp_data_dir):
+        """New ids never reuse ids of deleted leads (AUTOINCREMENT)."""
+        db = LeadDatabase(temp_data_dir / "leads.db")
+        lead, _ = db.insert_lead(RawLead(source="csv", source_id="1"))
+        db.delete_lead(lead.id)
+        db.insert_many([RawLead(source="csv", source_id="2")])
+        assert [lead.id for lead in db.get_all_leads()] == [lead.id + 1]
+
+    def test_empty_batch(self, db):
+        result = db.insert_many([])
+        assert (result.new_count, result.merged_count) == (0, 0)
+
+
+class TestContactKeys:
+    """Tests for normalized, indexed dedup keys."""
+
+    def test_normalize_phone(self):
+        assert normalize_phone("(614) 555-0101") == "+16145550101"
+        assert normalize_phone("1-614-555-0101") == "+16145550101"
+        assert normalize_phone("+44 20 7946 0958") == "+442079460958"
+        assert normalize_phone("0044 20 7946 0958") == "+442079460958"
+        assert normalize_phone("614.555.0101 ext. 12") == "+16145550101"
+        assert normalize_phone("555-0101") == "5550101"
+        assert normalize_phone("n/a") is None
+
+    def test_normalize_email_and_username(self):
+        assert normalize_email(" Jo.Smith+homes@GoogleMail.com") == "josmith@gmail.com"
+        assert normalize_email("Jo.Smith+homes@example.com") == "jo.smith+homes@example.com"
+        assert normalize_username("@Powell_Home") == "powell_home"
+
+    def test_formatted_contacts_dedupe(self, db):
+        lead, _ = db.insert_lead(RawLead(source="csv", email="jo.smith@gmail.com",
+                                         phone="614-555-0101"))
+        assert db.find_duplicate(RawLead(source="zillow", phone="+1 (614) 555-0101")).id == lead.id
+        duplicate = db.find_duplicate(RawLead(source="zillow", email="JoSmith+buy@gmail.com"))
+        assert duplicate.id == lead.id
+        # A shorter number inside a stored one is no longer a match
+        assert db.find_duplicate(RawLead(source="zillow", phone="555-0101")) is None
+
+    def test_dedup_probes_use_key_indexes(self, db):
+        with db._read_connection() as conn:
+            for column in ("email_key", "phone_key"):
+                sql = f"SELECT * FROM leads WHERE {column} = ? ORDER BY id LIMIT 1"
+                plan = " ".join(row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", ("x",)))
+                assert f"idx_leads_{column}" in plan
+
+    def test_backfill_on_open(self, temp_data_dir):
+        db = LeadDatabase(temp_data_dir / "leads.db")
+        lead, _ = db.insert_lead(RawLead(source="csv", email="Jo@Example.com", phone="6145550101"))
+        with db.transaction() as conn:
+            conn.execute("UPDATE leads SET email_key = NULL, phone_key = NULL")
+        assert db.find_duplicate(RawLead(source="web", phone="614 555 0101")) is None
+
+        reopened = LeadDatabase(temp_data_dir / "leads.db")
+        assert reopened.find_duplicate(RawLead(source="web", phone="614 555 0101")).id == lead.id
+        assert reopened.find_duplicate(RawLead(source="web", email="jo@example.com")).id == lead.id
+
+    def test_update_lead_refreshes_keys(self, db):
+        lead, _ = db.insert_lead(RawLead(source="csv", name="Jo"))
+        lead.phone = "614-555-0199"
+        db.update_lead(lead)
+        assert db.find_duplicate(RawLead(source="web", phone="16145550199")).id == lead.id
+
+
+class TestSearch:
+    """Tests for full-text lead search."""
+
+    @pytest.fixture
+    def search_db(self, db):
+        db.insert_lead(RawLead(source="csv", source_id="1", name="Amy Powell",
+                               email="amy@example.com"))
+        db.insert_lead(RawLead(source="csv", source_id="2", name="Bob",
+                               notes="Renting now, looking in Powell next spring"))
+        db.insert_lead(RawLead(source="csv", source_id="3", name="Cy", phone="614-555-0101"))
+        return db
+
+    def _like(self, db, query):
+        with db._read_connection() as conn:
+            return {row[0] for row in conn.execute(
+                "SELECT id FROM leads WHERE name LIKE ?1 OR email LIKE ?1 OR phone LIKE ?1 "
+                "OR username LIKE ?1 OR notes LIKE ?1 OR bio LIKE ?1", (f"%{query}%",)
+            )}
+
+    def test_matches_substring_semantics(self, search_db):
+        for query in ("POWELL", "owel", "555-01", "example.com", "next spring", "zzz", "po"):
+            found = {lead.id for lead in search_db.search_leads(query)}
+            assert found == self._like(search_db, query)
+
+    def test_ranked_prefers_name_and_snippets(self, search_db):
+        leads = search_db.search_leads("powell", ranked=True)
+        assert [lead.name for lead in leads] == ["Amy Powell", "Bob"]
+        assert "[Powell]" in leads[1].snippet
+
+    def test_index_follows_writes(self, search_db):
+        lead = search_db.search_leads("Cy")[0]
+        lead.notes = "Relocating to Dublin"
+        search_db.update_lead(lead)
+        assert [lead.id for lead in search_db.search_leads("dublin")] == [lead.id]
+
+        search_db.insert_lead(RawLead(source="csv", source_id="1", notes="Also likes Dublin"))
+        assert len(search_db.search_leads("dublin")) == 2
+
+        search_db.delete_lead(lead.id)
+        assert [lead.name for lead in search_db.search_leads("dublin")] == ["Amy Powell"]
+
+    def test_index_built_for_existing_database(self, search_db):
+        with search_db.transaction() as conn:
+            conn.execute("DROP TABLE leads_fts")
+            for trigger in ("insert", "delete", "update"):
+                conn.execute(f"DROP TRIGGER leads_fts_{trigger}")
+
+        reopened = LeadDatabase(search_db.db_path)
+        ranked = reopened.search_leads("powell", ranked=True)
+        assert [lead.name for lead in ranked] == ["Amy Powell", "Bob"]
+        with reopened.transaction() as conn:
+            # Raises if the index disagrees with the leads table
+            conn.execute("INSERT INTO leads_fts (leads_fts, rank) VALUES ('integrity-check', 1)")
+
+    def test_without_fts5_falls_back_to_like(self, temp_data_dir, monkeypatch):
+        from td_lead_engine.storage import database, search_index
+
+        class NoFts5:
+            def __init__(self, conn):
+                self.conn = conn
+
+            def execute(self, sql, *args):
+                if "VIRTUAL TABLE" in sql:
+                    raise sqlite3.OperationalError("no such module: fts5")
+                return self.conn.execute(sql, *args)
+
+        monkeypatch.setattr(database, "ensure_search_index",
+                            lambda conn: search_index.ensure_search_index(NoFts5(conn)))
+        db = LeadDatabase(temp_data_dir / "leads.db")
+        db.insert_lead(RawLead(source="csv", source_id="1", name="Amy Powell"))
+        with db._read_connection() as conn:
+            tables = conn.execute("SELECT name FROM sqlite_master WHERE name LIKE 'leads_fts%'")
+            assert tables.fetchall() == []
+        assert [lead.name for lead in db.search_leads("owel", ranked=True)] == ["Amy Powell"]
+        assert db.get_leads_page(query="POWELL").total == 1
+
+
+class TestIterLeads:
+    """Tests for keyset-paginated streaming."""
+
+    def test_streams_every_lead_in_id_order(self, scored_db):
+        ids = [lead.id for lead in scored_db.iter_leads(batch_size=4)]
+        assert ids == sorted(ids) and len(ids) == 25
+
+    def test_score_order_with_ties(self, scored_db):
+        leads = list(scored_db.iter_leads(batch_size=3, order_key="score"))
+        keys = [(lead.score, lead.id) for lead in leads]
+        assert keys == sorted(keys, key=lambda k: (-k[0], k[1]))
+        assert len(leads) == 25
+
+    def test_where_filter(self, scored_db):
+        hot = [lead.id for lead in scored_db.iter_leads(batch_size=2, where="tier = ?",
+                                                        params=("hot",), order_key="score")]
+        assert sorted(hot) == sorted(lead.id for lead in scored_db.get_all_leads(tier="hot"))
+
+    def test_unknown_order_key(self, db):
+        with pytest.raises(ValueError):
+            next(db.iter_leads(order_key="name"))
+
+    def test_export_streams_all_leads(self, scored_db, temp_data_dir):
+        path = temp_data_dir / "leads.csv"
+        assert scored_db.export_to_csv(path) == 25
+        assert len(path.read_text().splitlines()) == 26
+
+
+class TestProjections:
+    """Tests for field-projected queries returning LeadRow."""
+
+    def test_rows_match_full_leads(self, scored_db):
+        full = scored_db.get_all_leads()
+        rows = scored_db.get_all_leads(fields=["name", "score", "tier", "status", "created_at"])
+        assert [r.id for r in rows] == [lead.id for lead in full]
+        for row, lead in zip(rows, full):
+            assert (row.name, row.score, row.tier, row.status) == (
+                lead.name, lead.score, lead.tier, lead.status
+            )
+            assert row.created_at == lead.created_at
+            assert row.display_name == lead.display_name
+            assert row.effective_score == lead.effective_score
+
+    def test_unselected_field_raises(self, scored_db):
+        row = scored_db.get_all_leads(fields=["score"], limit=1)[0]
+        assert row.keys() == ["id", "score", "effective_score"]
+        with pytest.raises(AttributeError):
+            row.notes
+
+    def test_internal_lookups_do_not_recurse(self, scored_db):
+        """copy and uninitialized rows ask for dunder/private names without recursing."""
+        row = scored_db.get_all_leads(fields=["name"], limit=1)[0]
+        assert copy.copy(row).name == row.name
+        empty = LeadRow.__new__(LeadRow)
+        with pytest.raises(AttributeError):
+            empty._row
+        with pytest.raises(AttributeError):
+            empty.name
+
+    def test_json_decoded_on_access(self, scored_db):
+        row = next(scored_db.iter_leads(fields=["score_breakdown", "messages_json"],
+                                        where="id = 1"))
+        assert "matches" in row.breakdown
+        assert row.messages == ["ready to buy"]
+
+    def test_iter_projection_adds_order_columns(self, scored_db):
+        rows = list(scored_db.iter_leads(batch_size=5, order_key="score", fields=["name"]))
+        assert [r.id for r in rows] == [lead.id for lead in scored_db.iter_leads(order_key="score")]
+
+    def test_unknown_field(self, db):
+        with pytest.raises(ValueError):
+            db.get_all_leads(fields=["name", "password"])
+        with pytest.raises(ValueError):
+            next(db.iter_leads(fields=["effective_score"]))
+
+
+class TestLeadPages:
+    """Tests for cursor-paginated listings."""
+
+    def _all_pages(self, db, **filters):
+        pages = [db.get_leads_page(**filters)]
+        while pages[-1].next_cursor:
+            pages.append(db.get_leads_page(cursor=pages[-1].next_cursor, **filters))
+        return pages
+
+    def test_pages_cover_listing_once(self, scored_db):
+        pages = self._all_pages(scored_db, limit=4)
+        leads = [lead for page in pages for lead in page.leads]
+        assert len(pages) == 7 and all(page.total == 25 for page in pages)
+        keys = [(lead.score, lead.id) for lead in leads]
+        assert keys == sorted(keys, key=lambda k: (-k[0], k[1]))
+        assert len({lead.id for lead in leads}) == 25
+
+    def test_filters_apply_before_limit(self, scored_db):
+        min_score = sorted(lead.score for lead in scored_db.iter_leads())[12]
+        pages = self._all_pages(scored_db, limit=3, min_score=min_score, query="lease")
+        leads = [lead for page in pages for lead in page.leads]
+        expected = [lead for lead in scored_db.iter_leads()
+                    if lead.score >= min_score and "lease" in lead.notes.lower()]
+        assert pages[0].total == len(leads) == len(expected)
+
+    def test_cursor_bound_to_filters(self, scored_db):
+        cursor = scored_db.get_leads_page(limit=2).next_cursor
+        with pytest.raises(ValueError):
+            scored_db.get_leads_page(limit=2, tier="warm", cursor=cursor)
+        with pytest.raises(ValueError):
+            scored_db.get_leads_page(cursor="not-a-cursor")
+
+
+class TestLeadStats:
+    """Tests for trigger-maintained statistics."""
+
+    def _recount(self, db):
+        with db._read_connection() as conn:
+            total, avg, high, low = conn.execute(
+                "SELECT COUNT(*), AVG(score), MAX(score), MIN(score) FROM leads"
+            ).fetchone()
+            groups = {
+                d: dict(conn.execute(f"SELECT {d}, COUNT(*) FROM leads GROUP BY {d}").fetchall())
+                for d in ("tier", "status", "source")
+            }
+        return {
+            "total_leads": total,
+            "by_tier": groups["tier"],
+            "by_status": groups["status"],
+            "by_source": groups["source"],
+            "score_avg": round(avg or 0, 1),
+            "score_max": high or 0,
+            "score_min": low or 0,
+        }
+
+    def test_stats_follow_every_write_path(self, db):
+        _seed(db, 12)
+        db.insert_many([RawLead(source="zillow", source_id=str(i), notes="preapproved")
+                        for i in range(5)])
+        db.score_all_leads()
+        lead = db.get_lead(1)
+        lead.status = LeadStatus.CONTACTED
+        db.update_lead(lead)
+        db.delete_lead(2)
+
+        assert db.get_stats() == self._recount(db)
+        assert db.check_stats() == []
+
+    def test_check_reports_and_repairs_drift(self, db):
+        _seed(db, 3)
+        with db.transaction() as conn:
+            conn.execute("DROP TRIGGER leads_stats_insert")
+            conn.execute("INSERT INTO leads (source, tier) VALUES ('manual', 'hot')")
+
+        drift = {(row["dimension"], row["value"]) for row in db.check_stats()}
+        assert drift == {("all", ""), ("tier", "hot"), ("status", "new"), ("source", "manual")}
+        db.check_stats(repair=True)
+        assert db.check_stats() == []
+        assert db.get_stats() == self._recount(db)
+
+    def test_stats_built_for_existing_database(self, db):
+        _seed(db, 4)
+        with db.transaction() as conn:
+            conn.execute("DROP TABLE lead_stats")
+        assert LeadDatabase(db.db_path).get_stats() == self._recount(db)
+
+
+class TestBackup:
+    """Tests for online backups and restore."""
+
+    def test_backup_is_a_standalone_copy(self, db, temp_data_dir):
+        import sqlite3
+
+        _seed(db, 10)
+        result = db.backup(temp_data_dir / "backups")
+        assert result.path.exists() and result.pages > 0
+        assert result.size_bytes == result.path.stat().st_size
+
+        conn = sqlite3.connect(result.path)
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "delete"
+        assert conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0] == 10
+        conn.close()
+
+    def test_rotation_keeps_newest_generations(self, db, temp_data_dir):
+        from td_lead_engine.storage.backup import list_backups
+
+        _seed(db, 3)
+        results = [db.backup(temp_data_dir / "backups", keep=2) for _ in range(4)]
+        assert list_backups(db.db_path, temp_data_dir / "backups") == [r.path for r in results[-2:]]
+        assert results[-1].removed == [results[1].path]
+
+    def test_compressed_restore_roundtrip(self, db, temp_data_dir):
+        _seed(db, 6)
+        result = db.backup(temp_data_dir / "backups", compress=True)
+        assert result.path.name.endswith(".db.gz")
+
+        db.insert_lead(RawLead(source="csv", source_id="extra", name="Extra Lead"))
+        assert db.get_stats()["total_leads"] == 7
+        assert db.restore(result.path) > 0
+        assert db.get_stats()["total_leads"] == 6
+        assert [lead.name for lead in db.search_leads("Lead 5")] == ["Lead 5"]
+        assert db.check_stats() == []
+
+    def test_backup_during_concurrent_inserts(self, db, temp_data_dir):
+        import sqlite3
+        import threading
+
+        from td_lead_engine.storage.backup import backup_database
+
+        _seed(db, 200)
+        stop = threading.Event()
+
+        def insert():
+            i = 0
+            while not stop.is_set():
+                db.insert_lead(RawLead(source="csv", source_id=f"live-{i}", name=f"Live {i}"))
+                i += 1
+
+        writer = threading.Thread(target=insert)
+        writer.start()
+        try:
+            result = backup_database(db.db_path, temp_data_dir / "backups", pages=1, pause=0.001)
+        finally:
+            stop.set()
+            writer.join()
+
+        conn = sqlite3.connect(result.path)
+        assert conn.execute("PRAGMA integrity_check").fetchone()[0] == "ok"
+        count = conn.execute("SELECT COUNT(*) FROM leads").fetchone()[0]
+        stats = conn.execute("SELECT count FROM lead_stats WHERE dimension = 'all'").fetchone()[0]
+        conn.close()
+        assert 200 <= count <= db.get_stats()["total_leads"] and stats == count
+
+
+class TestParquetExport:
+    """Tests for columnar export and analytics snapshots."""
+
+    @pytest.fixture
+    def scored_db(self, scored_db):
+        """The shared scored leads, with a few interactions."""
+        pytest.importorskip("pyarrow")
+        from td_lead_engine.storage.models import InteractionType
+
+        for lead_id in (1, 2, 3):
+            scored_db.add_interaction(
+                lead_id, InteractionType.NOTE, f"note {lead_id}", {"by": "test"}
+            )
+        return scored_db
+
+    def test_export_streams_tables_with_types(self, scored_db, temp_data_dir):
+        import pandas as pd
+
+        out = temp_data_dir / "export"
+        counts = scored_db.export_parquet(out, batch_size=5)
+        with scored_db._read_connection() as conn:
+            interactions = conn.execute("SELECT COUNT(*) FROM interactions").fetchone()[0]
+        # No website schema, so no lead_events
+        assert counts == {"leads": 25, "interactions": interactions}
+
+        leads = pd.read_parquet(out / "leads.parquet")
+        assert list(leads["id"]) == list(range(1, 26))
+        assert leads["score"].dtype == "int64"
+        assert str(leads["created_at"].dtype).startswith("datetime64")
+        assert leads.set_index("id").loc[1, "name"] == "Lead 0"
+
+    def test_tier_filter_applies_to_related_tables(self, scored_db, temp_data_dir):
+        import pandas as pd
+
+        hot = {lead.id for lead in scored_db.get_all_leads(tier="hot")}
+        counts = scored_db.export_parquet(temp_data_dir / "hot", tier="hot")
+        assert counts["leads"] == len(hot)
+        interactions = pd.read_parquet(temp_data_dir / "hot" / "interactions.parquet")
+        assert len(interactions) == counts["interactions"] > 0
+        assert set(interactions["lead_id"]) <= hot
+
+    def test_snapshot_is_reused_until_stale(self, scored_db):
+        from datetime import timedelta
+
+        first = scored_db.snapshot(columns={"leads": ["source", "score"]})
+        assert list(first.leads.columns) == ["source", "score"] and len(first.leads) == 25
+        assert scored_db.snapshot().created_at == first.created_at
+        assert scored_db.snapshot(max_age=None).created_at > first.created_at
+        assert scored_db.snapshot(max_age=timedelta(0)).lead_events.empty
+
+    def test_report_from_snapshot_matches_streamed(self, scored_db):
+        from td_lead_engine.analytics.reports import ReportGenerator
+
+        streamed = ReportGenerator(scored_db).generate_daily_report()
+        snapshot = scored_db.snapshot(columns=ReportGenerator.SNAPSHOT_COLUMNS)
+        columnar = ReportGenerator(scored_db, snapshot=snapshot).generate_daily_report()
+        assert columnar.source_quality == pytest.approx(streamed.source_quality)
+        assert columnar.top_signals == streamed.top_signals
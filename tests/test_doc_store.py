@@ -0,0 +1,181 @@
+"""Tests for the SQLite document store behind the JSON managers."""
+
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.core.doc_store import DocumentStore, keyed, open_store
+from td_lead_engine.landing_pages.page_builder import LandingPageBuilder
+from td_lead_engine.tasks.task_manager import TaskManager, TaskType
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestDocumentStore:
+    """Tests for DocumentStore and Collection."""
+
+    def test_put_get_delete(self, temp_data_dir):
+        store = DocumentStore(temp_data_dir / "store.db")
+        tasks = store.collection("tasks")
+        tasks.put("a", {"id": "a", "n": 1})
+        tasks.put("a", {"id": "a", "n": 2})
+        tasks.put_many([("b", {"id": "b"}), ("c", {"id": "c"})])
+
+        assert tasks.get("a") == {"id": "a", "n": 2}
+        assert len(tasks) == 3
+        tasks.delete("b")
+        assert "b" not in tasks
+        assert [key for key, _ in tasks.items()] == ["a", "c"]
+        assert tasks.get("missing") is None
+
+    def test_collections_are_separate(self, temp_data_dir):
+        store = DocumentStore(temp_data_dir / "store.db")
+        store.collection("a").put("1", {"v": "a"})
+        store.collection("b").put("1", {"v": "b"})
+        assert store.collection("a").get("1") == {"v": "a"}
+        assert len(store.collection("b")) == 1
+
+    def test_find_uses_index(self, temp_data_dir):
+        store = DocumentStore(temp_data_dir / "store.db")
+        tasks = store.collection("tasks", indexes=("lead_id",))
+        tasks.put_many(keyed([{"id": str(i), "lead_id": f"L{i % 3}"} for i in range(9)]))
+
+        assert [d["id"] for d in tasks.find("lead_id", "L1")] == ["1", "4", "7"]
+        plan = store._conn.execute(
+            "EXPLAIN QUERY PLAN SELECT data FROM documents WHERE collection = 'tasks' "
+            "AND json_extract(data, '$.lead_id') = 'L1'"
+        ).fetchall()
+        assert "idx_doc_tasks_lead_id" in str(plan)
+
+    def test_find_keys_uses_index(self, temp_data_dir):
+        store = DocumentStore(temp_data_dir / "store.db")
+        nodes = store.collection("nodes", indexes=("parent",))
+        nodes.put_many((str(i), {"parent": f"p{i % 4}"}) for i in range(12))
+        assert sorted(nodes.find_keys("parent", ["p1", "p3", "p9"])) == [
+            "1", "11", "3", "5", "7", "9"
+        ]
+        assert nodes.find_keys("parent", []) == []
+
+    def test_transaction_commits_together(self, temp_data_dir):
+        path = temp_data_dir / "store.db"
+        store = DocumentStore(path, write_behind=True, flush_interval=60)
+        pages = store.collection("pages")
+        pages.put("early", {"views": 1})
+        with store.transaction():
+            pages.put("p", {"views": pages.get("early")["views"] + 1})
+        # Pending writes are flushed first; writes inside aren't buffered
+        assert store.pending() == 0
+        assert DocumentStore(path).collection("pages").get("p") == {"views": 2}
+
+        with pytest.raises(RuntimeError):
+            with store.transaction():
+                pages.put("p", {"views": 3})
+                raise RuntimeError("abort")
+        assert pages.get("p") == {"views": 2}
+
+    def test_invalid_names_rejected(self, temp_data_dir):
+        store = DocumentStore(temp_data_dir / "store.db")
+        with pytest.raises(ValueError):
+            store.collection("tasks; DROP TABLE documents")
+        with pytest.raises(ValueError):
+            store.collection("tasks").find("a') OR 1=1 --", 1)
+
+    def test_write_behind_buffers_until_flush(self, temp_data_dir):
+        path = temp_data_dir / "store.db"
+        store = DocumentStore(path, write_behind=True, flush_interval=60)
+        pages = store.collection("pages")
+        pages.put("p", {"views": 1})
+        pages.put("p", {"views": 2})
+        pages.put("q", {"views": 1})
+        pages.delete("q")
+
+        assert store.pending() == 2
+        assert pages.get("p") == {"views": 2}
+        assert pages.get("q") is None
+        assert DocumentStore(path).collection("pages").get("p") is None
+
+        store.flush()
+        assert store.pending() == 0
+        assert DocumentStore(path).collection("pages").get("p") == {"views": 2}
+
+    def test_write_behind_flushes_at_max_pending(self, temp_data_dir):
+        store = DocumentStore(
+            temp_data_dir / "store.db", write_behind=True, flush_interval=60, max_pending=3
+        )
+        pages = store.collection("pages")
+        for i in range(3):
+            pages.put(str(i), {"i": i})
+        assert store.pending() == 0
+        assert len(DocumentStore(temp_data_dir / "store.db").collection("pages")) == 3
+
+    def test_open_store_is_shared(self, temp_data_dir):
+        first = open_store(temp_data_dir / "store.db", write_behind=True)
+        assert open_store(temp_data_dir / "sub" / ".." / "store.db") is first
+        first.close()
+        assert open_store(temp_data_dir / "store.db") is not first
+
+    def test_import_legacy_runs_once(self, temp_data_dir):
+        legacy = temp_data_dir / "tasks.json"
+        legacy.write_text(json.dumps({"tasks": [{"id": "a"}, {"id": "b"}]}))
+        store = DocumentStore(temp_data_dir / "store.db")
+        tasks = store.collection("tasks")
+
+        assert tasks.import_legacy(legacy, lambda data: keyed(data["tasks"])) == 2
+        tasks.delete_many(["a", "b"])
+        assert tasks.import_legacy(legacy, lambda data: keyed(data["tasks"])) == 0
+        assert len(tasks) == 0
+        assert legacy.exists()
+
+    def test_replace_all(self, temp_data_dir):
+        tasks = DocumentStore(temp_data_dir / "store.db").collection("tasks")
+        tasks.put_many([("a", {}), ("b", {})])
+        tasks.replace_all([("b", {"v": 1}), ("c", {})])
+        assert dict(tasks.items()) == {"b": {"v": 1}, "c": {}}
+
+
+class TestManagerPersistence:
+    """Managers keep their public behavior on top of the store."""
+
+    def test_task_manager_round_trip(self, temp_data_dir):
+        path = temp_data_dir / "tasks.json"
+        manager = TaskManager(data_path=path)
+        due = datetime.now() + timedelta(days=1)
+        keep = manager.create_task("Call", TaskType.CALL, due, lead_id="L1")
+        drop = manager.create_task("Email", TaskType.EMAIL, due, lead_id="L1")
+        manager.delete_task(drop.id)
+
+        reloaded = TaskManager(data_path=path)
+        assert list(reloaded.tasks) == [keep.id]
+        assert [t.id for t in reloaded.get_tasks_for_lead("L1")] == [keep.id]
+        assert not path.exists()
+
+    def test_task_manager_imports_legacy_json(self, temp_data_dir):
+        path = temp_data_dir / "tasks.json"
+        task = TaskManager(data_path=temp_data_dir / "seed.json").create_task(
+            "Call", TaskType.CALL, datetime.now(), lead_id="L1"
+        )
+        path.write_text(json.dumps({"tasks": [task.to_dict()]}))
+
+        assert list(TaskManager(data_path=path).tasks) == [task.id]
+
+    def test_landing_page_views_write_behind(self, temp_data_dir):
+        builder = LandingPageBuilder(storage_path=str(temp_data_dir / "pages"))
+        page = builder.create_page("Valuation", "valuation", "What's my home worth?")
+        for _ in range(5):
+            builder.record_view(page.id)
+
+        # Same directory in the same process shares the store and its pending writes
+        shared = LandingPageBuilder(storage_path=str(temp_data_dir / "pages"))
+        assert shared.pages[page.id].views == 5
+        builder.store.flush()
+        reopened = DocumentStore(temp_data_dir / "pages" / "store.db")
+        stored = reopened.collection("pages").get(page.id)
+        assert stored["views"] == 5
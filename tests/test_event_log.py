@@ -0,0 +1,186 @@
+"""Tests for the segmented event log and the EventTracker on top of it."""
+
+import json
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.core.segment_log import SegmentedLog
+from td_lead_engine.tracking.events import EventCategory, EventTracker
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+BASE = datetime(2026, 1, 1)
+
+
+def fill(log: SegmentedLog, hours: int):
+    for h in range(hours):
+        at = BASE + timedelta(hours=h)
+        log.append({"n": h, "timestamp": at.isoformat()}, at=at)
+
+
+class TestSegmentedLog:
+    """Tests for SegmentedLog."""
+
+    def test_rotates_by_time_and_scans_range(self, temp_data_dir):
+        log = SegmentedLog(temp_data_dir / "log", segment_seconds=24 * 3600)
+        fill(log, 72)
+
+        segments = log.segments()
+        assert len(segments) == 3
+        assert [s.count for s in segments] == [24, 24, 24]
+        assert segments[0].sealed and not segments[-1].sealed
+
+        start, end = BASE + timedelta(hours=30), BASE + timedelta(hours=33)
+        assert [r["n"] for r in log.scan(start, end)] == [30, 31, 32, 33]
+        assert [r["n"] for r in log.scan(end=BASE + timedelta(hours=1))] == [0, 1]
+        assert [r["n"] for r in log.scan(reverse=True)][:2] == [71, 70]
+
+    def test_rotates_by_size(self, temp_data_dir):
+        log = SegmentedLog(temp_data_dir / "log", segment_bytes=200)
+        fill(log, 20)
+        assert len(log.segments()) > 3
+        assert len(log) == 20
+        assert [r["n"] for r in log.scan()] == list(range(20))
+
+    def test_range_reads_only_overlapping_segments(self, temp_data_dir, monkeypatch):
+        log = SegmentedLog(temp_data_dir / "log", segment_seconds=24 * 3600)
+        fill(log, 72)
+        read = []
+        original = SegmentedLog._read
+        monkeypatch.setattr(SegmentedLog, "_read",
+                            lambda self, s: read.append(s.seq) or original(self, s))
+
+        list(log.scan(BASE + timedelta(hours=50), BASE + timedelta(hours=52)))
+        assert read == [3]
+
+    def test_newest_stops_early(self, temp_data_dir):
+        log = SegmentedLog(temp_data_dir / "log", segment_seconds=24 * 3600)
+        fill(log, 72)
+        newest = log.newest(3, where=lambda r: r["n"] % 2 == 0)
+        assert [r["n"] for r in newest] == [70, 68, 66]
+        assert [r["n"] for r in log.newest(2, end=BASE + timedelta(hours=5))] == [5, 4]
+
+    def test_reopen_uses_index_and_appends(self, temp_data_dir):
+        log = SegmentedLog(temp_data_dir / "log", segment_seconds=24 * 3600)
+        fill(log, 30)
+        log.close()
+        index = json.loads((temp_data_dir / "log" / "segments.json").read_text())
+        assert list(index) == ["segment-00000001.jsonl"]
+
+        reopened = SegmentedLog(temp_data_dir / "log", segment_seconds=24 * 3600)
+        assert [s.count for s in reopened.segments()] == [24, 6]
+        at = BASE + timedelta(hours=30)
+        reopened.append({"n": 30, "timestamp": at.isoformat()})
+        assert len(reopened) == 31
+
+    def test_torn_line_is_skipped(self, temp_data_dir):
+        log = SegmentedLog(temp_data_dir / "log")
+        fill(log, 2)
+        log.close()
+        segment = log.segments()[-1].path
+        segment.write_text(segment.read_text() + '{"n": 9, "times')
+
+        reopened = SegmentedLog(temp_data_dir / "log")
+        at = BASE + timedelta(hours=2)
+        reopened.append({"n": 2, "timestamp": at.isoformat()})
+        assert [r["n"] for r in reopened.scan()] == [0, 1, 2]
+
+    def test_invalid_fsync_policy(self, temp_data_dir):
+        with pytest.raises(ValueError):
+            SegmentedLog(temp_data_dir / "log", fsync="sometimes")
+
+    def test_fsync_always(self, temp_data_dir, monkeypatch):
+        synced = []
+        monkeypatch.setattr("td_lead_engine.core.segment_log.os.fsync", synced.append)
+        log = SegmentedLog(temp_data_dir / "log", fsync="always")
+        fill(log, 3)
+        assert len(synced) == 3
+
+
+class TestEventTracker:
+    """EventTracker keeps full history in the log and a tail in memory."""
+
+    def test_history_beyond_tail(self, temp_data_dir):
+        tracker = EventTracker(str(temp_data_dir / "events"), tail_size=10)
+        for i in range(25):
+            tracker.track_page_view(f"/p{i}", visitor_id=f"v{i % 3}")
+
+        assert len(tracker.events) == 10
+        assert len(tracker.get_events(limit=100)) == 25
+        assert tracker.get_event_counts() == {"page:view": 25}
+        latest = tracker.get_events(visitor_id="v1", limit=2)
+        assert [e.page_url for e in latest] == ["/p22", "/p19"]
+
+    def test_reload_fills_tail(self, temp_data_dir):
+        tracker = EventTracker(str(temp_data_dir / "events"), tail_size=5)
+        for i in range(8):
+            tracker.track(EventCategory.SEARCH, "perform", value=i)
+        tracker.close()
+
+        reloaded = EventTracker(str(temp_data_dir / "events"), tail_size=5)
+        assert [e.value for e in reloaded.events] == [3, 4, 5, 6, 7]
+        assert len(reloaded.get_events(category=EventCategory.SEARCH, limit=50)) == 8
+
+    @pytest.mark.parametrize("tail_size", [5000, 3])
+    def test_property_engagement(self, temp_data_dir, tail_size):
+        tracker = EventTracker(str(temp_data_dir / "events"), tail_size=tail_size)
+        for visitor in ("v1", "v2", "v1"):
+            tracker.track_property_view("p1", visitor_id=visitor)
+        tracker.track_property_view("p2", visitor_id="v3")
+        tracker.track_property_favorite("p1", visitor_id="v2")
+        tracker.track_showing_scheduled("p1", lead_id="L1")
+
+        engagement = tracker.get_property_engagement("p1")
+        assert engagement["total_views"] == 3
+        assert engagement["favorites"] == 1
+        assert engagement["showings_scheduled"] == 1
+        assert engagement["unique_visitors"] == 2
+        assert engagement["favorite_rate"] == pytest.approx(100 / 3)
+
+    def test_property_engagement_covers_all_history(self, temp_data_dir):
+        storage = temp_data_dir / "events"
+        storage.mkdir()
+        old = datetime.now() - timedelta(days=90)
+        (storage / "events.json").write_text(json.dumps([
+            {"id": visitor, "category": "property", "action": "view", "visitor_id": visitor,
+             "property_id": "p1", "timestamp": old.isoformat()}
+            for visitor in ("v1", "v2")
+        ]))
+        tracker = EventTracker(str(storage), tail_size=2)
+        tracker.track_property_view("p1", visitor_id="v3")
+
+        engagement = tracker.get_property_engagement("p1")
+        assert engagement["total_views"] == 3
+        assert engagement["unique_visitors"] == 3
+        recent = tracker.get_property_engagement("p1", start_date=old + timedelta(days=1))
+        assert recent["total_views"] == 1
+
+    def test_engagement_of_an_idle_property_reads_no_events(self, temp_data_dir, monkeypatch):
+        tracker = EventTracker(str(temp_data_dir / "events"), tail_size=1)
+        tracker.track_property_view("p1", visitor_id="v1")
+        tracker.track_property_view("p1", visitor_id="v2")
+        monkeypatch.setattr(tracker.log, "scan", lambda *args, **kwargs: pytest.fail("log scanned"))
+        assert tracker.get_property_engagement("p2")["unique_visitors"] == 0
+
+    def test_imports_legacy_events_json(self, temp_data_dir):
+        storage = temp_data_dir / "events"
+        storage.mkdir()
+        legacy = [
+            {"id": str(i), "category": "page", "action": "view",
+             "timestamp": (BASE + timedelta(minutes=i)).isoformat()}
+            for i in range(3)
+        ]
+        (storage / "events.json").write_text(json.dumps(legacy))
+
+        tracker = EventTracker(str(storage))
+        assert [e.id for e in tracker.events] == ["0", "1", "2"]
+        assert len(EventTracker(str(storage)).events) == 3
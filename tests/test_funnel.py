@@ -0,0 +1,106 @@
+"""Tests for the single-pass funnel engine and EventTracker funnels."""
+
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.tracking.events import EventCategory, EventTracker
+from td_lead_engine.tracking.funnel import FunnelEngine
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+BASE = datetime(2026, 1, 1)
+STEPS = ["page:view", "property:view", "form:submit"]
+
+
+def run(engine: FunnelEngine, events):
+    for visitor_id, event_type, days in events:
+        engine.feed(visitor_id, event_type, BASE + timedelta(days=days))
+    return engine.counts()
+
+
+class TestFunnelEngine:
+    """Tests for FunnelEngine."""
+
+    def test_steps_must_happen_in_order(self):
+        counts = run(FunnelEngine(STEPS), [
+            ("a", "page:view", 0), ("a", "property:view", 1), ("a", "form:submit", 2),
+            ("b", "form:submit", 0), ("b", "page:view", 1), ("b", "property:view", 2),
+            ("c", "property:view", 0), ("c", "form:submit", 1),
+        ])
+        assert counts == [2, 2, 1]
+
+    def test_window_and_latest_start(self):
+        events = [
+            ("a", "page:view", 0), ("a", "property:view", 1), ("a", "form:submit", 9),
+            # A later entry restarts the window
+            ("b", "page:view", 0), ("b", "page:view", 5), ("b", "property:view", 6),
+            ("b", "form:submit", 11),
+        ]
+        assert run(FunnelEngine(STEPS, window=timedelta(days=7)), events) == [2, 2, 1]
+        assert run(FunnelEngine(STEPS), events) == [2, 2, 2]
+
+    def test_repeated_step_needs_two_events(self):
+        steps = ["page:view", "page:view", "form:submit"]
+        counts = run(FunnelEngine(steps), [
+            ("a", "page:view", 0), ("a", "form:submit", 1),
+            ("b", "page:view", 0), ("b", "page:view", 1), ("b", "form:submit", 2),
+        ])
+        assert counts == [2, 1, 1]
+
+    def test_unordered_counts_each_step(self):
+        counts = run(FunnelEngine(STEPS, ordered=False), [
+            ("a", "form:submit", 0), ("b", "property:view", 0), ("b", "page:view", 1),
+        ])
+        assert counts == [1, 1, 1]
+
+    def test_no_steps(self):
+        with pytest.raises(ValueError):
+            FunnelEngine([])
+
+
+class TestFunnelAnalysis:
+    """EventTracker.get_funnel_analysis over the tail and the log."""
+
+    def track_visitors(self, tracker: EventTracker):
+        for i in range(6):
+            visitor = f"v{i}"
+            referrer = "https://www.google.com/" if i % 2 else ""
+            tracker.track_page_view("/home", visitor_id=visitor, referrer=referrer)
+            if i < 4:
+                tracker.track_property_view(f"p{i}", visitor_id=visitor)
+            if i < 2:
+                tracker.track_form_submission("contact", visitor_id=visitor)
+        # Submitted without viewing a property first
+        tracker.track_form_submission("contact", visitor_id="v5")
+
+    @pytest.mark.parametrize("tail_size", [5000, 3])
+    def test_funnel_with_breakdown(self, temp_data_dir, tail_size):
+        tracker = EventTracker(str(temp_data_dir / "events"), tail_size=tail_size)
+        self.track_visitors(tracker)
+
+        steps = [("page", "view"), ("property", "view"), ("form", "submit")]
+        result = tracker.get_funnel_analysis(
+            steps, window=timedelta(days=7), breakdown="source", ordered=True
+        )
+        assert [s["count"] for s in result["steps"]] == [6, 4, 2]
+        assert [s["events"] for s in result["steps"]] == [6, 4, 3]
+        assert result["overall_conversion"] == pytest.approx(100 / 3)
+        assert [s["count"] for s in result["breakdown"]["google.com"]["steps"]] == [3, 2, 1]
+        assert [s["count"] for s in result["breakdown"]["direct"]["steps"]] == [3, 2, 1]
+
+        unordered = tracker.get_funnel_analysis(steps)
+        assert [s["count"] for s in unordered["steps"]] == [6, 4, 3]
+
+    def test_unknown_breakdown(self, temp_data_dir):
+        tracker = EventTracker(str(temp_data_dir / "events"))
+        with pytest.raises(ValueError):
+            tracker.get_funnel_analysis([(EventCategory.PAGE.value, "view")], breakdown="device")
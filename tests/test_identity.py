@@ -0,0 +1,138 @@
+"""Tests for the identity graph and visitor → lead stitching."""
+
+import json
+import multiprocessing
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.tracking.identity import IdentityGraph, identity_nodes
+from td_lead_engine.tracking.visitor import VisitorStatus, VisitorTracker
+
+
+def _link_sessions(path, worker, count):
+    graph = IdentityGraph(path)
+    for i in range(count):
+        graph.link("visitor:shared", f"session:{worker}-{i}")
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestIdentityGraph:
+    """Tests for IdentityGraph."""
+
+    def test_nodes_hash_normalized_contacts(self):
+        nodes = identity_nodes(visitor_id="v1", email="J.Doe+x@Gmail.com", phone="614-555-1234")
+        assert nodes[0] == "visitor:v1"
+        assert nodes[1] == identity_nodes(email="jdoe@gmail.com")[0]
+        assert nodes[2] == identity_nodes(phone="+1 (614) 555-1234")[0]
+        assert "gmail" not in nodes[1] and "555" not in nodes[2]
+        assert identity_nodes(phone="555-1234") == []
+
+    def test_link_merges_sets(self, temp_data_dir):
+        graph = IdentityGraph(temp_data_dir / "identity.db")
+        graph.link("visitor:a", "session:1")
+        graph.link("visitor:b", "session:2", "email:x")
+        assert graph.resolve("session:1").root != graph.resolve("session:2").root
+
+        graph.link("visitor:a", "email:x", lead_id="L1")
+        identity = graph.resolve("session:1")
+        assert identity.root == graph.resolve("session:2").root
+        assert identity.lead_id == "L1"
+        assert sorted(identity.ids("visitor")) == ["a", "b"]
+        assert graph.lead_for("visitor:zzz", "session:2") == "L1"
+        assert graph.resolve("visitor:zzz") is None
+
+    def test_merged_set_keeps_a_lead(self, temp_data_dir):
+        graph = IdentityGraph(temp_data_dir / "identity.db")
+        graph.link("visitor:a", lead_id="L1")
+        graph.link("visitor:a", "visitor:b")
+        assert graph.lead_for("visitor:b") == "L1"
+        graph.link("visitor:b", lead_id="L2")
+        assert graph.lead_for("visitor:a") == "L2"
+
+    def test_persisted_and_paths_compressed(self, temp_data_dir):
+        graph = IdentityGraph(temp_data_dir / "identity.db")
+        for i in range(20):
+            graph.link(f"visitor:{i}", f"session:{i}")
+        for i in range(1, 20):
+            graph.link("visitor:0", f"visitor:{i}")
+        root = graph.resolve("session:7").root
+        # Reads don't write; the next link through the node compresses its path
+        assert graph.nodes.get("session:7") == {"parent": "visitor:7"}
+        graph.link("session:7")
+        assert graph.nodes.get("session:7") == {"parent": root}
+
+        graph.store.close()
+        reopened = IdentityGraph(temp_data_dir / "identity.db")
+        identity = reopened.resolve("session:19")
+        assert identity.size == 40
+        assert len(set(identity.members)) == 40
+
+    def test_root_holds_no_member_list(self, temp_data_dir):
+        graph = IdentityGraph(temp_data_dir / "identity.db")
+        root = graph.link("visitor:a", "session:1", "session:2", lead_id="L1")
+        assert graph.nodes.get(root) == {"size": 3, "lead_id": "L1"}
+        graph.nodes.put(root, {"members": ["visitor:a", "session:1", "session:2"],
+                               "lead_id": "L1"})
+        # Roots written with a member list still count their size
+        assert graph.resolve("session:2").size == 3
+
+    def test_links_from_other_processes_all_kept(self, temp_data_dir):
+        path = temp_data_dir / "identity.db"
+        ctx = multiprocessing.get_context("fork")
+        workers = [ctx.Process(target=_link_sessions, args=(path, w, 100)) for w in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        assert all(worker.exitcode == 0 for worker in workers)
+
+        identity = IdentityGraph(path).resolve("visitor:shared")
+        assert identity.size == 301
+        assert len(identity.ids("session")) == 300
+
+
+class TestVisitorStitching:
+    """VisitorTracker resolves visitors, sessions and leads through the graph."""
+
+    def test_identify_stitches_devices(self, temp_data_dir):
+        tracker = VisitorTracker(str(temp_data_dir / "tracking"))
+        phone = tracker.get_or_create_visitor("fp-phone")
+        laptop = tracker.get_or_create_visitor("fp-laptop")
+        assert tracker.get_or_create_visitor("fp-phone") is phone
+
+        first = tracker.start_session(phone.id, "/home")
+        tracker.track_page_view(first.id, "/listing/123")
+        second = tracker.start_session(laptop.id, "/home")
+        tracker.track_event(second.id, "search", {"city": "Columbus"})
+
+        tracker.identify_visitor(laptop.id, "jo@example.com")
+        tracker.identify_visitor(phone.id, "Jo@Example.com", lead_id="42")
+        assert laptop.lead_id == "42" and laptop.status == VisitorStatus.LEAD
+        assert tracker.resolve_lead(session_id=second.id) == "42"
+        assert tracker.resolve_lead(email="jo@example.com") == "42"
+
+        timeline = tracker.get_lead_timeline("42")
+        assert [(item["type"], item["visitor_id"]) for item in timeline] == [
+            ("page_view", phone.id), ("search", laptop.id)
+        ]
+        assert tracker.get_lead_timeline("nope") == []
+
+    def test_builds_graph_for_stored_visitors(self, temp_data_dir):
+        storage = temp_data_dir / "tracking"
+        storage.mkdir()
+        (storage / "visitors.json").write_text(json.dumps([
+            {"id": "v1", "email": "a@example.com", "lead_id": "7", "sessions": ["s1"],
+             "fingerprint": "fp"},
+        ]))
+
+        tracker = VisitorTracker(str(storage))
+        assert tracker.resolve_lead(session_id="s1") == "7"
+        assert tracker.get_or_create_visitor("fp").id == "v1"
@@ -0,0 +1,159 @@
+"""Tests for the conversion model and ML score blending."""
+
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from td_lead_engine.connectors.base import RawLead
+from td_lead_engine.core.config import ConversionEvent, ScoringConfig
+from td_lead_engine.core.ml_model import ConversionModel, blend_scores, load_conversion_model
+from td_lead_engine.core.scorer import LeadScorer
+from td_lead_engine.storage.database import LeadDatabase
+
+
+def _event(lead_id, converted, signals, source="csv"):
+    return ConversionEvent(
+        lead_id=lead_id,
+        converted=converted,
+        conversion_type="buyer",
+        signals_at_conversion=signals,
+        score_at_conversion=0,
+        days_to_conversion=0,
+        source=source,
+    )
+
+
+def _events():
+    """Preapproved leads mostly convert; lease-is-up leads mostly don't."""
+    events = []
+    for i in range(40):
+        events.append(_event(i, i % 10 != 0, ["preapproved"]))
+        events.append(_event(100 + i, i % 10 == 0, ["lease is up"], source="instagram"))
+    return events
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+@pytest.fixture
+def model():
+    return ConversionModel.train(_events(), LeadScorer().signals)
+
+
+class TestConversionModel:
+    """Tests for training, inference and the on-disk artifact."""
+
+    def test_learns_signal_direction(self, model):
+        """Signals seen on converted leads raise the probability."""
+        assert model.predict(["preapproved"], "csv") > 0.7
+        assert model.predict(["lease is up"], "instagram") < 0.3
+        assert model.metadata["samples"] == 80
+        assert model.metadata["auc"] > 0.8
+
+    def test_needs_both_outcomes(self):
+        """A single-class history cannot be trained on."""
+        with pytest.raises(ValueError):
+            ConversionModel.train([_event(1, True, ["preapproved"])], LeadScorer().signals)
+
+    def test_save_load_round_trip(self, model, temp_data_dir):
+        """The artifact reloads with memory-mapped, identical coefficients."""
+        path = temp_data_dir / "model.bin"
+        model.save(path)
+        loaded = ConversionModel.load(path)
+        assert isinstance(loaded.coefficients, np.memmap)
+        assert loaded.coefficients.tolist() == model.coefficients.tolist()
+        assert loaded.phrases == model.phrases
+        assert load_conversion_model(path) is load_conversion_model(path)
+        assert load_conversion_model(temp_data_dir / "missing.bin") is None
+
+    def test_rejects_foreign_file(self, temp_data_dir):
+        path = temp_data_dir / "model.bin"
+        path.write_bytes(b"not a model")
+        with pytest.raises(ValueError):
+            ConversionModel.load(path)
+
+    def test_blend_scores(self):
+        """ml_weight interpolates between rule score and probability points."""
+        config = ScoringConfig(ml_weight=0.25)
+        blended = blend_scores(np.array([100, 0]), np.array([0.5, 1.0]), config)
+        points = 2 * config.hot_threshold
+        assert blended.tolist() == [int(0.75 * 100 + 0.25 * points / 2), int(0.25 * points)]
+
+
+class TestMLBlending:
+    """Tests for blending model probabilities into stored scores."""
+
+    @pytest.fixture
+    def ml_db(self, model, temp_data_dir):
+        path = temp_data_dir / "model.bin"
+        model.save(path)
+        config = ScoringConfig(use_ml_scoring=True, ml_weight=0.5, ml_model_path=str(path))
+        db = LeadDatabase(temp_data_dir / "leads.db", scoring_config=config)
+        notes = ["I'm preapproved", "My lease is up soon", "Just saying hi"]
+        for i, text in enumerate(notes * 3):
+            db.insert_lead(RawLead(source="csv", source_id=str(i), name=f"Lead {i}", notes=text))
+        return db
+
+    def test_batch_matches_single_lead(self, ml_db):
+        """Vectorized blending agrees with score_lead's per-lead blend."""
+        scorer = LeadScorer()
+        ml_db.score_all_leads(scorer)
+        batch = {lead.id: (lead.score, lead.tier) for lead in ml_db.get_all_leads()}
+        for lead in ml_db.get_all_leads():
+            single = ml_db.score_lead(lead, scorer, force=True)
+            assert batch[lead.id] == (single.score, single.tier)
+            rule = scorer.score_text(lead.notes, source=lead.source).total_score
+            assert single.score != rule
+
+    def test_pool_blends_each_chunk(self, ml_db):
+        """Chunks scored on a process pool are blended as they are written."""
+        scorer = LeadScorer()
+        ml_db.score_all_leads(scorer)
+        serial = {lead.id: (lead.score, lead.tier) for lead in ml_db.get_all_leads()}
+        assert ml_db.score_all_leads(scorer, workers=2, chunk_size=2, force=True) == 9
+        assert {lead.id: (lead.score, lead.tier) for lead in ml_db.get_all_leads()} == serial
+
+    def test_blend_is_idempotent(self, ml_db):
+        """Re-applying the same model changes nothing."""
+        ml_db.score_all_leads(LeadScorer())
+        assert ml_db.apply_ml_scores() == 0
+
+    def test_disabled_keeps_rule_scores(self, ml_db):
+        """With use_ml_scoring off, stored scores are the rule scores."""
+        ml_db.scoring_config.use_ml_scoring = False
+        scorer = LeadScorer()
+        ml_db.score_all_leads(scorer)
+        for lead in ml_db.get_all_leads():
+            assert lead.score == scorer.score_text(lead.notes, source=lead.source).total_score
+
+    def test_score_lead_then_score_all_leads(self, ml_db):
+        """A lead rescored alone keeps its blended score through the next batch run."""
+        scorer = LeadScorer()
+        ml_db.score_all_leads(scorer)
+        lead = ml_db.get_lead(3)
+        lead.notes = "I'm preapproved and ready to buy"
+        single = ml_db.score_lead(lead, scorer)
+        new_lead = RawLead(source="csv", source_id="new", notes="I'm preapproved")
+        added, _ = ml_db.insert_lead(new_lead)
+        added = ml_db.score_lead(added, scorer)
+
+        assert ml_db.score_all_leads(scorer) == 0
+        for expected in (single, added):
+            stored = ml_db.get_lead(expected.id)
+            assert (stored.score, stored.tier) == (expected.score, expected.tier)
+
+    def test_disabling_restores_rule_scores(self, ml_db):
+        """Turning ML scoring off puts blended scores back on the rule scores."""
+        scorer = LeadScorer()
+        ml_db.score_all_leads(scorer)
+        ml_db.scoring_config.use_ml_scoring = False
+        assert ml_db.score_all_leads(scorer) == 0
+        for lead in ml_db.get_all_leads():
+            assert lead.score == scorer.score_text(lead.notes, source=lead.source).total_score
+        assert ml_db.apply_ml_scores() == 0
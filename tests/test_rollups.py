@@ -0,0 +1,214 @@
+"""Tests for the minute/hour/day rollup counters and the analytics served from them."""
+
+import random
+import sqlite3
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+from td_lead_engine.core.rollups import RollupStore, cover, floor_time
+from td_lead_engine.landing_pages.analytics import PageAnalytics
+from td_lead_engine.tracking.attribution import AttributionManager, AttributionModel
+from td_lead_engine.tracking.events import EventCategory, EventTracker
+
+
+@pytest.fixture
+def temp_data_dir():
+    """Create temporary data directory."""
+    with tempfile.TemporaryDirectory() as tmpdir:
+        yield Path(tmpdir)
+
+
+class TestRollupStore:
+    """Tests for RollupStore."""
+
+    def test_cover_uses_coarse_buckets_in_the_middle(self):
+        start, end = datetime(2026, 3, 1, 22, 30), datetime(2026, 3, 4, 1, 15)
+        pieces = cover(start, end)
+        assert sorted((g, lo.isoformat(), hi.isoformat()) for g, lo, hi in pieces) == [
+            ("day", "2026-03-02T00:00:00", "2026-03-04T00:00:00"),
+            ("hour", "2026-03-01T23:00:00", "2026-03-02T00:00:00"),
+            ("hour", "2026-03-04T00:00:00", "2026-03-04T01:00:00"),
+            ("minute", "2026-03-01T22:30:00", "2026-03-01T23:00:00"),
+            ("minute", "2026-03-04T01:00:00", "2026-03-04T01:16:00"),
+        ]
+
+    def test_counts_match_raw_events(self, temp_data_dir):
+        rng = random.Random(7)
+        now = datetime.now()
+        store = RollupStore(temp_data_dir / "rollups.db", max_pending=100)
+        events = []
+        for _ in range(3000):
+            at = now - timedelta(minutes=rng.randrange(4 * 24 * 60))
+            event_type, source = rng.choice("abc"), rng.choice(["google", "direct"])
+            store.add(at, event_type, source=source)
+            events.append((floor_time(at, "minute"), event_type, source))
+
+        for _ in range(25):
+            start = now - timedelta(minutes=rng.randrange(5 * 24 * 60))
+            end = start + timedelta(minutes=rng.randrange(3 * 24 * 60))
+            expected = {}
+            for at, event_type, source in events:
+                if floor_time(start, "minute") <= at <= end and source == "google":
+                    expected[event_type] = expected.get(event_type, 0) + 1
+            assert store.counts(start, end, where={"source": "google"}) == expected
+
+    def test_series_and_values(self, temp_data_dir):
+        store = RollupStore(temp_data_dir / "rollups.db")
+        day = datetime(2026, 3, 1, 10)
+        store.add(day, "sale", value=2.5)
+        store.add(day + timedelta(hours=1), "sale", value=1.0)
+        store.add(day + timedelta(days=1), "sale", value=4.0)
+
+        end = day + timedelta(days=2)
+        assert store.series(day, end) == {"2026-03-01": 2, "2026-03-02": 1}
+        assert store.series(day, end, "hour") == {
+            "2026-03-01T10": 1, "2026-03-01T11": 1, "2026-03-02T10": 1
+        }
+        assert store.counts(day, end, by=(), values=True) == {(): (3, 7.5)}
+
+    def test_active_range(self, temp_data_dir):
+        store = RollupStore(temp_data_dir / "rollups.db")
+        day = datetime(2026, 3, 1, 10, 30)
+        store.add(day, "property:view", property_id="p1")
+        store.add(day + timedelta(days=2), "property:view", property_id="p1")
+        store.add(day + timedelta(days=5), "property:view", property_id="p2")
+        assert store.active_range("hour", {"property_id": "p1"}) == (
+            datetime(2026, 3, 1, 10), datetime(2026, 3, 3, 10)
+        )
+        assert store.active_range("day") == (datetime(2026, 3, 1), datetime(2026, 3, 6))
+        assert store.active_range("hour", {"property_id": "p3"}) is None
+
+    def test_buffered_until_flush_and_persisted(self, temp_data_dir):
+        store = RollupStore(temp_data_dir / "rollups.db", flush_interval=3600)
+        at = datetime(2026, 3, 1, 12)
+        store.add(at, "view", page="/a")
+        rows = store._conn.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+        assert rows == 0
+        store.close()
+
+        reopened = RollupStore(temp_data_dir / "rollups.db")
+        assert reopened.total(at, at, where={"page": "/a"}) == 1
+
+    def test_old_minutes_pruned_and_edges_widened(self, temp_data_dir):
+        store = RollupStore(temp_data_dir / "rollups.db", minute_retention=timedelta(days=1))
+        old = datetime.now().replace(minute=20) - timedelta(days=3)
+        store.add(old, "view")
+        store.flush()
+        minutes = store._conn.execute("SELECT COUNT(*) FROM rollups WHERE granularity = 'minute'")
+        assert minutes.fetchone()[0] == 0
+        # The old minute is gone; the query falls back to its hour
+        assert store.total(old + timedelta(minutes=5), old + timedelta(minutes=6)) == 1
+
+    def test_rebuild_replaces_counters(self, temp_data_dir):
+        store = RollupStore(temp_data_dir / "rollups.db")
+        at = datetime(2026, 3, 1, 12)
+        store.add(at, "stale")
+        assert not store.built
+        store.rebuild([(at, {"event_type": "view"}), (at, {"event_type": "view"})])
+        assert store.built
+        assert store.counts(at, at) == {"view": 2}
+
+    def test_counters_without_property_dimension_are_rebuilt(self, temp_data_dir):
+        path = temp_data_dir / "rollups.db"
+        with sqlite3.connect(path) as conn:
+            conn.execute(
+                "CREATE TABLE rollups (granularity TEXT, bucket TEXT, event_type TEXT, "
+                "source TEXT, campaign TEXT, page TEXT, count INTEGER, value REAL)"
+            )
+            conn.execute("CREATE TABLE rollup_meta (key TEXT PRIMARY KEY, value TEXT)")
+            conn.execute("INSERT INTO rollup_meta VALUES ('built_at', '2026-03-01T00:00:00')")
+        conn.close()
+
+        reopened = RollupStore(path)
+        assert not reopened.built
+        reopened.add(datetime(2026, 3, 1, 12), "view", property_id="p1")
+        counts = reopened.counts(datetime(2026, 3, 1), datetime(2026, 3, 2), by=("property_id",))
+        assert counts == {"p1": 1}
+
+
+class TestRollupAnalytics:
+    """Count queries answered from rollups."""
+
+    def test_event_counts_and_timeline(self, temp_data_dir):
+        tracker = EventTracker(str(temp_data_dir / "events"))
+        for i in range(5):
+            tracker.track_page_view(f"/listing/{i}?ref=x", referrer="https://www.google.com/search")
+        tracker.track_search({"utm_source": "newsletter", "utm_campaign": "spring"})
+
+        assert tracker.get_event_counts() == {"page:view": 5, "search:perform": 1}
+        today = datetime.now().strftime("%Y-%m-%d")
+        assert tracker.get_event_timeline(category=EventCategory.PAGE) == {today: 5}
+        assert tracker.get_event_timeline(source="google.com") == {today: 5}
+        assert tracker.get_event_timeline(campaign="spring") == {today: 1}
+        by_page = tracker.rollups.counts(datetime.now() - timedelta(hours=1), datetime.now(),
+                                         by=("page",))
+        assert by_page == {
+            "/listing/0": 1, "/listing/1": 1, "/listing/2": 1, "/listing/3": 1, "/listing/4": 1,
+            "": 1,
+        }
+        tracker.close()
+
+        # Counters are rebuilt from the log when the rollups are missing
+        (temp_data_dir / "events" / "rollups.db").unlink()
+        rebuilt = EventTracker(str(temp_data_dir / "events"))
+        assert rebuilt.get_event_counts() == {"page:view": 5, "search:perform": 1}
+
+    def test_channel_performance(self, temp_data_dir):
+        manager = AttributionManager(str(temp_data_dir / "attribution"))
+        manager.add_touch_point("lead1", channel="paid", source="google", medium="cpc",
+                                campaign="spring")
+        manager.add_touch_point("lead1", channel="social", source="facebook", medium="social")
+        manager.add_touch_point("lead2", channel="paid", source="google", medium="cpc")
+        manager.record_conversion("lead1", value=1000)
+        manager.record_conversion("lead2", value=500)
+        manager.record_conversion("lead2", value=300)  # Replaces the first
+
+        performance = manager.get_channel_performance()
+        assert performance["paid"]["conversions"] == 2
+        # 40% first + 40% last, 100% single touch
+        assert performance["paid"]["credit"] == pytest.approx(1.4)
+        assert performance["paid"]["value"] == pytest.approx(700)
+        assert performance["paid"]["first_touch_conversions"] == 2
+        assert performance["social"]["last_touch_conversions"] == 1
+
+        # Another model recomputes the credits instead of reading the rollups
+        first_touch = manager.get_channel_performance(model=AttributionModel.FIRST_TOUCH)
+        assert first_touch["paid"]["credit"] == pytest.approx(2.0)
+        assert first_touch["paid"]["value"] == pytest.approx(1300)
+        assert "social" not in first_touch
+        last_touch = manager.get_campaign_performance(model=AttributionModel.LAST_TOUCH)
+        assert last_touch == {}
+        assert manager.get_campaign_performance()["spring"]["credit"] == pytest.approx(0.4)
+        assert manager.get_attribution("lead1").channel_credits == {"paid": 0.4, "social": 0.4}
+        assert manager.get_campaign_performance()["spring"]["value"] == pytest.approx(400)
+
+        rebuilt = AttributionManager(str(temp_data_dir / "attribution"))
+        rebuilt.rebuild_rollups()
+        for channel, stats in rebuilt.get_channel_performance().items():
+            assert stats == pytest.approx(performance[channel])
+
+    def test_page_stats(self, temp_data_dir):
+        analytics = PageAnalytics(str(temp_data_dir / "analytics"))
+        analytics.record_page_view("p1", "v1", referrer="https://google.com",
+                                   user_agent="Mobile Safari")
+        analytics.record_page_view("p1", "v2", utm_source="facebook", utm_campaign="spring")
+        analytics.record_page_view("p1", "v1")
+        analytics.record_page_view("p2", "v3")
+        analytics.record_form_submission("p1", "f1", "v1")
+
+        stats = analytics.get_page_stats("p1")
+        assert stats["total_views"] == 3
+        assert stats["unique_visitors"] == 2
+        assert stats["total_conversions"] == 1
+        assert stats["traffic_sources"] == {"google": 1, "facebook": 1, "direct": 1}
+        assert stats["device_breakdown"] == {"mobile": 1, "desktop": 2}
+        assert stats["top_campaigns"] == [{"campaign": "spring", "count": 1}]
+        assert stats["daily_views"] == {datetime.now().strftime("%Y-%m-%d"): 3}
+
+        overall = analytics.get_overall_stats()
+        assert overall["total_views"] == 4
+        assert overall["top_pages"][0]["page_id"] == "p1"
+        assert overall["conversions_by_day"] == {datetime.now().strftime("%Y-%m-%d"): 1}
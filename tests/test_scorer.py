@@ -1,8 +1,17 @@
 """Tests for the scoring engine."""
 
+import json
+import os
+import re
+
 import pytest
-from td_lead_engine.core.scorer import LeadScorer, ScoringResult
-from td_lead_engine.core.signals import SignalCategory
+from td_lead_engine.core import scorer as scorer_module
+from td_lead_engine.core.config import ScoringConfig
+from td_lead_engine.core.matcher import PhraseMatcher, VariantPhraseMatcher, edit_distance
+from td_lead_engine.core.scorer import (
+    LeadScorer, ScoreCache, ScoringResult, get_shared_scorer, quick_score
+)
+from td_lead_engine.core.signals import INTENT_SIGNALS, SignalCategory
 
 
 class TestLeadScorer:
@@ -120,3 +129,218 @@ class TestScoringResult:
         assert ScoringResult(total_score=-1).is_negative
         assert not ScoringResult(total_score=0).is_negative
         assert not ScoringResult(total_score=100).is_negative
+
+
+class TestScoringConfig:
+    """Tests for applying ScoringConfig weights and thresholds in the scorer."""
+
+    def test_thresholds_come_from_config(self):
+        """Tiers follow the config's thresholds rather than fixed values."""
+        config = ScoringConfig(hot_threshold=40, category_multipliers={}, source_multipliers={})
+        result = LeadScorer(config=config).score_text("I'm preapproved")
+        assert result.total_score >= 40
+        assert result.tier == "hot"
+        assert ScoringResult(total_score=100, config=config).tier == "hot"
+
+    def test_overrides_and_multipliers(self):
+        """Phrase overrides, category and source multipliers all apply."""
+        config = ScoringConfig(
+            category_multipliers={"buyer_active": 2.0},
+            source_multipliers={"zillow": 1.5},
+            signal_weight_overrides={"preapproved": 10},
+        )
+        scorer = LeadScorer(config=config)
+        assert scorer.score_text("preapproved").total_score == 20
+        assert scorer.score_text("preapproved", source="zillow").total_score == 30
+        assert scorer.score_text("preapproved", source="unknown").total_score == 20
+
+    def test_match_weight_is_effective_weight(self):
+        """SignalMatch.weight carries the weight actually added to the total."""
+        config = ScoringConfig(category_multipliers={}, signal_weight_overrides={"preapproved": 7})
+        result = LeadScorer(config=config).score_text("preapproved")
+        assert [m.weight for m in result.matches] == [7]
+        assert result.total_score == 7
+
+    def test_config_changes_version(self):
+        """Scores computed under different configs have different versions."""
+        assert LeadScorer(config=ScoringConfig()).version != \
+            LeadScorer(config=ScoringConfig(hot_threshold=100)).version
+
+    def test_hot_reload_on_mtime_change(self, tmp_path, monkeypatch):
+        """Editing scoring_config.json is picked up without a new scorer."""
+        monkeypatch.setattr(scorer_module, "CONFIG_RELOAD_INTERVAL", 0)
+        path = tmp_path / "scoring_config.json"
+        path.write_text(json.dumps({"signal_weight_overrides": {"preapproved": 10}}))
+        scorer = LeadScorer(config_path=path)
+        matcher = scorer._matcher
+        assert scorer.score_text("preapproved").total_score == 10
+
+        path.write_text(json.dumps({"signal_weight_overrides": {"preapproved": 33}}))
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 5))
+        assert scorer.score_text("preapproved").total_score == 33
+        assert scorer._matcher is matcher
+
+
+class TestScoreCache:
+    """Tests for memoized scoring and the shared scorer."""
+
+    def test_repeated_text_hits_cache(self):
+        """The second score of the same text is served from the cache."""
+        scorer = LeadScorer(config=ScoringConfig(), cache=ScoreCache(10))
+        first = scorer.score_text("Ready to buy in Dublin")
+        second = scorer.score_text("Ready to buy in Dublin")
+        assert second is first
+        assert scorer.cache.stats()["hits"] == 1
+        assert scorer.cache.stats()["misses"] == 1
+
+    def test_lru_eviction(self):
+        """The least recently used entry is evicted past the bound."""
+        scorer = LeadScorer(config=ScoringConfig(), cache=ScoreCache(2))
+        scorer.score_text("ready to buy")
+        scorer.score_text("need to sell")
+        scorer.score_text("ready to buy")
+        scorer.score_text("lease is up")
+        assert scorer.cache.evictions == 1
+        scorer.score_text("ready to buy")
+        assert scorer.cache.hits == 2
+
+    def test_source_multiplier_is_part_of_key(self):
+        """Sources with their own multiplier get separate entries."""
+        config = ScoringConfig(category_multipliers={}, source_multipliers={"zillow": 2.0})
+        scorer = LeadScorer(config=config, cache=ScoreCache(10))
+        plain = scorer.score_text("preapproved")
+        boosted = scorer.score_text("preapproved", source="zillow")
+        assert boosted.total_score == 2 * plain.total_score
+        # Sources without a multiplier share the default entry
+        assert scorer.score_text("preapproved", source="csv") is plain
+
+    def test_shared_scorer_is_process_wide(self):
+        """get_shared_scorer returns one cached instance used by quick_score."""
+        scorer = get_shared_scorer()
+        assert get_shared_scorer() is scorer
+        assert scorer.cache is not None
+        hits = scorer.cache.hits
+        quick_score("We are relocating to Powell")
+        quick_score("We are relocating to Powell")
+        assert scorer.cache.hits > hits
+
+
+class TestPhraseMatcher:
+    """Tests for the single-pass phrase matcher."""
+
+    def test_word_boundaries(self):
+        """Phrases should not match inside longer words."""
+        matcher = PhraseMatcher(["relocating", "ohio"])
+        assert matcher.find_first("we are relocatingsoon to ohio") == [(1, 25)]
+        assert matcher.find_first("relocating to ohio.") == [(0, 0), (1, 14)]
+
+    def test_first_occurrence_and_phrase_order(self):
+        """Each phrase is reported once, at its first occurrence, in phrase order."""
+        matcher = PhraseMatcher(["powell", "dublin"])
+        assert matcher.find_first("Dublin, Powell or Dublin") == [(0, 8), (1, 0)]
+
+    def test_duplicate_phrases_reported_once(self):
+        """Duplicate phrases (case-insensitive) keep only the first index."""
+        matcher = PhraseMatcher(["Down Payment", "down payment"])
+        assert matcher.find_first("saving for a DOWN PAYMENT") == [(0, 13)]
+
+    def test_overlapping_phrases(self):
+        """Overlapping phrases should all be found."""
+        matcher = PhraseMatcher(["first time homebuyer", "homebuyer", "first time"])
+        assert matcher.find_first("first time homebuyer") == [(0, 0), (1, 11), (2, 0)]
+
+    def test_punctuation_phrases_match_regex_semantics(self):
+        """Phrases with punctuation behave like the word-boundary regex."""
+        phrases = ["re/max", "pre-approved", "what's my home worth", "$500k"]
+        matcher = PhraseMatcher(phrases)
+        text = "RE/MAX said I'm Pre-Approved; what's my home worth at $500k?"
+        expected = []
+        for index, phrase in enumerate(phrases):
+            match = re.search(r"\b" + re.escape(phrase) + r"\b", text, re.IGNORECASE)
+            if match:
+                expected.append((index, match.start()))
+        assert matcher.find_first(text) == expected
+
+    def test_scorer_matches_legacy_regex_loop(self):
+        """LeadScorer results should equal the per-pattern regex loop."""
+        scorer = LeadScorer(config=ScoringConfig())
+        text = (
+            "First time homebuyer here, PRE-APPROVED and house hunting in Powell. "
+            "My lease is up soon; what's my home worth in Dublin? Not a realtor."
+        )
+        expected = []
+        seen = set()
+        for signal in INTENT_SIGNALS:
+            match = re.search(r"\b" + re.escape(signal.phrase) + r"\b", text, re.IGNORECASE)
+            if match and signal.phrase.lower() not in seen:
+                seen.add(signal.phrase.lower())
+                expected.append((signal.phrase, match.start(), match.group()))
+
+        result = scorer.score_text(text)
+        assert [(m.signal.phrase, m.position, m.matched_text) for m in result.matches] == expected
+
+
+class TestVariantMatching:
+    """Tests for spacing, punctuation and typo tolerant matching."""
+
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.matcher = VariantPhraseMatcher([s.phrase for s in INTENT_SIGNALS])
+
+    def _found(self, text):
+        return [
+            (self.matcher.phrases[i], text[a:b])
+            for i, a, b in self.matcher.find_first_spans(text)
+        ]
+
+    def test_separator_folding(self):
+        """Whitespace, hyphen and apostrophe variants match the phrase."""
+        assert self._found("we are house-hunting") == [("house hunting", "house-hunting")]
+        assert self._found("I am pre approved") == [("preapproved", "pre approved")]
+        assert self._found("whats my home worth?") == [
+            ("what's my home worth", "whats my home worth")
+        ]
+
+    def test_typos_in_long_words(self):
+        """A single edit in a longer token is corrected."""
+        assert self._found("preaproved already") == [("preapproved", "preaproved")]
+        assert self._found("lookin for a home") == [("looking for a home", "lookin for a home")]
+        assert self._found("relocatng for work") == [("relocating", "relocatng")]
+
+    def test_short_words_stay_exact(self):
+        """Short tokens are not fuzzed ("horse" is not "house")."""
+        assert self._found("looking for a horse") == []
+        assert self._found("bonds and stocks") == []
+
+    def test_no_folding_across_sentence_punctuation(self):
+        """Only whitespace, hyphens and apostrophes are folded between tokens."""
+        assert self._found("pre. approved") == []
+
+    def test_variant_not_double_counted(self):
+        """A phrase matched exactly is not reported again through its variants."""
+        found = self._found("Pre-approved and preapproved")
+        assert [phrase for phrase, _ in found].count("pre-approved") == 1
+        assert "preapproved" in [phrase for phrase, _ in found]
+
+    def test_edit_distance(self):
+        """Transpositions count as one edit; distance is capped at the limit."""
+        assert edit_distance("frist", "first", 2) == 1
+        assert edit_distance("lookin", "looking", 1) == 1
+        assert edit_distance("abcdef", "uvwxyz", 2) == 3
+
+    def test_scorer_uses_variants(self):
+        """Variant matches are scored and report the text that matched."""
+        fuzzy = LeadScorer(config=ScoringConfig(fuzzy_matching=True))
+        result = fuzzy.score_text("Were pre aproved and house-hunting")
+        assert {m.signal.phrase for m in result.matches} == {"preapproved", "house hunting"}
+        assert LeadScorer(config=ScoringConfig()).score_text(
+            "Were pre aproved and house-hunting"
+        ).total_score == 0
+
+    def test_fuzzy_is_opt_in_and_versioned(self):
+        """Exact matching by default; the matching mode is part of the scoring version."""
+        exact = LeadScorer(config=ScoringConfig())
+        fuzzy = LeadScorer(config=ScoringConfig(fuzzy_matching=True))
+        assert not exact.fuzzy and fuzzy.fuzzy
+        assert exact.version != fuzzy.version